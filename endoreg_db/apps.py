@@ -10,9 +10,15 @@ class EndoregDbConfig(AppConfig):
         Performs application startup tasks when the Django app is fully loaded.
         
         This method imports media-related model modules to ensure they are registered
-        and ready for use when the application starts.
+        and ready for use when the application starts, and connects the signals that
+        drop the cached requirement evaluation plan when requirement data changes.
         """
         import endoreg_db.models.media.video
         import endoreg_db.models.media.frame
         import endoreg_db.models.media.pdf
+        from endoreg_db.models.requirement.requirement_evaluation.evaluation_plan import (
+            connect_plan_invalidation_signals,
+        )
+
+        connect_plan_invalidation_signals()
         pass
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from endoreg_db.utils.base_data_snapshot import compile_base_data_snapshot, get_snapshot_path
+
+
+class Command(BaseCommand):
+    help = """Load the base data from YAML into an empty database and write it to a
+    snapshot that load_base_db_data restores in one bulk operation"""
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--output",
+            type=str,
+            default=None,
+            help="Snapshot file (default: ENDOREG_BASE_DATA_SNAPSHOT or data/base_data_snapshot.json.gz)",
+        )
+
+    def handle(self, *args, **options):
+        """
+        Compiles the base data snapshot.
+
+        The YAML load runs in a transaction that is rolled back, so the database stays
+        empty. Fails if the database already contains endoreg_db rows, since those
+        would end up in the snapshot.
+        """
+        path = options["output"] or get_snapshot_path()
+        try:
+            counts = compile_base_data_snapshot(path)
+        except ValueError as e:
+            raise CommandError(str(e)) from e
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Wrote {sum(counts.values())} rows of {len(counts)} tables to {path}"
+            )
+        )
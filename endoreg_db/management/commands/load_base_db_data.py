@@ -11,6 +11,16 @@ class Command(BaseCommand):
             action="store_true",
             help="Display verbose output for all commands",
         )
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Reload all YAML files, including those unchanged since the last load",
+        )
+        parser.add_argument(
+            "--no-snapshot",
+            action="store_true",
+            help="Load the YAML files even if a matching base data snapshot exists",
+        )
 
     def handle(self, *args, **options):
         # verbose = options['verbose']
@@ -20,9 +30,25 @@ class Command(BaseCommand):
         This management command displays an initial message and then runs a series of data loading routines 
         (via call_command) in a specified order. It ignores any verbose setting from the command-line options 
         and forces verbose output. A final success message is printed after all commands complete.
+        
+        YAML files that are unchanged since their last load are skipped; `--force` reloads all of them.
+        On an empty database a base data snapshot (see `compile_base_data_snapshot`) is restored
+        instead if its checksum matches the YAML files.
         """
         verbose = True
 
+        if options["force"]:
+            from endoreg_db.models import BaseDataFile
+
+            # Forget the stored file hashes so every file is loaded again
+            BaseDataFile.objects.all().delete()
+        elif not options["no_snapshot"]:
+            from endoreg_db.utils.base_data_snapshot import restore_base_data_snapshot
+
+            if restore_base_data_snapshot():
+                self.stdout.write(self.style.SUCCESS("Restored base db models from snapshot."))
+                return
+
         self.stdout.write(self.style.SUCCESS("Populating base db models with data..."))
 
         out = self.stdout
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('endoreg_db', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videopredictionmeta',
+            name='score_labels',
+            field=models.JSONField(blank=True, help_text='Label names of the score matrix columns, in order.', null=True),
+        ),
+        migrations.AddField(
+            model_name='videopredictionmeta',
+            name='score_matrix',
+            field=models.FileField(blank=True, help_text='Raw per-frame model scores (frames x labels) as a .npy file.', null=True, upload_to='predictions'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('endoreg_db', '0002_video_prediction_meta_score_matrix'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BaseDataFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('path', models.CharField(max_length=500, unique=True)),
+                ('model_name', models.CharField(max_length=100)),
+                ('content_hash', models.CharField(max_length=64)),
+                ('loaded_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Base Data File',
+                'verbose_name_plural': 'Base Data Files',
+            },
+        ),
+    ]
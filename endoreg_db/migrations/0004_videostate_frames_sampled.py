@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('endoreg_db', '0003_base_data_file'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='videostate',
+            name='frames_sampled',
+            field=models.BooleanField(default=False, help_text='True if the frame directory only holds a selected subset of frames (extract_selected_frames).'),
+        ),
+    ]
@@ -139,7 +139,8 @@ from .other import (
     InformationSourceType,
     Unit,
     EmissionFactor,
-    Tag
+    Tag,
+    BaseDataFile,
 )
 
 from .requirement import (
@@ -331,6 +332,7 @@ __all__ = [
     "Unit",
     "EmissionFactor",
     "Tag",
+    "BaseDataFile",
 
     ###### Requirement ######
     "Requirement",
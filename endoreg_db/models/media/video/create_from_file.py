@@ -12,7 +12,7 @@ if TYPE_CHECKING:
     from endoreg_db.models import VideoFile
 
 from ....utils.video.ffmpeg_wrapper import transcode_videofile_if_required
-from ....utils.hashs import get_video_hash
+from ....utils.hashs import get_file_prehash, get_video_hash
 from ....utils.file_operations import get_uuid_filename
 
 logger = logging.getLogger(__name__)
@@ -255,6 +255,8 @@ def _create_from_file(
         final_storage_path.parent.mkdir(parents=True, exist_ok=True)
 
         # 5. Move or Copy the file to final storage using improved method
+        source_stat = transcoded_file_path.stat()
+        source_prehash = get_file_prehash(transcoded_file_path)
         try:
             if delete_source and transcoded_file_path == file_path:
                 logger.debug("Moving original file %s to %s", file_path, final_storage_path)
@@ -274,10 +276,15 @@ def _create_from_file(
         except Exception as e:
             raise RuntimeError(f"Failed to move file to final storage: {e}") from e
 
-        # 6. Verify hash after move/copy
-        final_hash = get_video_hash(final_storage_path)
-        if final_hash != video_hash:
-            logger.error("Hash mismatch after file operation! Expected %s, got %s", video_hash, final_hash)
+        # 6. Verify hash after move/copy. A rename keeps the inode, so the cheap
+        # pre-hash suffices; copies are verified with the full hash.
+        final_stat = final_storage_path.stat()
+        if (final_stat.st_dev, final_stat.st_ino) == (source_stat.st_dev, source_stat.st_ino):
+            expected_hash, final_hash = source_prehash, get_file_prehash(final_storage_path)
+        else:
+            expected_hash, final_hash = video_hash, get_video_hash(final_storage_path)
+        if final_hash != expected_hash:
+            logger.error("Hash mismatch after file operation! Expected %s, got %s", expected_hash, final_hash)
             final_storage_path.unlink(missing_ok=True)
             raise RuntimeError(f"Hash mismatch after file operation for {final_storage_path}")
 
@@ -23,9 +23,14 @@ def _pipe_1(
     binarize_threshold: float = 0.5,
     test_run: bool = False,
     n_test_frames: int = 10,
+    streaming_inference: bool = False,
 ) -> bool:
     """
     Pipeline 1: Extract frames, text, predict, create segments, optionally delete frames.
+
+    With streaming_inference=True the prediction step decodes the raw video directly
+    instead of reading the extracted frame images, so frames are not extracted; OCR
+    then decodes only its sampled frames.
     """
     success = False # Initialize success flag
     from .video_file_segments import _convert_sequences_to_db_segments # Added import
@@ -38,8 +43,9 @@ def _pipe_1(
     logger.info(f"Starting Pipe 1 for video {video_file.uuid}")
     try:
         # 1. Heavy I/O operations outside the transaction block
-        logger.info("Pipe 1: Extracting frames...")
-        video_file.extract_frames(overwrite=False)  # Avoid overwriting if already extracted
+        if not streaming_inference:
+            logger.info("Pipe 1: Extracting frames...")
+            video_file.extract_frames(overwrite=False)  # Avoid overwriting if already extracted
 
         logger.info("Pipe 1: Extracting text metadata...")
         video_file.update_text_metadata(
@@ -47,7 +53,7 @@ def _pipe_1(
         )
         with transaction.atomic():
             state = video_file.get_or_create_state()
-            if not state.frames_extracted:
+            if not state.frames_extracted and not streaming_inference:
                 logger.error("Pipe 1 failed: Frame extraction did not complete successfully.")
                 return False
 
@@ -74,6 +80,7 @@ def _pipe_1(
                     binarize_threshold=binarize_threshold,
                     test_run=test_run,
                     n_test_frames=n_test_frames,
+                    streaming=streaming_inference,
                 )
             except Exception as e:
                 logger.error(f"Pipe 1 failed during prediction: {e}", exc_info=True)
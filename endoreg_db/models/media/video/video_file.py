@@ -10,6 +10,7 @@ from django.core.files import File
 from django.core.validators import FileExtensionValidator
 from django.db.models import F
 from endoreg_db.utils.calc_duration_seconds import _calc_duration_vf
+from endoreg_db.utils.frame_ranges import FrameRangeSet
 
 # --- Import model-specific function modules ---
 from .create_from_file import _create_from_file
@@ -28,6 +29,7 @@ from .video_file_meta import (
 )
 from .video_file_frames import (
     _extract_frames,
+    _extract_selected_frames,
     _initialize_frames,
     _delete_frames,
     _get_frame_path,
@@ -238,6 +240,7 @@ class VideoFile(models.Model):
     update_text_metadata = _update_text_metadata
 
     extract_frames = _extract_frames
+    extract_selected_frames = _extract_selected_frames
     initialize_frames = _initialize_frames
     delete_frames = _delete_frames
     get_frame_path = _get_frame_path
@@ -593,6 +596,19 @@ class VideoFile(models.Model):
             logger.error("Error getting outside segments for video %s: %s", self.uuid, e, exc_info=True)
             return self.label_video_segments.none()
     
+    def get_outside_frame_ranges(self, only_validated: bool = False) -> FrameRangeSet:
+        """
+        Return the frames of all "outside" segments of this video as merged frame number ranges.
+
+        Parameters:
+            only_validated (bool): If True, only segments with a validated state are included.
+
+        Returns:
+            FrameRangeSet: Inclusive frame number ranges (segment end frames are exclusive); supports
+                `frame_number in ranges` and per-frame masks.
+        """
+        return FrameRangeSet.from_segments(self.get_outside_segments(only_validated=only_validated))
+
     @classmethod
     def get_all_videos(cls) -> models.QuerySet["VideoFile"]:
         """
@@ -18,22 +18,25 @@ def _extract_text_from_video_frames(
 ) -> Optional[Dict[str, str]]:
     """
     Extracts text from a sample of video frames using OCR based on processor ROIs.
-    Requires frames to be extracted. Raises ValueError on pre-condition failure.
+    If all frames are extracted, evenly spaced frame files are reused; otherwise only
+    the sampled frames are decoded (see VideoFile.extract_selected_frames).
+    Raises ValueError on pre-condition failure.
     Returns dictionary of extracted text or None if no text found.
 
     State Transitions:
-        - Pre-condition: Requires state.frames_extracted=True.
+        - Pre-condition: Requires state.frames_extracted=True or a known frame_count.
         - Post-condition: No state changes.
     """
     from endoreg_db.utils.ocr import (
         extract_text_from_rois,
     )  # Local import for dependency isolation
+    from endoreg_db.utils.video.ffmpeg_wrapper import FrameSelection
 
     state = video.get_or_create_state() # Use State helper
     # --- Pre-condition Check ---
-    if not state.frames_extracted:
+    if not state.frames_extracted and not video.frame_count:
         # Raise exception
-        raise ValueError(f"Frames not extracted for video {video.uuid}. Cannot extract text.")
+        raise ValueError(f"Frames not extracted and frame count unknown for video {video.uuid}. Cannot extract text.")
     # --- End Pre-condition Check ---
 
     processor: Optional["EndoscopyProcessor"] = video.processor
@@ -41,13 +44,17 @@ def _extract_text_from_video_frames(
         # Raise exception
         raise ValueError(f"Processor not set for video {video.uuid}. Cannot extract text.")
 
-    try:
-        frame_paths = video.get_frame_paths() # Use Frame helper
-    except Exception as e:
-        logger.error("Error getting frame paths for video %s: %s", video.uuid, e, exc_info=True)
-        raise RuntimeError(f"Could not get frame paths for video {video.uuid}") from e
+    if state.frames_extracted:
+        try:
+            frame_paths = video.get_frame_paths() # Use Frame helper
+        except Exception as e:
+            logger.error("Error getting frame paths for video %s: %s", video.uuid, e, exc_info=True)
+            raise RuntimeError(f"Could not get frame paths for video {video.uuid}") from e
+        n_frames = len(frame_paths)
+    else:
+        frame_paths = None
+        n_frames = video.frame_count
 
-    n_frames = len(frame_paths)
     if n_frames == 0:
         logger.warning("No frame paths found for video %s during text extraction.", video.uuid)
         return None # Return None if no frames, not an error condition for this function
@@ -64,8 +71,17 @@ def _extract_text_from_video_frames(
     )
 
     # Select evenly spaced frames
-    step = max(1, n_frames // n_frames_to_process)
-    selected_frame_paths = frame_paths[::step][:n_frames_to_process]
+    if frame_paths is not None:
+        step = max(1, n_frames // n_frames_to_process)
+        selected_frame_paths = frame_paths[::step][:n_frames_to_process]
+    else:
+        try:
+            selected_frame_paths = video.extract_selected_frames(
+                FrameSelection.evenly_spaced(n_frames_to_process, n_frames)
+            )
+        except Exception as e:
+            logger.error("Error extracting OCR sample frames for video %s: %s", video.uuid, e, exc_info=True)
+            raise RuntimeError(f"Could not extract sample frames for video {video.uuid}") from e
 
     # Extract text from ROIs for selected frames
     rois_texts = defaultdict(list)
@@ -121,25 +137,26 @@ def _predict_video_pipeline(
     binarize_threshold: float = 0.5,
     test_run: bool = False,
     n_test_frames: int = 10,
+    streaming: bool = False,
 ) -> Dict[str, List[Tuple[int, int]]]: # Changed return type to non-optional
     """
     Executes the video prediction pipeline using an AI model.
-    Requires frames to be extracted. Raises exceptions on failure.
+    Requires frames to be extracted, unless streaming=True, in which case frames are
+    decoded from the raw video straight into the model without touching the frame
+    directory. Raises exceptions on failure.
 
     State Transitions:
-        - Pre-condition: Requires state.frames_extracted=True.
+        - Pre-condition: Requires state.frames_extracted=True (streaming=False only).
         - Post-condition: No state changes directly. (Calling pipeline sets flags).
     """
     # Import heavy dependencies locally
     from ...administration.ai import AiModel
     try:
-        from ....utils.ai import InferenceDataset, MultiLabelClassificationNet, Classifier
+        import numpy as np
+        from ....utils.ai import InferenceDataset, Classifier
+        from ....utils.ai.predict import sample_config
 
-        from ....utils.ai.postprocess import (
-            concat_pred_dicts,
-            make_smooth_preds,
-            find_true_pred_sequences,
-        )
+        from ....utils.ai.postprocess import prediction_matrix_to_sequences
     except ImportError as e:
         logger.error("Failed to import endo_ai components: %s. Prediction unavailable.", e, exc_info=True)
         # Raise exception
@@ -150,18 +167,26 @@ def _predict_video_pipeline(
         n_test_frames = GLOBAL_N_TEST_FRAMES
         logger.info("Using global TEST_RUN settings for prediction pipeline.")
 
-    state = video.get_or_create_state() # Use State helper
-    # --- Pre-condition Check ---
-    if not state.frames_extracted:
-        # Raise exception
-        raise ValueError(f"Frames not extracted for video {video.uuid}. Prediction aborted.")
-    # --- End Pre-condition Check ---
+    if streaming:
+        # --- Pre-condition Check ---
+        raw_file_path = video.get_raw_file_path() if video.has_raw else None
+        if not raw_file_path or not raw_file_path.exists():
+            # Raise exception
+            raise FileNotFoundError(f"Raw video file not found at {raw_file_path} for video {video.uuid}. Streaming prediction aborted.")
+        # --- End Pre-condition Check ---
+    else:
+        state = video.get_or_create_state() # Use State helper
+        # --- Pre-condition Check ---
+        if not state.frames_extracted:
+            # Raise exception
+            raise ValueError(f"Frames not extracted for video {video.uuid}. Prediction aborted.")
+        # --- End Pre-condition Check ---
 
-    # Frame directory check
-    frame_dir = video.get_frame_dir_path() # Use IO helper
-    if not frame_dir or not frame_dir.exists() or not any(frame_dir.iterdir()):
-        # Raise exception
-        raise FileNotFoundError(f"Frame directory {frame_dir} is empty or does not exist for video {video.uuid}. Prediction aborted.")
+        # Frame directory check
+        frame_dir = video.get_frame_dir_path() # Use IO helper
+        if not frame_dir or not frame_dir.exists() or not any(frame_dir.iterdir()):
+            # Raise exception
+            raise FileNotFoundError(f"Frame directory {frame_dir} is empty or does not exist for video {video.uuid}. Prediction aborted.")
 
     model: Optional[AiModel] = model_meta.model
     if not model:
@@ -204,84 +229,65 @@ def _predict_video_pipeline(
         raise RuntimeError("Failed to get or create VideoPredictionMeta") from e
 
     # --- Dataset Preparation ---
-    datasets = {
-        "inference_dataset": InferenceDataset,
-        # Add other dataset types here if needed
-    }
-    dataset_model_class = datasets.get(dataset_name)
-    if not dataset_model_class:
-        # Raise exception
-        raise ValueError(f"Dataset class '{dataset_name}' not found for video {video.uuid}. Prediction aborted.")
+    crop_template = video.get_crop_template() # Use Meta helper
 
-    try:
-        paths = video.get_frame_paths() # Use Frame helper
-        if not paths:
-            raise FileNotFoundError(f"No frame paths returned by get_frame_paths for {frame_dir} (Video: {video.uuid})")
-    except Exception as e:
-        logger.error(
-            "Error listing or getting frame files from %s for video %s: %s", frame_dir, video.uuid, e, exc_info=True
-        )
-        raise RuntimeError(f"Error getting frame paths from {frame_dir}") from e
+    if not streaming:
+        datasets = {
+            "inference_dataset": InferenceDataset,
+            # Add other dataset types here if needed
+        }
+        dataset_model_class = datasets.get(dataset_name)
+        if not dataset_model_class:
+            # Raise exception
+            raise ValueError(f"Dataset class '{dataset_name}' not found for video {video.uuid}. Prediction aborted.")
 
-    logger.info("Found %d frame files in %s for video %s.", len(paths), frame_dir, video.uuid)
+        try:
+            paths = video.get_frame_paths() # Use Frame helper
+            if not paths:
+                raise FileNotFoundError(f"No frame paths returned by get_frame_paths for {frame_dir} (Video: {video.uuid})")
+        except Exception as e:
+            logger.error(
+                "Error listing or getting frame files from %s for video %s: %s", frame_dir, video.uuid, e, exc_info=True
+            )
+            raise RuntimeError(f"Error getting frame paths from {frame_dir}") from e
 
-    crop_template = video.get_crop_template() # Use Meta helper
-    string_paths = [p.as_posix() for p in paths]
-    crops = [crop_template] * len(paths) # Assuming same crop for all frames
+        logger.info("Found %d frame files in %s for video %s.", len(paths), frame_dir, video.uuid)
 
-    if test_run:
-        logger.info("TEST RUN: Using first %d frames for video %s.", n_test_frames, video.uuid)
-        string_paths = string_paths[:n_test_frames]
-        crops = crops[:n_test_frames]
-        if not string_paths:
-             # Raise exception
-            raise ValueError(f"Not enough frames ({len(paths)}) for test run (required {n_test_frames}) for video {video.uuid}.")
+        string_paths = [p.as_posix() for p in paths]
+        crops = [crop_template] * len(paths) # Assuming same crop for all frames
 
-    try:
-        ds_config = model_meta.get_inference_dataset_config()
-        ds = dataset_model_class(string_paths, crops, config=ds_config)
-        logger.info("Created dataset '%s' with %d items for video %s.", dataset_name, len(ds), video.uuid)
-        if len(ds) > 0:
-            sample = ds[0] # Get a sample for debugging shape
-            logger.debug("Sample shape: %s", sample.shape)
-    except Exception as e:
-        logger.error(
-            "Failed to create dataset '%s' for video %s: %s", dataset_name, video.uuid, e, exc_info=True
-        )
-        # Raise exception
-        raise RuntimeError(f"Failed to create dataset '{dataset_name}'") from e
+        if test_run:
+            logger.info("TEST RUN: Using first %d frames for video %s.", n_test_frames, video.uuid)
+            string_paths = string_paths[:n_test_frames]
+            crops = crops[:n_test_frames]
+            if not string_paths:
+                 # Raise exception
+                raise ValueError(f"Not enough frames ({len(paths)}) for test run (required {n_test_frames}) for video {video.uuid}.")
 
-    # --- Model Loading ---
-    try:
-        # Check if CUDA is available
-        import torch
-        if torch.cuda.is_available():
-            try:
-                # Try loading on GPU first
-                ai_model_instance = MultiLabelClassificationNet.load_from_checkpoint(
-                    checkpoint_path=weights_path.as_posix(), # Ensure path is string
-                )
-                # Attempt to move to GPU
-                _ = ai_model_instance.cuda()
-                logger.info("Loaded model on GPU for video %s.", video.uuid)
-            except RuntimeError as cuda_err:
-                # If GPU loading fails, fall back to CPU
-                logger.warning("GPU loading failed for video %s: %s. Falling back to CPU.", video.uuid, cuda_err)
-                ai_model_instance = MultiLabelClassificationNet.load_from_checkpoint(
-                    checkpoint_path=weights_path.as_posix(),
-                    map_location='cpu'
-                )
-                logger.info("Loaded model on CPU for video %s.", video.uuid)
-        else:
-            # No CUDA available, load directly on CPU
-            logger.info("CUDA not available. Loading model on CPU for video %s.", video.uuid)
-            ai_model_instance = MultiLabelClassificationNet.load_from_checkpoint(
-                checkpoint_path=weights_path.as_posix(),
-                map_location='cpu'
+        try:
+            ds_config = model_meta.get_inference_dataset_config()
+            ds = dataset_model_class(string_paths, crops, config=ds_config)
+            logger.info("Created dataset '%s' with %d items for video %s.", dataset_name, len(ds), video.uuid)
+            if len(ds) > 0:
+                sample = ds[0] # Get a sample for debugging shape
+                logger.debug("Sample shape: %s", sample.shape)
+        except Exception as e:
+            logger.error(
+                "Failed to create dataset '%s' for video %s: %s", dataset_name, video.uuid, e, exc_info=True
             )
+            # Raise exception
+            raise RuntimeError(f"Failed to create dataset '{dataset_name}'") from e
 
+    # --- Model Loading ---
+    try:
+        # Served from the process-wide model cache; only the first video per worker loads the checkpoint
+        ai_model_instance = model_meta.get_inference_model()
+        logger.info("Using model on %s for video %s.", next(ai_model_instance.parameters()).device, video.uuid)
         _ = ai_model_instance.eval() # Set to evaluation mode
-        classifier = Classifier(ai_model_instance, verbose=True) # Assuming Classifier exists
+        # Model-specific preprocessing and loader settings override the classifier defaults
+        classifier_config = sample_config.copy()
+        classifier_config.update(model_meta.get_inference_dataset_config())
+        classifier = Classifier(ai_model_instance, config=classifier_config, verbose=True)
         logger.info("AI model loaded successfully for video %s from %s.", video.uuid, weights_path)
     except Exception as e:
         logger.error(
@@ -292,9 +298,24 @@ def _predict_video_pipeline(
 
     # --- Inference ---
     try:
-        logger.info("Starting inference on %d frames for video %s...", len(string_paths), video.uuid)
-        predictions = classifier.pipe(string_paths, crops)
-        logger.info("Inference completed for video %s.", video.uuid)
+        if streaming:
+            from ....utils.video import iter_video_frames
+
+            max_frames = n_test_frames if test_run else None
+            logger.info("Starting streaming inference on %s for video %s...", raw_file_path.name, video.uuid)
+            frames = iter_video_frames(raw_file_path, max_frames=max_frames)
+            frame_numbers, predictions = classifier.pipe_stream(
+                frames, crop_template, as_array=True, expected_frames=max_frames or video.frame_count or 0
+            )
+            if len(predictions) == 0:
+                raise ValueError(f"No frames could be decoded from {raw_file_path} for video {video.uuid}.")
+            if not np.array_equal(frame_numbers, np.arange(len(frame_numbers))):
+                raise ValueError(f"Decoded frame numbers are not contiguous for video {video.uuid}.")
+            logger.info("Streaming inference completed on %d frames for video %s.", len(predictions), video.uuid)
+        else:
+            logger.info("Starting inference on %d frames for video %s...", len(string_paths), video.uuid)
+            predictions = classifier.pipe(string_paths, crops, as_array=True)
+            logger.info("Inference completed for video %s.", video.uuid)
     except Exception as e:
         logger.error("Inference failed for video %s: %s", video.uuid, e, exc_info=True)
         # Raise exception
@@ -303,10 +324,6 @@ def _predict_video_pipeline(
     # --- Post-processing ---
     try:
         logger.info("Post-processing predictions for video %s...", video.uuid)
-        readable_predictions = [classifier.readable(p) for p in predictions]
-
-        merged_predictions = concat_pred_dicts(readable_predictions)
-
         fps = video.get_fps() # Use Meta helper
         if not fps:
             logger.warning(
@@ -315,23 +332,22 @@ def _predict_video_pipeline(
             )
             fps = 30 # Default FPS if unknown
 
-        smooth_merged_predictions = {}
-        for key in merged_predictions.keys():
-            smooth_merged_predictions[key] = make_smooth_preds(
-                prediction_array=merged_predictions[key],
-                window_size_s=smooth_window_size_s,
-                fps=fps,
-            )
-
-        binary_smooth_merged_predictions = {}
-        for key in smooth_merged_predictions.keys():
-            binary_smooth_merged_predictions[key] = (
-                smooth_merged_predictions[key] > binarize_threshold
-            )
+        # Smoothing, thresholding and sequence search run on the whole (frames x labels) matrix at once
+        labels = classifier.config["labels"]
+        n_labels = min(len(labels), predictions.shape[1])
 
-        sequences = {}
-        for label, prediction_array in binary_smooth_merged_predictions.items():
-            sequences[label] = find_true_pred_sequences(prediction_array)
+        # Keep the raw scores so segments can be regenerated with other settings without the model
+        try:
+            _video_prediction_meta.save_score_matrix(predictions[:, :n_labels], labels[:n_labels])
+        except Exception as e:
+            logger.warning("Could not store score matrix for video %s: %s", video.uuid, e, exc_info=True)
+        sequences = prediction_matrix_to_sequences(
+            predictions[:, :n_labels],
+            labels[:n_labels],
+            window_size_s=smooth_window_size_s,
+            fps=fps,
+            threshold=binarize_threshold,
+        )
 
         logger.info(
             "Post-processing completed for video %s. Found sequences for labels: %s",
@@ -356,6 +372,7 @@ def _predict_video_entry(
     test_run: bool = GLOBAL_TEST_RUN,
     n_test_frames: int = GLOBAL_N_TEST_FRAMES,
     save_results: bool = True, # Note: save_results is handled in video_file.py now
+    streaming: bool = False,
 ):
     """Entry point called from VideoFile.predict_video. Imports and calls the main prediction logic."""
     from endoreg_db.models import AiModel, ModelMeta # Local import
@@ -383,6 +400,7 @@ def _predict_video_entry(
         binarize_threshold=binarize_threshold,
         test_run=test_run,
         n_test_frames=n_test_frames,
+        streaming=streaming,
     )
     # --- End Explicit Arguments ---
 
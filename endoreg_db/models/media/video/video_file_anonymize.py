@@ -1,7 +1,7 @@
 import logging
 import shutil
 from pathlib import Path
-from typing import TYPE_CHECKING, List, Tuple, Dict, Optional, Set
+from typing import TYPE_CHECKING, List, Tuple, Dict, Optional
 import uuid
 from django.db import transaction
 import cv2
@@ -10,11 +10,13 @@ from django.conf import settings
 
 
 
+from endoreg_db.utils.frame_ranges import FrameRangeSet
 from endoreg_db.utils.hashs import get_video_hash
 from endoreg_db.utils.validate_endo_roi import validate_endo_roi
-from ....utils.video.ffmpeg_wrapper import assemble_video_from_frames
-from ...utils import anonymize_frame  # Import from models.utils
-from .video_file_segments import _get_outside_frames, _get_outside_frame_numbers
+from ....utils.video.ffmpeg_wrapper import assemble_video_from_frames, anonymize_video_with_filters
+from ....utils.video.frame_stream import get_video_dimensions, iter_video_frames, write_video_frames
+from ...utils import anonymize_frame, mask_frame  # Import from models.utils
+from .video_file_segments import _get_outside_frames, _get_outside_frame_ranges
 
 if TYPE_CHECKING:
     from .video_file import VideoFile
@@ -23,13 +25,18 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# "stream" decodes, masks and re-encodes the raw video in one pass without frame files;
+# "ffmpeg" does the same inside FFmpeg with a crop/pad/lutrgb filter graph;
+# "frames" anonymizes extracted JPEG frames and assembles the video from them.
+ANONYMIZATION_ENGINES = ("stream", "ffmpeg", "frames")
+
 
 def _create_anonymized_frame_files(
     video: "VideoFile",
     anonymized_frame_dir: Path,
     endo_roi: Dict[str, int],
     frames: "QuerySet[Frame]",
-    outside_frame_numbers: Set[int],
+    outside_frames: FrameRangeSet,
     censor_color: Tuple[int, int, int] = (0, 0, 0),
 ) -> List[Path]:
     """
@@ -40,7 +47,7 @@ def _create_anonymized_frame_files(
         anonymized_frame_dir: Directory to save anonymized frames.
         endo_roi: The endoscope region of interest dictionary.
         frames: QuerySet of all Frame objects for the video.
-        outside_frame_numbers: Set of frame numbers labeled as 'outside'.
+        outside_frames: Frame number ranges labeled as 'outside'.
         censor_color: BGR color tuple for censoring.
 
     Returns:
@@ -58,7 +65,7 @@ def _create_anonymized_frame_files(
         try:
             _frame_number = frame_obj.frame_number
             target_path = anonymized_frame_dir / f"frame_{frame_obj.frame_number:07d}.jpg"
-            make_all_black = frame_obj.frame_number in outside_frame_numbers
+            make_all_black = frame_obj.frame_number in outside_frames
 
             try:
                 source_path = frame_obj.file_path
@@ -192,7 +199,7 @@ def _make_temporary_anonymized_frames(video: "VideoFile") -> Tuple[Path, List[Pa
     if not all_frames.exists():
         raise FileNotFoundError(f"No frame objects found for video {video.uuid} after extraction attempt.")
 
-    outside_frame_numbers = _get_outside_frame_numbers(video)
+    outside_frames = _get_outside_frame_ranges(video)
 
     logger.info("Generating %d temporary anonymized frame files for video %s...", all_frames.filter(is_extracted=True).count(), video.uuid)
     generated_frame_paths = _create_anonymized_frame_files(
@@ -200,25 +207,89 @@ def _make_temporary_anonymized_frames(video: "VideoFile") -> Tuple[Path, List[Pa
         anonymized_frame_dir=temp_anonym_frame_dir,
         endo_roi=endo_roi,
         frames=all_frames,
-        outside_frame_numbers=outside_frame_numbers,
+        outside_frames=outside_frames,
     )
     logger.info("Generated %d temporary anonymized frame files for video %s.", len(generated_frame_paths), video.uuid)
     return temp_anonym_frame_dir, generated_frame_paths
 
 
+def _stream_anonymized_video(
+    video: "VideoFile",
+    output_path: Path,
+    endo_roi: Dict[str, int],
+    outside_frames: FrameRangeSet,
+    censor_color: Tuple[int, int, int] = (0, 0, 0),
+    backend: str = "auto",
+) -> int:
+    """
+    Writes an anonymized copy of the raw video in a single decode/encode pass.
+
+    Frames are decoded into memory, masked outside the endoscope ROI (or filled with
+    censor_color for 'outside' frames) and piped straight into the encoder, so no frame
+    files are read or written.
+
+    Args:
+        video: The VideoFile instance; its raw file is the source.
+        output_path: Path of the anonymized video to write.
+        endo_roi: The endoscope region of interest dictionary.
+        outside_frames: Frame number ranges labeled as 'outside'.
+        censor_color: BGR color tuple for censoring (same convention as anonymize_frame).
+        backend: Decoder/encoder backend ('ffmpeg', 'opencv' or 'auto').
+
+    Returns:
+        The number of frames written.
+
+    Raises:
+        ValueError: If the FPS of the video cannot be determined.
+        RuntimeError: If decoding or encoding fails or no frames were written.
+    """
+    raw_file_path = video.get_raw_file_path()
+    fps = video.get_fps()
+    if fps is None:
+        raise ValueError(f"FPS could not be determined for {video.uuid}, cannot encode anonymized video.")
+    width, height = get_video_dimensions(raw_file_path)
+
+    # Decoded frames are RGB
+    rgb_censor_color = tuple(reversed(censor_color))
+
+    def masked_frames():
+        frames = iter_video_frames(raw_file_path, backend=backend)
+        for frame_number, frame in tqdm(frames, total=video.frame_count, desc=f"Anonymizing video {video.uuid}"):
+            yield mask_frame(
+                frame,
+                endo_roi,
+                all_black=frame_number in outside_frames,
+                censor_color=rgb_censor_color,
+            )
+
+    n_frames = write_video_frames(masked_frames(), output_path, fps, width, height, backend=backend)
+    if n_frames == 0:
+        raise RuntimeError(f"No frames could be decoded from the raw video of {video.uuid}.")
+    logger.info("Wrote %d anonymized frames for video %s to %s", n_frames, video.uuid, output_path)
+    return n_frames
+
+
 @transaction.atomic
-def _anonymize(video: "VideoFile", delete_original_raw: bool = True) -> bool:
+def _anonymize(video: "VideoFile", delete_original_raw: bool = True, engine: str = "stream") -> bool:
     """
     Performs full anonymization of a video by censoring frames, assembling a processed video file, updating database records, and optionally deleting original raw assets.
+
+    With engine="stream" (default) the raw video is decoded, masked and re-encoded in one
+    pass and no extracted frames are needed. engine="ffmpeg" runs the same masking as an
+    FFmpeg filter graph (static ROI, 'outside' ranges blacked out). engine="frames"
+    anonymizes the extracted frame files and assembles the video from them.
     
     Raises:
-        ValueError: If required preconditions are not met (e.g., frames not extracted, sensitive metadata not validated).
+        ValueError: If required preconditions are not met (e.g., frames not extracted for engine="frames", sensitive metadata not validated) or the engine is unknown.
         FileNotFoundError: If the raw video file is missing.
         RuntimeError: If anonymization or video assembly fails.
     
     Returns:
         bool: True if anonymization completes successfully.
     """
+    if engine not in ANONYMIZATION_ENGINES:
+        raise ValueError(f"Unknown anonymization engine '{engine}'. Expected one of {ANONYMIZATION_ENGINES}.")
+
     state = video.get_or_create_state()
 
     if state.anonymized:
@@ -226,7 +297,7 @@ def _anonymize(video: "VideoFile", delete_original_raw: bool = True) -> bool:
         return True
     if not video.has_raw:
         raise FileNotFoundError(f"Raw file is missing for video {video.uuid}, cannot anonymize.")
-    if not state.frames_extracted:
+    if engine == "frames" and not state.frames_extracted:
         raise ValueError(f"Frames not extracted for video {video.uuid}, cannot anonymize.")
     if not video.sensitive_meta or not video.sensitive_meta.is_verified:
         raise ValueError(f"Sensitive metadata for video {video.uuid} is not validated. Cannot anonymize.")
@@ -235,30 +306,58 @@ def _anonymize(video: "VideoFile", delete_original_raw: bool = True) -> bool:
     
     
 
-    logger.info("Starting anonymization process for video %s", video.uuid)
+    logger.info("Starting anonymization process for video %s (engine=%s)", video.uuid, engine)
 
     temp_anonym_frame_dir = None
     anonymized_video_path = None
     try:
-        temp_anonym_frame_dir, generated_frame_paths = _make_temporary_anonymized_frames(video)
-        if not generated_frame_paths:
-            raise RuntimeError(f"Failed to generate temporary anonymized frames for video {video.uuid}.")
+        if engine in ("stream", "ffmpeg"):
+            endo_roi = video.get_endo_roi()
+            if not validate_endo_roi(endo_roi_dict=endo_roi):
+                raise ValueError(f"Endoscope ROI is not valid for video {video.uuid}")
+
+            anonymized_video_path = video.get_target_anonymized_video_path()
+            anonymized_video_path.parent.mkdir(parents=True, exist_ok=True)
+            anonymized_video_path.unlink(missing_ok=True)
 
-        anonymized_video_path = video.get_target_anonymized_video_path()
-        anonymized_video_path.parent.mkdir(parents=True, exist_ok=True)
+            if engine == "stream":
+                _stream_anonymized_video(
+                    video,
+                    output_path=anonymized_video_path,
+                    endo_roi=endo_roi,
+                    outside_frames=_get_outside_frame_ranges(video),
+                )
+            else:
+                raw_file_path = video.get_raw_file_path()
+                width, height = get_video_dimensions(raw_file_path)
+                anonymize_video_with_filters(
+                    raw_file_path,
+                    anonymized_video_path,
+                    width=width,
+                    height=height,
+                    endo_roi=endo_roi,
+                    blackout_ranges=_get_outside_frame_ranges(video).ranges(),
+                )
+        else:
+            temp_anonym_frame_dir, generated_frame_paths = _make_temporary_anonymized_frames(video)
+            if not generated_frame_paths:
+                raise RuntimeError(f"Failed to generate temporary anonymized frames for video {video.uuid}.")
 
-        anonymized_video_path.unlink(missing_ok=True)
+            anonymized_video_path = video.get_target_anonymized_video_path()
+            anonymized_video_path.parent.mkdir(parents=True, exist_ok=True)
 
-        fps = video.get_fps()
-        if fps is None:
-            raise ValueError(f"FPS could not be determined for {video.uuid}, cannot assemble video.")
+            anonymized_video_path.unlink(missing_ok=True)
+
+            fps = video.get_fps()
+            if fps is None:
+                raise ValueError(f"FPS could not be determined for {video.uuid}, cannot assemble video.")
 
-        logger.info("Assembling anonymized video for %s at %s", video.uuid, anonymized_video_path)
-        assemble_video_from_frames(
-            frame_paths=generated_frame_paths,
-            output_path=anonymized_video_path,
-            fps=fps,
-        )
+            logger.info("Assembling anonymized video for %s at %s", video.uuid, anonymized_video_path)
+            assemble_video_from_frames(
+                frame_paths=generated_frame_paths,
+                output_path=anonymized_video_path,
+                fps=fps,
+            )
 
         if not anonymized_video_path.exists():
             raise RuntimeError(f"Processed video file not found after assembly for {video.uuid}: {anonymized_video_path}")
@@ -8,6 +8,7 @@ Submodules:
     _create_frame_object  : Constructs a frame object from frame data.
     _delete_frames        : Performs deletion of frame records.
     _extract_frames       : Extracts frames from video content.
+    _extract_selected_frames : Extracts only a stride, frame numbers or times of a video.
     _get_frame_number     : Retrieves the frame number for a specific frame.
     _get_frame_path       : Constructs the filesystem path for a frame.
     _get_frame_paths      : Retrieves paths for multiple frames.
@@ -15,6 +16,7 @@ Submodules:
     _get_frame            : Obtains details for a single frame.
     _get_frames           : Aggregates multiple frame details.
     _initialize_frames    : Initializes frame data for processing.
+    _insert_frame_rows    : Inserts frame rows in batches (COPY on PostgreSQL).
 
 Usage:
     Import the required functions directly from this module to perform specific video frame operations.
@@ -23,6 +25,7 @@ from ._bulk_create_frames import _bulk_create_frames
 from ._create_frame_object import _create_frame_object
 from ._delete_frames import _delete_frames
 from ._extract_frames import _extract_frames
+from ._extract_selected_frames import _extract_selected_frames
 from ._get_frame_number import _get_frame_number
 from ._get_frame_path import _get_frame_path
 from ._get_frame_paths import _get_frame_paths
@@ -30,12 +33,14 @@ from ._get_frame_range import _get_frame_range
 from ._get_frame import _get_frame
 from ._get_frames import _get_frames
 from ._initialize_frames import _initialize_frames
+from ._insert_frame_rows import _insert_frame_rows
 from ._mark_frames_extracted_status import _mark_frames_extracted_status
 __all__ = [
     "_bulk_create_frames",
     "_create_frame_object",
     "_delete_frames",
     "_extract_frames",
+    "_extract_selected_frames",
     "_get_frame_number",
     "_get_frame_path",
     "_get_frame_paths",
@@ -43,5 +48,6 @@ __all__ = [
     "_get_frame",
     "_get_frames",
     "_initialize_frames",
+    "_insert_frame_rows",
     "_mark_frames_extracted_status",
 ]
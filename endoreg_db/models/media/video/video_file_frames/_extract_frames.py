@@ -1,7 +1,8 @@
 import logging
+from endoreg_db.config.env import env_int
 from endoreg_db.models.media.video.video_file_io import _get_frame_dir_path
 from endoreg_db.utils.video.ffmpeg_wrapper import extract_frames as ffmpeg_extract_frames
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
     from endoreg_db.models import VideoFile
@@ -12,12 +13,17 @@ from django.db import transaction
 import shutil
 logger = logging.getLogger(__name__)
 
+# Concurrent ffmpeg processes per extraction; chunked extraction is opt-in via ENDOREG_FRAME_EXTRACTION_WORKERS
+DEFAULT_EXTRACTION_WORKERS = 1
+
+
 def _extract_frames(
     video: "VideoFile",
     quality: int = 2,
     overwrite: bool = False,
     ext="jpg",
     verbose=False,
+    workers: Optional[int] = None,
 ) -> bool:
     """
     Extract frames from a raw video file, update frame extraction status in the database, and manage related file system operations.
@@ -29,6 +35,9 @@ def _extract_frames(
         quality (int, optional): Quality parameter for ffmpeg extraction. Defaults to 2.
         overwrite (bool, optional): Whether to overwrite existing extracted frames. Defaults to False.
         ext (str, optional): File extension for extracted frames. Defaults to "jpg".
+        workers (int, optional): Number of concurrent ffmpeg processes, each extracting a
+            keyframe-aligned chunk. Frames are marked as extracted per finished chunk.
+            Defaults to ENDOREG_FRAME_EXTRACTION_WORKERS or 1.
     
     Returns:
         bool: True if extraction and updates succeed.
@@ -57,6 +66,11 @@ def _extract_frames(
     frames_exist_in_db = Frame.objects.filter(video=video).exists()
     files_exist_on_disk = frame_dir.exists() and any(frame_dir.iterdir())
 
+    # Frames of a sampled extraction (extract_selected_frames) do not count as extracted.
+    if files_exist_on_disk and not state.frames_extracted and not overwrite and state.frames_sampled:
+        logger.info("Frame directory of video %s holds sampled frames only. Extracting all frames.", video.uuid)
+        overwrite = True
+
     # Fast-path: if frames exist and we are not overwriting, update state and return.
     if (state.frames_extracted or files_exist_on_disk) and not overwrite:
         logger.info(
@@ -101,8 +115,47 @@ def _extract_frames(
 
     try:
         logger.info("Starting frame extraction for video %s to %s", video.uuid, frame_dir)
-        # Step 1: Perform the long-running frame extraction outside any transaction.
-        extracted_paths = ffmpeg_extract_frames(raw_file_path, frame_dir, quality=quality, ext=ext)
+        if workers is None:
+            workers = env_int("ENDOREG_FRAME_EXTRACTION_WORKERS", DEFAULT_EXTRACTION_WORKERS)
+
+        marked_paths = set()
+
+        def mark_chunk_extracted(chunk_paths):
+            frame_numbers = []
+            for frame_path in chunk_paths:
+                try:
+                    frame_numbers.append(int(frame_path.stem.split('_')[-1]))
+                except (ValueError, IndexError) as e:
+                    logger.warning("Could not parse frame number from extracted file %s: %s", frame_path.name, e)
+            marked_paths.update(chunk_paths)
+            # Update contiguous runs by range, which avoids a huge IN clause
+            for first, last in _contiguous_runs(frame_numbers):
+                try:
+                    update_count = Frame.objects.filter(
+                        video=video, frame_number__range=(first, last)
+                    ).update(is_extracted=True)
+                    logger.info(
+                        "Marked %d Frame objects as is_extracted=True for video %s (frames %d-%d).",
+                        update_count, video.uuid, first, last,
+                    )
+                except Exception as update_e:
+                    logger.error("Failed to update is_extracted flag for frames of video %s: %s", video.uuid, update_e, exc_info=True)
+
+        def log_progress(frames_done, frames_total):
+            if verbose and frames_total:
+                logger.info("Extracted %d/%d frames for video %s.", frames_done, frames_total, video.uuid)
+
+        # Step 1: Perform the long-running frame extraction outside any transaction,
+        # marking frames as extracted chunk by chunk.
+        extracted_paths = ffmpeg_extract_frames(
+            raw_file_path,
+            frame_dir,
+            quality=quality,
+            ext=ext,
+            workers=workers,
+            progress_callback=log_progress,
+            chunk_callback=mark_chunk_extracted,
+        )
         if not extracted_paths:
             logger.warning(
                 "ffmpeg_extract_frames returned no paths for video %s. Check video duration and ffmpeg logs.",
@@ -115,31 +168,11 @@ def _extract_frames(
 
         logger.info("Successfully extracted %d frames using ffmpeg for video %s.", len(extracted_paths), video.uuid)
 
-        extracted_frame_numbers = []
-        for frame_path in extracted_paths:
-            try:
-                frame_number = int(frame_path.stem.split('_')[-1])
-                extracted_frame_numbers.append(frame_number)
-            except (ValueError, IndexError) as e:
-                logger.warning("Could not parse frame number from extracted file %s: %s", frame_path.name, e)
-
-        # Step 2: Perform all the quick DB updates inside a minimal atomic transaction.
+        # Step 2: Mark frames not reported through a chunk callback, then the extraction as complete.
+        unmarked_paths = [path for path in extracted_paths if path not in marked_paths]
+        if unmarked_paths:
+            mark_chunk_extracted(unmarked_paths)
         with transaction.atomic():
-            if extracted_frame_numbers:
-                try:
-                    update_count = Frame.objects.filter(
-                        video=video, frame_number__in=extracted_frame_numbers
-                    ).update(is_extracted=True)
-                    logger.info("Marked %d Frame objects as is_extracted=True for video %s.", update_count, video.uuid)
-                    if update_count != len(extracted_frame_numbers):
-                        logger.warning(
-                            "Number of updated frames (%d) does not match number of parsed extracted files (%d) for video %s.",
-                            update_count,
-                            len(extracted_frame_numbers),
-                            video.uuid,
-                        )
-                except Exception as update_e:
-                    logger.error("Failed to update is_extracted flag for frames of video %s: %s", video.uuid, update_e, exc_info=True)
             if extracted_paths:
                 state.refresh_from_db()
                 state.mark_frames_extracted()
@@ -159,3 +192,17 @@ def _extract_frames(
         except Exception as db_err:
             logger.error("Failed to reset flags/state in DB during error handling for video %s: %s", video.uuid, db_err)
         raise RuntimeError(f"Frame extraction or update failed for video {video.uuid}.") from e
+
+
+def _contiguous_runs(numbers):
+    """Yields (first, last) for each run of consecutive integers in numbers."""
+    run_start = previous = None
+    for number in sorted(set(numbers)):
+        if previous is not None and number == previous + 1:
+            previous = number
+            continue
+        if run_start is not None:
+            yield run_start, previous
+        run_start = previous = number
+    if run_start is not None:
+        yield run_start, previous
@@ -0,0 +1,102 @@
+import logging
+from pathlib import Path
+from typing import TYPE_CHECKING, List
+
+from endoreg_db.models.media.video.video_file_io import _get_frame_dir_path
+from endoreg_db.utils.video.ffmpeg_wrapper import FrameSelection, extract_selected_frames
+
+if TYPE_CHECKING:
+    from endoreg_db.models import VideoFile
+
+logger = logging.getLogger(__name__)
+
+
+def _extract_selected_frames(
+    video: "VideoFile",
+    selection: FrameSelection,
+    quality: int = 2,
+    overwrite: bool = False,
+    ext: str = "jpg",
+) -> List[Path]:
+    """
+    Extracts only the frames of ``selection`` (a stride, frame numbers or times) into the frame directory.
+
+    Frame objects are created (or marked as extracted) for the selected frames only;
+    the rest of the video is neither decoded nor initialized. Frames that are already
+    extracted are reused unless ``overwrite`` is set.
+    Does NOT update VideoState.frames_extracted; unless all frames were extracted before,
+    VideoState.frames_sampled is set, so a later full extraction still runs.
+
+    Returns:
+        Sorted paths of the selected frames that exist on disk.
+
+    Raises:
+        FileNotFoundError: If the raw video file is missing.
+        ValueError: If the frame directory cannot be determined or the selection cannot be resolved.
+        RuntimeError: If ffmpeg fails.
+    """
+    from endoreg_db.models import Frame
+    from ._extract_frames import _contiguous_runs
+    from ._insert_frame_rows import _insert_frame_rows
+
+    if not video.has_raw:
+        raise FileNotFoundError(f"Raw video file not available for {video.uuid}. Cannot extract frames.")
+
+    raw_file_path = video.get_raw_file_path()
+    if not raw_file_path or not raw_file_path.exists():
+        raise FileNotFoundError(f"Raw video file not found at {raw_file_path} for video {video.uuid}. Cannot extract frames.")
+
+    frame_dir = _get_frame_dir_path(video)
+    if not frame_dir:
+        raise ValueError(f"Cannot determine frame directory path for video {video.uuid}.")
+
+    frame_numbers = selection.resolve(video.fps, video.frame_count)
+    if not frame_numbers:
+        logger.warning("Frame selection %s is empty for video %s.", selection, video.uuid)
+        return []
+
+    frame_paths = {}
+    if not overwrite:
+        already_extracted = Frame.objects.filter(
+            video=video,
+            frame_number__range=(frame_numbers[0], frame_numbers[-1]),
+            is_extracted=True,
+        ).values_list("frame_number", "relative_path")
+        selected = set(frame_numbers)
+        for frame_number, relative_path in already_extracted:
+            path = frame_dir / relative_path
+            if frame_number in selected and path.exists():
+                frame_paths[frame_number] = path
+
+    missing = [n for n in frame_numbers if n not in frame_paths]
+    if missing:
+        logger.info(
+            "Extracting %d selected frames (%d already present) for video %s.",
+            len(missing), len(frame_paths), video.uuid,
+        )
+        extracted = extract_selected_frames(
+            raw_file_path,
+            frame_dir,
+            FrameSelection(frame_numbers=missing),
+            quality=quality,
+            ext=ext,
+            fps=video.fps,
+            frame_count=video.frame_count,
+        )
+
+        _insert_frame_rows(
+            video, ((n, path.name) for n, path in extracted.items()), extracted=True, total=len(extracted)
+        )
+        # Rows that existed before (e.g. from initialize_frames) keep is_extracted=False otherwise
+        for first, last in _contiguous_runs(extracted):
+            Frame.objects.filter(
+                video=video, frame_number__range=(first, last), is_extracted=False
+            ).update(is_extracted=True)
+        frame_paths.update(extracted)
+
+        state = video.get_or_create_state()
+        if extracted and not state.frames_extracted and not state.frames_sampled:
+            state.frames_sampled = True
+            state.save(update_fields=["frames_sampled", "date_modified"])
+
+    return [frame_paths[n] for n in sorted(frame_paths)]
@@ -1,4 +1,3 @@
-from tqdm import tqdm
 from pathlib import Path
 from typing import List
 from typing import TYPE_CHECKING, Optional
@@ -23,7 +22,8 @@ def _initialize_frames(video: "VideoFile", frame_paths: Optional[List[Path]] = N
     and marked as `is_extracted=False`.
 
     Updates state.frames_initialized and state.frame_count.
-    Uses bulk_create with ignore_conflicts=True, so it won't fail if frames already exist.
+    Rows are inserted in batches (COPY on PostgreSQL) and existing frames are skipped,
+    so it won't fail if frames already exist.
 
     Raises RuntimeError on failure to create/update frames or update state.
 
@@ -32,11 +32,11 @@ def _initialize_frames(video: "VideoFile", frame_paths: Optional[List[Path]] = N
         - On Failure: Does not change state (error is raised).
     """
     from endoreg_db.models import Frame
-    from endoreg_db.models.media.video.video_file_frames._bulk_create_frames import _bulk_create_frames
-    from endoreg_db.models.media.video.video_file_frames._create_frame_object import _create_frame_object
+    from endoreg_db.models.media.video.video_file_frames._extract_frames import _contiguous_runs
+    from endoreg_db.models.media.video.video_file_frames._insert_frame_rows import _insert_frame_rows
 
 
-    frames_to_create = []
+    frame_rows = []
     num_expected_or_provided = 0
     mark_as_extracted = False
 
@@ -44,16 +44,16 @@ def _initialize_frames(video: "VideoFile", frame_paths: Optional[List[Path]] = N
         logger.info("Initializing Frame objects based on %d provided paths for video %s.", len(frame_paths), video.uuid)
         mark_as_extracted = True
         num_expected_or_provided = len(frame_paths)
-        for frame_path in tqdm(frame_paths, desc=f"Initializing Frames from Paths {video.uuid}", unit="frame"):
+        for frame_path in frame_paths:
             try:
-                frame_number = int(frame_path.stem.split('_')[-1])
-                relative_path_str = frame_path.name
-                frames_to_create.append(
-                    _create_frame_object(video, frame_number, relative_path_str, extracted=mark_as_extracted)
-                )
+                frame_rows.append((int(frame_path.stem.split('_')[-1]), frame_path.name))
             except (ValueError, IndexError) as e:
                 logger.warning("Could not parse frame number from %s: %s", frame_path.name, e)
                 continue
+
+        def iter_rows():
+            return iter(frame_rows)
+        n_rows = len(frame_rows)
     else:
         expected_frame_count = video.frame_count
         if expected_frame_count is None or expected_frame_count <= 0:
@@ -71,30 +71,30 @@ def _initialize_frames(video: "VideoFile", frame_paths: Optional[List[Path]] = N
         logger.info("Initializing %d expected Frame objects for video %s (is_extracted=False).", expected_frame_count, video.uuid)
         mark_as_extracted = False
         num_expected_or_provided = expected_frame_count
-        for frame_number in tqdm(range(expected_frame_count), desc=f"Initializing Expected Frames {video.uuid}", unit="frame"):
-            relative_path_str = f"frame_{frame_number:07d}.jpg"
-            frames_to_create.append(
-                _create_frame_object(video, frame_number, relative_path_str, extracted=mark_as_extracted)
-            )
-            
-    if frames_to_create:
+
+        # Rows are generated lazily, so no per-frame objects are held for the whole video
+        def iter_rows():
+            return ((frame_number, f"frame_{frame_number:07d}.jpg") for frame_number in range(expected_frame_count))
+        n_rows = expected_frame_count
+
+    if n_rows:
         for attempt in range(5):
 
             try:
-                _bulk_create_frames(video, frames_to_create)
-                num_created_or_ignored = len(frames_to_create)
-                logger.info("Bulk create attempted for %d Frame objects for video %s (ignore_conflicts=True).", num_created_or_ignored, video.uuid)
+                _insert_frame_rows(video, iter_rows(), extracted=mark_as_extracted, total=n_rows)
+                logger.info("Inserted %d Frame rows for video %s (existing rows skipped).", n_rows, video.uuid)
 
                 if mark_as_extracted:
-                    frame_numbers_to_update = [f.frame_number for f in frames_to_create]
-                    if frame_numbers_to_update:
-                        update_count = Frame.objects.filter(
-                        video=video,
-                        frame_number__in=frame_numbers_to_update,
-                        is_extracted=False
+                    # Existing rows keep is_extracted=False on insert; update them per range of frame numbers
+                    update_count = 0
+                    for first, last in _contiguous_runs(frame_number for frame_number, _ in frame_rows):
+                        update_count += Frame.objects.filter(
+                            video=video,
+                            frame_number__range=(first, last),
+                            is_extracted=False,
                         ).update(is_extracted=True)
-                        if update_count > 0:
-                            logger.info("Marked %d existing Frame objects as is_extracted=True for video %s.", update_count, video.uuid)
+                    if update_count > 0:
+                        logger.info("Marked %d existing Frame objects as is_extracted=True for video %s.", update_count, video.uuid)
 
                 try:
                     state = video.get_or_create_state()
@@ -105,6 +105,7 @@ def _initialize_frames(video: "VideoFile", frame_paths: Optional[List[Path]] = N
                 except Exception as state_e:
                     logger.error("Failed to update state after frame initialization for video %s: %s", video.uuid, state_e, exc_info=True)
                     raise RuntimeError(f"Failed to update state after frame initialization for video {video.uuid}") from state_e
+                break
 
             except OperationalError as e:
                 if "database is locked" in str(e):
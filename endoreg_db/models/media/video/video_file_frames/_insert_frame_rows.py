@@ -0,0 +1,140 @@
+import io
+import logging
+from itertools import islice
+from typing import TYPE_CHECKING, Iterable, Optional, Tuple
+
+from django.db import connection, transaction
+from tqdm import tqdm
+
+from endoreg_db.config.env import env_int
+
+if TYPE_CHECKING:
+    from endoreg_db.models import VideoFile
+
+logger = logging.getLogger(__name__)
+
+# Rows per INSERT (or per COPY buffer flush); override with ENDOREG_FRAME_INSERT_BATCH_SIZE
+DEFAULT_FRAME_INSERT_BATCH_SIZE = 5000
+
+
+def _insert_frame_rows(
+    video: "VideoFile",
+    rows: Iterable[Tuple[int, str]],
+    extracted: bool = False,
+    total: Optional[int] = None,
+    batch_size: Optional[int] = None,
+) -> int:
+    """
+    Inserts Frame rows for ``(frame_number, relative_path)`` pairs, skipping existing ones.
+
+    ``rows`` is consumed lazily, so only one batch of Frame objects exists at a time.
+    On PostgreSQL the rows are streamed with COPY into a temporary table and inserted
+    with ``ON CONFLICT DO NOTHING``; SQLite uses batched ``INSERT OR IGNORE`` without
+    model instances, other backends batched ``bulk_create(ignore_conflicts=True)``.
+    Existing rows are left unchanged (including their is_extracted flag).
+
+    Returns:
+        The number of rows passed in.
+    """
+    if batch_size is None:
+        batch_size = env_int("ENDOREG_FRAME_INSERT_BATCH_SIZE", DEFAULT_FRAME_INSERT_BATCH_SIZE)
+    rows = tqdm(rows, total=total, desc=f"Initializing Frames {video.uuid}", unit="frame", mininterval=1.0)
+
+    if connection.vendor == "postgresql":
+        return _copy_frame_rows(video, rows, extracted, batch_size)
+    if connection.vendor == "sqlite":
+        return _executemany_frame_rows(video, rows, extracted, batch_size)
+    return _bulk_create_frame_rows(video, rows, extracted, batch_size)
+
+
+def _frame_columns():
+    from endoreg_db.models import Frame
+
+    opts = Frame._meta
+    qn = connection.ops.quote_name
+    names = ("video", "frame_number", "relative_path", "is_extracted", "timestamp")
+    return qn(opts.db_table), {name: qn(opts.get_field(name).column) for name in names}
+
+
+def _executemany_frame_rows(video: "VideoFile", rows, extracted: bool, batch_size: int) -> int:
+    table, columns = _frame_columns()
+    sql = (
+        f"INSERT OR IGNORE INTO {table} "
+        f"({columns['video']}, {columns['frame_number']}, {columns['relative_path']}, {columns['is_extracted']}) "
+        "VALUES (%s, %s, %s, %s)"
+    )
+    n_rows = 0
+    rows = iter(rows)
+    with transaction.atomic(), connection.cursor() as cursor:
+        while True:
+            batch = [(video.pk, frame_number, relative_path, extracted) for frame_number, relative_path in islice(rows, batch_size)]
+            if not batch:
+                break
+            cursor.executemany(sql, batch)
+            n_rows += len(batch)
+    return n_rows
+
+
+def _bulk_create_frame_rows(video: "VideoFile", rows, extracted: bool, batch_size: int) -> int:
+    from endoreg_db.models import Frame
+
+    n_rows = 0
+    rows = iter(rows)
+    while True:
+        batch = [
+            Frame(video=video, frame_number=frame_number, relative_path=relative_path, is_extracted=extracted)
+            for frame_number, relative_path in islice(rows, batch_size)
+        ]
+        if not batch:
+            break
+        Frame.objects.bulk_create(batch, ignore_conflicts=True)
+        n_rows += len(batch)
+    return n_rows
+
+
+def _copy_frame_rows(video: "VideoFile", rows, extracted: bool, batch_size: int) -> int:
+    table, columns = _frame_columns()
+    staging = "endoreg_frame_copy"
+
+    n_rows = 0
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE IF NOT EXISTS {staging} "
+            "(frame_number integer, relative_path varchar(512)) ON COMMIT DROP"
+        )
+        cursor.execute(f"TRUNCATE {staging}")
+        copy_sql = f"COPY {staging} (frame_number, relative_path) FROM STDIN"
+        raw_cursor = cursor.cursor
+        if hasattr(raw_cursor, "copy"):  # psycopg 3
+            with raw_cursor.copy(copy_sql) as copy:
+                for frame_number, relative_path in rows:
+                    copy.write_row((frame_number, relative_path))
+                    n_rows += 1
+        else:  # psycopg2
+            rows = iter(rows)
+            while True:
+                batch = list(islice(rows, batch_size))
+                if not batch:
+                    break
+                # Relative paths are plain file names; escape the COPY text format specials anyway
+                buffer = io.StringIO(
+                    "".join(
+                        f"{frame_number}\t{_escape_copy_text(relative_path)}\n"
+                        for frame_number, relative_path in batch
+                    )
+                )
+                raw_cursor.copy_expert(copy_sql, buffer)
+                n_rows += len(batch)
+
+        cursor.execute(
+            f"INSERT INTO {table} "
+            f"({columns['video']}, {columns['frame_number']}, {columns['relative_path']}, {columns['is_extracted']}, {columns['timestamp']}) "
+            f"SELECT %s, frame_number, relative_path, %s, NULL FROM {staging} "
+            f"ON CONFLICT ({columns['video']}, {columns['frame_number']}) DO NOTHING",
+            [video.pk, extracted],
+        )
+    return n_rows
+
+
+def _escape_copy_text(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\t", "\\t").replace("\n", "\\n").replace("\r", "\\r")
@@ -22,20 +22,21 @@ def _update_text_metadata(
 ) -> Optional["SensitiveMeta"]:
     """
     Extracts text from a fraction of video frames, updates or creates SensitiveMeta,
-    and potentially updates the VideoFile's date field. Requires frames to be extracted.
+    and potentially updates the VideoFile's date field. Without a full frame extraction,
+    only the sampled frames are decoded.
     Raises ValueError if pre-conditions not met, RuntimeError on processing failure.
 
     State Transitions:
-        - Pre-condition: Requires state.frames_extracted=True.
+        - Pre-condition: Requires state.frames_extracted=True or a known frame_count.
         - Post-condition: Sets state.text_meta_extracted=True (even if no text found).
     """
     logger.debug(f"Updating text metadata for video {video.uuid}")
     state = video.get_or_create_state()
 
     # --- Pre-condition Checks ---
-    if not state.frames_extracted:
+    if not state.frames_extracted and not video.frame_count:
         # Raise exception instead of returning None
-        raise ValueError(f"Cannot update text metadata for video {video.uuid}: Frames not extracted.")
+        raise ValueError(f"Cannot update text metadata for video {video.uuid}: Frames not extracted and frame count unknown.")
 
     if state.text_meta_extracted and not overwrite:
         logger.info("Text already extracted for video %s and overwrite=False. Skipping.", video.uuid) # Changed to info
@@ -2,7 +2,9 @@ import logging
 from typing import TYPE_CHECKING, List, Dict, Tuple, Set
 from icecream import ic
 from pathlib import Path
-from django.db.models import Q  # Import Q for complex queries
+from django.db.models import Exists, OuterRef
+
+from endoreg_db.utils.frame_ranges import FrameRangeSet
 
 if TYPE_CHECKING:
     from .video_file import VideoFile
@@ -132,25 +134,25 @@ def _get_outside_segments(video: "VideoFile", outside_label_name: str = "outside
         return LabelVideoSegment.objects.none()
 
 
-def _get_outside_frame_numbers(video: "VideoFile", outside_label_name: str = "outside") -> Set[int]:
+def _get_outside_frame_ranges(video: "VideoFile", outside_label_name: str = "outside") -> FrameRangeSet:
     """
-    Gets a set of frame numbers corresponding to segments labeled as 'outside'.
+    Gets the frames of segments labeled as 'outside' as merged, inclusive frame number ranges.
     """
-    outside_segments = _get_outside_segments(video, outside_label_name)
-    frame_numbers = set()
-    for segment in outside_segments:
-        frame_numbers.update(range(segment.start_frame_number, segment.end_frame_number + 1))
-    if frame_numbers:
-        logger.info("Found %d frame numbers marked as '%s' for video %s.", len(frame_numbers), outside_label_name, video.uuid)
+    frame_ranges = FrameRangeSet.from_segments(_get_outside_segments(video, outside_label_name))
+    if frame_ranges:
+        logger.info(
+            "Found %d frames in %d ranges marked as '%s' for video %s.",
+            len(frame_ranges), len(frame_ranges.starts), outside_label_name, video.uuid,
+        )
     else:
         logger.info("No frame numbers marked as '%s' found for video %s.", outside_label_name, video.uuid)
-    return frame_numbers
+    return frame_ranges
 
 
 def _get_outside_frames(video: "VideoFile", outside_label_name: str = "outside") -> "QuerySet[Frame]":
     """
     Gets a QuerySet of all unique Frame objects that fall within any segment
-    labeled with the specified 'outside_label_name'.
+    labeled with the specified 'outside_label_name' (end frame exclusive, like ``LabelVideoSegment.get_frames``).
     """
     from ..frame import Frame  # Local import
 
@@ -158,17 +160,15 @@ def _get_outside_frames(video: "VideoFile", outside_label_name: str = "outside")
     if not outside_segments.exists():
         return Frame.objects.none()
 
-    q_objects: Q | None = None
-    for segment in outside_segments:
-        clause = Q(frame_number__gte=segment.start_frame_number,
-                   frame_number__lt=segment.end_frame_number)
-        q_objects = clause if q_objects is None else q_objects | clause
-
-    if q_objects is None:
-        return Frame.objects.none()
-
+    # One range join against the segments instead of an OR of per-segment clauses
+    in_outside_segment = Exists(
+        outside_segments.filter(
+            start_frame_number__lte=OuterRef("frame_number"),
+            end_frame_number__gt=OuterRef("frame_number"),
+        )
+    )
     try:
-        return video.frames.filter(q_objects).distinct().order_by('frame_number')
+        return video.frames.filter(in_outside_segment).order_by('frame_number')
     except Exception as e:
         logger.error("Error filtering outside frames for video %s: %s", video.uuid, e, exc_info=True)
         return Frame.objects.none()
@@ -184,9 +184,10 @@ class PatientExamination(models.Model):
                 indication_choices_list.append(pei.indication_choice)
 
         # Fetch all patient lab values associated with this patient examination's patient
-        patient_lab_values = []
+        # (via the related manager, so prefetched lab values are reused)
+        patient_lab_values: List["PatientLabValue"] = []
         if self.patient:
-            patient_lab_values = list(PatientLabValue.objects.filter(patient=self.patient))
+            patient_lab_values = list(self.patient.lab_values.all())
 
         current_examination = [self.examination] if self.examination else []
         
@@ -205,16 +206,19 @@ class PatientExamination(models.Model):
             if patient_finding.finding:
                 findings_list.append(patient_finding.finding)
                 
-            # Add all active classifications and their choices from this PatientFinding
-            for pf_classification in patient_finding.active_classifications:
+            # Add all active classifications and their choices from this PatientFinding.
+            # Filtered in Python so prefetched classifications are reused.
+            for pf_classification in patient_finding.classifications.all():
+                if not pf_classification.is_active:
+                    continue
                 if pf_classification.classification:
                     finding_classifications_list.append(pf_classification.classification)
                 if pf_classification.classification_choice:
                     finding_classification_choices_list.append(pf_classification.classification_choice)
             
             # Add all active interventions from this PatientFinding  
-            for pf_intervention in patient_finding.active_interventions:
-                if pf_intervention.intervention:
+            for pf_intervention in patient_finding.interventions.all():
+                if pf_intervention.is_active and pf_intervention.intervention:
                     finding_interventions_list.append(pf_intervention.intervention)
 
         return RequirementLinks(
@@ -331,7 +331,10 @@ class PatientFinding(models.Model):
         finding_classifications_list = []
         finding_classification_choices_list = []
         
-        for pf_classification in self.active_classifications:
+        # Filtered in Python so prefetched classifications and interventions are reused
+        for pf_classification in self.classifications.all():
+            if not pf_classification.is_active:
+                continue
             if pf_classification.classification:
                 finding_classifications_list.append(pf_classification.classification)
             if pf_classification.classification_choice:
@@ -339,8 +342,8 @@ class PatientFinding(models.Model):
         
         # Get all active finding interventions
         finding_interventions_list = []
-        for pf_intervention in self.active_interventions:
-            if pf_intervention.intervention:
+        for pf_intervention in self.interventions.all():
+            if pf_intervention.is_active and pf_intervention.intervention:
                 finding_interventions_list.append(pf_intervention.intervention)
         
         # Include patient examination and patient for context
@@ -153,6 +153,13 @@ class ModelMeta(models.Model):
         # Delegate to logic function
         return logic.get_inference_dataset_config_logic(self)
 
+    def get_inference_model(self, device: Optional[str] = None) -> "TorchModule":
+        """
+        Returns the eval-mode model for this version from the process-wide model cache.
+        """
+        # Delegate to logic function
+        return logic.get_inference_model_logic(self, device)
+
     def natural_key(self) -> Tuple[str, str]:
         """
         Returns the natural key for serialization.
@@ -178,9 +178,48 @@ def get_inference_dataset_config_logic(model_meta: "ModelMeta") -> dict:
         "size_y": model_meta.size_y, # Add size_y key
         "size_x": model_meta.size_x, # Add size_x key
         "axes": [int(x) for x in model_meta.axes.split(',')],
+        "batchsize": model_meta.batchsize,
+        # Parallel frame loading, see endoreg_db.utils.ai.parallel_loader
+        "num_workers": model_meta.num_workers,
+        "worker_mode": "thread",
         # Add other relevant config like normalization type, etc.
     }
 
+def get_inference_model_logic(model_meta: "ModelMeta", device: Optional[str] = None):
+    """
+    Returns the eval-mode classification model for model_meta from the process-wide
+    model cache, loading it on first use. If no device is given, CUDA is tried first
+    and CPU is used as fallback.
+    """
+    from endoreg_db.utils.ai.model_cache import (
+        ModelCacheKey,
+        get_model_cache,
+        load_classification_model,
+        resolve_device,
+        weights_fingerprint,
+    )
+
+    if not model_meta.weights:
+        raise ValueError(f"No weights file associated with ModelMeta {model_meta.name} (v{model_meta.version}).")
+
+    weights_path = Path(model_meta.weights.path)
+    cache = get_model_cache()
+    fingerprint = weights_fingerprint(weights_path)
+
+    def load(target_device: str):
+        key = ModelCacheKey(model_meta.name, str(model_meta.version), fingerprint, target_device)
+        return cache.get_or_load(key, lambda: load_classification_model(weights_path, target_device))
+
+    target_device = resolve_device(device)
+    if device is None and target_device != "cpu":
+        try:
+            return load(target_device)
+        except RuntimeError as e:
+            logger.warning("Loading %s on %s failed: %s. Falling back to CPU.", model_meta.name, target_device, e)
+            return load("cpu")
+    return load(target_device)
+
+
 # Placeholder for get_config_dict_logic
 def get_config_dict_logic(model_meta: "ModelMeta") -> dict:
     # Returns a dictionary representation of the model's configuration
@@ -8,10 +8,13 @@ from ..label.label_video_segment import (
     LabelVideoSegment,
 
 )
-from ..utils import find_segments_in_prediction_array
+from ..utils import find_segments_in_prediction_array, PREDICTION_DIR
 
 import numpy as np
+import os
 import pickle
+import tempfile
+from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +36,19 @@ class VideoPredictionMeta(models.Model):
     date_created = models.DateTimeField(auto_now_add=True)
     date_modified = models.DateTimeField(auto_now=True)
     prediction_array = models.BinaryField(blank=True, null=True)
+    # Raw (frames x labels) model scores as .npy, so results can be re-smoothed and
+    # re-thresholded without running the model again
+    score_matrix = models.FileField(
+        upload_to=PREDICTION_DIR.name,  # Use .name for relative path
+        null=True,
+        blank=True,
+        help_text="Raw per-frame model scores (frames x labels) as a .npy file.",
+    )
+    score_labels = models.JSONField(
+        null=True,
+        blank=True,
+        help_text="Label names of the score matrix columns, in order.",
+    )
 
     video_file = models.ForeignKey(
         "VideoFile",
@@ -103,6 +119,100 @@ class VideoPredictionMeta(models.Model):
                 logger.error(f"Error unpickling prediction array for {self}: {e}")
                 return None
 
+    def save_score_matrix(self, scores: np.ndarray, labels: List[str]):
+        """
+        Stores the raw (frames x labels) score matrix as .npy next to the other media files.
+
+        The file is written to a temporary name and moved into place, so readers never
+        see a partially written matrix.
+        """
+        from django.core.files.storage import default_storage
+
+        scores = np.asarray(scores)
+        if scores.ndim != 2 or scores.shape[1] != len(labels):
+            raise ValueError(f"Score matrix shape {scores.shape} does not match {len(labels)} labels.")
+
+        relative_name = f"{PREDICTION_DIR.name}/{self.video_file.uuid}_{self.model_meta.pk}.npy"
+        target = Path(default_storage.path(relative_name))
+        target.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, suffix=".npy.tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                np.save(f, scores, allow_pickle=False)
+            os.replace(tmp_name, target)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+
+        self.score_matrix.name = relative_name
+        self.score_labels = list(labels)
+        self.save(update_fields=["score_matrix", "score_labels", "date_modified"])
+        logger.info("Saved %s score matrix for %s", scores.shape, self)
+
+    def get_score_matrix(self, mmap: bool = True) -> Optional[np.ndarray]:
+        """
+        Returns the stored score matrix, memory-mapped read-only by default, or None.
+        """
+        if not self.score_matrix:
+            return None
+        try:
+            path = self.score_matrix.path
+            return np.load(path, mmap_mode="r" if mmap else None, allow_pickle=False)
+        except (FileNotFoundError, ValueError) as e:
+            logger.error("Could not load score matrix for %s: %s", self, e)
+            return None
+
+    def compute_sequences(
+        self, smooth_window_size_s: float = 1, binarize_threshold: float = 0.5
+    ) -> Optional[dict]:
+        """
+        Re-smooths and re-thresholds the stored scores without running the model.
+
+        Returns {label_name: [(start, stop), ...]} like ``VideoFile.predict_video``, or
+        None if no score matrix is stored.
+        """
+        from endoreg_db.utils.ai.postprocess import prediction_matrix_to_sequences
+
+        scores = self.get_score_matrix()
+        if scores is None:
+            return None
+        fps = self.get_video().get_fps() or 30  # Same fallback as the prediction pipeline
+        return prediction_matrix_to_sequences(
+            scores,
+            self.score_labels or [],
+            window_size_s=smooth_window_size_s,
+            fps=fps,
+            threshold=binarize_threshold,
+        )
+
+    def regenerate_segments_from_scores(
+        self, smooth_window_size_s: float = 1, binarize_threshold: float = 0.5
+    ) -> Optional[dict]:
+        """
+        Replaces the predicted LabelVideoSegments of this prediction with segments
+        computed from the stored scores. Returns the new sequences, or None if no
+        score matrix is stored.
+        """
+        from django.db import transaction
+        from ..media.video.video_file_segments import _convert_sequences_to_db_segments
+
+        sequences = self.compute_sequences(smooth_window_size_s, binarize_threshold)
+        if sequences is None:
+            logger.warning("No score matrix stored for %s. Cannot regenerate segments.", self)
+            return None
+
+        video_obj = self.get_video()
+        with transaction.atomic():
+            LabelVideoSegment.objects.filter(prediction_meta=self).delete()
+            _convert_sequences_to_db_segments(
+                video=video_obj,
+                sequences=sequences,
+                video_prediction_meta=self,
+            )
+            video_obj.sequences = sequences
+            video_obj.save(update_fields=["sequences"])
+        return sequences
+
     def calculate_prediction_array(self, window_size_in_seconds: int = None):
         """
         Fetches all predictions for the associated video, labelset, and model meta,
@@ -21,6 +21,8 @@ from .unit import Unit
 
 from .tag import Tag
 
+from .base_data_file import BaseDataFile
+
 __all__ = [
     'Material',
     'Resource',
@@ -37,4 +39,5 @@ __all__ = [
     "Unit",
     "EmissionFactor",
     "Tag",
+    "BaseDataFile",
 ]
\ No newline at end of file
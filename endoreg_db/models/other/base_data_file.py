@@ -0,0 +1,21 @@
+from django.db import models
+
+
+class BaseDataFile(models.Model):
+    """
+    Records the content hash of a base data YAML file that has been loaded.
+
+    The YAML loader skips files whose hash is unchanged since the last successful load.
+    """
+
+    path = models.CharField(max_length=500, unique=True)
+    model_name = models.CharField(max_length=100)
+    content_hash = models.CharField(max_length=64)
+    loaded_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Base Data File"
+        verbose_name_plural = "Base Data Files"
+
+    def __str__(self):
+        return f"{self.path} ({self.content_hash[:12]})"
@@ -1,6 +1,7 @@
 from django.db import models
 from typing import TYPE_CHECKING, Dict, List, Union
 from endoreg_db.utils.links.requirement_link import RequirementLinks
+from .requirement_evaluation.evaluation_plan import get_input_links
 import logging
 from subprocess import run
 
@@ -40,6 +41,7 @@ if TYPE_CHECKING:
         RequirementSet, 
         Gender
     )
+    from .requirement_evaluation.evaluation_plan import RequirementPlan
     # from endoreg_db.utils.links.requirement_link import RequirementLinks # Already imported above
 
 
@@ -364,6 +366,17 @@ class Requirement(models.Model):
         from .requirement_evaluation.requirement_type_parser import data_model_dict
         return data_model_dict
     
+    @property
+    def evaluation_plan(self) -> "RequirementPlan":
+        """
+        Returns the compiled, process-wide cached plan of this requirement.
+
+        The plan holds the links, expected models, gender ids and operators used by
+        `evaluate`, loaded once for all requirements instead of queried per call.
+        """
+        from .requirement_evaluation.evaluation_plan import get_requirement_plan
+        return get_requirement_plan(self)
+
     @property
     def active_links(self) -> Dict[str, List]:
         """Returns a dictionary of linked models containing only non-empty entries.
@@ -397,8 +410,9 @@ class Requirement(models.Model):
 
         evaluate_result_list_func = all if mode == "strict" else any
 
-        requirement_req_links = self.links
-        expected_models = self.expected_models
+        plan = self.evaluation_plan
+        requirement_req_links = plan.links
+        expected_models = plan.expected_models
 
         # helpers to avoid passing a complex tuple to isinstance/issubclass which confuses type checkers
         def _is_expected_instance(obj) -> bool:
@@ -439,22 +453,23 @@ class Requirement(models.Model):
                     
                     queryset_results = []
                     for item in _input:
-                        if not hasattr(item, 'links') or not isinstance(item.links, RequirementLinks):
+                        item_links = get_input_links(item)
+                        if item_links is None:
                             raise TypeError(
                                 f"Item {item} of type {type(item)} in QuerySet does not have a valid .links attribute of type RequirementLinks."
                             )
                         
                         # Evaluate this single item against the requirement
-                        item_input_links = RequirementLinks(**item.links.active())
+                        item_input_links = RequirementLinks(**item_links.active())
                         
                         # Evaluate all operators for this single item
                         item_operator_results = []
-                        for operator in self.operators.all():
+                        for operator in plan.operators:
                             try:
                                 operator_result = operator.evaluate(
                                     requirement_links=requirement_req_links,
                                     input_links=item_input_links,
-                                    requirement=self,
+                                    requirement=plan.requirement,
                                     original_input_args=args,
                                     **kwargs
                                 )
@@ -474,17 +489,18 @@ class Requirement(models.Model):
                     continue # Move to the next arg after processing queryset
                 else:
                     raise TypeError(
-                        f"Input type {type(_input)} is not among expected models: {self.expected_models} "
+                        f"Input type {type(_input)} is not among expected models: {list(expected_models)} "
                         f"nor a QuerySet of expected models."
                     )
 
             # Process single model instance
-            if not hasattr(_input, 'links') or not isinstance(_input.links, RequirementLinks):
+            input_links = get_input_links(_input)
+            if input_links is None:
                 raise TypeError(
                     f"Input {_input} of type {type(_input)} does not have a valid .links attribute of type RequirementLinks."
                 )
             
-            active_input_links = _input.links.active() # Get dict of non-empty lists
+            active_input_links = input_links.active() # Get dict of non-empty lists
             for link_key, link_list in active_input_links.items():
                 if link_key not in aggregated_input_links_data:
                     aggregated_input_links_data[link_key] = []
@@ -514,8 +530,7 @@ class Requirement(models.Model):
         final_input_links = RequirementLinks(**aggregated_input_links_data)
         
         # Gender strict check: if this requirement has genders, only pass if patient.gender is in the set
-        genders_exist = self.genders.exists()
-        if genders_exist:
+        if plan.gender_ids:
             # Import here to avoid circular import
             from endoreg_db.models.administration.person.patient import Patient
             patient = None
@@ -523,13 +538,13 @@ class Requirement(models.Model):
                 if isinstance(arg, Patient):
                     patient = arg
                     break
-            if patient is None or patient.gender is None:
+            if patient is None or patient.gender_id is None:
                 return False
-            if not self.genders.filter(pk=patient.gender.pk).exists():
+            if patient.gender_id not in plan.gender_ids:
                 return False
 
-        operators = self.operators.all()
-        if not operators.exists(): # If a requirement has no operators, its evaluation is ambiguous.
+        operators = plan.operators
+        if not operators: # If a requirement has no operators, its evaluation is ambiguous.
             # Consider if this should be True, False, or an error.
             # For now, if no operators, and mode is strict, it's vacuously true. If loose, vacuously false.
             # However, typically a requirement implies some condition.
@@ -544,7 +559,7 @@ class Requirement(models.Model):
         for operator in operators:
             # Prepare kwargs for the operator, including the current Requirement instance
             op_kwargs = kwargs.copy() # Start with kwargs passed to Requirement.evaluate
-            op_kwargs['requirement'] = self # Add the Requirement instance itself
+            op_kwargs['requirement'] = plan.requirement # Add the Requirement instance itself (relations prefetched)
             op_kwargs['original_input_args'] = args # Add the original input arguments for operators that need them (e.g., age operators)
             operator_results.append(operator.evaluate(
                 requirement_links=requirement_req_links,
@@ -580,8 +595,9 @@ class Requirement(models.Model):
 
         evaluate_result_list_func = all if mode == "strict" else any
 
-        requirement_req_links = self.links
-        expected_models = self.expected_models
+        plan = self.evaluation_plan
+        requirement_req_links = plan.links
+        expected_models = plan.expected_models
 
         # helpers to avoid passing a complex tuple to isinstance/issubclass which confuses type checkers
         def _is_expected_instance(obj) -> bool:
@@ -622,22 +638,23 @@ class Requirement(models.Model):
                     
                     queryset_results = []
                     for item in _input:
-                        if not hasattr(item, 'links') or not isinstance(item.links, RequirementLinks):
+                        item_links = get_input_links(item)
+                        if item_links is None:
                             raise TypeError(
                                 f"Item {item} of type {type(item)} in QuerySet does not have a valid .links attribute of type RequirementLinks."
                             )
                         
                         # Evaluate this single item against the requirement
-                        item_input_links = RequirementLinks(**item.links.active())
+                        item_input_links = RequirementLinks(**item_links.active())
                         
                         # Evaluate all operators for this single item
                         item_operator_results = []
-                        for operator in self.operators.all():
+                        for operator in plan.operators:
                             try:
                                 operator_result = operator.evaluate(
                                     requirement_links=requirement_req_links,
                                     input_links=item_input_links,
-                                    requirement=self,
+                                    requirement=plan.requirement,
                                     original_input_args=args,
                                     **kwargs
                                 )
@@ -657,17 +674,18 @@ class Requirement(models.Model):
                     continue # Move to the next arg after processing queryset
                 else:
                     raise TypeError(
-                        f"Input type {type(_input)} is not among expected models: {self.expected_models} "
+                        f"Input type {type(_input)} is not among expected models: {list(expected_models)} "
                         f"nor a QuerySet of expected models."
                     )
 
             # Process single model instance
-            if not hasattr(_input, 'links') or not isinstance(_input.links, RequirementLinks):
+            input_links = get_input_links(_input)
+            if input_links is None:
                 raise TypeError(
                     f"Input {_input} of type {type(_input)} does not have a valid .links attribute of type RequirementLinks."
                 )
             
-            active_input_links = _input.links.active() # Get dict of non-empty lists
+            active_input_links = input_links.active() # Get dict of non-empty lists
             for link_key, link_list in active_input_links.items():
                 if link_key not in aggregated_input_links_data:
                     aggregated_input_links_data[link_key] = []
@@ -697,8 +715,7 @@ class Requirement(models.Model):
         final_input_links = RequirementLinks(**aggregated_input_links_data)
         
         # Gender strict check: if this requirement has genders, only pass if patient.gender is in the set
-        genders_exist = self.genders.exists()
-        if genders_exist:
+        if plan.gender_ids:
             # Import here to avoid circular import
             from endoreg_db.models.administration.person.patient import Patient
             patient = None
@@ -706,13 +723,13 @@ class Requirement(models.Model):
                 if isinstance(arg, Patient):
                     patient = arg
                     break
-            if patient is None or patient.gender is None:
+            if patient is None or patient.gender_id is None:
                 return False
-            if not self.genders.filter(pk=patient.gender.pk).exists():
+            if patient.gender_id not in plan.gender_ids:
                 return False
 
-        operators = self.operators.all()
-        if not operators.exists(): # If a requirement has no operators, its evaluation is ambiguous.
+        operators = plan.operators
+        if not operators: # If a requirement has no operators, its evaluation is ambiguous.
             # Consider if this should be True, False, or an error.
             # For now, if no operators, and mode is strict, it's vacuously true. If loose, vacuously false.
             # However, typically a requirement implies some condition.
@@ -728,7 +745,7 @@ class Requirement(models.Model):
         for operator in operators:
             # Prepare kwargs for the operator, including the current Requirement instance
             op_kwargs = kwargs.copy() # Start with kwargs passed to Requirement.evaluate
-            op_kwargs['requirement'] = self # Add the Requirement instance itself
+            op_kwargs['requirement'] = plan.requirement # Add the Requirement instance itself (relations prefetched)
             op_kwargs['original_input_args'] = args # Add the original input arguments for operators that need them (e.g., age operators)
             try:
                 operator_result = operator.evaluate(
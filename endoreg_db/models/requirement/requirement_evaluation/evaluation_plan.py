@@ -0,0 +1,389 @@
+"""
+Compiled, per-process cached evaluation plans for requirements and requirement sets.
+
+Evaluating a ``Requirement`` needs its links (13 M2M relations), its expected models,
+genders and operators; a ``RequirementSet`` additionally needs its requirements and the
+transitive ``links_to_sets`` closure. Loading these per call makes evaluating one patient
+examination against all sets cost hundreds of queries.
+
+``get_evaluation_plan`` loads every requirement and requirement set once, in a fixed
+number of queries, into immutable ``RequirementPlan`` / ``RequirementSetPlan`` objects.
+The plan is cached per process and dropped whenever requirement data changes (see
+``connect_plan_invalidation_signals``, wired in ``EndoregDbConfig.ready``). Changes made
+by other processes are picked up after ``ENDOREG_REQUIREMENT_PLAN_TTL`` seconds
+(default 300, 0 keeps the plan until a local change drops it).
+
+Evaluation inputs are not part of the plan. ``input_links_memo`` memoizes their
+``.links`` for the duration of one evaluation, so each input is resolved once no matter
+how many requirements look at it.
+"""
+
+import hashlib
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import TYPE_CHECKING, Any, Callable, Dict, FrozenSet, List, Mapping, Optional, Set, Tuple
+
+from django.db import models
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+from endoreg_db.config.env import env_int
+from endoreg_db.utils.links.requirement_link import RequirementLinks
+
+if TYPE_CHECKING:
+    from endoreg_db.models import Requirement, RequirementOperator, RequirementSet
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REQUIREMENT_PLAN_TTL = 300
+
+# Requirement M2M fields that make up Requirement.links
+REQUIREMENT_LINK_FIELDS = (
+    "examinations",
+    "examination_indications",
+    "lab_values",
+    "diseases",
+    "disease_classification_choices",
+    "events",
+    "findings",
+    "finding_classifications",
+    "finding_classification_choices",
+    "finding_interventions",
+    "medications",
+    "medication_indications",
+    "medication_intake_times",
+)
+
+
+@dataclass(frozen=True)
+class RequirementPlan:
+    """Everything ``Requirement.evaluate`` needs from the requirement side."""
+
+    requirement: "Requirement"
+    links: RequirementLinks
+    link_ids: Mapping[str, FrozenSet[int]]
+    expected_models: Tuple[type, ...]
+    gender_ids: FrozenSet[int]
+    operators: Tuple["RequirementOperator", ...]
+
+    @property
+    def pk(self) -> int:
+        return self.requirement.pk
+
+
+@dataclass(frozen=True)
+class RequirementSetPlan:
+    """A requirement set with its requirement ids and linked set ids resolved."""
+
+    requirement_set: "RequirementSet"
+    requirement_ids: Tuple[int, ...]
+    linked_set_ids: Tuple[int, ...]
+    all_linked_set_ids: Tuple[int, ...]
+    eval_function: Optional[Callable[[List[bool]], bool]]
+
+    @property
+    def pk(self) -> int:
+        return self.requirement_set.pk
+
+    @property
+    def set_type_name(self) -> Optional[str]:
+        set_type = self.requirement_set.requirement_set_type
+        return set_type.name if set_type else None
+
+
+@dataclass(frozen=True)
+class RequirementEvaluationPlan:
+    requirements: Mapping[int, RequirementPlan]
+    requirement_sets: Mapping[int, RequirementSetPlan]
+    compiled_at: float
+    # Fingerprint of the requirement definitions; equal across processes for equal data
+    version: str
+
+
+def compile_requirement_plan(requirement: "Requirement") -> RequirementPlan:
+    """
+    Builds the plan of a single requirement.
+
+    Uses prefetched relations where available, so compiling a prefetched queryset does
+    not issue further queries.
+    """
+    from .requirement_type_parser import data_model_dict
+
+    link_lists = {field: list(getattr(requirement, field).all()) for field in REQUIREMENT_LINK_FIELDS}
+    return RequirementPlan(
+        requirement=requirement,
+        links=RequirementLinks(**link_lists),
+        link_ids=MappingProxyType({field: frozenset(obj.pk for obj in objs) for field, objs in link_lists.items()}),
+        expected_models=tuple(data_model_dict[t.name] for t in requirement.requirement_types.all()),
+        gender_ids=frozenset(g.pk for g in requirement.genders.all()),
+        operators=tuple(requirement.operators.all()),
+    )
+
+
+def _collect_all_linked_set_ids(set_id: int, links: Mapping[int, Tuple[int, ...]]) -> Tuple[int, ...]:
+    """Same traversal order as ``RequirementSet.all_linked_sets``, on ids."""
+    visited: Set[int] = set()
+    result: List[int] = []
+
+    def _collect(current: int):
+        if current in visited:
+            return
+        visited.add(current)
+        for linked in links.get(current, ()):
+            if linked not in visited:
+                result.append(linked)
+                _collect(linked)
+
+    _collect(set_id)
+    return tuple(result)
+
+
+def _field_values(obj: models.Model) -> Tuple[str, ...]:
+    return tuple(str(getattr(obj, field.attname)) for field in obj._meta.concrete_fields)
+
+
+def _plan_version(
+    requirements: Mapping[int, RequirementPlan], requirement_sets: Mapping[int, RequirementSetPlan]
+) -> str:
+    """Hashes everything the plan is compiled from, so a changed definition changes the version."""
+    hash_object = hashlib.sha256()
+    for pk in sorted(requirements):
+        plan = requirements[pk]
+        hash_object.update(repr((
+            _field_values(plan.requirement),
+            sorted((field, sorted(ids)) for field, ids in plan.link_ids.items()),
+            [model.__name__ for model in plan.expected_models],
+            sorted(plan.gender_ids),
+            [_field_values(operator) for operator in plan.operators],
+        )).encode())
+    for pk in sorted(requirement_sets):
+        plan = requirement_sets[pk]
+        hash_object.update(repr((
+            _field_values(plan.requirement_set),
+            plan.requirement_ids,
+            plan.linked_set_ids,
+        )).encode())
+    return hash_object.hexdigest()
+
+
+def compile_evaluation_plan() -> RequirementEvaluationPlan:
+    """Loads all requirements and requirement sets into a plan with a fixed number of queries."""
+    from endoreg_db.models import Requirement, RequirementSet
+
+    from ..requirement_set import REQUIREMENT_SET_TYPE_FUNCTION_LOOKUP
+
+    requirement_qs = Requirement.objects.select_related("unit").prefetch_related(
+        *REQUIREMENT_LINK_FIELDS, "requirement_types", "genders", "operators"
+    )
+    requirements = {r.pk: compile_requirement_plan(r) for r in requirement_qs}
+
+    set_requirements: Dict[int, List[int]] = {}
+    for set_id, requirement_id in (
+        RequirementSet.requirements.through.objects.order_by("pk").values_list("requirementset_id", "requirement_id")
+    ):
+        set_requirements.setdefault(set_id, []).append(requirement_id)
+
+    set_links: Dict[int, Tuple[int, ...]] = {}
+    for from_id, to_id in (
+        RequirementSet.links_to_sets.through.objects.order_by("pk").values_list(
+            "from_requirementset_id", "to_requirementset_id"
+        )
+    ):
+        set_links[from_id] = set_links.get(from_id, ()) + (to_id,)
+
+    requirement_sets = {}
+    for requirement_set in RequirementSet.objects.select_related("requirement_set_type"):
+        set_type = requirement_set.requirement_set_type
+        requirement_sets[requirement_set.pk] = RequirementSetPlan(
+            requirement_set=requirement_set,
+            requirement_ids=tuple(set_requirements.get(requirement_set.pk, ())),
+            linked_set_ids=set_links.get(requirement_set.pk, ()),
+            all_linked_set_ids=_collect_all_linked_set_ids(requirement_set.pk, set_links),
+            eval_function=REQUIREMENT_SET_TYPE_FUNCTION_LOOKUP.get(set_type.name) if set_type else None,
+        )
+
+    return RequirementEvaluationPlan(
+        requirements=MappingProxyType(requirements),
+        requirement_sets=MappingProxyType(requirement_sets),
+        compiled_at=time.monotonic(),
+        version=_plan_version(requirements, requirement_sets),
+    )
+
+
+_plan: Optional[RequirementEvaluationPlan] = None
+_plan_lock = threading.Lock()
+
+
+def get_evaluation_plan(refresh: bool = False) -> RequirementEvaluationPlan:
+    """Returns the cached plan of this process, compiling it if missing, expired or ``refresh`` is set."""
+    global _plan
+    ttl = env_int("ENDOREG_REQUIREMENT_PLAN_TTL", DEFAULT_REQUIREMENT_PLAN_TTL)
+    with _plan_lock:
+        plan = _plan
+        if refresh or plan is None or (ttl > 0 and time.monotonic() - plan.compiled_at > ttl):
+            plan = compile_evaluation_plan()
+            _plan = plan
+        return plan
+
+
+def invalidate_evaluation_plan() -> None:
+    """Drops the cached plan; the next evaluation compiles a fresh one."""
+    global _plan
+    with _plan_lock:
+        _plan = None
+
+
+def get_requirement_plan(requirement: "Requirement") -> RequirementPlan:
+    """
+    Returns the plan of ``requirement``.
+
+    Requirements missing from the cached plan (e.g. created by another process) trigger
+    one recompilation; unsaved requirements are compiled on their own.
+    """
+    if requirement.pk is None:
+        return compile_requirement_plan(requirement)
+    plan = get_evaluation_plan()
+    if requirement.pk not in plan.requirements:
+        plan = get_evaluation_plan(refresh=True)
+    requirement_plan = plan.requirements.get(requirement.pk)
+    return requirement_plan if requirement_plan is not None else compile_requirement_plan(requirement)
+
+
+def get_requirement_set_plan(requirement_set: "RequirementSet") -> RequirementSetPlan:
+    """Returns the plan of a saved requirement set, recompiling once if it is missing."""
+    plan = get_evaluation_plan()
+    if requirement_set.pk not in plan.requirement_sets:
+        plan = get_evaluation_plan(refresh=True)
+    return plan.requirement_sets[requirement_set.pk]
+
+
+_input_memo: ContextVar[Optional[Dict[Any, Any]]] = ContextVar("requirement_input_memo", default=None)
+
+
+@contextmanager
+def input_links_memo():
+    """
+    Memoizes evaluation inputs for the duration of the block.
+
+    Nested blocks share the outermost memo. Inputs must not change inside the block.
+    """
+    if _input_memo.get() is not None:
+        yield
+        return
+    token = _input_memo.set({})
+    try:
+        yield
+    finally:
+        _input_memo.reset(token)
+
+
+def memoized_input(key: Any, factory: Callable[[], Any]) -> Any:
+    """Returns ``factory()``, cached under ``key`` while an ``input_links_memo`` block is active."""
+    memo = _input_memo.get()
+    if memo is None:
+        return factory()
+    if key not in memo:
+        memo[key] = factory()
+    return memo[key]
+
+
+def get_input_links(obj) -> Optional[RequirementLinks]:
+    """Returns ``obj.links`` if it is a ``RequirementLinks`` object, else None."""
+    if isinstance(obj, models.Model) and obj.pk is not None:
+        links = memoized_input(("links", type(obj), obj.pk), lambda: getattr(obj, "links", None))
+    else:
+        links = getattr(obj, "links", None)
+    return links if isinstance(links, RequirementLinks) else None
+
+
+def evaluate_requirement_set_plan(
+    plan: RequirementEvaluationPlan,
+    set_plan: RequirementSetPlan,
+    input_object,
+    mode: str = "loose",
+    _results: Optional[Dict[int, bool]] = None,
+    _stack: FrozenSet[int] = frozenset(),
+) -> bool:
+    """
+    Evaluates a requirement set plan; same semantics as ``RequirementSet.evaluate``.
+
+    Each set is evaluated once per call and reused wherever it is linked. A set that
+    links back to a set currently being evaluated skips that set instead of recursing.
+    """
+    if _results is None:
+        _results = {}
+    if set_plan.pk in _results:
+        return _results[set_plan.pk]
+
+    requirement_set = set_plan.requirement_set
+    results = [
+        plan.requirements[requirement_id].requirement.evaluate(
+            requirement_set._get_evaluation_input_for_requirement(plan.requirements[requirement_id].requirement, input_object),
+            mode=mode,
+        )
+        for requirement_id in set_plan.requirement_ids
+    ]
+
+    stack = _stack | {set_plan.pk}
+    for linked_id in set_plan.all_linked_set_ids:
+        if linked_id in stack:
+            continue
+        results.append(
+            evaluate_requirement_set_plan(plan, plan.requirement_sets[linked_id], input_object, mode, _results, stack)
+        )
+
+    result = bool(set_plan.eval_function(results)) if set_plan.eval_function else all(results)
+    _results[set_plan.pk] = result
+    return result
+
+
+def _invalidate_on_change(sender, **kwargs):
+    invalidate_evaluation_plan()
+
+
+def _invalidate_on_m2m_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_evaluation_plan()
+
+
+def connect_plan_invalidation_signals() -> None:
+    """
+    Drops the cached plan whenever requirement data or anything a plan holds changes.
+
+    Covers requirements, requirement sets and their types and operators, every model
+    linked from ``Requirement`` (its link targets, genders, unit), the M2M tables and
+    bulk loads of base data YAML files.
+    """
+    from endoreg_db.models import (
+        Requirement,
+        RequirementOperator,
+        RequirementSet,
+        RequirementSetType,
+        RequirementType,
+    )
+    from endoreg_db.utils.dataloader import base_data_loaded
+
+    senders = {Requirement, RequirementOperator, RequirementSet, RequirementSetType, RequirementType}
+    senders.update(field.related_model for field in Requirement._meta.many_to_many)
+    senders.add(Requirement._meta.get_field("unit").related_model)
+    for sender in senders:
+        uid = f"requirement_plan_invalidation_{sender._meta.label_lower}"
+        post_save.connect(_invalidate_on_change, sender=sender, dispatch_uid=uid, weak=False)
+        post_delete.connect(_invalidate_on_change, sender=sender, dispatch_uid=uid, weak=False)
+
+    # The YAML loader writes base data with bulk queries, which send no model signals
+    base_data_loaded.connect(_invalidate_on_change, dispatch_uid="requirement_plan_invalidation_base_data", weak=False)
+
+    through_models = [field.remote_field.through for field in Requirement._meta.many_to_many]
+    through_models += [RequirementSet.requirements.through, RequirementSet.links_to_sets.through]
+    for through in through_models:
+        m2m_changed.connect(
+            _invalidate_on_m2m_change,
+            sender=through,
+            dispatch_uid=f"requirement_plan_invalidation_{through._meta.label_lower}",
+            weak=False,
+        )
@@ -1,6 +1,15 @@
 from django.db import models
 from typing import TYPE_CHECKING, List
 
+from .requirement_evaluation.evaluation_plan import (
+    RequirementSetPlan,
+    evaluate_requirement_set_plan,
+    get_evaluation_plan,
+    get_requirement_set_plan,
+    input_links_memo,
+    memoized_input,
+)
+
 
 REQUIREMENT_SET_TYPE_FUNCTION_LOOKUP = {
     "all": all,
@@ -155,12 +164,16 @@ class RequirementSet(models.Model):
         Returns:
             A list of boolean values indicating whether each requirement is satisfied.
         """
+        set_plan = self.evaluation_plan
+        plan = get_evaluation_plan()
         results = []
-        for requirement in self.requirements.all():
-            # Get the appropriate input for this specific requirement
-            evaluation_input = self._get_evaluation_input_for_requirement(requirement, input_object)
-            result = requirement.evaluate(evaluation_input, mode=mode)
-            results.append(result)
+        with input_links_memo():
+            for requirement_id in set_plan.requirement_ids:
+                requirement = plan.requirements[requirement_id].requirement
+                # Get the appropriate input for this specific requirement
+                evaluation_input = self._get_evaluation_input_for_requirement(requirement, input_object)
+                result = requirement.evaluate(evaluation_input, mode=mode)
+                results.append(result)
         return results
     
     def _get_evaluation_input_for_requirement(self, requirement, input_object):
@@ -174,7 +187,7 @@ class RequirementSet(models.Model):
         Returns:
             The most appropriate input object for the requirement evaluation
         """
-        expected_models = requirement.expected_models
+        expected_models = requirement.evaluation_plan.expected_models
         
         # If the input object is already one of the expected models, use it directly
         for expected_model in expected_models:
@@ -189,7 +202,12 @@ class RequirementSet(models.Model):
         if isinstance(input_object, PatientExamination):
             # If requirement expects PatientFinding, return the examination's findings
             if PatientFinding in expected_models:
-                return input_object.patient_findings.all()
+                def _load_findings():
+                    findings = input_object.patient_findings.all()
+                    len(findings)  # evaluate now so .exists() and iteration reuse the rows
+                    return findings
+
+                return memoized_input(("patient_findings", input_object.pk), _load_findings)
 
         
         # Handle other model conversions as needed in the future
@@ -203,15 +221,25 @@ class RequirementSet(models.Model):
         Returns:
             A list of boolean values indicating whether each linked requirement set is satisfied.
         """
+        set_plan = self.evaluation_plan
+        plan = get_evaluation_plan()
         results = []
-        linked_sets = self.all_linked_sets
-        if not linked_sets:
-            return results
-        for linked_set in linked_sets:
-            result = linked_set.evaluate(input_object)
-            results.append(result)
+        with input_links_memo():
+            for linked_set_id in set_plan.all_linked_set_ids:
+                linked_set_plan = plan.requirement_sets[linked_set_id]
+                result = evaluate_requirement_set_plan(plan, linked_set_plan, input_object, _stack=frozenset({self.pk}))
+                results.append(result)
         return results
     
+    @property
+    def evaluation_plan(self) -> RequirementSetPlan:
+        """
+        Returns the compiled, process-wide cached plan of this requirement set.
+
+        The plan holds the ids of the set's requirements and (transitively) linked sets.
+        """
+        return get_requirement_set_plan(self)
+
     @property
     def eval_function(self):
         """
@@ -229,20 +257,18 @@ class RequirementSet(models.Model):
         
         Combines the evaluation results of all direct requirements and linked requirement sets, then applies the set's evaluation function (such as all, any, none, etc.) to determine if the input object meets the overall criteria.
         
+        Uses the cached evaluation plan; each linked set is evaluated once per call, even if several sets link to it.
+        
         Args:
             input_object: The object to be evaluated against the requirements and linked sets.
         
         Returns:
             True if the input object satisfies the requirement set according to its evaluation logic; otherwise, False.
         """
-        evaluate_r_results = self.evaluate_requirements(input_object)
-        evaluate_rs_results = self.evaluate_requirement_sets(input_object)
-
-        results = evaluate_r_results + evaluate_rs_results
-
-        eval_result = self.eval_function(results) if self.eval_function else all(results)
-
-        return eval_result
+        set_plan = self.evaluation_plan
+        plan = get_evaluation_plan()
+        with input_links_memo():
+            return evaluate_requirement_set_plan(plan, set_plan, input_object)
     
     @property
     def all_linked_sets(self):
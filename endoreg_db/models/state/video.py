@@ -33,6 +33,7 @@ class VideoState(models.Model):
         
     frames_extracted = models.BooleanField(default=False, help_text="True if raw frames have been extracted to files.")
     frames_initialized = models.BooleanField(default=False, help_text="True if Frame DB objects have been created.")
+    frames_sampled = models.BooleanField(default=False, help_text="True if the frame directory only holds a selected subset of frames (extract_selected_frames).")
     frame_count = models.PositiveIntegerField(null=True, blank=True, help_text="Number of frames extracted/initialized.")
 
     # Metadata related states
@@ -138,8 +139,9 @@ class VideoState(models.Model):
             save (bool): If True, persist the change to the database immediately.
         """
         self.frames_extracted = True
+        self.frames_sampled = False
         if save:
-            self.save(update_fields=["frames_extracted", "date_modified"])
+            self.save(update_fields=["frames_extracted", "frames_sampled", "date_modified"])
 
     def mark_frames_not_extracted(self, *, save: bool = True) -> None:
         """
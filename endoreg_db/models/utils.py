@@ -25,6 +25,7 @@ TMP_VIDEO_DIR = VIDEO_DIR / "tmp"
 ANONYM_VIDEO_DIR = data_paths["video_export"]
 FRAME_DIR = data_paths["frame"]
 WEIGHTS_DIR = data_paths["weights"]
+PREDICTION_DIR = data_paths["prediction"]
 PDF_DIR = data_paths["raw_pdf"]
 DOCUMENT_DIR = data_paths["pdf"]
 
@@ -71,6 +72,45 @@ def find_segments_in_prediction_array(prediction_array: np.array, min_frame_len:
 
     return segments
 
+def mask_frame(
+    frame: np.ndarray, endo_roi, all_black: bool = False, censor_color: Tuple[int, int, int] = (0, 0, 0)
+) -> np.ndarray:
+    """
+    Blacks out the pixels of a frame outside the endoscope ROI, or fills the whole frame
+    with censor_color if all_black is set. The frame is modified in place and returned.
+    censor_color must be given in the channel order of the frame.
+    """
+    if all_black:
+        frame[:] = censor_color
+        return frame
+
+    # Validate ROI dictionary keys
+    required_keys = {"x", "y", "width", "height"}
+    if not required_keys.issubset(endo_roi):
+        raise ValueError(f"Invalid endo_roi dictionary provided: {endo_roi}. Missing keys.")
+
+    x = endo_roi["x"]
+    y = endo_roi["y"]
+    width = endo_roi["width"]
+    height = endo_roi["height"]
+
+    # Add boundary checks for ROI coordinates
+    h_orig, w_orig = frame.shape[:2]
+    x1, y1 = max(0, x), max(0, y)
+    x2, y2 = min(w_orig, x + width), min(h_orig, y + height)
+
+    if x1 >= x2 or y1 >= y2:
+        logger.warning(f"ROI [{x},{y},{width},{height}] is outside or invalid for frame dimensions {w_orig}x{h_orig}. Resulting frame might be all black.")
+        frame[:] = 0
+    else:
+        # black out the four borders around the endoscope roi
+        frame[:y1] = 0
+        frame[y2:] = 0
+        frame[y1:y2, :x1] = 0
+        frame[y1:y2, x2:] = 0
+    return frame
+
+
 def anonymize_frame(
     raw_frame_path: Path, target_frame_path: Path, endo_roi, all_black: bool = False, censor_color: Tuple[int, int, int] = (0, 0, 0) # Added censor_color param
 ):
@@ -82,33 +122,7 @@ def anonymize_frame(
         # Raise error instead of returning None/frame
         raise FileNotFoundError(f"Could not read frame at {raw_frame_path}")
 
-    # make black frame with same size as original frame
-    new_frame = np.zeros_like(frame)
-
-    if not all_black:
-        # Validate ROI dictionary keys
-        required_keys = {"x", "y", "width", "height"}
-        if not required_keys.issubset(endo_roi):
-            raise ValueError(f"Invalid endo_roi dictionary provided: {endo_roi}. Missing keys.")
-
-        x = endo_roi["x"]
-        y = endo_roi["y"]
-        width = endo_roi["width"]
-        height = endo_roi["height"]
-
-        # Add boundary checks for ROI coordinates
-        h_orig, w_orig, _ = frame.shape
-        x1, y1 = max(0, x), max(0, y)
-        x2, y2 = min(w_orig, x + width), min(h_orig, y + height)
-
-        if x1 >= x2 or y1 >= y2:
-            logger.warning(f"ROI [{x},{y},{width},{height}] is outside or invalid for frame dimensions {w_orig}x{h_orig}. Resulting frame might be all black.")
-        else:
-            # copy valid endoscope roi part to black frame
-            new_frame[y1:y2, x1:x2] = frame[y1:y2, x1:x2]
-    else:
-        # If all_black, fill with censor_color (defaults to black)
-        new_frame[:] = censor_color
+    new_frame = mask_frame(frame, endo_roi, all_black=all_black, censor_color=censor_color)
 
     # Check if writing the anonymized frame was successful
     success = cv2.imwrite(target_frame_path.as_posix(), new_frame)
@@ -128,6 +142,7 @@ __all__ = [
     "PDF_DIR",
     "DOCUMENT_DIR",
     "prepare_bulk_frames",
+    "mask_frame",
     "anonymize_frame",
     "find_segments_in_prediction_array",
     "TEST_RUN",
@@ -0,0 +1,207 @@
+from bisect import bisect_left
+from collections import defaultdict
+from functools import reduce
+from operator import or_
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urljoin
+
+from django.conf import settings
+from django.db.models import Q
+
+from endoreg_db.models import Frame, ImageClassificationAnnotation, InformationSourceType, VideoFile
+from endoreg_db.utils.frame_ranges import FrameRangeSet
+
+import logging
+logger = logging.getLogger(__name__)
+
+if TYPE_CHECKING:
+    from endoreg_db.models import LabelVideoSegment
+
+
+def _media_relpath_from_file_path(file_path) -> str:
+    """
+    Return a media-relative path (never an absolute server path).
+    If MEDIA_ROOT is a prefix, strip it; otherwise return the basename.
+    Accepts str or Path-like.
+    """
+    p = Path(str(file_path))
+    media_root = getattr(settings, "MEDIA_ROOT", None)
+    if media_root:
+        try:
+            rel = p.resolve().relative_to(Path(media_root).resolve())
+            return rel.as_posix()
+        except Exception:
+            pass
+    return p.name  # safe fallback
+
+def _media_url_from_file_path(file_path, request=None) -> str:
+    """
+    Build a public URL for the file using MEDIA_URL + relpath.
+    If `request` is provided, return an absolute URL.
+    """
+    base = getattr(settings, "MEDIA_URL", "/media/")
+    if not base.endswith("/"):
+        base += "/"
+    rel = _media_relpath_from_file_path(file_path)
+    url = urljoin(base, rel)
+    if request is not None:
+        try:
+            return request.build_absolute_uri(url)
+        except Exception:
+            pass
+    return url
+
+
+def _segment_videos(segments: List["LabelVideoSegment"]) -> Dict[int, VideoFile]:
+    """Returns the videos of the segments by id, fetching those not yet cached in one query."""
+    from endoreg_db.models import LabelVideoSegment
+
+    videos = {}
+    for segment in segments:
+        if LabelVideoSegment.video_file.is_cached(segment) and segment.video_file is not None:
+            videos[segment.video_file_id] = segment.video_file
+    missing = {segment.video_file_id for segment in segments if segment.video_file_id} - set(videos)
+    if missing:
+        videos.update(VideoFile.objects.in_bulk(missing))
+    return videos
+
+
+# Frame ranges per frame/annotation query; keeps the OR'd WHERE clause below SQLite's expression depth limit
+FRAME_QUERY_RANGE_BATCH_SIZE = 200
+
+
+def _segment_frame_ranges(segments: List["LabelVideoSegment"]) -> List[Tuple[int, int, int]]:
+    """
+    Returns ``(video_id, first, last)`` frame ranges covering the segments.
+
+    Segment ends are exclusive; overlapping or touching segments of a video are merged,
+    so no frame outside all segments is part of a range.
+    """
+    by_video = defaultdict(list)
+    for segment in segments:
+        by_video[segment.video_file_id].append((segment.start_frame_number, segment.end_frame_number - 1))
+    return [
+        (video_id, first, last)
+        for video_id, ranges in by_video.items()
+        for first, last in FrameRangeSet(ranges).ranges()
+    ]
+
+
+def _batched_frame_ranges(segments: List["LabelVideoSegment"], prefix: str = "") -> List[Q]:
+    """Q objects matching the frames of the segments, one per ``FRAME_QUERY_RANGE_BATCH_SIZE`` ranges."""
+    ranges = _segment_frame_ranges(segments)
+    return [
+        reduce(or_, (
+            Q(**{f"{prefix}video_id": video_id, f"{prefix}frame_number__range": (first, last)})
+            for video_id, first, last in ranges[i:i + FRAME_QUERY_RANGE_BATCH_SIZE]
+        ))
+        for i in range(0, len(ranges), FRAME_QUERY_RANGE_BATCH_SIZE)
+    ]
+
+
+def _source_type_names(source_ids: Set[int]) -> Dict[int, Set[str]]:
+    """Returns the information source type names per information source id."""
+    names = defaultdict(set)
+    if source_ids:
+        through = InformationSourceType.information_sources.through
+        rows = through.objects.filter(informationsource_id__in=source_ids).values_list(
+            "informationsource_id", "informationsourcetype__name"
+        )
+        for source_id, name in rows:
+            names[source_id].add(name)
+    return names
+
+
+def build_segment_frame_payloads(segments: Iterable["LabelVideoSegment"], request=None) -> Dict[int, dict]:
+    """
+    Builds the ``time_segments`` payload of ``LabelVideoSegmentSerializer`` for many segments at once.
+
+    Frames, annotations (with labels) and the information source types of the annotations are
+    fetched with one query each for all segments (per ``FRAME_QUERY_RANGE_BATCH_SIZE`` merged
+    frame ranges), plus one query for videos that are not cached on the segments. Frames are
+    assigned to the segments in Python; frame paths are derived from one frame directory
+    lookup per video instead of one per frame.
+
+    Returns:
+        Dict[int, dict]: Payload per segment id.
+    """
+    from endoreg_db.serializers import ImageClassificationAnnotationSerializer
+
+    segments = [segment for segment in segments if segment.pk is not None]
+    linked = [segment for segment in segments if segment.video_file_id]
+    videos = _segment_videos(linked)
+    for segment in linked:
+        if segment.video_file_id in videos:
+            segment.video_file = videos[segment.video_file_id]  # start_time/end_time use the video's fps
+
+    payloads = {
+        segment.pk: {
+            "segment_id": segment.id,
+            "segment_start": segment.start_frame_number,
+            "segment_end": segment.end_frame_number,
+            "start_time": segment.start_time,
+            "end_time": segment.end_time,
+            "frames": [],
+        }
+        for segment in segments
+    }
+    if not linked:
+        return payloads
+
+    frame_dirs = {video_id: video.get_frame_dir_path() for video_id, video in videos.items()}
+
+    frames_by_video = defaultdict(list)
+    for frame_ranges in _batched_frame_ranges(linked):
+        for frame in Frame.objects.filter(frame_ranges).order_by("video_id", "frame_number"):
+            frames_by_video[frame.video_id].append(frame)
+
+    frame_numbers = {video_id: [frame.frame_number for frame in frames] for video_id, frames in frames_by_video.items()}
+    segment_frames = {}
+    for segment in linked:
+        frames = frames_by_video.get(segment.video_file_id, [])
+        numbers = frame_numbers.get(segment.video_file_id, [])
+        first = bisect_left(numbers, segment.start_frame_number)
+        last = bisect_left(numbers, segment.end_frame_number)
+        segment_frames[segment.pk] = frames[first:last]
+    covered_frames = {frame.pk: frame for frames in segment_frames.values() for frame in frames}
+
+    annotations_by_frame = defaultdict(list)
+    annotations = []
+    for frame_ranges in _batched_frame_ranges(linked, prefix="frame__"):
+        annotations += (
+            ImageClassificationAnnotation.objects.filter(frame_ranges)
+            .select_related("label")
+            .order_by("pk")
+        )
+    for annotation in annotations:
+        annotations_by_frame[annotation.frame_id].append(annotation)
+    source_types = _source_type_names({a.information_source_id for a in annotations if a.information_source_id})
+
+    frame_payloads: Dict[int, dict] = {}
+    for frame in covered_frames.values():
+        frame_annotations = annotations_by_frame.get(frame.pk, [])
+        for annotation in frame_annotations:
+            annotation.frame = frame  # avoids a query per annotation for frame_number
+        predictions = [a for a in frame_annotations if "prediction" in source_types.get(a.information_source_id, ())]
+        manual = [a for a in frame_annotations if "manual_annotation" in source_types.get(a.information_source_id, ())]
+
+        file_path = frame_dirs[frame.video_id] / frame.relative_path
+        frame_payloads[frame.pk] = {
+            "frame_filename": file_path.name,
+            "frame_file_path": _media_relpath_from_file_path(file_path),
+            "frame_url": _media_url_from_file_path(file_path, request=request),
+            "all_classifications": ImageClassificationAnnotationSerializer(frame_annotations, many=True).data,
+            "predictions": ImageClassificationAnnotationSerializer(predictions, many=True).data,
+            "frame_id": frame.id,
+            "manual_annotations": ImageClassificationAnnotationSerializer(manual, many=True).data,
+        }
+
+    for segment in linked:
+        payloads[segment.pk]["frames"] = [frame_payloads[frame.pk] for frame in segment_frames[segment.pk]]
+    return payloads
+
+
+def get_segment_frame_payload(segment: "LabelVideoSegment", request=None) -> Optional[dict]:
+    """Builds the ``time_segments`` payload of a single segment (see ``build_segment_frame_payloads``)."""
+    return build_segment_frame_payloads([segment], request=request).get(segment.pk)
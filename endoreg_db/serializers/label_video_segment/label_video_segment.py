@@ -1,9 +1,6 @@
 from rest_framework import serializers
 from typing import List
 from django.core.exceptions import ObjectDoesNotExist
-from django.conf import settings
-from urllib.parse import urljoin
-from pathlib import Path
 
 from ...models import LabelVideoSegment, VideoFile
 import logging
@@ -18,6 +15,12 @@ from ._lvs_create import (
 from ._lvs_update import (
     _update,
 )
+from ._lvs_frames import (
+    _media_relpath_from_file_path,
+    _media_url_from_file_path,
+    build_segment_frame_payloads,
+    get_segment_frame_payload,
+)
 from ._lvs_validate import (
     _validate,
     _extract_and_validate_basic_attrs,
@@ -31,39 +34,18 @@ from endoreg_db.serializers import ImageClassificationAnnotationSerializer
 
 logger = logging.getLogger(__name__)
 
-# add these small helpers (could be private functions in this module)
-def _media_relpath_from_file_path(file_path) -> str:
-    """
-    Return a media-relative path (never an absolute server path).
-    If MEDIA_ROOT is a prefix, strip it; otherwise return the basename.
-    Accepts str or Path-like.
-    """
-    p = Path(str(file_path))
-    media_root = getattr(settings, "MEDIA_ROOT", None)
-    if media_root:
-        try:
-            rel = p.resolve().relative_to(Path(media_root).resolve())
-            return rel.as_posix()
-        except Exception:
-            pass
-    return p.name  # safe fallback
+class LabelVideoSegmentListSerializer(serializers.ListSerializer):
+    """Builds the frame payloads (``time_segments``) of all serialized segments in one batch."""
 
-def _media_url_from_file_path(file_path, request=None) -> str:
-    """
-    Build a public URL for the file using MEDIA_URL + relpath.
-    If `request` is provided, return an absolute URL.
-    """
-    base = getattr(settings, "MEDIA_URL", "/media/")
-    if not base.endswith("/"):
-        base += "/"
-    rel = _media_relpath_from_file_path(file_path)
-    url = urljoin(base, rel)
-    if request is not None:
+    def to_representation(self, data):
+        segments = list(data.all() if hasattr(data, "all") else data)
+        self.child._frame_payloads = build_segment_frame_payloads(
+            segments, request=self.context.get("request")
+        )
         try:
-            return request.build_absolute_uri(url)
-        except Exception:
-            pass
-    return url
+            return super().to_representation(segments)
+        finally:
+            self.child._frame_payloads = None
 
 
 class LabelVideoSegmentSerializer(serializers.ModelSerializer):
@@ -125,6 +107,7 @@ class LabelVideoSegmentSerializer(serializers.ModelSerializer):
             "time_segments"
         ]
         read_only_fields = ['id', 'video_name']
+        list_serializer_class = LabelVideoSegmentListSerializer
         extra_kwargs = {
             'start_frame_number': {'required': False},
             'end_frame_number': {'required': False},
@@ -142,44 +125,18 @@ class LabelVideoSegmentSerializer(serializers.ModelSerializer):
             logger.debug(f"Serializer initialized with data: {self.initial_data}")
 
 
-    def get_time_segments(self, obj: LabelVideoSegment) -> List[dict]:
-        frames = obj.frames
-        time_segments = {
-            "segment_id": obj.id,
-            "segment_start": obj.start_frame_number,
-            "segment_end": obj.end_frame_number,
-            "start_time": obj.start_time,
-            "end_time": obj.end_time,
-            "frames": []
-        }
+    def get_time_segments(self, obj: LabelVideoSegment) -> dict:
+        """
+        Return the segment's frames with their file path, URL and classification annotations.
 
+        Frames and annotations are fetched in bulk (see ``build_segment_frame_payloads``);
+        with ``many=True`` once for all serialized segments.
+        """
+        payloads = getattr(self, "_frame_payloads", None)
+        if payloads and obj.pk in payloads:
+            return payloads[obj.pk]
         request = self.context.get("request") if hasattr(self, "context") else None
-
-        for frame in frames:
-            all_classifications = ImageClassificationAnnotationSerializer(
-                frame.image_classification_annotations.all(), many=True
-            ).data
-            predictions = ImageClassificationAnnotationSerializer(frame.predictions, many=True).data
-            manual_annotations = ImageClassificationAnnotationSerializer(
-                frame.manual_annotations, many=True
-            ).data if frame.has_manual_annotations else []
-
-            # 👇 changed here: no absolute server path; give a media-relative path + a URL
-            rel = _media_relpath_from_file_path(frame.file_path)
-            url = _media_url_from_file_path(frame.file_path, request=request)
-
-            frame_data = {
-                "frame_filename": Path(str(frame.file_path)).name,
-                "frame_file_path": rel,            # backwards-compatible, now relative
-                "frame_url": url,                  # new: what the frontend should use
-                "all_classifications": all_classifications,
-                "predictions": predictions,
-                "frame_id": frame.id,
-                "manual_annotations": manual_annotations
-            }
-            time_segments["frames"].append(frame_data)
-
-        return time_segments
+        return get_segment_frame_payload(obj, request=request)
 
     def get_label_name(self, obj):# -> Any | Literal['unknown']:
         """
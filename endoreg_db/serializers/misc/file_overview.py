@@ -29,6 +29,8 @@ class FileOverviewSerializer(serializers.Serializer):
         
         For VideoFile instances, extracts and structures metadata such as patient, examination, equipment, and examiner information, and generates an anonymized version of the text by replacing sensitive fields with placeholders. For RawPdfFile instances, extracts text and anonymized text directly and determines statuses based on available fields.
         
+        Statuses use the ``has_validated_segments`` / ``anonymized_text_length`` annotations when the queryset provides them. With ``include_text=False`` in the context (or deferred text fields), text and anonymizedText are empty.
+        
         Parameters:
             instance: A VideoFile or RawPdfFile object to be serialized.
         
@@ -40,6 +42,8 @@ class FileOverviewSerializer(serializers.Serializer):
         """
         text = ""
         anonym_text = ""
+        include_text = self.context.get("include_text", True)
+        deferred = instance.get_deferred_fields()
         
         if isinstance(instance, VideoFile):
             media_type = "video"
@@ -53,13 +57,13 @@ class FileOverviewSerializer(serializers.Serializer):
             anonym_status = vs.anonymization_status
             
             # ------- annotation status (validated label segments)
-            if instance.label_video_segments.filter(state__is_validated=True).exists():
-                annot_status = "done"
-            else:
-                annot_status = "not_started"
+            has_validated_segments = getattr(instance, "has_validated_segments", None)
+            if has_validated_segments is None:
+                has_validated_segments = instance.label_video_segments.filter(state__is_validated=True).exists()
+            annot_status = "done" if has_validated_segments else "not_started"
             
             # ------- Extract text from sensitive_meta for videos
-            if instance.sensitive_meta:
+            if include_text and instance.sensitive_meta:
                 sm = instance.sensitive_meta
                 # Create a structured text representation from sensitive meta
                 text_parts = []
@@ -126,14 +130,21 @@ class FileOverviewSerializer(serializers.Serializer):
             media_type = "pdf"
             created_at = instance.date_created
             filename = instance.file.name.split("/")[-1] if instance.file else "unknown"
-            # Check anonymized_text field
-            anonym_status = "done" if (instance.anonymized_text and instance.anonymized_text.strip()) else "not_started"
+            # Check anonymized_text field (or its annotated length if the text is deferred)
+            anonymized_text_length = getattr(instance, "anonymized_text_length", None)
+            if anonymized_text_length is not None or "anonymized_text" in deferred:
+                has_anonymized_text = bool(anonymized_text_length)
+            else:
+                has_anonymized_text = bool(instance.anonymized_text and instance.anonymized_text.strip())
+            anonym_status = "done" if has_anonymized_text else "not_started"
             # PDF annotation == "sensitive meta validated"
             annot_status = "done" if getattr(instance.sensitive_meta, "is_verified", False) else "not_started"
             
             # Extract text content from PDF
-            text = instance.text or ""
-            anonym_text = instance.anonymized_text or ""
+            if include_text and "text" not in deferred:
+                text = instance.text or ""
+            if include_text and "anonymized_text" not in deferred:
+                anonym_text = instance.anonymized_text or ""
 
         else:  # shouldn't happen
             raise TypeError(f"Unsupported instance for overview: {type(instance)}")
@@ -184,11 +184,21 @@ class VideoFileSerializer(serializers.ModelSerializer):
         sequences = self.get_sequences(obj)
         return list(sequences.keys()) if sequences else []
 
+    def _expand_frames(self) -> bool:
+        """
+        Return True if per-frame entries were requested (``?expand=frames`` or ``expand_frames`` in the context).
+        """
+        if self.context.get("expand_frames"):
+            return True
+        request = self.context.get("request")
+        query_params = getattr(request, "query_params", None) or getattr(request, "GET", {})
+        return "frames" in str(query_params.get("expand", "")).split(",")
+
     def get_label_time_segments(self, obj:"Video"):
         """
-        Convert frame sequences for each label into time segments with frame-level metadata.
+        Convert frame sequences for each label into time segments.
         
-        For each label in the video, this method generates a list of time segments based on frame index ranges, converting them to seconds using the video's FPS. Each segment includes the raw frame indices, start and end times in seconds, and detailed information for each frame in the segment, such as filename, full file path, and a placeholder for predictions.
+        For each label in the video, this method generates a list of time segments based on frame index ranges, converting them to seconds using the video's FPS. Each segment is a compact range descriptor with the raw frame indices, start and end times in seconds and the number of frames, so the payload size does not grow with the video length. Frames are fetched page by page from ``/api/videos/<id>/frames/``; with ``?expand=frames`` each segment additionally includes the former per-frame entries (filename, full file path and a placeholder for predictions).
         
         Returns:
             dict: A dictionary mapping each label to its list of time segments and associated frame metadata.
@@ -209,7 +219,8 @@ class VideoFileSerializer(serializers.ModelSerializer):
                 })
 
         sequences = self.get_sequences(obj)  # Fetch sequence data
-        frame_dir = Path(obj.frame_dir)  # Get the correct directory from the model
+        expand_frames = self._expand_frames()
+        frame_dir = Path(obj.frame_dir) if expand_frames else None  # Get the correct directory from the model
         time_segments = {}  # Dictionary to store converted times and frame predictions
 
         for label, frame_ranges in sequences.items():
@@ -224,34 +235,34 @@ class VideoFileSerializer(serializers.ModelSerializer):
                 start_time = start_frame / fps  # Convert frame index to seconds
                 end_time = end_frame / fps  # Convert frame index to seconds
 
-                frame_data = {}  # Store frame-wise info
-
-                # Fetch predictions for frames within this range
-                for frame_num in range(start_frame, end_frame + 1):
-
-                        frame_filename = f"frame_{str(frame_num).zfill(7)}.jpg"  # Frame filename format
-                        frame_path = (
-                            frame_dir / frame_filename
-                        )  # Full path to the frame
-
-                        frame_data[frame_num] = {
-                            "frame_filename": frame_filename,
-                            "frame_file_path": str(frame_path),
-                            "predictions": None,
-                        }
+                time_range = {
+                    "segment_start": start_frame,  # Raw start frame (not divided by FPS)
+                    "segment_end": end_frame,  # Raw end frame (not divided by FPS)
+                    "start_time": round(
+                        start_time, 2
+                    ),  # Converted start time in seconds
+                    "end_time": round(end_time, 2),  # Converted end time in seconds
+                    "frame_count": end_frame - start_frame + 1,  # prediction sequences are inclusive
+                }
+
+                if expand_frames:
+                    frame_data = {}  # Store frame-wise info
+                    for frame_num in range(start_frame, end_frame + 1):
+
+                            frame_filename = f"frame_{str(frame_num).zfill(7)}.jpg"  # Frame filename format
+                            frame_path = (
+                                frame_dir / frame_filename
+                            )  # Full path to the frame
+
+                            frame_data[frame_num] = {
+                                "frame_filename": frame_filename,
+                                "frame_file_path": str(frame_path),
+                                "predictions": None,
+                            }
+                    time_range["frames"] = frame_data  # Attach frame details
 
                 # Append the converted time segment
-                label_times.append(
-                    {
-                        "segment_start": start_frame,  # Raw start frame (not divided by FPS)
-                        "segment_end": end_frame,  # Raw end frame (not divided by FPS)
-                        "start_time": round(
-                            start_time, 2
-                        ),  # Converted start time in seconds
-                        "end_time": round(end_time, 2),  # Converted end time in seconds
-                        "frames": frame_data,  # Attach frame details
-                    }
-                )
+                label_times.append(time_range)
 
             # Store time segments and frame_predictions under the label
             time_segments[label] = {
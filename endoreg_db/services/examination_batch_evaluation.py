@@ -0,0 +1,125 @@
+"""
+Bulk evaluation of requirement sets over many patient examinations.
+
+``evaluate_examination`` and ``RequirementSet.evaluate`` handle one input at a time and
+resolve its links with a dozen queries each. Auditing a quality indicator over a year
+of examinations therefore costs thousands of evaluations and tens of thousands of
+queries.
+
+``evaluate_examinations`` loads examinations in chunks with everything their
+``.links`` need prefetched (a fixed number of queries per chunk), takes the
+requirement side from the cached evaluation plan and evaluates every requested set for
+every examination without further queries. Linked sets shared between the requested
+sets are evaluated once per examination. Results are returned as a boolean matrix
+(examinations x requirement sets).
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+from django.db.models import Prefetch, QuerySet
+
+from endoreg_db.models.medical.patient.patient_examination import PatientExamination
+from endoreg_db.models.medical.patient.patient_finding import PatientFinding
+from endoreg_db.models.requirement.requirement_evaluation.evaluation_plan import (
+    evaluate_requirement_set_plan,
+    get_evaluation_plan,
+    input_links_memo,
+    memoized_input,
+)
+from endoreg_db.models.requirement.requirement_set import RequirementSet
+
+DEFAULT_BATCH_CHUNK_SIZE = 500
+
+
+def prefetch_for_evaluation(queryset: QuerySet[PatientExamination]) -> QuerySet[PatientExamination]:
+    """Adds the select/prefetch clauses that make ``.links`` of examinations and their findings query-free."""
+    findings = PatientFinding.objects.select_related("finding").prefetch_related(
+        "classifications__classification",
+        "classifications__classification_choice",
+        "interventions__intervention",
+    )
+    return queryset.select_related("patient", "examination").prefetch_related(
+        "indications__examination_indication",
+        "indications__indication_choice",
+        "patient__lab_values",
+        Prefetch("patient_findings", queryset=findings),
+    )
+
+
+@dataclass(frozen=True)
+class ExaminationEvaluationMatrix:
+    """Boolean results of ``requirement_set_ids`` (columns) for ``examination_ids`` (rows)."""
+
+    examination_ids: np.ndarray
+    requirement_set_ids: np.ndarray
+    results: np.ndarray
+
+    def for_examination(self, examination_id: int) -> Dict[int, bool]:
+        """Returns ``{requirement_set_id: satisfied}`` for one examination."""
+        row = int(np.flatnonzero(self.examination_ids == examination_id)[0])
+        return dict(zip(self.requirement_set_ids.tolist(), self.results[row].tolist()))
+
+    def satisfied_fraction(self) -> Dict[int, float]:
+        """Returns the fraction of examinations that satisfy each requirement set."""
+        if not len(self.examination_ids):
+            return {set_id: 0.0 for set_id in self.requirement_set_ids.tolist()}
+        return dict(zip(self.requirement_set_ids.tolist(), self.results.mean(axis=0).tolist()))
+
+
+def _evaluation_input(examination: PatientExamination) -> PatientExamination:
+    # RequirementSet._get_evaluation_input_for_requirement looks up the examination's
+    # findings in the memo; hand it the prefetched queryset instead of a new query
+    memoized_input(("patient_findings", examination.pk), examination.patient_findings.all)
+    return examination
+
+
+def evaluate_examinations(
+    examinations: QuerySet[PatientExamination],
+    requirement_sets: Optional[Iterable[Union[RequirementSet, int]]] = None,
+    chunk_size: int = DEFAULT_BATCH_CHUNK_SIZE,
+) -> ExaminationEvaluationMatrix:
+    """
+    Evaluates requirement sets for every examination of a queryset.
+
+    Args:
+        examinations: PatientExaminations to evaluate; prefetches are added here.
+        requirement_sets: RequirementSets (or their ids) to evaluate. Defaults to all sets.
+        chunk_size: Number of examinations loaded (and prefetched) at a time.
+
+    Returns:
+        ExaminationEvaluationMatrix with one row per examination, in queryset order,
+        and one column per requirement set. For acyclic set links each entry equals
+        ``requirement_set.evaluate(examination)``.
+    """
+    plan = get_evaluation_plan()
+    if requirement_sets is None:
+        set_ids = list(plan.requirement_sets)
+    else:
+        set_ids = [rs.pk if isinstance(rs, RequirementSet) else int(rs) for rs in requirement_sets]
+        if any(set_id not in plan.requirement_sets for set_id in set_ids):
+            plan = get_evaluation_plan(refresh=True)
+    set_plans = [plan.requirement_sets[set_id] for set_id in set_ids]
+
+    examination_ids: List[int] = []
+    rows: List[np.ndarray] = []
+    for examination in prefetch_for_evaluation(examinations).iterator(chunk_size=chunk_size):
+        # One memo per examination: links are resolved once, linked sets evaluated once
+        set_results: Dict[int, bool] = {}
+        row = np.zeros(len(set_plans), dtype=bool)
+        with input_links_memo():
+            evaluation_input = _evaluation_input(examination)
+            for column, set_plan in enumerate(set_plans):
+                row[column] = evaluate_requirement_set_plan(plan, set_plan, evaluation_input, _results=set_results)
+        examination_ids.append(examination.pk)
+        rows.append(row)
+
+    results = np.vstack(rows) if rows else np.zeros((0, len(set_plans)), dtype=bool)
+    return ExaminationEvaluationMatrix(
+        examination_ids=np.asarray(examination_ids, dtype=np.int64),
+        requirement_set_ids=np.asarray(set_ids, dtype=np.int64),
+        results=results,
+    )
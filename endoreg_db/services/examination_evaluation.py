@@ -6,6 +6,11 @@ from django.db.models import Prefetch
 from endoreg_db.schemas.examination_evaluation import ExaminationEvalReport, RequirementSetEval, RequirementEval
 from endoreg_db.models.medical.patient.patient_examination import PatientExamination
 from endoreg_db.models.requirement.requirement_set import RequirementSet
+from endoreg_db.models.requirement.requirement_evaluation.evaluation_plan import (
+    RequirementEvaluationPlan,
+    get_evaluation_plan,
+    input_links_memo,
+)
 import endoreg_db.services.lookup_service
 
 def _get_requirement_sets_for_exam(exam: PatientExamination) -> List[RequirementSet]:
@@ -41,11 +46,22 @@ def _reduce_bools(bools: List[bool], set_type_name: str | None) -> bool:
     func = REQUIREMENT_SET_TYPE_FUNCTION_LOOKUP.get(set_type_name or "all", all)
     return bool(func(bools))
 
-def _eval_set_tree(root: RequirementSet, input_object, visited: Set[int]) -> RequirementSetEval:
+def _eval_set_tree(
+    root: RequirementSet, input_object, visited: Set[int], plan: RequirementEvaluationPlan | None = None
+) -> RequirementSetEval:
     """
     Recursively evaluate a RequirementSet node and linked children.
     Protect against cycles with visited set.
+    Requirements and linked sets are taken from the cached evaluation plan, not queried per node;
+    a set missing from the plan (e.g. created by another process) triggers one recompilation.
     """
+    if plan is None:
+        plan = get_evaluation_plan()
+    if root.pk not in plan.requirement_sets:
+        plan = get_evaluation_plan(refresh=True)
+    set_plan = plan.requirement_sets[root.pk]
+    root = set_plan.requirement_set
+
     if root.pk in visited:
         # Cycle detected -> treat as already evaluated (neutral element for AND is True; but better: skip node)
         # We skip to avoid infinite recursion; AND/OR exact treatment depends on your business semantics.
@@ -62,7 +78,8 @@ def _eval_set_tree(root: RequirementSet, input_object, visited: Set[int]) -> Req
 
     # Evaluate direct requirements
     req_evals: List[RequirementEval] = []
-    for r in root.requirements.all():
+    for requirement_id in set_plan.requirement_ids:
+        r = plan.requirements[requirement_id].requirement
         ok, msg = _eval_requirement(r, input_object)
         req_evals.append(
             RequirementEval(
@@ -76,8 +93,9 @@ def _eval_set_tree(root: RequirementSet, input_object, visited: Set[int]) -> Req
 
     # Evaluate linked sets
     child_evals: List[RequirementSetEval] = []
-    for child in root.links_to_sets.all():
-        child_evals.append(_eval_set_tree(child, input_object, visited))
+    for child_id in set_plan.linked_set_ids:
+        child = plan.requirement_sets[child_id].requirement_set
+        child_evals.append(_eval_set_tree(child, input_object, visited, plan))
 
     # Combine booleans
     bools = [re.satisfied for re in req_evals] + [ce.is_satisfied for ce in child_evals]
@@ -135,7 +153,11 @@ def evaluate_examination(request: dict) -> ExaminationEvalReport:
     sets = _get_requirement_sets_for_exam(exam)
 
     visited: Set[int] = set()
-    set_evals: List[RequirementSetEval] = [_eval_set_tree(s, exam, visited) for s in sets]
+    plan = get_evaluation_plan()
+    if any(s.pk not in plan.requirement_sets for s in sets):
+        plan = get_evaluation_plan(refresh=True)
+    with input_links_memo():
+        set_evals: List[RequirementSetEval] = [_eval_set_tree(s, exam, visited, plan) for s in sets]
 
     # Aggregate summary
     overall = all(se.is_satisfied for se in set_evals) if set_evals else True
@@ -1,11 +1,14 @@
 # services/lookup_service.py
 from __future__ import annotations
 from typing import Dict, Any, List
+from django.core.cache import cache
 from django.db.models import Prefetch
 from endoreg_db.models.medical.patient.patient_examination import PatientExamination
 from endoreg_db.models.medical.examination import ExaminationRequirementSet
+from endoreg_db.models.requirement.requirement_evaluation.evaluation_plan import get_evaluation_plan
 from endoreg_db.models.requirement.requirement_set import RequirementSet
-from .lookup_store import LookupStore
+from .lookup_store import DEFAULT_TTL_SECONDS, LookupStore
+from .requirement_dependencies import affected_requirement_ids, changed_input_ids, examination_input_state
 
 
 def load_patient_exam_for_eval(pk: int) -> PatientExamination:
@@ -117,15 +120,42 @@ def create_lookup_token_for_pe(pe_id: int) -> str:
     token = LookupStore().init(build_initial_lookup(pe))
     return token
 
-def recompute_lookup(token: str) -> Dict[str, Any]:
+
+def _lookup_delta(previous: Dict[str, Any], current: Dict[str, Any]) -> Dict[str, Dict[Any, Any]]:
+    """
+    Returns the entries of ``current`` that differ from ``previous``, per top-level key.
+
+    Entries that no longer exist are reported as None; keys without changes are omitted.
+    """
+    delta: Dict[str, Dict[Any, Any]] = {}
+    for key, entries in current.items():
+        old_entries = previous.get(key) or {}
+        changed = {k: v for k, v in entries.items() if k not in old_entries or old_entries[k] != v}
+        changed.update({k: None for k in old_entries if k not in entries})
+        if changed:
+            delta[key] = changed
+    return delta
+
+
+def recompute_lookup(token: str, full: bool = False) -> Dict[str, Any]:
+    """
+    Re-evaluates the requirements of the selected sets and stores the derived data.
+
+    The rows the evaluation depends on (findings, classifications, lab values, ...) are
+    recorded per token. Subsequent calls re-evaluate only the requirements that depend
+    on changed rows (see ``services.requirement_dependencies``) plus requirements not
+    evaluated before, and return only the changed entries per derived key (removed
+    entries as None). If the requirement definitions changed since the last call (the
+    evaluation plan's version differs), all requirements are evaluated again. ``full=True`` re-evaluates everything and returns the complete
+    derived data.
+    """
     import logging
     logger = logging.getLogger(__name__)
     
     store = LookupStore(token=token)
     
     # Simple reentrancy guard using data
-    data = store.get_all()
-    if data.get('_recomputing'):
+    if store.get('_recomputing'):
         logger.warning(f"Recompute already in progress for token {token}, skipping")
         return {}
     
@@ -165,6 +195,21 @@ def recompute_lookup(token: str) -> Dict[str, Any]:
         rs_objs = [rs for rs in requirement_sets_for_patient_exam(pe) if rs.id in selected_rs_ids]
         logger.debug(f"Found {len(rs_objs)} requirement set objects for token {token}")
 
+        # 0) which requirements have to be evaluated again
+        input_state = examination_input_state(pe)
+        plan = get_evaluation_plan()
+        previous_state = None if full else cache.get(store.input_state_key)
+        previous_status: Dict[str, bool] = data.get("requirementStatus") or {}
+        requirement_ids = {r.id for rs in rs_objs for r in rs.requirements.all()}
+        if previous_state is None or cache.get(store.plan_version_key) != plan.version:
+            stale_ids = requirement_ids
+        else:
+            changed = changed_input_ids(previous_state, input_state)
+            logger.debug(f"Changed input rows for token {token}: {changed}")
+            stale_ids = affected_requirement_ids(plan, requirement_ids, changed)
+            stale_ids |= {r_id for r_id in requirement_ids if str(r_id) not in previous_status}
+        logger.debug(f"Evaluating {len(stale_ids)} of {len(requirement_ids)} requirements for token {token}")
+
         # 1) requirements grouped by set (already prefetched in load func)
         requirements_by_set = {
             rs.id: [ {"id": r.id, "name": r.name} for r in rs.requirements.all() ]
@@ -177,20 +222,29 @@ def recompute_lookup(token: str) -> Dict[str, Any]:
         for rs in rs_objs:
             req_results = []
             for r in rs.requirements.all():
-                ok = bool(r.evaluate(pe, mode="strict"))  # or "loose" if you prefer
-                requirement_status[str(r.id)] = ok
-                req_results.append(ok)
+                if str(r.id) not in requirement_status:
+                    if r.id in stale_ids:
+                        requirement_status[str(r.id)] = bool(r.evaluate(pe, mode="strict"))  # or "loose" if you prefer
+                    else:
+                        requirement_status[str(r.id)] = previous_status[str(r.id)]
+                req_results.append(requirement_status[str(r.id)])
             set_status[str(rs.id)] = rs.eval_function(req_results) if rs.eval_function else all(req_results)
 
         # 3) suggestions per requirement (defaults + classification choices you already expose)
         suggested_actions: Dict[str, List[Dict[str, Any]]] = {}
         req_defaults: Dict[str, Any] = {}
         cls_choices: Dict[str, Any] = {}
+        previous_defaults = data.get("requirementDefaults") or {}
+        previous_choices = data.get("classificationChoices") or {}
 
         for rs in rs_objs:
             for r in rs.requirements.all():
-                defaults = getattr(r, "default_findings", lambda pe: [])(pe)  # [{finding_id, payload...}]
-                choices  = getattr(r, "classification_choices", lambda pe: [])(pe)  # [{classification_id, label,...}]
+                if r.id in stale_ids:
+                    defaults = getattr(r, "default_findings", lambda pe: [])(pe)  # [{finding_id, payload...}]
+                    choices  = getattr(r, "classification_choices", lambda pe: [])(pe)  # [{classification_id, label,...}]
+                else:
+                    defaults = previous_defaults.get(str(r.id))
+                    choices = previous_choices.get(str(r.id))
                 if defaults:
                     req_defaults[str(r.id)] = defaults
                 if choices:
@@ -227,15 +281,18 @@ def recompute_lookup(token: str) -> Dict[str, Any]:
         
         logger.debug(f"Updating store for token {token} with {len(updates)} update keys")
         
-        # Only write if changed (idempotent)
-        prev_derived = store.get_many(list(updates.keys()))
-        if prev_derived != updates:
-            store.set_many(updates)  # <-- does NOT call recompute
-            logger.debug(f"Derived data changed, updated store for token {token}")
+        # Only write keys that changed (idempotent)
+        prev_derived = {key: data.get(key) for key in updates}
+        delta = _lookup_delta(prev_derived, updates)
+        if delta:
+            store.set_many({key: updates[key] for key in delta})  # <-- does NOT call recompute
+            logger.debug(f"Derived data changed for token {token}: {sorted(delta)}")
         else:
             logger.debug(f"Derived data unchanged, skipping store update for token {token}")
+        cache.set(store.input_state_key, input_state, DEFAULT_TTL_SECONDS)
+        cache.set(store.plan_version_key, plan.version, DEFAULT_TTL_SECONDS)
         
         store.mark_recompute_done()
-        return updates
+        return updates if full else delta
     finally:
         store.set('_recomputing', False)
@@ -1,60 +1,227 @@
 # services/lookup_store.py
 from __future__ import annotations
+import time
 import uuid
-from typing import Any, Dict, Iterable, Optional
+from contextlib import contextmanager
+from typing import Any, Dict, Iterable, List, Optional
 from django.core.cache import cache
 from django.conf import settings
 
+from endoreg_db.config.env import env_str
+
 # Align TTL with Django cache TIMEOUT for consistency in tests and runtime
 try:
     DEFAULT_TTL_SECONDS = int(settings.CACHES.get('default', {}).get('TIMEOUT', 60 * 30))
 except Exception:
     DEFAULT_TTL_SECONDS = 60 * 30  # 30 minutes fallback
 
+# "blob": the whole lookup dict in one cache entry (lookup:<token>)
+# "fields": one cache entry per top-level key plus a key manifest
+LOOKUP_STORE_BACKEND = env_str("ENDOREG_LOOKUP_STORE_BACKEND", "blob")
+
+LOCK_TIMEOUT_SECONDS = 5  # a crashed writer blocks the token at most this long
+LOCK_WAIT_SECONDS = 2.0
+
+
+class LookupVersionConflict(Exception):
+    """Raised by a patch whose expected_version no longer matches the stored version."""
+
+    def __init__(self, token: str, expected: int, actual: int):
+        super().__init__(f"Lookup {token} is at version {actual}, expected {expected}")
+        self.expected = expected
+        self.actual = actual
+
+
+class LookupLockTimeout(Exception):
+    """Raised if the write lock of a lookup could not be acquired in time."""
+
+
+class _BlobBackend:
+    """Stores the lookup dict as a single cache entry; every write rewrites the whole dict."""
+
+    def __init__(self, cache_key: str):
+        self.cache_key = cache_key
+
+    def read_all(self) -> Optional[Dict[str, Any]]:
+        return cache.get(self.cache_key)
+
+    def read_many(self, keys: List[str]) -> Dict[str, Any]:
+        data = cache.get(self.cache_key) or {}
+        return {k: data[k] for k in keys if k in data}
+
+    def write_all(self, data: Dict[str, Any], ttl: int) -> None:
+        cache.set(self.cache_key, data, ttl)
+
+    def write_updates(self, updates: Dict[str, Any], ttl: int) -> None:
+        data = cache.get(self.cache_key) or {}
+        data.update(updates)
+        cache.set(self.cache_key, data, ttl)
+
+    def delete(self) -> None:
+        cache.delete(self.cache_key)
+
+
+class _FieldBackend:
+    """
+    Stores every top-level key of the lookup dict as its own cache entry.
+
+    ``<cache_key>:keys`` lists the stored keys. Reads fetch only the requested
+    entries; writes serialize only the changed values and refresh the TTL of the
+    others. A lookup written by the blob backend is read as is and split into
+    fields on its first write.
+    """
+
+    def __init__(self, cache_key: str):
+        self.cache_key = cache_key
+        self.keys_key = f"{cache_key}:keys"
+
+    def field_key(self, name: str) -> str:
+        return f"{self.cache_key}:f:{name}"
+
+    def read_all(self) -> Optional[Dict[str, Any]]:
+        names = cache.get(self.keys_key)
+        if names is None:
+            return cache.get(self.cache_key)
+        values = cache.get_many([self.field_key(n) for n in names])
+        return {n: values[self.field_key(n)] for n in names if self.field_key(n) in values}
+
+    def read_many(self, keys: List[str]) -> Dict[str, Any]:
+        values = cache.get_many([self.keys_key] + [self.field_key(k) for k in keys])
+        if self.keys_key not in values:
+            legacy = cache.get(self.cache_key) or {}
+            return {k: legacy[k] for k in keys if k in legacy}
+        return {k: values[self.field_key(k)] for k in keys if self.field_key(k) in values}
+
+    def write_all(self, data: Dict[str, Any], ttl: int) -> None:
+        stale = set(cache.get(self.keys_key) or []) - set(data)
+        if stale:
+            cache.delete_many([self.field_key(n) for n in stale])
+        cache.set_many({self.field_key(k): v for k, v in data.items()}, ttl)
+        cache.set(self.keys_key, sorted(data), ttl)
+        cache.delete(self.cache_key)
+
+    def write_updates(self, updates: Dict[str, Any], ttl: int) -> None:
+        names = cache.get(self.keys_key)
+        if names is None:
+            legacy = cache.get(self.cache_key)
+            if legacy is not None:
+                self.write_all({**legacy, **updates}, ttl)
+                return
+            names = []
+        cache.set_many({self.field_key(k): v for k, v in updates.items()}, ttl)
+        # Unchanged fields must not expire before the manifest
+        for name in names:
+            if name not in updates:
+                cache.touch(self.field_key(name), ttl)
+        cache.set(self.keys_key, sorted(set(names) | set(updates)), ttl)
+
+    def delete(self) -> None:
+        names = cache.get(self.keys_key) or []
+        cache.delete_many([self.field_key(n) for n in names] + [self.keys_key, self.cache_key])
+
+
+_BACKENDS = {
+    "blob": _BlobBackend,
+    "fields": _FieldBackend,
+}
+
+
 class LookupStore:
     """
     Server-side lookup dictionary stored in Django cache.
     Return a token to the client; later requests use that token to get/update parts.
+
+    Writes are serialized per token with a cache lock and bump a version counter;
+    ``patch(..., expected_version=...)`` rejects updates based on an outdated read.
     """
-    def __init__(self, token: Optional[str] = None):
+    def __init__(self, token: Optional[str] = None, backend: Optional[str] = None):
         self.token = token or uuid.uuid4().hex
+        self.backend = backend or LOOKUP_STORE_BACKEND
+        if self.backend not in _BACKENDS:
+            raise ValueError(f"Unknown lookup store backend {self.backend!r}, expected one of {sorted(_BACKENDS)}")
+        self._storage = _BACKENDS[self.backend](self.cache_key)
 
     @property
     def cache_key(self) -> str:
         return f"lookup:{self.token}"
 
+    @property
+    def version_key(self) -> str:
+        return f"{self.cache_key}:version"
+
+    @property
+    def input_state_key(self) -> str:
+        """Input rows of the last recompute (see ``lookup_service.recompute_lookup``)."""
+        return f"{self.cache_key}:inputs"
+
+    @property
+    def plan_version_key(self) -> str:
+        """Evaluation plan version of the last recompute."""
+        return f"{self.cache_key}:plan_version"
+
+    @contextmanager
+    def lock(self):
+        """Holds the write lock of this token (``cache.add`` is atomic on all cache backends)."""
+        lock_key = f"{self.cache_key}:lock"
+        owner = uuid.uuid4().hex
+        deadline = time.monotonic() + LOCK_WAIT_SECONDS
+        while not cache.add(lock_key, owner, LOCK_TIMEOUT_SECONDS):
+            if time.monotonic() > deadline:
+                raise LookupLockTimeout(f"Could not lock lookup {self.token}")
+            time.sleep(0.005)
+        try:
+            yield
+        finally:
+            if cache.get(lock_key) == owner:
+                cache.delete(lock_key)
+
     def init(self, initial: Optional[Dict[str, Any]] = None, ttl: int = DEFAULT_TTL_SECONDS) -> str:
-        cache.set(self.cache_key, initial or {}, ttl)
+        with self.lock():
+            self._storage.write_all(initial or {}, ttl)
+            cache.set(self.version_key, 1, ttl)
+            # Recompute state belongs to the previous data of this token
+            cache.delete_many([self.input_state_key, self.plan_version_key])
         return self.token
 
+    def get_version(self) -> int:
+        return cache.get(self.version_key, 0)
+
     def get_all(self) -> Dict[str, Any]:
-        return cache.get(self.cache_key, {})
+        return self._storage.read_all() or {}
 
     def get_many(self, keys: Iterable[str]) -> Dict[str, Any]:
-        data = self.get_all()
-        return {k: data.get(k) for k in keys}
+        keys = list(keys)
+        found = self._storage.read_many(keys)
+        return {k: found.get(k) for k in keys}
 
-    def set_many(self, updates: Dict[str, Any], ttl: int = DEFAULT_TTL_SECONDS) -> None:
-        data = self.get_all()
-        data.update(updates)
-        cache.set(self.cache_key, data, ttl)
+    def set_many(self, updates: Dict[str, Any], ttl: int = DEFAULT_TTL_SECONDS) -> int:
+        return self.patch(updates, ttl)
 
     def get(self, key: str, default: Any = None) -> Any:
-        return self.get_all().get(key, default)
+        return self._storage.read_many([key]).get(key, default)
 
-    def set(self, key: str, value: Any, ttl: int = DEFAULT_TTL_SECONDS) -> None:
-        data = self.get_all()
-        data[key] = value
-        cache.set(self.cache_key, data, ttl)
+    def set(self, key: str, value: Any, ttl: int = DEFAULT_TTL_SECONDS) -> int:
+        return self.patch({key: value}, ttl)
 
     def delete(self) -> None:
-        cache.delete(self.cache_key)
-        
-    def patch(self, updates: Dict[str, Any], ttl: int = DEFAULT_TTL_SECONDS) -> None:
-        """Patch existing data with updates."""
-        data = self.get_all()
-        data.update(updates)
-        cache.set(self.cache_key, data, ttl)
+        self._storage.delete()
+        cache.delete_many([self.version_key, self.input_state_key, self.plan_version_key])
+
+    def patch(self, updates: Dict[str, Any], ttl: int = DEFAULT_TTL_SECONDS, expected_version: Optional[int] = None) -> int:
+        """
+        Patch existing data with updates and return the new version.
+
+        Raises LookupVersionConflict if expected_version is given and the lookup was
+        changed in the meantime.
+        """
+        with self.lock():
+            version = self.get_version()
+            if expected_version is not None and expected_version != version:
+                raise LookupVersionConflict(self.token, expected_version, version)
+            self._storage.write_updates(updates, ttl)
+            version += 1
+            cache.set(self.version_key, version, ttl)
+        return version
         
 
     def validate_and_recover_data(self, token):
@@ -98,15 +265,11 @@ class LookupStore:
     
     def should_recompute(self, token):
         """Check if recomputation is needed based on data freshness"""
-        data = self.get_all()
-        if not data:
-            return True
-            
         # Check if we have a last_recompute timestamp
-        last_recompute = data.get('_last_recompute')
+        last_recompute = self.get('_last_recompute')
         if not last_recompute:
             return True
-            
+
         # Only recompute if it's been more than 30 seconds since last recompute
         # This prevents excessive recomputation while allowing for updates
         from datetime import datetime, timedelta
@@ -115,7 +278,7 @@ class LookupStore:
             return datetime.now() - last_recompute_time > timedelta(seconds=30)
         except (ValueError, TypeError):
             return True
-    
+
     def mark_recompute_done(self):
         """Mark that recomputation has been completed"""
         from datetime import datetime
@@ -9,7 +9,6 @@ import logging
 import shutil
 import sys
 import os
-import hashlib
 from pathlib import Path
 from typing import TYPE_CHECKING, Union
 from contextlib import contextmanager
@@ -18,6 +17,7 @@ from django.db import transaction
 from endoreg_db.models.media.pdf.raw_pdf import RawPdfFile
 from endoreg_db.models.state.raw_pdf import RawPdfState
 from endoreg_db.models import SensitiveMeta
+from endoreg_db.utils.hashs import get_file_hash
 from endoreg_db.utils.paths import PDF_DIR, STORAGE_DIR
 import time
 
@@ -101,16 +101,9 @@ class PdfImportService:
             except OSError:
                 pass
     
-    def _sha256(self, path: Path, chunk: int = 1024 * 1024) -> str:
+    def _sha256(self, path: Path) -> str:
         """Compute SHA256 hash of a file."""
-        h = hashlib.sha256()
-        with open(path, "rb") as f:
-            while True:
-                b = f.read(chunk)
-                if not b:
-                    break
-                h.update(b)
-        return h.hexdigest()
+        return get_file_hash(path)
     
     def _quarantine(self, source: Path) -> Path:
         """Move file to quarantine directory to prevent re-processing."""
@@ -0,0 +1,124 @@
+"""
+Dependencies of requirement results on the data of a patient examination.
+
+A requirement is evaluated against the examination's ``.links``; which parts of them
+matter follows from the requirement's own link fields (a requirement linking lab values
+looks at the patient's lab values, one linking classification choices at the finding
+classifications, ...). ``examination_input_state`` captures the rows of every such
+input category as ``{category: {row_id: row_values}}``; comparing two states yields
+the changed row ids per category, and ``affected_requirement_ids`` the requirements
+that have to be evaluated again.
+
+Operators are arbitrary callables, so dependencies are tracked per category rather
+than per row: a requirement is re-evaluated when any row of a category it depends on
+was added, removed or changed. Requirements without links or with links to patient
+data that is not captured here (diseases, events, medications) are always
+re-evaluated.
+"""
+
+from typing import Any, Dict, FrozenSet, Iterable, Mapping, Optional, Set
+
+from endoreg_db.models.medical.patient.patient_examination import PatientExamination
+from endoreg_db.models.medical.patient.patient_examination_indication import PatientExaminationIndication
+from endoreg_db.models.medical.patient.patient_finding import PatientFinding
+from endoreg_db.models.medical.patient.patient_finding_classification import PatientFindingClassification
+from endoreg_db.models.medical.patient.patient_finding_intervention import PatientFindingIntervention
+from endoreg_db.models.medical.patient.patient_lab_value import PatientLabValue
+from endoreg_db.models.requirement.requirement_evaluation.evaluation_plan import RequirementEvaluationPlan
+
+# Every requirement may look at the patient and the examination itself (gender, age, type)
+PATIENT = "patient"
+
+# Requirement link field -> input categories it depends on; None: not tracked
+LINK_FIELD_DEPENDENCIES: Dict[str, Optional[FrozenSet[str]]] = {
+    "examinations": frozenset(),
+    "examination_indications": frozenset({"indications"}),
+    "lab_values": frozenset({"lab_values"}),
+    "findings": frozenset({"patient_findings"}),
+    "finding_classifications": frozenset({"patient_findings", "finding_classifications"}),
+    "finding_classification_choices": frozenset({"patient_findings", "finding_classifications"}),
+    "finding_interventions": frozenset({"patient_findings", "finding_interventions"}),
+    "diseases": None,
+    "disease_classification_choices": None,
+    "events": None,
+    "medications": None,
+    "medication_indications": None,
+    "medication_intake_times": None,
+}
+
+InputState = Dict[str, Dict[int, tuple]]
+
+
+def examination_input_state(pe: PatientExamination) -> InputState:
+    """Returns the rows of every tracked input category of ``pe`` (one query per category)."""
+    patient = pe.patient
+    return {
+        PATIENT: {
+            pe.pk: (pe.examination_id, pe.date_start, patient.gender_id if patient else None, patient.dob if patient else None)
+        },
+        "patient_findings": _rows(
+            PatientFinding.objects.filter(patient_examination=pe), "finding_id", "is_active"
+        ),
+        "finding_classifications": _rows(
+            PatientFindingClassification.objects.filter(finding__patient_examination=pe),
+            "finding_id", "classification_id", "classification_choice_id", "is_active",
+        ),
+        "finding_interventions": _rows(
+            PatientFindingIntervention.objects.filter(finding__patient_examination=pe),
+            "finding_id", "intervention_id", "is_active", "state",
+        ),
+        "lab_values": _rows(
+            PatientLabValue.objects.filter(patient_id=pe.patient_id) if pe.patient_id else PatientLabValue.objects.none(),
+            "lab_value_id", "value", "value_str", "datetime",
+        ),
+        "indications": _rows(
+            PatientExaminationIndication.objects.filter(patient_examination=pe),
+            "examination_indication_id", "indication_choice_id",
+        ),
+    }
+
+
+def _rows(queryset, *fields: str) -> Dict[int, tuple]:
+    return {row[0]: tuple(row[1:]) for row in queryset.values_list("pk", *fields)}
+
+
+def changed_input_ids(previous: Mapping[str, Mapping[int, Any]], current: Mapping[str, Mapping[int, Any]]) -> Dict[str, Set[int]]:
+    """Returns the ids of rows added, removed or changed between two input states, per category."""
+    changed: Dict[str, Set[int]] = {}
+    for category in set(previous) | set(current):
+        old_rows = previous.get(category, {})
+        new_rows = current.get(category, {})
+        ids = {row_id for row_id in set(old_rows) | set(new_rows) if old_rows.get(row_id) != new_rows.get(row_id)}
+        if ids:
+            changed[category] = ids
+    return changed
+
+
+def requirement_dependencies(plan: RequirementEvaluationPlan, requirement_id: int) -> Optional[FrozenSet[str]]:
+    """Returns the input categories a requirement depends on, or None if it has to be evaluated on every change."""
+    requirement_plan = plan.requirements.get(requirement_id)
+    if requirement_plan is None:
+        return None
+    linked_fields = [field for field, ids in requirement_plan.link_ids.items() if ids]
+    if not linked_fields:
+        return None
+    categories: Set[str] = {PATIENT}
+    for field in linked_fields:
+        field_categories = LINK_FIELD_DEPENDENCIES.get(field)
+        if field_categories is None:
+            return None
+        categories |= field_categories
+    return frozenset(categories)
+
+
+def affected_requirement_ids(
+    plan: RequirementEvaluationPlan, requirement_ids: Iterable[int], changed_categories: Iterable[str]
+) -> Set[int]:
+    """Returns the requirements among ``requirement_ids`` whose result may differ after the given changes."""
+    changed_categories = set(changed_categories)
+    affected = set()
+    for requirement_id in requirement_ids:
+        dependencies = requirement_dependencies(plan, requirement_id)
+        if dependencies is None or dependencies & changed_categories:
+            affected.add(requirement_id)
+    return affected
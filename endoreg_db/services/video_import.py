@@ -13,6 +13,7 @@ from pathlib import Path
 from typing import TYPE_CHECKING, Union
 from django.db import transaction
 from endoreg_db.models import VideoFile, SensitiveMeta
+from endoreg_db.models.media.video.create_from_file import atomic_move_with_fallback
 from endoreg_db.utils.paths import STORAGE_DIR, RAW_FRAME_DIR, VIDEO_DIR
 
 class VideoImportService():
@@ -584,16 +585,8 @@ class VideoImportService():
             output_path
         )
         
-        # Save cleaned video back to VideoFile (atomic transaction)
-        with transaction.atomic():
-            # Save the cleaned video using Django's FileField
-            from django.core.files.base import ContentFile
-            with open(cleaned_video_path, 'rb') as f:
-                self.current_video.processed_file.save(
-                    cleaned_video_path.name,
-                    ContentFile(f.read())
-                )
-            self.current_video.save()
+        # Save cleaned video back to VideoFile without loading it into memory
+        self._store_processed_video(Path(cleaned_video_path))
         
         # Update sensitive metadata with extracted information
         self._update_sensitive_metadata(extracted_metadata)
@@ -603,6 +596,28 @@ class VideoImportService():
         
         self.logger.info(f"Frame cleaning with ROI masking completed: {cleaned_video_path.name}")
 
+    def _store_processed_video(self, cleaned_video_path: Path):
+        """
+        Move the cleaned video into processed_file storage and point the VideoFile at it.
+
+        The file is renamed, or copied in chunks across filesystems, outside any database
+        transaction; only the field update runs inside one.
+        """
+        processed_file = self.current_video.processed_file
+        # Same name resolution as FieldFile.save(), without reading the content
+        name = processed_file.field.generate_filename(self.current_video, cleaned_video_path.name)
+        name = processed_file.storage.get_available_name(name, max_length=processed_file.field.max_length)
+        target_path = Path(processed_file.storage.path(name))
+        target_path.parent.mkdir(parents=True, exist_ok=True)
+
+        atomic_move_with_fallback(cleaned_video_path, target_path)
+
+        with transaction.atomic():
+            self.current_video.processed_file.name = name
+            self.current_video.save()
+
+        self.logger.info(f"Stored cleaned video at {target_path}")
+
     def _update_sensitive_metadata(self, extracted_metadata):
         """Update sensitive metadata with extracted information."""
         if not (self.current_video.sensitive_meta and extracted_metadata):
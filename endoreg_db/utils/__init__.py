@@ -15,10 +15,15 @@ from .env import DEBUG, DJANGO_SETTINGS_MODULE, get_env_var
 # file_operations
 from .file_operations import copy_with_progress, get_uuid_filename, rename_file_uuid
 
+# frame_ranges
+from .frame_ranges import FrameRangeSet
+
 # hashs
 from .hashs import (
     DJANGO_NAME_SALT,
     get_examiner_hash,
+    get_file_hash,
+    get_file_prehash,
     get_hash_string,
     get_patient_examination_hash,
     get_pdf_hash,
@@ -66,8 +71,11 @@ __all__ = [
     "DJANGO_NAME_SALT",
     "DJANGO_SETTINGS_MODULE",
     "ensure_aware_datetime",
+    "FrameRangeSet",
     "get_env_var",
     "get_examiner_hash",
+    "get_file_hash",
+    "get_file_prehash",
     "get_hash_string",
     "get_patient_examination_hash",
     "get_pdf_hash",
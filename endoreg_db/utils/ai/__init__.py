@@ -1,9 +1,17 @@
-from .inference_dataset import InferenceDataset
+from .batch_preprocess import BatchPreprocessor
+from .inference_dataset import InferenceDataset, FrameFileDataset, StreamingInferenceDataset
+from .model_cache import ModelCache, ModelCacheKey, get_model_cache
 from .multilabel_classification_net import MultiLabelClassificationNet
 from .predict import Classifier
 
 __all__ = [
+    "BatchPreprocessor",
     "InferenceDataset",
+    "FrameFileDataset",
+    "StreamingInferenceDataset",
+    "ModelCache",
+    "ModelCacheKey",
+    "get_model_cache",
     "MultiLabelClassificationNet",
     "Classifier",
 ]
\ No newline at end of file
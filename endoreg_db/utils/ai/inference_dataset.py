@@ -1,4 +1,5 @@
-from torch.utils.data import Dataset
+import torch
+from torch.utils.data import Dataset, IterableDataset
 import numpy as np
 from PIL import Image
 from torchvision import transforms
@@ -18,35 +19,90 @@ class InferenceDataset(Dataset):
             # Normalize the image using the provided mean and std
             transforms.Normalize(mean=self.config["mean"], std=self.config["std"])
         ])
-        
+
     def __len__(self):
         # Returns the total number of samples
         return len(self.paths)
 
-    def __getitem__(self, idx):
-        # Open the image with Pillow
-        with Image.open(self.paths[idx]) as pil_image:
-            # Convert the image to RGB to ensure 3 channels
-            pil_image = pil_image.convert('RGB')
+    def preprocess(self, image, crop):
+        """
+        Crops, scales and normalizes a single RGB frame.
 
-        # Get the corresponding crop for the current image
-        crop = self.crops[idx]
+        Args:
+            image: RGB image as numpy array of shape (height, width, 3).
+            crop: Crop parameters (ymin, ymax, xmin, xmax).
 
-        # Crop the image based on the provided crop parameters and convert to numpy for cropping
+        Returns:
+            Normalized image tensor of shape (3, size_y, size_x).
+        """
+        # Crop the image based on the provided crop parameters
         cropped = self.cropper(
-            np.array(pil_image),  # Convert PIL image to numpy array for cropping
+            image,
             crop,
             scale=[
                 self.config["size_x"],
                 self.config["size_y"]
-            ]    
+            ]
         )
 
         # Convert cropped numpy array back to PIL image for torchvision transforms
         cropped_pil = Image.fromarray(cropped.astype('uint8'), 'RGB')
-        
+
         # Apply the transformations
-        img = self.transforms(cropped_pil)
+        return self.transforms(cropped_pil)
+
+    def load_image(self, idx):
+        """Reads the image at ``paths[idx]`` as an RGB numpy array."""
+        # Open the image with Pillow
+        with Image.open(self.paths[idx]) as pil_image:
+            # Convert the image to RGB to ensure 3 channels
+            pil_image = pil_image.convert('RGB')
+        return np.array(pil_image)
 
+    def __getitem__(self, idx):
+        # Get the corresponding crop for the current image
+        return self.preprocess(self.load_image(idx), self.crops[idx])
+
+
+class FrameFileDataset(InferenceDataset):
+    """
+    Yields decoded frames as uint8 tensors of shape (H, W, 3) without preprocessing.
+
+    Used together with ``BatchPreprocessor``, which crops, resizes and normalizes
+    whole batches at once. All images must have the same size.
+    """
+
+    def __getitem__(self, idx):
+        return torch.from_numpy(self.load_image(idx))
+
+
+class StreamingInferenceDataset(IterableDataset):
+    """
+    Iterable dataset over decoded frames, e.g. from ``iter_video_frames``.
+
+    Frames are preprocessed exactly like ``InferenceDataset`` items, but come from an
+    in-memory iterator instead of image files on disk. Yields ``(frame_number, tensor)``
+    so the original frame numbers survive batching.
+    """
+
+    def __init__(self, frames, crop, config, preprocess=True):
+        """
+        Args:
+            frames: Iterable of (frame_number, RGB numpy array) tuples.
+            crop: Crop parameters (ymin, ymax, xmin, xmax) applied to every frame.
+            config: Dataset config, see ``ModelMeta.get_inference_dataset_config``.
+            preprocess: If False, frames are yielded as raw uint8 (H, W, 3) tensors
+                for batched preprocessing with ``BatchPreprocessor``.
+        """
+        self.frames = frames
+        self.crop = crop
+        self.config = config
+        self.preprocess_frames = preprocess
+        self._preprocessor = InferenceDataset([], [], config)
 
-        return img
+    def __iter__(self):
+        for frame_number, frame in self.frames:
+            if self.preprocess_frames:
+                yield frame_number, self._preprocessor.preprocess(frame, self.crop)
+            else:
+                yield frame_number, torch.from_numpy(np.ascontiguousarray(frame))
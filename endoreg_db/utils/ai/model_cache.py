@@ -0,0 +1,243 @@
+"""
+Process-wide cache for loaded inference models.
+
+Loading a ``MultiLabelClassificationNet`` checkpoint takes seconds and a Celery worker
+typically runs the same model on a whole queue of videos. ``ModelCache`` keeps loaded,
+eval-mode models resident per process, keyed by (name, version, weights hash, device),
+and evicts the least recently used models once the configured memory budget is
+exceeded.
+
+Usage:
+    cache = get_model_cache()
+    model = cache.get_or_load(
+        ModelCacheKey(name, version, weights_fingerprint(path), "cpu"),
+        lambda: load_classification_model(path, "cpu"),
+    )
+
+The memory budget is read from ``ENDOREG_MODEL_CACHE_MB`` (default 2048, 0 disables
+caching).
+"""
+
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, NamedTuple, Optional, Tuple, Union
+
+import torch
+from torch import nn
+
+from endoreg_db.config.env import env_int
+from endoreg_db.utils.hashs import get_file_hash
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_CACHE_MB = 2048
+
+
+class ModelCacheKey(NamedTuple):
+    name: str
+    version: str
+    weights_hash: str
+    device: str
+
+
+@dataclass
+class ModelCacheStats:
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    load_seconds: float = 0.0
+    resident_models: int = 0
+    resident_bytes: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def as_dict(self) -> Dict[str, float]:
+        data = asdict(self)
+        data["hit_rate"] = self.hit_rate
+        return data
+
+
+def model_nbytes(model: nn.Module) -> int:
+    """Returns the memory taken by the parameters and buffers of a model."""
+    tensors = list(model.parameters()) + list(model.buffers())
+    return sum(t.numel() * t.element_size() for t in tensors)
+
+
+_fingerprints: Dict[Tuple[str, int, int], str] = {}
+_fingerprints_lock = threading.Lock()
+
+
+def weights_fingerprint(weights_path: Union[str, Path]) -> str:
+    """
+    Returns the SHA-256 of a weights file.
+
+    The digest is memoized per (path, size, mtime), so a checkpoint is only hashed again
+    after it changed on disk.
+    """
+    path = Path(weights_path)
+    stat = path.stat()
+    memo_key = (path.resolve().as_posix(), stat.st_size, stat.st_mtime_ns)
+    with _fingerprints_lock:
+        cached = _fingerprints.get(memo_key)
+    if cached is not None:
+        return cached
+
+    fingerprint = get_file_hash(path)
+    with _fingerprints_lock:
+        _fingerprints[memo_key] = fingerprint
+    return fingerprint
+
+
+def load_classification_model(weights_path: Union[str, Path], device: str) -> nn.Module:
+    """Loads a ``MultiLabelClassificationNet`` checkpoint onto ``device`` in eval mode."""
+    from .multilabel_classification_net import MultiLabelClassificationNet
+
+    model = MultiLabelClassificationNet.load_from_checkpoint(
+        checkpoint_path=Path(weights_path).as_posix(),
+        map_location=device,
+    )
+    model = model.to(device)
+    model.eval()
+    return model
+
+
+class ModelCache:
+    """
+    LRU cache of loaded models with a memory budget.
+
+    A model larger than the whole budget is still kept (after evicting everything
+    else), so a worker running a single big model does not reload it for every video.
+    All methods are thread-safe; loading happens under the lock so concurrent requests
+    for the same model load it only once.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._models: "OrderedDict[ModelCacheKey, Tuple[nn.Module, int]]" = OrderedDict()
+        self._stats = ModelCacheStats()
+        self._lock = threading.RLock()
+
+    def get_or_load(self, key: ModelCacheKey, loader: Callable[[], nn.Module]) -> nn.Module:
+        """Returns the cached model for ``key`` or loads it with ``loader`` and caches it."""
+        with self._lock:
+            entry = self._models.get(key)
+            if entry is not None:
+                self._models.move_to_end(key)
+                self._stats.hits += 1
+                return entry[0]
+
+            self._stats.misses += 1
+            start = time.perf_counter()
+            model = loader()
+            load_seconds = time.perf_counter() - start
+            self._stats.load_seconds += load_seconds
+            model.eval()
+
+            if self.max_bytes <= 0:
+                return model
+
+            nbytes = model_nbytes(model)
+            logger.info(
+                "Loaded model %s v%s on %s in %.2fs (%.1f MB).",
+                key.name, key.version, key.device, load_seconds, nbytes / 1e6,
+            )
+            if nbytes > self.max_bytes:
+                logger.warning(
+                    "Model %s v%s (%.1f MB) exceeds the model cache budget of %.1f MB.",
+                    key.name, key.version, nbytes / 1e6, self.max_bytes / 1e6,
+                )
+            self._models[key] = (model, nbytes)
+            self._evict(keep=key)
+            return model
+
+    def _evict(self, keep: Optional[ModelCacheKey] = None):
+        while self.resident_bytes > self.max_bytes and len(self._models) > 1:
+            key = next(iter(self._models))
+            if key == keep:
+                self._models.move_to_end(key)
+                key = next(iter(self._models))
+            self._models.pop(key)
+            self._stats.evictions += 1
+            logger.info("Evicted model %s v%s on %s from the model cache.", key.name, key.version, key.device)
+
+    def discard(self, key: ModelCacheKey) -> bool:
+        """Removes a model from the cache. Returns True if it was cached."""
+        with self._lock:
+            return self._models.pop(key, None) is not None
+
+    def clear(self, device: Optional[str] = None):
+        """Removes all models, or only those on ``device`` (e.g. ``"cuda"``)."""
+        with self._lock:
+            for key in list(self._models):
+                if device is None or key.device.split(":")[0] == device:
+                    self._models.pop(key)
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(nbytes for _, nbytes in self._models.values())
+
+    def __contains__(self, key: ModelCacheKey) -> bool:
+        return key in self._models
+
+    def __len__(self) -> int:
+        return len(self._models)
+
+    def stats(self) -> ModelCacheStats:
+        """Returns a snapshot of the cache metrics."""
+        with self._lock:
+            stats = ModelCacheStats(**asdict(self._stats))
+            stats.resident_models = len(self._models)
+            stats.resident_bytes = self.resident_bytes
+            return stats
+
+
+_model_cache: Optional[ModelCache] = None
+_model_cache_lock = threading.Lock()
+
+
+def get_model_cache() -> ModelCache:
+    """Returns the process-wide model cache, creating it on first use."""
+    global _model_cache
+    with _model_cache_lock:
+        if _model_cache is None:
+            budget_mb = env_int("ENDOREG_MODEL_CACHE_MB", DEFAULT_MODEL_CACHE_MB)
+            _model_cache = ModelCache(max_bytes=budget_mb * 1024 * 1024)
+        return _model_cache
+
+
+def _drop_cuda_models_after_fork():
+    # CUDA contexts do not survive fork (e.g. Celery prefork children); CPU models
+    # are shared copy-on-write and stay usable.
+    if _model_cache is not None:
+        _model_cache.clear(device="cuda")
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_drop_cuda_models_after_fork)
+
+
+def resolve_device(device: Optional[str] = None) -> str:
+    """Returns ``device`` or the default inference device ("cuda" if available)."""
+    if device:
+        return device
+    return "cuda" if torch.cuda.is_available() else "cpu"
+
+
+__all__ = [
+    "ModelCache",
+    "ModelCacheKey",
+    "ModelCacheStats",
+    "get_model_cache",
+    "load_classification_model",
+    "model_nbytes",
+    "resolve_device",
+    "weights_fingerprint",
+]
@@ -0,0 +1,123 @@
+"""
+Parallel batch loading for inference that is safe inside Celery workers.
+
+``torch.utils.data.DataLoader`` with ``num_workers > 0`` starts worker processes, which
+is not allowed from a daemonic Celery prefork child ("daemonic processes are not
+allowed to have children") and is fragile after fork in general. Image decoding and
+resizing in PIL/OpenCV release the GIL, so a thread pool gives most of the speedup
+without any new processes.
+
+Worker modes (``config["worker_mode"]``):
+    "thread":  ``ThreadedBatchLoader`` with ``num_workers`` threads (default).
+    "process": ``DataLoader`` with spawn-context worker processes. Falls back to
+               "thread" when called from a daemonic process such as a Celery worker.
+"""
+
+import logging
+import multiprocessing
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterator, Sequence
+
+import torch
+from torch.utils.data import DataLoader, Dataset
+from torch.utils.data._utils.collate import default_collate
+
+logger = logging.getLogger(__name__)
+
+WORKER_MODES = ("thread", "process")
+# Batches in flight per worker, same meaning as DataLoader's prefetch_factor
+PREFETCH_FACTOR = 2
+
+
+class ThreadedBatchLoader:
+    """
+    Loads batches of a map-style dataset on a thread pool, in order.
+
+    Each batch is loaded by one worker thread; up to ``num_workers * prefetch_factor``
+    batches are in flight so the model never waits for decoding while threads are free.
+    """
+
+    def __init__(self, dataset: Dataset, batch_size: int, num_workers: int, prefetch_factor: int = PREFETCH_FACTOR):
+        if num_workers < 1:
+            raise ValueError("ThreadedBatchLoader requires at least one worker")
+        self.dataset = dataset
+        self.batch_size = batch_size
+        self.num_workers = num_workers
+        self.prefetch_factor = prefetch_factor
+
+    def __len__(self) -> int:
+        return (len(self.dataset) + self.batch_size - 1) // self.batch_size
+
+    def _load_batch(self, indices: Sequence[int]):
+        return default_collate([self.dataset[idx] for idx in indices])
+
+    def __iter__(self) -> Iterator:
+        n_items = len(self.dataset)
+        batches = (
+            range(start, min(start + self.batch_size, n_items))
+            for start in range(0, n_items, self.batch_size)
+        )
+        max_in_flight = self.num_workers * self.prefetch_factor
+
+        with ThreadPoolExecutor(max_workers=self.num_workers, thread_name_prefix="inference-loader") as pool:
+            pending = deque()
+            try:
+                for indices in batches:
+                    pending.append(pool.submit(self._load_batch, indices))
+                    if len(pending) >= max_in_flight:
+                        yield pending.popleft().result()
+                while pending:
+                    yield pending.popleft().result()
+            finally:
+                # Consumer stopped early or a batch failed: drop queued work
+                for future in pending:
+                    future.cancel()
+
+
+def _in_daemon_process() -> bool:
+    return multiprocessing.current_process().daemon
+
+
+def make_inference_loader(dataset: Dataset, config: Dict):
+    """
+    Returns an iterable over batches of ``dataset`` according to ``config``.
+
+    Uses ``config["batchsize"]``, ``config["num_workers"]`` and ``config["worker_mode"]``
+    (see module docstring). With ``num_workers == 0`` a plain in-process DataLoader is
+    returned.
+    """
+    batch_size = int(config["batchsize"])
+    num_workers = int(config.get("num_workers", 0) or 0)
+    mode = config.get("worker_mode", "thread")
+    if mode not in WORKER_MODES:
+        raise ValueError(f"Unknown worker_mode {mode!r}, expected one of {WORKER_MODES}")
+
+    if num_workers > 0 and mode == "process" and _in_daemon_process():
+        logger.warning(
+            "Worker processes cannot be started from a daemonic process (e.g. Celery prefork); "
+            "using %d loader threads instead.",
+            num_workers,
+        )
+        mode = "thread"
+
+    if num_workers > 0 and mode == "thread":
+        return ThreadedBatchLoader(dataset, batch_size, num_workers)
+
+    return DataLoader(
+        dataset=dataset,
+        batch_size=batch_size,
+        num_workers=num_workers,
+        shuffle=False,
+        pin_memory=torch.cuda.is_available(),
+        # spawn avoids inheriting CUDA state and open DB connections from a forked parent
+        multiprocessing_context="spawn" if num_workers > 0 else None,
+        persistent_workers=False,
+    )
+
+
+__all__ = [
+    "ThreadedBatchLoader",
+    "WORKER_MODES",
+    "make_inference_loader",
+]
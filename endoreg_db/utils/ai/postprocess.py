@@ -1,3 +1,5 @@
+from typing import Dict, List, Optional, Sequence, Tuple
+
 import numpy as np
 
 
@@ -61,3 +63,186 @@ def find_true_pred_sequences(predictions):
     outside_sequences = [(int(start), int(stop)) for start, stop in outside_sequences]
 
     return outside_sequences
+
+
+# --- Vectorized post-processing on (frames x labels) prediction matrices ---
+
+
+def smoothing_window_size(window_size_s=1, fps=50):
+    """Number of frames in the moving-average window used by ``make_smooth_preds``."""
+    return max(int(window_size_s * fps), 1)
+
+
+def smooth_prediction_matrix(predictions, window_size_s=1, fps=50):
+    """
+    Moving average over the frame axis of a (frames, labels) matrix.
+
+    Equivalent to ``make_smooth_preds`` applied to every column, computed for all
+    labels at once with a cumulative sum.
+    """
+    predictions = np.asarray(predictions)
+    window_size = smoothing_window_size(window_size_s, fps)
+    n_frames = predictions.shape[0]
+    if n_frames < window_size:
+        # np.convolve(mode="valid") swaps its inputs if the kernel is longer
+        mean = predictions.sum(axis=0, dtype=np.float64) / window_size
+        return np.repeat(mean[None, :], window_size - n_frames + 1, axis=0)
+
+    cumsum = np.zeros((n_frames + 1, predictions.shape[1]), dtype=np.float64)
+    np.cumsum(predictions, axis=0, dtype=np.float64, out=cumsum[1:])
+    return (cumsum[window_size:] - cumsum[:-window_size]) / window_size
+
+
+def find_true_pred_sequences_matrix(binary_predictions) -> List[List[Tuple[int, int]]]:
+    """
+    Finds runs of True values in every column of a (frames, labels) boolean matrix.
+
+    Returns one list of (start, stop) tuples per label, inclusive like
+    ``find_true_pred_sequences``.
+    """
+    binary_predictions = np.asarray(binary_predictions, dtype=bool)
+    n_labels = binary_predictions.shape[1]
+    padded = np.zeros((binary_predictions.shape[0] + 2, n_labels), dtype=np.int8)
+    padded[1:-1] = binary_predictions
+    changes = np.diff(padded, axis=0)
+
+    # Transposing makes np.nonzero return changes ordered by label, then frame
+    start_labels, starts = np.nonzero(changes.T == 1)
+    _, stops = np.nonzero(changes.T == -1)
+    stops = stops - 1
+
+    sequences: List[List[Tuple[int, int]]] = [[] for _ in range(n_labels)]
+    for label_idx, start, stop in zip(start_labels.tolist(), starts.tolist(), stops.tolist()):
+        sequences[label_idx].append((start, stop))
+    return sequences
+
+
+def prediction_matrix_to_sequences(
+    predictions, labels: Sequence[str], window_size_s=1, fps=50, threshold=0.5
+) -> Dict[str, List[Tuple[int, int]]]:
+    """
+    Smooths, binarizes and finds sequences for a (frames, labels) prediction matrix.
+
+    Returns a dict mapping each label to its list of (start, stop) sequences, in
+    smoothed frame indices like the per-label functions above.
+    """
+    smooth = smooth_prediction_matrix(predictions, window_size_s=window_size_s, fps=fps)
+    sequences = find_true_pred_sequences_matrix(smooth > threshold)
+    return dict(zip(labels, sequences))
+
+
+class PredictionBuffer:
+    """
+    Growable (frames, labels) float matrix that batches of predictions are written into.
+
+    Preallocated for ``capacity`` frames (e.g. the dataset length or the video's frame
+    count) and grown geometrically only if more rows arrive.
+    """
+
+    def __init__(self, capacity: int = 0, dtype=np.float32):
+        self.capacity = max(int(capacity), 0)
+        self.dtype = np.dtype(dtype)
+        self._data: Optional[np.ndarray] = None
+        self._n_rows = 0
+
+    def __len__(self) -> int:
+        return self._n_rows
+
+    def append(self, batch):
+        """Copies a (batch_size, n_labels) array into the matrix."""
+        batch = np.asarray(batch)
+        if self._data is None:
+            self._data = np.empty((max(self.capacity, batch.shape[0]), batch.shape[1]), dtype=self.dtype)
+        end = self._n_rows + batch.shape[0]
+        if end > self._data.shape[0]:
+            grown = np.empty((max(end, 2 * self._data.shape[0]), self._data.shape[1]), dtype=self.dtype)
+            grown[:self._n_rows] = self._data[:self._n_rows]
+            self._data = grown
+        self._data[self._n_rows:end] = batch
+        self._n_rows = end
+
+    def array(self) -> np.ndarray:
+        """Returns the filled rows (a view, no copy unless the buffer is over-allocated)."""
+        if self._data is None:
+            return np.empty((0, 0), dtype=self.dtype)
+        return self._data[:self._n_rows]
+
+
+class IncrementalSequenceFinder:
+    """
+    Emits prediction sequences while batches of predictions arrive.
+
+    Keeps only the last ``window_size - 1`` raw rows and the currently open run per
+    label, so memory does not grow with video length. The sequences produced by
+    ``update`` and ``finalize`` together equal ``prediction_matrix_to_sequences`` on
+    the full matrix.
+
+    Usage:
+        finder = IncrementalSequenceFinder(labels, fps=fps)
+        for batch in batches:                 # (batch_size, n_labels) arrays
+            for label, start, stop in finder.update(batch):
+                ...
+        remaining = finder.finalize()
+    """
+
+    def __init__(self, labels: Sequence[str], window_size_s=1, fps=50, threshold=0.5):
+        self.labels = list(labels)
+        self.window_size = smoothing_window_size(window_size_s, fps)
+        self.threshold = threshold
+        self._tail: Optional[np.ndarray] = None
+        self._n_smoothed = 0
+        self._open_starts = np.full(len(self.labels), -1, dtype=np.int64)
+        self._finalized = False
+
+    def update(self, batch) -> List[Tuple[str, int, int]]:
+        """Adds a (batch_size, n_labels) batch and returns the sequences it closed."""
+        if self._finalized:
+            raise RuntimeError("IncrementalSequenceFinder has already been finalized")
+        batch = np.asarray(batch)[:, :len(self.labels)]
+        rows = batch if self._tail is None else np.concatenate([self._tail, batch])
+        self._tail = rows[-(self.window_size - 1):] if self.window_size > 1 else rows[:0]
+        if rows.shape[0] < self.window_size:
+            return []
+
+        cumsum = np.zeros((rows.shape[0] + 1, rows.shape[1]), dtype=np.float64)
+        np.cumsum(rows, axis=0, dtype=np.float64, out=cumsum[1:])
+        smooth = (cumsum[self.window_size:] - cumsum[:-self.window_size]) / self.window_size
+        return self._consume(smooth > self.threshold)
+
+    def _consume(self, binary) -> List[Tuple[str, int, int]]:
+        offset = self._n_smoothed
+        self._n_smoothed += binary.shape[0]
+
+        # Prepend the state before this chunk so runs can continue across chunks
+        previous = (self._open_starts >= 0).astype(np.int8)
+        padded = np.concatenate([previous[None, :], binary.astype(np.int8)])
+        changes = np.diff(padded, axis=0)
+
+        closed = []
+        for label_idx in range(len(self.labels)):
+            column = changes[:, label_idx]
+            for frame_idx in np.flatnonzero(column).tolist():
+                if column[frame_idx] == 1:
+                    self._open_starts[label_idx] = offset + frame_idx
+                else:
+                    closed.append((self.labels[label_idx], int(self._open_starts[label_idx]), offset + frame_idx - 1))
+                    self._open_starts[label_idx] = -1
+        return closed
+
+    def finalize(self) -> List[Tuple[str, int, int]]:
+        """Closes sequences still open at the end of the video and returns them."""
+        if self._finalized:
+            return []
+        self._finalized = True
+
+        closed = []
+        if self._n_smoothed == 0 and self._tail is not None and self._tail.shape[0] > 0:
+            # Fewer frames than the smoothing window: same result as the offline path
+            smooth = smooth_prediction_matrix(self._tail, window_size_s=self.window_size, fps=1)
+            closed.extend(self._consume(smooth > self.threshold))
+
+        last = self._n_smoothed - 1
+        for label_idx in np.flatnonzero(self._open_starts >= 0).tolist():
+            closed.append((self.labels[label_idx], int(self._open_starts[label_idx]), last))
+            self._open_starts[label_idx] = -1
+        return closed
@@ -9,8 +9,15 @@ from torch import nn
 import numpy as np
 from tqdm import tqdm
 from icecream import ic
-from .inference_dataset import InferenceDataset
-from .postprocess import concat_pred_dicts, make_smooth_preds, find_true_pred_sequences
+from .batch_preprocess import BatchPreprocessor, uniform_crop
+from .inference_dataset import InferenceDataset, FrameFileDataset, StreamingInferenceDataset
+from .parallel_loader import make_inference_loader
+from .postprocess import (
+    PredictionBuffer,
+    concat_pred_dicts,
+    find_true_pred_sequences_matrix,
+    smooth_prediction_matrix,
+)
 
 sample_config = {
     # mean and std for normalization
@@ -22,7 +29,13 @@ sample_config = {
     # how to wrangle axes of the image before putting them in the network
     "axes": [2, 0, 1],  # 2,1,0 for opencv
     "batchsize": 16,
-    "num_workers": 0,  # always 1 for Windows systems # FIXME: fix celery crash if multiprocessing
+    "num_workers": 0,
+    # "thread" is safe inside Celery workers; "process" uses spawn-context DataLoader workers
+    "worker_mode": "thread",
+    # crop/resize/normalize whole batches at once if all frames share one crop
+    "batch_preprocessing": True,
+    # dtype of the (frames, labels) prediction matrix; float16 halves memory for long videos
+    "prediction_dtype": "float32",
     # maybe add sigmoid after prediction?
     "activation": nn.Sigmoid(),
     "labels": [
@@ -52,74 +65,159 @@ class Classifier:
         self.model = model
         self.verbose = verbose
 
-    def pipe(self, paths, crops, verbose=None):
+    def pipe(self, paths, crops, verbose=None, as_array=False, on_batch=None):
         """
         Processes input data through the model pipeline and returns predictions.
         Args:
             paths (list): List of file paths to the input data.
             crops (list): List of crop regions for the input data.
             verbose (bool, optional): If True, prints detailed logs. Defaults to None.
+            as_array (bool, optional): If True, returns a preallocated (frames, labels)
+                NumPy matrix of dtype config["prediction_dtype"] instead of a list.
+            on_batch (callable, optional): Called with each batch of predictions as a
+                (batch_size, labels) NumPy array, e.g. IncrementalSequenceFinder.update.
         Returns:
-            list: Predictions generated by the model.
+            list or np.ndarray: Predictions generated by the model.
         """
 
         if verbose is None:
             verbose = self.verbose
 
-        dataset = InferenceDataset(paths, crops, self.config)
+        batch_preprocessor = self._get_batch_preprocessor(crops)
+        if batch_preprocessor is not None:
+            dataset = FrameFileDataset(paths, crops, self.config)
+        else:
+            dataset = InferenceDataset(paths, crops, self.config)
         if verbose:
             ic("Dataset created")
 
+        dl = make_inference_loader(dataset, self.config)
+        if verbose:
+            ic("Dataloader created")
+
+        predictions = PredictionBuffer(len(dataset), self._prediction_dtype())
+
+        with torch.inference_mode():
+            if self.verbose:
+                ic("Starting inference")
+
+            device = self._prepare_model(verbose)
+
+            for batch in tqdm(dl):
+                batch = batch.to(device, non_blocking=True)
+                if batch_preprocessor is not None:
+                    batch = batch_preprocessor(batch)
+                prediction = self.model(batch)
+                prediction = self.config["activation"](prediction).float().cpu().numpy()
+                predictions.append(prediction)
+                if on_batch is not None:
+                    on_batch(prediction)
+
+        if as_array:
+            return predictions.array()
+        return predictions.array().tolist()
+
+    def pipe_stream(self, frames, crop, verbose=None, as_array=False, on_batch=None, expected_frames=0):
+        """
+        Runs inference on decoded frames without reading or writing image files.
+        Args:
+            frames (iterable): (frame_number, RGB numpy array) tuples, e.g. from
+                endoreg_db.utils.video.iter_video_frames.
+            crop (tuple): Crop region applied to every frame.
+            verbose (bool, optional): If True, prints detailed logs. Defaults to None.
+            as_array (bool, optional): If True, returns NumPy arrays instead of lists
+                (see ``pipe``).
+            on_batch (callable, optional): Called with each batch of predictions (see ``pipe``).
+            expected_frames (int, optional): Frame count used to preallocate the
+                prediction matrix, e.g. the video's frame count.
+        Returns:
+            tuple: (frame_numbers, predictions) where frame_numbers[i] is the frame
+                number predictions[i] belongs to.
+        """
+
+        if verbose is None:
+            verbose = self.verbose
+
+        batch_preprocessor = self._get_batch_preprocessor([crop])
+        dataset = StreamingInferenceDataset(
+            frames, crop, self.config, preprocess=batch_preprocessor is None
+        )
+        # Frames come from a single decoder pipe, so loading stays in-process
         dl = DataLoader(
             dataset=dataset,
             batch_size=self.config["batchsize"],
-            num_workers=self.config["num_workers"],
-            shuffle=False,
+            num_workers=0,
             pin_memory=True,
         )
         if verbose:
-            ic("Dataloader created")
+            ic("Streaming dataloader created")
 
-        predictions = []
+        frame_numbers = []
+        predictions = PredictionBuffer(expected_frames, self._prediction_dtype())
 
         with torch.inference_mode():
-            if self.verbose:
-                ic("Starting inference")
-                
-            # Ensure model exists
-            if self.model is None:
-                raise ValueError("Model is not loaded")
-            
-            # Use the device the model is currently on, with fallback to CPU
-            try:
-                # Check what device the model parameters are on
-                model_device = next(self.model.parameters()).device
-                device = model_device
-                if verbose:
-                    print(f"Using device: {device}")
-            except StopIteration:
-                # Model has no parameters, default to CPU
-                device = torch.device("cpu")
-                if verbose:
-                    print("Model has no parameters, defaulting to CPU")
-            except Exception as e:
-                # Any other issue, fall back to CPU
-                device = torch.device("cpu")
-                if verbose:
-                    print(f"Device detection failed, using CPU: {e}")
-                    
-            # Ensure model is in eval mode
-            self.model.eval()
-            
-            for batch in tqdm(dl):
+            device = self._prepare_model(verbose)
+
+            for batch_frame_numbers, batch in tqdm(dl):
                 batch = batch.to(device, non_blocking=True)
+                if batch_preprocessor is not None:
+                    batch = batch_preprocessor(batch)
                 prediction = self.model(batch)
-                prediction = (
-                    self.config["activation"](prediction).cpu().tolist()
-                )  # .numpy().tolist()
-                predictions += prediction
+                prediction = self.config["activation"](prediction).float().cpu().numpy()
+                predictions.append(prediction)
+                frame_numbers.append(batch_frame_numbers.numpy())
+                if on_batch is not None:
+                    on_batch(prediction)
+
+        frame_numbers = np.concatenate(frame_numbers) if frame_numbers else np.empty(0, dtype=np.int64)
+        if as_array:
+            return frame_numbers, predictions.array()
+        return frame_numbers.tolist(), predictions.array().tolist()
 
-        return predictions
+    def _prediction_dtype(self):
+        return np.dtype(self.config.get("prediction_dtype", "float32"))
+
+    def _get_batch_preprocessor(self, crops):
+        """
+        Returns a BatchPreprocessor if batch preprocessing is enabled and all frames
+        share one crop, otherwise None (frames are preprocessed one by one).
+        """
+        if not self.config.get("batch_preprocessing", False):
+            return None
+        crop = uniform_crop(crops)
+        if crop is None:
+            return None
+        return BatchPreprocessor(crop, self.config)
+
+    def _prepare_model(self, verbose):
+        """
+        Puts the model into eval mode and returns the device its parameters live on.
+        Falls back to CPU if the device cannot be determined.
+        """
+        # Ensure model exists
+        if self.model is None:
+            raise ValueError("Model is not loaded")
+
+        # Use the device the model is currently on, with fallback to CPU
+        try:
+            # Check what device the model parameters are on
+            device = next(self.model.parameters()).device
+            if verbose:
+                print(f"Using device: {device}")
+        except StopIteration:
+            # Model has no parameters, default to CPU
+            device = torch.device("cpu")
+            if verbose:
+                print("Model has no parameters, defaulting to CPU")
+        except Exception as e:
+            # Any other issue, fall back to CPU
+            device = torch.device("cpu")
+            if verbose:
+                print(f"Device detection failed, using CPU: {e}")
+
+        # Ensure model is in eval mode
+        self.model.eval()
+        return device
 
     def __call__(self, image, crop=None):
         return self.pipe([image], [crop])
@@ -206,22 +304,16 @@ class Classifier:
         """
         # Concatenate the predictions
         predictions = concat_pred_dicts(pred_dicts)
+        keys = list(predictions.keys())
+        matrix = np.column_stack([predictions[key] for key in keys])
+
+        smooth_matrix = smooth_prediction_matrix(matrix, window_size_s=window_size_s, fps=fps)
+        binary_matrix = smooth_matrix > 0.5
+        sequences = find_true_pred_sequences_matrix(binary_matrix)
 
-        smooth_predictions = {key: [] for key in predictions.keys()}
-        for key in predictions.keys():
-            smooth_predictions[key] = make_smooth_preds(
-                predictions[key], window_size_s=window_size_s, fps=fps
-            )
-
-        binary_predictions = {}
-        for key in smooth_predictions.keys():
-            binary_predictions[key] = np.array(
-                [p > 0.5 for p in smooth_predictions[key]]
-            )
-
-        raw_sequences = {}
-        for key, value in binary_predictions.items():
-            raw_sequences[key] = find_true_pred_sequences(value)
+        smooth_predictions = {key: smooth_matrix[:, i] for i, key in enumerate(keys)}
+        binary_predictions = {key: binary_matrix[:, i] for i, key in enumerate(keys)}
+        raw_sequences = dict(zip(keys, sequences))
 
         filtered_sequences = {}
         min_seq_len = int(min_seq_len_s * fps)
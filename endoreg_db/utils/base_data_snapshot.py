@@ -0,0 +1,170 @@
+"""
+Precompiled snapshot of the base data.
+
+Loading the base data from YAML parses a few hundred files and resolves natural keys
+for every fresh database (test runs, new containers). A snapshot stores the rows the
+YAML loader produced, keyed by a checksum over all base data YAML files and the
+migration state, and restores them into an empty database with one ``bulk_create``
+per table.
+
+- ``python manage.py compile_base_data_snapshot`` writes the snapshot (run it against
+  an empty database, e.g. with ``config.settings.test``),
+- ``load_base_db_data`` restores it when the checksum matches and the base data tables
+  are empty, and loads the YAML files otherwise.
+
+The snapshot path is ``ENDOREG_BASE_DATA_SNAPSHOT`` (default
+``data/base_data_snapshot.json.gz`` in the repository root).
+"""
+
+import gzip
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from django.apps import apps
+from django.core import serializers
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+from django.db.migrations.loader import MigrationLoader
+
+from endoreg_db.config.env import env_path
+from endoreg_db.data import DATA_DIR
+from endoreg_db.utils.dataloader import base_data_loaded
+
+logger = logging.getLogger(__name__)
+
+# Bump when the snapshot layout or the YAML loader output changes
+SNAPSHOT_VERSION = 1
+
+
+def get_snapshot_path() -> Path:
+    return env_path("ENDOREG_BASE_DATA_SNAPSHOT", "data/base_data_snapshot.json.gz")
+
+
+def base_data_checksum() -> str:
+    """Returns a sha256 over all base data YAML files and the latest migration of every app."""
+    hash_object = hashlib.sha256(f"v{SNAPSHOT_VERSION}".encode())
+    for yaml_file in sorted(DATA_DIR.rglob("*.yaml")):
+        hash_object.update(yaml_file.relative_to(DATA_DIR).as_posix().encode())
+        hash_object.update(yaml_file.read_bytes())
+    leaf_nodes = MigrationLoader(None, ignore_no_migrations=True).graph.leaf_nodes()
+    hash_object.update(json.dumps(sorted(leaf_nodes)).encode())
+    return hash_object.hexdigest()
+
+
+def _snapshot_models() -> List[type]:
+    # Auto-created M2M through tables are dumped as tables of their own
+    return list(apps.get_app_config("endoreg_db").get_models(include_auto_created=True))
+
+
+def dump_base_data_snapshot(path: Optional[Path] = None, checksum: Optional[str] = None) -> Dict[str, int]:
+    """
+    Writes every non-empty endoreg_db table of the current database to a snapshot.
+
+    Returns the number of rows per model label.
+    """
+    path = Path(path) if path is not None else get_snapshot_path()
+    objects = []
+    counts: Dict[str, int] = {}
+    for model in _snapshot_models():
+        queryset = model._base_manager.order_by("pk")
+        if not queryset.exists():
+            continue
+        # Local fields only: M2M values are in the through tables, MTI parents in their own
+        fields = [f.name for f in model._meta.local_fields]
+        rows = serializers.serialize("python", queryset.iterator(), fields=fields)
+        objects.extend(rows)
+        counts[model._meta.label] = len(rows)
+
+    snapshot = {
+        "version": SNAPSHOT_VERSION,
+        "checksum": checksum or base_data_checksum(),
+        "models": counts,
+        "objects": objects,
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with gzip.open(path, "wt", encoding="utf-8") as file:
+        json.dump(snapshot, file, cls=DjangoJSONEncoder)
+    return counts
+
+
+def compile_base_data_snapshot(path: Optional[Path] = None) -> Dict[str, int]:
+    """
+    Loads the base data from YAML and writes it to a snapshot.
+
+    The database must not contain any endoreg_db rows; the load is rolled back
+    afterwards.
+    """
+    from django.core.management import call_command
+
+    non_empty = [m._meta.label for m in _snapshot_models() if m._base_manager.exists()]
+    if non_empty:
+        raise ValueError(f"Base data snapshots must be compiled on an empty database, found rows in {non_empty}")
+
+    class _Rollback(Exception):
+        pass
+
+    counts: Dict[str, int] = {}
+    try:
+        with transaction.atomic():
+            call_command("load_base_db_data", force=True, no_snapshot=True)
+            counts = dump_base_data_snapshot(path)
+            raise _Rollback
+    except _Rollback:
+        pass
+    return counts
+
+
+def restore_base_data_snapshot(path: Optional[Path] = None, checksum: Optional[str] = None) -> bool:
+    """
+    Restores the base data from a snapshot.
+
+    Returns False (and changes nothing) if there is no snapshot, if it was compiled
+    from other base data or migrations, or if any of its tables already has rows.
+    """
+    path = Path(path) if path is not None else get_snapshot_path()
+    if not path.exists():
+        logger.info("No base data snapshot at %s", path)
+        return False
+    with gzip.open(path, "rt", encoding="utf-8") as file:
+        snapshot = json.load(file)
+    if snapshot.get("version") != SNAPSHOT_VERSION:
+        logger.info("Base data snapshot %s has version %s, expected %s", path, snapshot.get("version"), SNAPSHOT_VERSION)
+        return False
+    if snapshot.get("checksum") != (checksum or base_data_checksum()):
+        logger.info("Base data snapshot %s is outdated", path)
+        return False
+
+    snapshot_models = [apps.get_model(label) for label in snapshot["models"]]
+    if any(model._base_manager.exists() for model in snapshot_models):
+        logger.info("Base data tables are not empty, not restoring %s", path)
+        return False
+
+    by_model: Dict[type, list] = {model: [] for model in snapshot_models}
+    for deserialized in serializers.deserialize("python", snapshot["objects"]):
+        by_model[type(deserialized.object)].append(deserialized)
+
+    with transaction.atomic():
+        # Rows reference each other across tables; check the FKs once at the end
+        with connection.constraint_checks_disabled():
+            for model, deserialized_objects in by_model.items():
+                if model._meta.parents:
+                    # bulk_create does not support multi-table inheritance
+                    for deserialized in deserialized_objects:
+                        deserialized.save()
+                else:
+                    model._base_manager.bulk_create([d.object for d in deserialized_objects])
+        connection.check_constraints(table_names=[model._meta.db_table for model in snapshot_models])
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), snapshot_models)
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+
+    for model in snapshot_models:
+        base_data_loaded.send(sender=model)
+    logger.info("Restored %d base data rows from %s", len(snapshot["objects"]), path)
+    return True
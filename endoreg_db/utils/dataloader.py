@@ -1,10 +1,113 @@
+"""
+Loading of base data YAML files into Django models.
+
+Each YAML file is loaded in a single transaction with bulk queries:
+
+- natural keys of referenced models are resolved from a name -> instance map that is
+  preloaded once per referenced model (``NaturalKeyCache``),
+- new instances are created with ``bulk_create`` and changed ones written with
+  ``bulk_update`` (models that override ``save()`` are saved one by one),
+- many-to-many links are diffed against the through table and written with bulk
+  inserts and a single delete.
+
+The content hash of every loaded file is stored in ``BaseDataFile``; unchanged files
+are skipped on the next run. Files with unresolved natural keys are not recorded, so
+their links are repaired once the referenced data exists. Set ``ENDOREG_BASE_DATA_FORCE_RELOAD=1`` (or run
+``load_base_db_data --force``) to reload everything.
+"""
+
+import hashlib
+import json
 import os
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
 import yaml
-from django.core.exceptions import ObjectDoesNotExist
-from django.db import OperationalError, transaction
+from django.core.exceptions import FieldDoesNotExist, ObjectDoesNotExist
+from django.db import models, transaction
+from django.dispatch import Signal
+
+from endoreg_db.config.env import env_bool
 
+# Sent with sender=<model class> after a YAML file was written to the database with
+# bulk queries, which bypass post_save / m2m_changed
+base_data_loaded = Signal()
 
-def load_model_data_from_yaml(command, model_name, metadata, verbose):
+####################
+#TODO REMOVE AFTER TRANSLATION SUPPORT IS ADDED
+SKIP_NAMES = [
+    "name_de",  # German name, not used
+    "name_en",  # English name, not used
+    "description_de",  # German description
+    "description_en",  # English description
+]
+########################
+
+
+class NaturalKeyCache:
+    """
+    Resolves natural keys of one model with as few queries as possible.
+
+    Models with a unique ``name`` field are preloaded into a name -> instance map with
+    one query. Keys missing from the map (or models without such a field) fall back to
+    ``get_by_natural_key``; the result, including misses, is cached.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._cache: Dict[Any, Optional[models.Model]] = {}
+        self._preloaded = False
+        self._by_name = False
+
+    def _preload(self):
+        self._preloaded = True
+        try:
+            name_field = self.model._meta.get_field("name")
+        except FieldDoesNotExist:
+            return
+        if not getattr(name_field, "unique", False):
+            return
+        self._by_name = True
+        for obj in self.model.objects.all():
+            self._cache[obj.name] = obj
+
+    def get(self, key) -> Optional[models.Model]:
+        if not self._preloaded:
+            self._preload()
+        cache_key = tuple(key) if isinstance(key, list) else key
+        if cache_key not in self._cache:
+            try:
+                self._cache[cache_key] = self.model.objects.get_by_natural_key(key)
+            except ObjectDoesNotExist:
+                self._cache[cache_key] = None
+        return self._cache[cache_key]
+
+    def add(self, objs):
+        """Makes instances created by the loader resolvable and forgets cached misses."""
+        self._cache = {k: v for k, v in self._cache.items() if v is not None}
+        if self._by_name:
+            for obj in objs:
+                self._cache[obj.name] = obj
+
+
+def _get_cache(caches: Dict[type, NaturalKeyCache], model) -> NaturalKeyCache:
+    if model not in caches:
+        caches[model] = NaturalKeyCache(model)
+    return caches[model]
+
+
+def _file_key(model, dir_path, file_name) -> str:
+    return f"{model._meta.label}/{os.path.basename(os.path.normpath(dir_path))}/{file_name}"
+
+
+def _content_hash(content: bytes, metadata) -> str:
+    # Loader settings are part of the hash so changing them reloads the files
+    hash_object = hashlib.sha256(content)
+    hash_object.update(json.dumps([metadata["model"]._meta.label, list(metadata["foreign_keys"])]).encode())
+    return hash_object.hexdigest()
+
+
+def load_model_data_from_yaml(command, model_name, metadata, verbose, force=None):
     """
     Load model data from YAML files.
 
@@ -13,9 +116,14 @@ def load_model_data_from_yaml(command, model_name, metadata, verbose):
         model_name: Name of the model being loaded.
         metadata: Metadata including directory and foreign key information.
         verbose: Boolean indicating whether to print verbose output.
+        force: Reload files even if unchanged. Defaults to ENDOREG_BASE_DATA_FORCE_RELOAD.
     """
+    from endoreg_db.models import BaseDataFile
+
     if verbose:
         command.stdout.write(f"Start loading {model_name}")
+    if force is None:
+        force = env_bool("ENDOREG_BASE_DATA_FORCE_RELOAD", False)
     model = metadata["model"]
     dir_path = metadata["dir"]
     foreign_keys = metadata["foreign_keys"]
@@ -24,21 +132,176 @@ def load_model_data_from_yaml(command, model_name, metadata, verbose):
     _files = [f for f in os.listdir(dir_path) if f.endswith(".yaml")]
     # sort
     _files.sort()
-    for file in _files:
-        with open(os.path.join(dir_path, file), "r", encoding="utf-8") as file:
-            yaml_data = yaml.safe_load(file)
+    file_keys = [_file_key(model, dir_path, f) for f in _files]
+    loaded_hashes = dict(BaseDataFile.objects.filter(path__in=file_keys).values_list("path", "content_hash"))
+    caches: Dict[type, NaturalKeyCache] = {}
+    for file_name, file_key in zip(_files, file_keys):
+        with open(os.path.join(dir_path, file_name), "rb") as file:
+            content = file.read()
+        content_hash = _content_hash(content, metadata)
+        if not force and loaded_hashes.get(file_key) == content_hash:
+            if verbose:
+                command.stdout.write(f"Skipping unchanged {file_name}")
+            continue
 
-        load_data_with_foreign_keys(
-            command, model, yaml_data, foreign_keys, foreign_key_models, verbose
-        )
+        yaml_data = yaml.safe_load(content) or []
+        with transaction.atomic():
+            unresolved = load_data_with_foreign_keys(
+                command, model, yaml_data, foreign_keys, foreign_key_models, verbose, caches=caches
+            )
+            if unresolved:
+                # Not recorded, so the next run retries the missing links
+                BaseDataFile.objects.filter(path=file_key).delete()
+                if verbose:
+                    command.stdout.write(
+                        command.style.WARNING(f"{unresolved} unresolved key(s) in {file_name}, will reload on next run")
+                    )
+            else:
+                BaseDataFile.objects.update_or_create(
+                    path=file_key, defaults={"model_name": model_name, "content_hash": content_hash}
+                )
+        base_data_loaded.send(sender=model)
+
+
+def _resolve_foreign_keys(
+    command, fields, foreign_keys, foreign_key_models, caches, verbose
+) -> Tuple[Dict[str, tuple], int]:
+    """
+    Replaces FK natural keys in ``fields`` by instances.
+
+    M2M key lists are popped into the returned dict as ``{field: (model, keys)}``; they
+    are resolved after the batch is written, so entries can link to each other.
+
+    Returns:
+        Tuple of the M2M keys and the number of FK keys that could not be resolved.
+    """
+    m2m_keys = {}  # Store many-to-many relationships
+    misses = 0
+    for fk_field, fk_model in zip(foreign_keys, foreign_key_models):
+        # Skip fields that are not in the data
+        if fk_field not in fields:
+            continue
+
+        target_keys = fields.pop(fk_field, None)
+
+        # Ensure the foreign key exists
+        if target_keys is None:
+            if verbose:
+                command.stdout.write(
+                    command.style.WARNING(
+                        f"Foreign key {fk_field} not found in fields"
+                    )
+                )
+            continue  # Skip if no foreign key provided
+
+        # Process many-to-many fields or foreign keys
+        if isinstance(target_keys, list):  # Assume many-to-many relationship
+            m2m_keys[fk_field] = (fk_model, target_keys)
+        else:  # Single foreign key relationship
+            obj = _get_cache(caches, fk_model).get(target_keys)
+            if obj is None:
+                if verbose:
+                    command.stdout.write(
+                        command.style.WARNING(
+                            f"{fk_model.__name__} with key {target_keys} not found"
+                        )
+                    )
+                misses += 1
+                continue
+            fields[fk_field] = obj
+    return m2m_keys, misses
+
+
+def _resolve_m2m_keys(command, m2m_keys, caches, verbose) -> Tuple[Dict[str, list], int]:
+    """Resolves M2M natural keys; returns the related objects per field and the number of unresolved keys."""
+    m2m_relationships = {}
+    misses = 0
+    for fk_field, (fk_model, target_keys) in m2m_keys.items():
+        cache = _get_cache(caches, fk_model)
+        related_objects = []
+        for key in target_keys:
+            obj = cache.get(key)
+            if obj is None:
+                if verbose:
+                    command.stdout.write(
+                        command.style.WARNING(
+                            f"{fk_model.__name__} with key {key} not found"
+                        )
+                    )
+                misses += 1
+                continue
+            related_objects.append(obj)
+        m2m_relationships[fk_field] = related_objects
+    return m2m_relationships, misses
+
+
+def _changed_fields(obj, fields) -> Optional[List[str]]:
+    """
+    Applies ``fields`` to ``obj`` and returns the names of changed concrete fields.
+
+    Returns None if a key is not a concrete field; such instances are saved one by one.
+    """
+    changed = []
+    has_other_keys = False
+    for k, v in fields.items():
+        try:
+            field = obj._meta.get_field(k)
+        except FieldDoesNotExist:
+            field = None
+        if field is None or not getattr(field, "concrete", False) or field.many_to_many:
+            setattr(obj, k, v)
+            has_other_keys = True
+            continue
+        current = getattr(obj, field.attname)
+        new = v.pk if isinstance(v, models.Model) else v
+        if current != new:
+            setattr(obj, k, v)
+            changed.append(k)
+    return None if has_other_keys else changed
+
+
+def _save_m2m(model, objects_with_m2m: List[Tuple[models.Model, Dict[str, list]]]):
+    """Sets many-to-many relations of many instances with one diff per field."""
+    desired: Dict[str, Dict[Any, set]] = defaultdict(dict)
+    for obj, m2m_relationships in objects_with_m2m:
+        for field_name, related_objs in m2m_relationships.items():
+            if related_objs:  # Only set if there are objects to set
+                desired[field_name][obj.pk] = {o.pk for o in related_objs}
+
+    for field_name, targets_by_source in desired.items():
+        field = model._meta.get_field(field_name)
+        through = field.remote_field.through
+        source_column = field.m2m_field_name()
+        target_column = field.m2m_reverse_field_name()
+
+        existing: Dict[Any, Dict[Any, Any]] = defaultdict(dict)
+        for pk, source_id, target_id in through.objects.filter(
+            **{f"{source_column}__in": list(targets_by_source)}
+        ).values_list("pk", f"{source_column}_id", f"{target_column}_id"):
+            existing[source_id][target_id] = pk
+
+        to_delete = []
+        to_create = []
+        for source_id, target_ids in targets_by_source.items():
+            current = existing.get(source_id, {})
+            to_delete.extend(pk for target_id, pk in current.items() if target_id not in target_ids)
+            to_create.extend(
+                through(**{f"{source_column}_id": source_id, f"{target_column}_id": target_id})
+                for target_id in target_ids
+                if target_id not in current
+            )
+        if to_delete:
+            through.objects.filter(pk__in=to_delete).delete()
+        if to_create:
+            through.objects.bulk_create(to_create, ignore_conflicts=True)
 
 
 def load_data_with_foreign_keys(
-    command, model, yaml_data, foreign_keys, foreign_key_models, verbose
+    command, model, yaml_data, foreign_keys, foreign_key_models, verbose, caches=None
 ):
     """
     Load YAML data into Django model instances with FK and M2M support.
-    
+
     Processes each YAML entry to create or update a model instance. For each entry, the
     function extracts field data and uses the presence of a 'name' field to decide whether
     to update an existing instance or create a new one. Foreign key fields listed in
@@ -46,130 +309,113 @@ def load_data_with_foreign_keys(
     contains a list, it is treated as a many-to-many relationship and the corresponding
     objects are set after the instance is saved. Missing or unresolved foreign keys trigger
     warnings if verbose output is enabled.
-    
+
+    Named entries are written with bulk queries: existing instances are preloaded by
+    name, new ones bulk-created, changed ones bulk-updated and M2M relations diffed
+    against the through tables. Should be called inside a transaction.
+
     Parameters:
         model: The Django model class representing the data.
         yaml_data: A list of dictionaries representing YAML entries.
         foreign_keys: A list of foreign key field names to process from each entry.
         foreign_key_models: The corresponding Django model classes for each foreign key.
         verbose: If True, prints detailed output and warnings during processing.
+        caches: NaturalKeyCache per referenced model, shared between calls.
+
+    Returns:
+        int: Number of FK and M2M natural keys that could not be resolved.
     """
+    if caches is None:
+        caches = {}
+    # Models with custom save() logic or multi-table inheritance are not bulk-written
+    use_bulk = model.save is models.Model.save and not model._meta.parents
+
+    entries = []
+    names = []
+    unresolved = 0
     for entry in yaml_data:
-        fields = entry.get("fields", {})
+        fields = dict(entry.get("fields", {}))
         name = fields.pop("name", None)
 
-
-        ####################
-        #TODO REMOVE AFTER TRANSLATION SUPPORT IS ADDED
-        SKIP_NAMES=[
-            "name_de",  # German name, not used
-            "name_en",  # English name, not used
-            "description_de",  # German description
-            "description_en",  # English description
-        ]
-
-        
         # Remove fields that are not needed
         for skip_name in SKIP_NAMES:
             if skip_name in fields:
                 fields.pop(skip_name)
-        ########################
 
-        m2m_relationships = {}  # Store many-to-many relationships
-        # print(entry)
-
-        # Handle foreign keys and many-to-many relationships
-        for fk_field, fk_model in zip(foreign_keys, foreign_key_models):
-            # Skip fields that are not in the data
-            if fk_field not in fields:
-                continue
+        m2m_keys, misses = _resolve_foreign_keys(
+            command, fields, foreign_keys, foreign_key_models, caches, verbose
+        )
+        unresolved += misses
+        entries.append((name, fields, m2m_keys))
+        if name is not None:
+            names.append(name)
 
-            target_keys = fields.pop(fk_field, None)
+    existing = {}
+    for obj in model.objects.filter(name__in=names).order_by("pk") if names else []:
+        existing.setdefault(obj.name, obj)
 
-            # Ensure the foreign key exists
-            if target_keys is None:
+    to_create: Dict[str, models.Model] = {}
+    to_update: Dict[str, models.Model] = {}
+    update_fields = set()
+    objects_with_m2m = []
+    for name, fields, m2m_keys in entries:
+        if name is None:
+            # Try to find an existing object by all provided fields
+            obj = model.objects.filter(**fields).first()
+            if obj is None:
+                obj = model.objects.create(**fields)
                 if verbose:
                     command.stdout.write(
-                        command.style.WARNING(
-                            f"Foreign key {fk_field} not found in fields"
-                        )
+                        command.style.SUCCESS(f"Created {model.__name__} {name}")
                     )
-                continue  # Skip if no foreign key provided
-
-            # Process many-to-many fields or foreign keys
-            if isinstance(target_keys, list):  # Assume many-to-many relationship
-                related_objects = []
-                for key in target_keys:
-                    try:
-                        obj = fk_model.objects.get_by_natural_key(key)
-                    except ObjectDoesNotExist:
-                        if verbose:
-                            command.stdout.write(
-                                command.style.WARNING(
-                                    f"{fk_model.__name__} with key {key} not found"
-                                )
-                            )
-                        continue
-                    related_objects.append(obj)
-                m2m_relationships[fk_field] = related_objects
-            else:  # Single foreign key relationship
-                try:
-                    obj = fk_model.objects.get_by_natural_key(target_keys)
-                except ObjectDoesNotExist:
-                    if verbose:
-                        command.stdout.write(
-                            command.style.WARNING(
-                                f"{fk_model.__name__} with key {target_keys} not found"
-                            )
-                        )
-                    continue
-                fields[fk_field] = obj
-
-        # Create or update the main object (avoid update_or_create to prevent SQLite locks)
-        def _save_instance():
-            if name is None:
-                # Try to find an existing object by all provided fields
-                obj = model.objects.filter(**fields).first()
-                if obj is None:
-                    obj = model.objects.create(**fields)
-                    created = True
-                else:
-                    created = False
-            else:
-                obj = model.objects.filter(name=name).first()
-                if obj is None:
-                    obj = model.objects.create(name=name, **fields)
-                    created = True
-                else:
-                    # Update fields
-                    for k, v in fields.items():
-                        setattr(obj, k, v)
-                    obj.save()
-                    created = False
-            return obj, created
+        elif name in to_create:
+            # Repeated name within the batch: later entries update the pending instance
+            obj = to_create[name]
+            for k, v in fields.items():
+                setattr(obj, k, v)
+        elif name in existing:
+            obj = existing[name]
+            changed = _changed_fields(obj, fields)
+            if changed is None or not use_bulk:
+                obj.save()
+            elif changed:
+                to_update[name] = obj
+                update_fields.update(changed)
+        else:
+            obj = model(name=name, **fields)
+            to_create[name] = obj
+        objects_with_m2m.append((obj, m2m_keys))
 
-        try:
-            # Attempt save inside a transaction for consistency
-            with transaction.atomic():
-                obj, created = _save_instance()
-        except OperationalError:
-            # Retry once on SQLite lock
-            obj, created = _save_instance()
-
-        if created and verbose:
-            command.stdout.write(
-                command.style.SUCCESS(f"Created {model.__name__} {name}")
-            )
-        elif verbose:
-            pass
+    if to_create:
+        if use_bulk:
+            model.objects.bulk_create(list(to_create.values()))
+        else:
+            for obj in to_create.values():
+                obj.save()
+        if model in caches:
+            caches[model].add(to_create.values())
+        for name in to_create:
+            if verbose:
+                command.stdout.write(
+                    command.style.SUCCESS(f"Created {model.__name__} {name}")
+                )
+    if to_update:
+        model.objects.bulk_update(list(to_update.values()), sorted(update_fields))
 
-        # Set many-to-many relationships
-        for field_name, related_objs in m2m_relationships.items():
-            if related_objs:  # Only set if there are objects to set
-                getattr(obj, field_name).set(related_objs)
-                if verbose:
+    # Set many-to-many relationships
+    m2m_to_save = []
+    for obj, m2m_keys in objects_with_m2m:
+        m2m_relationships, misses = _resolve_m2m_keys(command, m2m_keys, caches, verbose)
+        unresolved += misses
+        m2m_to_save.append((obj, m2m_relationships))
+    _save_m2m(model, m2m_to_save)
+    if verbose:
+        for obj, m2m_relationships in m2m_to_save:
+            for field_name, related_objs in m2m_relationships.items():
+                if related_objs:
                     command.stdout.write(
                         command.style.SUCCESS(
-                            f"Set {len(related_objs)} {field_name} for {model.__name__} {name}"
+                            f"Set {len(related_objs)} {field_name} for {model.__name__} {getattr(obj, 'name', obj)}"
                         )
                     )
+    return unresolved
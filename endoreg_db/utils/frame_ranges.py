@@ -0,0 +1,91 @@
+"""
+Sets of frame numbers stored as sorted, merged inclusive ranges.
+
+Segments such as 'outside' cover long runs of frames. Storing their bounds instead of
+every frame number keeps memory proportional to the number of segments; membership
+is a binary search and per-frame masks are built with NumPy.
+"""
+
+from typing import Iterable, List, Tuple
+
+import numpy as np
+
+
+class FrameRangeSet:
+    """
+    Immutable set of frame numbers, stored as sorted, non-adjacent inclusive ranges.
+
+    Overlapping or touching input ranges are merged and empty ranges (last < first)
+    are dropped. Supports ``frame_number in ranges`` in O(log n), vectorized
+    membership tests via ``contains`` and boolean per-frame masks via ``mask``.
+    """
+
+    __slots__ = ("starts", "ends")
+
+    def __init__(self, ranges: Iterable[Tuple[int, int]] = ()):
+        bounds = np.asarray(list(ranges), dtype=np.int64).reshape(-1, 2)
+        bounds = bounds[bounds[:, 1] >= bounds[:, 0]]
+        bounds = bounds[np.argsort(bounds[:, 0], kind="stable")]
+        starts, ends = bounds[:, 0], bounds[:, 1]
+
+        if len(starts):
+            # A range starts a new group unless it overlaps or touches any earlier one
+            reach = np.maximum.accumulate(ends)
+            group_starts = np.flatnonzero(np.r_[True, starts[1:] > reach[:-1] + 1])
+            starts, ends = starts[group_starts], np.maximum.reduceat(ends, group_starts)
+
+        self.starts = starts
+        self.ends = ends
+        self.starts.flags.writeable = False
+        self.ends.flags.writeable = False
+
+    @classmethod
+    def from_segments(cls, segments) -> "FrameRangeSet":
+        """
+        Builds the set from a LabelVideoSegment queryset.
+
+        Segments cover ``[start_frame_number, end_frame_number)`` (like ``LabelVideoSegment.get_frames``);
+        they are stored as inclusive ``(start, end - 1)`` ranges.
+        """
+        return cls((start, end - 1) for start, end in segments.values_list("start_frame_number", "end_frame_number"))
+
+    def __contains__(self, frame_number) -> bool:
+        index = int(np.searchsorted(self.starts, frame_number, side="right")) - 1
+        return index >= 0 and bool(frame_number <= self.ends[index])
+
+    def contains(self, frame_numbers) -> np.ndarray:
+        """Returns a boolean array telling which of ``frame_numbers`` are in the set."""
+        frame_numbers = np.asarray(frame_numbers)
+        index = np.searchsorted(self.starts, frame_numbers, side="right") - 1
+        inside = index >= 0
+        inside[inside] = frame_numbers[inside] <= self.ends[index[inside]]
+        return inside
+
+    def mask(self, n_frames: int) -> np.ndarray:
+        """Returns a boolean array of length ``n_frames`` that is True for frames in the set."""
+        delta = np.zeros(n_frames + 1, dtype=np.int32)
+        visible = (self.starts < n_frames) & (self.ends >= 0)
+        np.add.at(delta, np.clip(self.starts[visible], 0, n_frames), 1)
+        np.add.at(delta, np.clip(self.ends[visible] + 1, 0, n_frames), -1)
+        return np.cumsum(delta[:-1]) > 0
+
+    def ranges(self) -> List[Tuple[int, int]]:
+        """Returns the merged inclusive (first, last) ranges in ascending order."""
+        return list(zip(self.starts.tolist(), self.ends.tolist()))
+
+    def __len__(self) -> int:
+        return int((self.ends - self.starts + 1).sum())
+
+    def __bool__(self) -> bool:
+        return len(self.starts) > 0
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, FrameRangeSet):
+            return NotImplemented
+        return np.array_equal(self.starts, other.starts) and np.array_equal(self.ends, other.ends)
+
+    def __repr__(self) -> str:
+        return f"FrameRangeSet({self.ranges()!r})"
+
+
+__all__ = ["FrameRangeSet"]
@@ -1,24 +1,75 @@
 import hashlib
 from pathlib import Path
 from datetime import datetime, date
+from typing import BinaryIO, Union
 
 import os
 
 SALT = os.getenv("DJANGO_SALT", "default_salt")
 DJANGO_NAME_SALT = os.environ.get("DJANGO_SALT", "default_salt")
 
+# Read buffer for file hashing. hashlib releases the GIL while digesting large
+# buffers, so hashing in a worker thread does not block other threads.
+HASH_CHUNK_SIZE = 8 * 1024 * 1024
+# Bytes read from the start and the end of a file for the pre-hash
+PREHASH_BLOCK_SIZE = 1024 * 1024
+
+
+def get_file_hash(
+    source: Union[str, os.PathLike, BinaryIO], chunk_size: int = HASH_CHUNK_SIZE
+) -> str:
+    """
+    Get the SHA-256 hex digest of a file, streaming it through a fixed-size buffer.
+
+    ``source`` may be a path or a binary file object, which is read from its current
+    position. Memory use is bounded by ``chunk_size`` regardless of the file size.
+    """
+    if isinstance(source, (str, os.PathLike)):
+        with open(source, "rb", buffering=0) as f:
+            return get_file_hash(f, chunk_size)
+
+    hash_object = hashlib.sha256(usedforsecurity=False)
+    readinto = getattr(source, "readinto", None)
+    if readinto is None:
+        # e.g. Django File objects without a raw file underneath
+        for chunk in iter(lambda: source.read(chunk_size), b""):
+            hash_object.update(chunk)
+        return hash_object.hexdigest()
+
+    buffer = bytearray(chunk_size)
+    view = memoryview(buffer)
+    while True:
+        n_read = readinto(buffer)
+        if not n_read:
+            break
+        hash_object.update(view[:n_read])
+    return hash_object.hexdigest()
+
+
+def get_file_prehash(path: Union[str, os.PathLike], block_size: int = PREHASH_BLOCK_SIZE) -> str:
+    """
+    Get a cheap fingerprint of a file from its size and its first and last ``block_size`` bytes.
+
+    Files with different pre-hashes differ; equal pre-hashes only make identical content
+    likely, so confirm with get_file_hash where it matters. Reads at most 2 * block_size bytes.
+    """
+    size = os.path.getsize(path)
+    hash_object = hashlib.sha256(usedforsecurity=False)
+    hash_object.update(size.to_bytes(8, "little"))
+    with open(path, "rb") as f:
+        hash_object.update(f.read(block_size))
+        if size > block_size:
+            f.seek(max(block_size, size - block_size))
+            hash_object.update(f.read(block_size))
+    return hash_object.hexdigest()
+
 
 def get_video_hash(video_path):
     """
     Get the hash of a video file.
     """
-    # Open the video file in read-binary mode:
-    with open(video_path, "rb") as f:
-        # Create the hash object, passing in the video contents for hashing:
-        hash_object = hashlib.sha256(f.read())
-        # Get the hexadecimal representation of the hash
-        video_hash = hash_object.hexdigest()
-        assert len(video_hash) <= 255, "Hash length exceeds 255 characters"
+    video_hash = get_file_hash(video_path)
+    assert len(video_hash) <= 255, "Hash length exceeds 255 characters"
 
     return video_hash
 
@@ -27,16 +78,7 @@ def get_pdf_hash(pdf_path: Path):
     """
     Get the hash of a pdf file.
     """
-    pdf_hash = None
-
-    # Open the file in binary mode and read its contents
-    with open(pdf_path, "rb") as f:
-        pdf_contents = f.read()
-        # Create a hash object using SHA-256 algorithm
-
-    hash_object = hashlib.sha256(pdf_contents, usedforsecurity=False)
-    # Get the hexadecimal representation of the hash
-    pdf_hash = hash_object.hexdigest()
+    pdf_hash = get_file_hash(pdf_path)
     assert len(pdf_hash) <= 255, "Hash length exceeds 255 characters"
 
     return pdf_hash
@@ -0,0 +1,282 @@
+"""
+Range-aware file responses for the media endpoints (videos, PDFs, downloads).
+
+``media_file_response`` serves a file from disk and answers
+
+- ``Range: bytes=...`` with 206 Partial Content, reading only the requested bytes;
+  several ranges are sent as ``multipart/byteranges``,
+- unsatisfiable ranges with 416 and ``Content-Range: bytes */<size>``,
+- ``If-Range`` with the full file once the validator no longer matches,
+- ``If-None-Match`` with 304 Not Modified,
+- HEAD with the headers of the full file, without reading it.
+
+A single range is read through ``RangeFile``, which stops at the end of the range;
+with ``ENDOREG_MEDIA_RANGE_SENDFILE`` the server's ``wsgi.file_wrapper`` may send it
+with sendfile(2) (gunicorn bounds it by Content-Length).
+
+Responses carry a strong ETag (mtime and size) and Last-Modified. With
+``ENDOREG_MEDIA_OFFLOAD=x-accel-redirect`` (nginx) or ``x-sendfile`` (Apache, lighttpd)
+the body is left to the web server, which then also handles ranges. For
+X-Accel-Redirect, files below ``ENDOREG_MEDIA_OFFLOAD_ROOT`` (default ``STORAGE_DIR``)
+are mapped to the internal location ``ENDOREG_MEDIA_OFFLOAD_PREFIX`` (default
+``/protected-media/``); other files are served by Django.
+"""
+
+import logging
+import mimetypes
+import os
+import uuid
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote
+
+from django.http import FileResponse, HttpResponse, HttpResponseNotModified, StreamingHttpResponse
+from django.http.response import HttpResponseBase
+from django.utils.http import content_disposition_header, http_date, parse_http_date_safe
+
+from endoreg_db.config.env import env_bool, env_str
+
+logger = logging.getLogger(__name__)
+
+BLOCK_SIZE = 64 * 1024
+# More ranges than this are answered with the full file instead of a huge multipart body
+MAX_RANGES = 16
+
+ByteRange = Tuple[int, int]  # inclusive first and last byte
+
+
+def parse_range_header(header: Optional[str], size: int) -> Optional[List[ByteRange]]:
+    """
+    Parses a ``Range`` header into sorted, non-overlapping inclusive byte ranges.
+
+    Returns None if the header is missing, malformed, not in bytes or asks for too many
+    ranges (the full file is served), and an empty list if no range is satisfiable.
+    """
+    if not header:
+        return None
+    unit, _, spec = header.partition("=")
+    if unit.strip().lower() != "bytes" or not spec.strip():
+        return None
+    parts = [p.strip() for p in spec.split(",") if p.strip()]
+    if not parts or len(parts) > MAX_RANGES:
+        return None
+
+    ranges: List[ByteRange] = []
+    for part in parts:
+        first, sep, last = part.partition("-")
+        first, last = first.strip(), last.strip()
+        if not sep or not (first or last) or (first and not first.isdigit()) or (last and not last.isdigit()):
+            return None
+        if not first:
+            # Suffix range: the last N bytes
+            length = int(last)
+            if length == 0 or size == 0:
+                continue
+            ranges.append((max(size - length, 0), size - 1))
+            continue
+        start = int(first)
+        end = int(last) if last else size - 1
+        if last and end < start:
+            return None
+        if start >= size:
+            continue
+        ranges.append((start, min(end, size - 1)))
+
+    merged: List[ByteRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class RangeFile:
+    """
+    Read-only view of ``length`` bytes of ``file_handle`` from its current position.
+
+    Passed to ``FileResponse`` so a 206 body never reads past the requested range.
+    """
+
+    def __init__(self, file_handle, length: int):
+        self.file_handle = file_handle
+        self.remaining = length
+
+    def read(self, size: int = -1) -> bytes:
+        if self.remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self.remaining:
+            size = self.remaining
+        data = self.file_handle.read(size)
+        self.remaining -= len(data)
+        return data
+
+    def close(self):
+        self.file_handle.close()
+
+
+class SendfileRangeFile(RangeFile):
+    """
+    ``RangeFile`` exposing the file descriptor, so ``wsgi.file_wrapper`` can send the range
+    with sendfile(2) instead of copying it through Python.
+
+    Only safe on servers that start at the current file offset and stop at Content-Length
+    (gunicorn does); enable with ``ENDOREG_MEDIA_RANGE_SENDFILE``.
+    """
+
+    def fileno(self) -> int:
+        return self.file_handle.fileno()
+
+
+def _etag(stat: os.stat_result) -> str:
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+
+
+def _not_modified(request, etag: str) -> bool:
+    if_none_match = request.headers.get("If-None-Match")
+    if not if_none_match:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def _if_range_matches(request, etag: str, stat: os.stat_result) -> bool:
+    """False if an ``If-Range`` validator no longer matches, so the full file must be sent."""
+    if_range = request.headers.get("If-Range")
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        # Only strong validators match (RFC 9110, 13.1.5)
+        return if_range == etag
+    date = parse_http_date_safe(if_range)
+    return date is not None and date == int(stat.st_mtime)
+
+
+def _offload_response(path: Path, content_type: str) -> Optional[HttpResponse]:
+    offload = env_str("ENDOREG_MEDIA_OFFLOAD", "").strip().lower()
+    if offload == "x-sendfile":
+        response = HttpResponse(content_type=content_type)
+        response["X-Sendfile"] = str(path)
+        return response
+    if offload == "x-accel-redirect":
+        from endoreg_db.utils.paths import STORAGE_DIR
+
+        root = Path(env_str("ENDOREG_MEDIA_OFFLOAD_ROOT", str(STORAGE_DIR))).resolve()
+        try:
+            relative = path.resolve().relative_to(root)
+        except ValueError:
+            logger.debug("Not offloading %s: outside of %s", path, root)
+            return None
+        prefix = env_str("ENDOREG_MEDIA_OFFLOAD_PREFIX", "/protected-media/").rstrip("/")
+        response = HttpResponse(content_type=content_type)
+        response["X-Accel-Redirect"] = quote(f"{prefix}/{relative.as_posix()}")
+        return response
+    return None
+
+
+def _multipart_response(path: Path, ranges: List[ByteRange], size: int, content_type: str) -> StreamingHttpResponse:
+    boundary = uuid.uuid4().hex
+    part_headers = [
+        (
+            f"--{boundary}\r\nContent-Type: {content_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{size}\r\n\r\n"
+        ).encode("ascii")
+        for start, end in ranges
+    ]
+    closing = f"--{boundary}--\r\n".encode("ascii")
+    length = sum(len(h) + (end - start + 1) + 2 for h, (start, end) in zip(part_headers, ranges)) + len(closing)
+
+    def body():
+        with open(path, "rb") as file_handle:
+            for header, (start, end) in zip(part_headers, ranges):
+                yield header
+                file_handle.seek(start)
+                remaining = end - start + 1
+                while remaining > 0:
+                    data = file_handle.read(min(BLOCK_SIZE, remaining))
+                    if not data:
+                        break
+                    remaining -= len(data)
+                    yield data
+                yield b"\r\n"
+            yield closing
+
+    response = StreamingHttpResponse(
+        body(), status=206, content_type=f"multipart/byteranges; boundary={boundary}"
+    )
+    response["Content-Length"] = str(length)
+    return response
+
+
+def media_file_response(
+    request,
+    path,
+    content_type: Optional[str] = None,
+    filename: Optional[str] = None,
+    as_attachment: bool = False,
+    headers: Optional[Dict[str, str]] = None,
+) -> HttpResponseBase:
+    """
+    Serves ``path`` with HTTP range support.
+
+    Args:
+        request: The (Django or DRF) request; its method and its Range, If-Range and
+            If-None-Match headers are honored.
+        path: File to serve. Raises FileNotFoundError if it does not exist.
+        content_type: Defaults to the type guessed from the file name.
+        filename: Name for Content-Disposition; defaults to the file name.
+        as_attachment: Content-Disposition ``attachment`` instead of ``inline``.
+        headers: Additional headers set on every response (e.g. CORS).
+    """
+    path = Path(path)
+    stat = path.stat()
+    size = stat.st_size
+    content_type = content_type or mimetypes.guess_type(str(path))[0] or "application/octet-stream"
+    etag = _etag(stat)
+
+    common_headers = {
+        "Accept-Ranges": "bytes",
+        "ETag": etag,
+        "Last-Modified": http_date(stat.st_mtime),
+    }
+    disposition = content_disposition_header(as_attachment, filename or path.name)
+    if disposition:
+        common_headers["Content-Disposition"] = disposition
+    common_headers.update(headers or {})
+
+    if _not_modified(request, etag):
+        response = HttpResponseNotModified()
+    elif request.method == "HEAD":
+        # Range is only defined for GET; answer with the headers of the full file without opening it
+        response = HttpResponse(content_type=content_type)
+        response["Content-Length"] = str(size)
+    elif (offloaded := _offload_response(path, content_type)) is not None:
+        response = offloaded
+    else:
+        ranges = None
+        if _if_range_matches(request, etag, stat):
+            ranges = parse_range_header(request.headers.get("Range"), size)
+
+        if ranges is None:
+            response = FileResponse(open(path, "rb"), content_type=content_type)
+            response["Content-Length"] = str(size)
+        elif not ranges:
+            response = HttpResponse(status=416)
+            response["Content-Range"] = f"bytes */{size}"
+        elif len(ranges) == 1:
+            start, end = ranges[0]
+            file_handle = open(path, "rb")
+            file_handle.seek(start)
+            range_file_class = SendfileRangeFile if env_bool("ENDOREG_MEDIA_RANGE_SENDFILE", False) else RangeFile
+            response = FileResponse(
+                range_file_class(file_handle, end - start + 1), status=206, content_type=content_type
+            )
+            response["Content-Length"] = str(end - start + 1)
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+        else:
+            response = _multipart_response(path, ranges, size, content_type)
+
+    for key, value in common_headers.items():
+        response[key] = value
+    return response
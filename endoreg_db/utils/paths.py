@@ -46,6 +46,7 @@ FRAME_DIR_NAME = "frames"
 PDF_DIR_NAME = "pdfs" # Changed from reports
 WEIGHTS_DIR_NAME = "model_weights"
 EXAMINATION_DIR_NAME = "examinations"
+PREDICTION_DIR_NAME = "predictions"
 
 RAW_VIDEO_DIR_NAME = f"{PREFIX_RAW}videos"
 RAW_FRAME_DIR_NAME = f"{PREFIX_RAW}frames"
@@ -57,6 +58,7 @@ ANONYM_VIDEO_DIR = STORAGE_DIR / ANONYM_VIDEO_DIR_NAME # Added
 FRAME_DIR = STORAGE_DIR / FRAME_DIR_NAME
 PDF_DIR = STORAGE_DIR / PDF_DIR_NAME # Changed
 WEIGHTS_DIR = STORAGE_DIR / WEIGHTS_DIR_NAME
+PREDICTION_DIR = STORAGE_DIR / PREDICTION_DIR_NAME
 RAW_VIDEO_DIR = STORAGE_DIR / RAW_VIDEO_DIR_NAME
 RAW_FRAME_DIR = STORAGE_DIR / RAW_FRAME_DIR_NAME
 RAW_PDF_DIR = STORAGE_DIR / RAW_PDF_DIR_NAME # Changed
@@ -83,6 +85,7 @@ data_paths:Dict[str,Path] = {
     "raw_frame": RAW_FRAME_DIR,
     "raw_pdf": RAW_PDF_DIR, # Changed
     "weights": WEIGHTS_DIR,
+    "prediction": PREDICTION_DIR,
     "weights_import": WEIGHTS_IMPORT_DIR,
     "export": EXPORT_DIR,
     "video_export": EXPORT_DIR / VIDEO_DIR_NAME,
@@ -9,6 +9,7 @@ from .ffmpeg_wrapper import (
     transcode_videofile_if_required,
     extract_frames as ffmpeg_extract_frames # Alias to avoid potential name clash if 'extract_frames' was used elsewhere directly from __init__
 )
+from .frame_stream import get_video_dimensions, iter_video_frames, write_video_frames
 
 
 __all__ = [
@@ -23,4 +24,8 @@ __all__ = [
     "transcode_video",
     "transcode_videofile_if_required",
     "ffmpeg_extract_frames", # Use the alias if needed
+    # In-memory frame decoding / encoding
+    "get_video_dimensions",
+    "iter_video_frames",
+    "write_video_frames",
 ]
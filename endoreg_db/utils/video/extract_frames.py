@@ -63,7 +63,7 @@ def initialize_frame_objects(
     storage_base_path = Path(video._meta.get_field('raw_file').storage.location) # Get storage root
 
     for i, path in tqdm(enumerate(extracted_paths, start=1)):
-        frame_number = int(path.stem.split("_")[1]) - 1 # Assuming frame_0000001.jpg is frame_number 0
+        frame_number = int(path.stem.split("_")[1])  # frame_0000000.jpg is frame_number 0
         relative_path = path.relative_to(storage_base_path).as_posix() # Path relative to MEDIA_ROOT
 
         # Create Frame instance (without saving yet)
@@ -1,8 +1,13 @@
 import subprocess
 import json
 import logging
+import re
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from fractions import Fraction
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, NamedTuple, Optional, Tuple
 import cv2
 from tqdm import tqdm
 import shutil
@@ -587,22 +592,207 @@ def transcode_videofile_if_required(
                 return None
         return input_path # Return original path if no copy needed
 
+_SHOWINFO_PTS_TIME = re.compile(r"Parsed_showinfo.*?pts_time:\s*(-?[0-9.]+)")
+
+
+def get_keyframe_times(video_path: Path) -> List[float]:
+    """
+    Returns the presentation times (seconds) of all keyframes of the first video stream.
+
+    Uses ffprobe if available, otherwise ffmpeg's showinfo filter. Both only decode
+    keyframes (``-skip_frame nokey``), so this is fast even for long videos.
+    Returns an empty list if the keyframes cannot be determined.
+    """
+    ffprobe_executable = shutil.which("ffprobe")
+    ffmpeg_executable = shutil.which("ffmpeg")
+    try:
+        if ffprobe_executable:
+            cmd = [
+                ffprobe_executable, "-v", "error",
+                "-select_streams", "v:0",
+                "-skip_frame", "nokey",
+                "-show_entries", "frame=best_effort_timestamp_time",
+                "-of", "csv=p=0",
+                str(video_path),
+            ]
+            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            times = [float(line.strip().rstrip(",")) for line in result.stdout.splitlines() if line.strip() not in ("", "N/A")]
+        elif ffmpeg_executable:
+            cmd = [
+                ffmpeg_executable, "-hide_banner", "-nostdin", "-nostats",
+                "-skip_frame", "nokey",
+                "-i", str(video_path),
+                "-map", "0:v:0",
+                "-vf", "showinfo",
+                "-f", "null", "-",
+            ]
+            result = subprocess.run(cmd, check=True, capture_output=True, text=True)
+            times = [float(match) for match in _SHOWINFO_PTS_TIME.findall(result.stderr)]
+        else:
+            return []
+    except (subprocess.CalledProcessError, ValueError) as e:
+        logger.warning("Could not determine keyframes of %s: %s", video_path, e)
+        return []
+    return sorted(set(times))
+
+
+def has_constant_frame_rate(video_path: Path) -> bool:
+    """
+    Returns True if the first video stream has a constant frame rate (r_frame_rate == avg_frame_rate).
+
+    Returns False if ffprobe is not available or the rates cannot be determined.
+    """
+    if not shutil.which("ffprobe"):
+        return False
+    info = get_stream_info(video_path)
+    video_streams = [s for s in (info or {}).get("streams", []) if s.get("codec_type") == "video"]
+    if not video_streams:
+        return False
+    try:
+        r_frame_rate = Fraction(video_streams[0]["r_frame_rate"])
+        avg_frame_rate = Fraction(video_streams[0]["avg_frame_rate"])
+    except (KeyError, ValueError, ZeroDivisionError):
+        return False
+    return r_frame_rate > 0 and r_frame_rate == avg_frame_rate
+
+
+class FrameChunk(NamedTuple):
+    """A keyframe-aligned range of frames extracted by one ffmpeg process."""
+    first_frame: int  # 0-based index of the first frame in the video
+    n_frames: Optional[int]  # None: until the end of the video
+    start_time: Optional[float]  # Keyframe time to seek to, None: start of the file
+
+
+def plan_frame_chunks(
+    keyframe_times: List[float], fps: float, n_chunks: int, min_chunk_frames: int = 250
+) -> List[FrameChunk]:
+    """
+    Splits a constant frame rate video into up to ``n_chunks`` ranges starting at keyframes.
+
+    Frame indices of the keyframes are derived from their timestamps and the frame rate,
+    so the chunks together cover every frame exactly once.
+    """
+    if n_chunks <= 1 or not keyframe_times or fps <= 0:
+        return [FrameChunk(0, None, None)]
+
+    t0 = keyframe_times[0]
+    keyframe_indices = sorted({int(round((t - t0) * fps)) for t in keyframe_times})
+    last_keyframe = keyframe_indices[-1]
+    target_size = max(last_keyframe / n_chunks, min_chunk_frames)
+
+    starts = [0]
+    for index in keyframe_indices[1:]:
+        if index - starts[-1] >= target_size and len(starts) < n_chunks:
+            starts.append(index)
+
+    chunks = []
+    for i, first_frame in enumerate(starts):
+        is_last = i == len(starts) - 1
+        n_frames = None if is_last else starts[i + 1] - first_frame
+        # ffmpeg measures -ss from the file's start time, so the seek is relative to the first
+        # keyframe; seek half a frame early so rounding of the keyframe time cannot skip its frame
+        start_time = None if first_frame == 0 else (first_frame - 0.5) / fps
+        chunks.append(FrameChunk(first_frame, n_frames, start_time))
+    return chunks
+
+
+def _run_frame_extraction(
+    ffmpeg_executable: str,
+    video_path: Path,
+    output_dir: Path,
+    quality: int,
+    ext: str,
+    chunk: FrameChunk,
+    fps: Optional[float] = None,
+    on_progress: Optional[Callable[[int], None]] = None,
+) -> List[Path]:
+    """
+    Runs one ffmpeg process for ``chunk`` and returns the frame files it wrote.
+
+    Output files are numbered globally after their 0-based frame number (``frame_%07d``
+    starting at ``first_frame``, like a single ffmpeg run over the whole file), matching
+    ``Frame.frame_number`` and ``Frame.relative_path``. Progress is read from ffmpeg's
+    ``-progress`` output and reported as the number of frames written so far.
+    """
+    output_pattern = output_dir / f"frame_%07d.{ext}"
+    cmd = [ffmpeg_executable, "-hide_banner", "-nostdin", "-nostats"]
+    if chunk.start_time is not None:
+        cmd.extend(["-ss", f"{chunk.start_time:.6f}"])
+    cmd.extend(["-i", str(video_path), "-qscale:v", str(quality)])
+    if fps is not None:
+        cmd.extend(["-vf", f"fps={fps}"])
+    if chunk.n_frames is not None:
+        cmd.extend(["-frames:v", str(chunk.n_frames)])
+    cmd.extend(["-start_number", str(chunk.first_frame)])
+    cmd.extend(["-progress", "pipe:1", str(output_pattern)])
+
+    logger.debug("Running FFmpeg command: %s", " ".join(cmd))
+    frames_written = 0
+    # stderr goes to a file so a chatty ffmpeg cannot block on a full pipe while we read progress
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, text=True)
+        try:
+            for line in process.stdout:
+                if line.startswith("frame="):
+                    try:
+                        frames = int(line.split("=", 1)[1])
+                    except ValueError:
+                        continue
+                    if on_progress is not None and frames > frames_written:
+                        on_progress(frames - frames_written)
+                    frames_written = max(frames_written, frames)
+            returncode = process.wait()
+        finally:
+            if process.poll() is None:
+                process.kill()
+                process.wait()
+        if returncode != 0:
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors="replace")
+            raise subprocess.CalledProcessError(returncode, cmd, stderr=stderr)
+
+    paths = []
+    number = chunk.first_frame
+    while chunk.n_frames is None or number < chunk.first_frame + chunk.n_frames:
+        frame_file = output_dir / f"frame_{number:07d}.{ext}"
+        if not frame_file.exists():
+            break
+        paths.append(frame_file)
+        number += 1
+    return paths
+
+
 def extract_frames(
     video_path: Path,
     output_dir: Path,
     quality: int,
     ext: str = "jpg",
-    fps: Optional[float] = None
+    fps: Optional[float] = None,
+    workers: int = 1,
+    progress_callback: Optional[Callable[[int, Optional[int]], None]] = None,
+    chunk_callback: Optional[Callable[[List[Path]], None]] = None,
 ) -> List[Path]:
     """
     Extracts frames from a video file using FFmpeg.
 
+    Files are named ``frame_{n:07d}.ext`` after their 0-based frame number, like
+    ``extract_selected_frames``. With ``workers > 1`` the video is split into
+    keyframe-aligned chunks that are extracted by concurrent ffmpeg processes; file
+    names are numbered globally, so the result is the same as for a single run.
+
     Args:
         video_path: Path to the input video file.
         output_dir: Directory to save the extracted frames.
         quality: Quality factor for JPEG extraction (1-31, lower is better).
         ext: Output frame image extension (e.g., 'jpg', 'png').
         fps: Optional frames per second to extract. If None, extracts all frames.
+            Resampling needs one continuous run, so ``fps`` disables chunking.
+        workers: Number of concurrent ffmpeg processes. Only used for videos with a
+            constant frame rate; others are extracted in one process.
+        progress_callback: Called as ``progress_callback(frames_done, frames_total)``
+            while frames are written; frames_total may be None.
+        chunk_callback: Called with the frame paths of each finished chunk, in
+            completion order, from the calling thread.
 
     Returns:
         A list of Path objects for the extracted frames.
@@ -615,25 +805,47 @@ def extract_frames(
         raise FileNotFoundError(error_msg)
 
     output_dir.mkdir(parents=True, exist_ok=True)
-    output_pattern = output_dir / f"frame_%07d.{ext}"
 
-    cmd = [
-        ffmpeg_executable, # Use the found executable path
-        "-i", str(video_path),
-        "-qscale:v", str(quality), # Video quality scale
-    ]
-
-    if fps is not None:
-        cmd.extend(["-vf", f"fps={fps}"])
-
-    cmd.append(str(output_pattern))
+    chunks = [FrameChunk(0, None, None)]
+    frames_total = None
+    if workers > 1 and fps is None:
+        video_fps, frames_total = _get_fps_and_frame_count(video_path)
+        if not has_constant_frame_rate(video_path):
+            # Frame numbers of the chunks are derived from keyframe times, which needs a constant frame rate
+            logger.info("%s has no verifiable constant frame rate, extracting frames in one process.", video_path.name)
+        elif video_fps:
+            chunks = plan_frame_chunks(get_keyframe_times(video_path), video_fps, workers)
+        logger.info("Extracting frames of %s in %d chunk(s) with up to %d workers.", video_path.name, len(chunks), workers)
+
+    progress_lock = threading.Lock()
+    frames_done = 0
+
+    def on_progress(new_frames: int):
+        nonlocal frames_done
+        if progress_callback is None:
+            return
+        with progress_lock:
+            frames_done += new_frames
+            progress_callback(frames_done, frames_total)
+
+    def run(chunk: FrameChunk) -> List[Path]:
+        return _run_frame_extraction(
+            ffmpeg_executable, video_path, output_dir, quality, ext, chunk, fps=fps, on_progress=on_progress
+        )
 
-    logger.info("Running FFmpeg command: %s", " ".join(cmd))
+    extracted_files: List[Path] = []
     try:
-        # Use subprocess.run for better error handling
-        result = subprocess.run(cmd, check=True, capture_output=True, text=True)
-        logger.debug("FFmpeg stdout:\n%s", result.stdout)
-        logger.debug("FFmpeg stderr:\n%s", result.stderr)
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(chunks)))) as pool:
+            futures = [pool.submit(run, chunk) for chunk in chunks]
+            try:
+                for future in as_completed(futures):
+                    chunk_files = future.result()
+                    extracted_files.extend(chunk_files)
+                    if chunk_callback is not None:
+                        chunk_callback(chunk_files)
+            finally:
+                for future in futures:
+                    future.cancel()
         logger.info("FFmpeg frame extraction completed successfully.")
     except FileNotFoundError as exc:
         # This might be redundant now but kept for safety
@@ -643,18 +855,27 @@ def extract_frames(
     except subprocess.CalledProcessError as e:
         logger.error("FFmpeg command failed with exit code %d.", e.returncode)
         logger.error("FFmpeg stderr:\n%s", e.stderr)
-        logger.error("FFmpeg stdout:\n%s", e.stdout)
         # Return empty list on error as frames were likely not created correctly
         return []
     except Exception as e:
         logger.error("An unexpected error occurred during FFmpeg execution: %s", e, exc_info=True)
         return []
 
-
-    # Collect paths of extracted frames
-    extracted_files = sorted(output_dir.glob(f"frame_*.{ext}"))
+    extracted_files.sort()
     return extracted_files
 
+
+def _get_fps_and_frame_count(video_path: Path) -> Tuple[Optional[float], Optional[int]]:
+    cap = cv2.VideoCapture(str(video_path))
+    try:
+        if not cap.isOpened():
+            return None, None
+        fps = cap.get(cv2.CAP_PROP_FPS) or None
+        frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or None
+        return fps, frame_count
+    finally:
+        cap.release()
+
 def extract_frame_range(
     video_path: Path,
     output_dir: Path,
@@ -713,6 +934,7 @@ def extract_frame_range(
         "-vsync", "vfr", # Variable frame rate sync to handle selected frames
         "-qscale:v", str(quality),
         "-copyts", # Attempt to copy timestamps if needed, might not be accurate with select
+        "-start_number", str(start_frame),  # selected frames are written sequentially
         str(output_pattern),
     ]
 
@@ -760,6 +982,331 @@ def extract_frame_range(
     logger.info("Found %d extracted frame files in range [%d, %d) for video %s.", len(extracted_files), start_frame, end_frame, video_path.name)
     return extracted_files
 
+class FrameSelection(NamedTuple):
+    """
+    Frames a consumer needs from a video, as a stride, explicit frame numbers or times.
+
+    Exactly one field should be set. ``frame_numbers`` are 0-based, ``times`` are in
+    seconds and are rounded to the nearest frame.
+    """
+    stride: Optional[int] = None
+    frame_numbers: Optional[List[int]] = None
+    times: Optional[List[float]] = None
+
+    @classmethod
+    def evenly_spaced(cls, n_frames: int, frame_count: int) -> "FrameSelection":
+        """Selects ``n_frames`` frames spread evenly over a video of ``frame_count`` frames."""
+        n_frames = max(1, min(n_frames, frame_count))
+        step = frame_count / n_frames
+        return cls(frame_numbers=sorted({int(i * step) for i in range(n_frames)}))
+
+    def resolve(self, fps: Optional[float], frame_count: Optional[int]) -> List[int]:
+        """
+        Returns the sorted, de-duplicated 0-based frame numbers of this selection.
+
+        Frame numbers beyond ``frame_count`` (if known) are dropped.
+
+        Raises:
+            ValueError: If the selection is empty or ambiguous, or ``times`` are given
+                without a frame rate.
+        """
+        given = [field for field in (self.stride, self.frame_numbers, self.times) if field is not None]
+        if len(given) != 1:
+            raise ValueError("FrameSelection needs exactly one of stride, frame_numbers or times.")
+
+        if self.stride is not None:
+            if self.stride < 1:
+                raise ValueError(f"Stride must be positive, got {self.stride}.")
+            if not frame_count:
+                raise ValueError("A stride selection needs the frame count of the video.")
+            numbers = range(0, frame_count, self.stride)
+        elif self.frame_numbers is not None:
+            numbers = self.frame_numbers
+        else:
+            if not fps:
+                raise ValueError("A time selection needs the frame rate of the video.")
+            numbers = [int(round(t * fps)) for t in self.times]
+
+        return sorted({n for n in numbers if n >= 0 and (not frame_count or n < frame_count)})
+
+
+# Above this average distance between selected frames, seeking to every frame is cheaper
+# than decoding the whole video once (a seek decodes at most one GOP).
+SEEK_MIN_FRAME_GAP = 250
+
+
+def _select_expression(frame_numbers: List[int]) -> str:
+    """Builds an ffmpeg ``select`` expression matching exactly ``frame_numbers`` (sorted)."""
+    first, last = frame_numbers[0], frame_numbers[-1]
+    if len(frame_numbers) > 2:
+        stride = frame_numbers[1] - first
+        if stride > 1 and all(b - a == stride for a, b in zip(frame_numbers, frame_numbers[1:])):
+            return f"between(n,{first},{last})*not(mod(n-{first},{stride}))"
+
+    terms = []
+    run_start = previous = first
+    for number in frame_numbers[1:] + [None]:
+        if number is not None and number == previous + 1:
+            previous = number
+            continue
+        terms.append(f"eq(n,{run_start})" if run_start == previous else f"between(n,{run_start},{previous})")
+        run_start = previous = number
+    return "+".join(terms)
+
+
+def extract_selected_frames(
+    video_path: Path,
+    output_dir: Path,
+    selection: FrameSelection,
+    quality: int,
+    ext: str = "jpg",
+    fps: Optional[float] = None,
+    frame_count: Optional[int] = None,
+) -> Dict[int, Path]:
+    """
+    Extracts only the frames of ``selection`` from a video using FFmpeg.
+
+    Sparse selections (e.g. a handful of OCR frames) seek to each frame and decode
+    only from the preceding keyframe; dense ones (e.g. every 25th frame for a
+    low-fps preview) run one decoding pass with a ``select`` filter, so only the
+    selected frames are encoded and written. Files are named ``frame_{n:07d}.ext``
+    after their 0-based frame number, matching ``Frame.relative_path``.
+
+    Args:
+        video_path: Path to the input video file.
+        output_dir: Directory to save the extracted frames.
+        selection: The frames to extract.
+        quality: Quality factor for JPEG extraction (1-31, lower is better).
+        ext: Output frame image extension (e.g., 'jpg', 'png').
+        fps, frame_count: Video properties; read from the file if not given.
+
+    Returns:
+        Mapping of frame number to the extracted file, for the frames that were written.
+
+    Raises:
+        FileNotFoundError: If the FFmpeg executable is not found.
+        ValueError: If the selection cannot be resolved.
+        RuntimeError: If FFmpeg fails.
+    """
+    ffmpeg_executable = shutil.which("ffmpeg")
+    if not ffmpeg_executable:
+        error_msg = "ffmpeg command not found. Ensure FFmpeg is installed and in the system's PATH."
+        logger.error(error_msg)
+        raise FileNotFoundError(error_msg)
+
+    if fps is None or frame_count is None:
+        probed_fps, probed_count = _get_fps_and_frame_count(video_path)
+        fps = fps or probed_fps
+        frame_count = frame_count or probed_count
+
+    frame_numbers = selection.resolve(fps, frame_count)
+    if not frame_numbers:
+        return {}
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    span = frame_numbers[-1] - frame_numbers[0] + 1
+    use_seek = bool(fps) and span / len(frame_numbers) > SEEK_MIN_FRAME_GAP
+    logger.info(
+        "Extracting %d selected frames of %s by %s.",
+        len(frame_numbers), video_path.name, "seeking" if use_seek else "select filter",
+    )
+
+    try:
+        if use_seek:
+            extracted = _extract_frames_by_seeking(
+                ffmpeg_executable, video_path, output_dir, frame_numbers, fps, quality, ext
+            )
+        else:
+            extracted = _extract_frames_by_select(
+                ffmpeg_executable, video_path, output_dir, frame_numbers, quality, ext
+            )
+    except subprocess.CalledProcessError as e:
+        logger.error("FFmpeg command failed with exit code %d.", e.returncode)
+        logger.error("FFmpeg stderr:\n%s", e.stderr)
+        raise RuntimeError(f"FFmpeg selected frame extraction failed for {video_path}") from e
+
+    if len(extracted) < len(frame_numbers):
+        logger.warning(
+            "Only %d of %d selected frames could be extracted from %s.",
+            len(extracted), len(frame_numbers), video_path.name,
+        )
+    return extracted
+
+
+def _extract_frames_by_seeking(
+    ffmpeg_executable: str,
+    video_path: Path,
+    output_dir: Path,
+    frame_numbers: List[int],
+    fps: float,
+    quality: int,
+    ext: str,
+) -> Dict[int, Path]:
+    extracted = {}
+    for number in frame_numbers:
+        frame_file = output_dir / f"frame_{number:07d}.{ext}"
+        cmd = [ffmpeg_executable, "-hide_banner", "-nostdin", "-nostats", "-loglevel", "error", "-y"]
+        if number:
+            # Accurate seek: decodes from the preceding keyframe and drops frames before
+            # the target. Half a frame early, so timestamp rounding cannot skip it.
+            cmd.extend(["-ss", f"{(number - 0.5) / fps:.6f}"])
+        cmd.extend(["-i", str(video_path), "-frames:v", "1", "-qscale:v", str(quality), str(frame_file)])
+        subprocess.run(cmd, check=True, capture_output=True, text=True)
+        if frame_file.exists():
+            extracted[number] = frame_file
+    return extracted
+
+
+def _extract_frames_by_select(
+    ffmpeg_executable: str,
+    video_path: Path,
+    output_dir: Path,
+    frame_numbers: List[int],
+    quality: int,
+    ext: str,
+) -> Dict[int, Path]:
+    # ffmpeg numbers the selected frames sequentially; write them to a scratch
+    # directory next to the target and rename them after their frame numbers.
+    extracted = {}
+    with tempfile.TemporaryDirectory(dir=output_dir, prefix=".select_") as scratch:
+        scratch_dir = Path(scratch)
+        cmd = [
+            ffmpeg_executable, "-hide_banner", "-nostdin", "-nostats", "-loglevel", "error",
+            "-i", str(video_path),
+            "-vf", f"select='{_select_expression(frame_numbers)}'",
+            "-vsync", "vfr",
+            "-qscale:v", str(quality),
+            str(scratch_dir / f"frame_%07d.{ext}"),
+        ]
+        subprocess.run(cmd, check=True, capture_output=True, text=True)
+        for index, number in enumerate(frame_numbers, start=1):
+            written = scratch_dir / f"frame_{index:07d}.{ext}"
+            if not written.exists():
+                break
+            frame_file = output_dir / f"frame_{number:07d}.{ext}"
+            written.replace(frame_file)
+            extracted[number] = frame_file
+    return extracted
+
+
+def build_anonymization_filter(
+    width: int,
+    height: int,
+    endo_roi: Dict[str, int],
+    blackout_ranges: List[Tuple[int, int]],
+    censor_color: Tuple[int, int, int] = (0, 0, 0),
+) -> str:
+    """
+    Builds an ffmpeg filter graph that anonymizes a video like ``anonymize_frame``.
+
+    Pixels outside the endoscope ROI are blacked out by cropping to the ROI and padding
+    back to the full frame; frames within ``blackout_ranges`` are filled with
+    ``censor_color``. Filtering happens in RGB so odd ROI offsets are exact.
+
+    Args:
+        width, height: Frame dimensions of the input video.
+        endo_roi: Dictionary with 'x', 'y', 'width' and 'height' of the endoscope ROI.
+        blackout_ranges: Sorted, non-overlapping inclusive (first, last) frame number ranges.
+        censor_color: BGR color tuple for blacked out frames.
+
+    Raises:
+        ValueError: If endo_roi is missing keys.
+    """
+    required_keys = {"x", "y", "width", "height"}
+    if not required_keys.issubset(endo_roi):
+        raise ValueError(f"Invalid endo_roi dictionary provided: {endo_roi}. Missing keys.")
+
+    x1, y1 = max(0, endo_roi["x"]), max(0, endo_roi["y"])
+    x2 = min(width, endo_roi["x"] + endo_roi["width"])
+    y2 = min(height, endo_roi["y"] + endo_roi["height"])
+
+    filters = ["format=rgb24"]
+    if x1 >= x2 or y1 >= y2:
+        logger.warning("ROI %s is outside or invalid for frame dimensions %dx%d. Output will be black.", endo_roi, width, height)
+        filters.append("lutrgb=r=0:g=0:b=0")
+    elif (x1, y1, x2, y2) != (0, 0, width, height):
+        filters.append(f"crop={x2 - x1}:{y2 - y1}:{x1}:{y1}")
+        filters.append(f"pad={width}:{height}:{x1}:{y1}:color=black")
+
+    if blackout_ranges:
+        blue, green, red = censor_color
+        enable = "+".join(
+            f"eq(n,{first})" if first == last else f"between(n,{first},{last})" for first, last in blackout_ranges
+        )
+        filters.append(f"lutrgb=r={red}:g={green}:b={blue}:enable='{enable}'")
+
+    if width % 2 or height % 2:
+        # yuv420p output needs even dimensions
+        filters.append("pad=ceil(iw/2)*2:ceil(ih/2)*2")
+    return ",".join(filters)
+
+
+def anonymize_video_with_filters(
+    input_path: Path,
+    output_path: Path,
+    width: int,
+    height: int,
+    endo_roi: Dict[str, int],
+    blackout_ranges: List[Tuple[int, int]],
+    censor_color: Tuple[int, int, int] = (0, 0, 0),
+    quality_mode: str = "balanced",
+) -> Path:
+    """
+    Anonymizes a video in a single FFmpeg run using ``build_anonymization_filter``.
+
+    Decoding, masking and encoding all happen inside FFmpeg; audio is dropped. The filter
+    graph is passed as a script file, so videos with many blackout ranges do not hit
+    command line length limits.
+
+    Returns:
+        The output path.
+
+    Raises:
+        FileNotFoundError: If the input file or the FFmpeg executable is not found.
+        RuntimeError: If FFmpeg fails.
+    """
+    if not input_path.exists():
+        raise FileNotFoundError(f"Input video not found for anonymization: {input_path}")
+    ffmpeg_executable = shutil.which("ffmpeg")
+    if not ffmpeg_executable:
+        error_msg = "ffmpeg command not found. Ensure FFmpeg is installed and in the system's PATH."
+        logger.error(error_msg)
+        raise FileNotFoundError(error_msg)
+
+    filter_graph = build_anonymization_filter(width, height, endo_roi, blackout_ranges, censor_color)
+    encoder_args, encoder_type = _build_encoder_args(quality_mode)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    with tempfile.NamedTemporaryFile("w", suffix=".ffgraph", delete=False) as script_file:
+        script_file.write(filter_graph)
+        script_path = Path(script_file.name)
+    try:
+        cmd = [
+            ffmpeg_executable, "-hide_banner", "-nostdin", "-nostats", "-loglevel", "error", "-y",
+            "-i", str(input_path),
+            "-map", "0:v:0",
+            "-vsync", "passthrough",  # Keep n in the filter graph equal to the decoded frame number
+            "-filter_script:v", str(script_path),
+            *encoder_args,
+            "-pix_fmt", "yuv420p",
+            "-movflags", "+faststart",
+            str(output_path),
+        ]
+        logger.info(
+            "Anonymizing %s with FFmpeg filters (%s, %d blackout ranges).",
+            input_path.name, encoder_type, len(blackout_ranges),
+        )
+        logger.debug("FFmpeg filter graph: %s", filter_graph)
+        subprocess.run(cmd, check=True, capture_output=True, text=True)
+    except subprocess.CalledProcessError as e:
+        logger.error("FFmpeg command failed with exit code %d.", e.returncode)
+        logger.error("FFmpeg stderr:\n%s", e.stderr)
+        raise RuntimeError(f"FFmpeg anonymization failed for {input_path}") from e
+    finally:
+        script_path.unlink(missing_ok=True)
+    return output_path
+
+
 __all__ = [
     "is_ffmpeg_available", # ADDED
     "check_ffmpeg_availability", # ADDED
@@ -769,4 +1316,10 @@ __all__ = [
     "transcode_videofile_if_required",
     "extract_frames",
     "extract_frame_range", # Add new function to __all__
+    "get_keyframe_times",
+    "plan_frame_chunks",
+    "FrameSelection",
+    "extract_selected_frames",
+    "build_anonymization_filter",
+    "anonymize_video_with_filters",
 ]
@@ -0,0 +1,304 @@
+"""
+Decodes and encodes video frames in memory without writing frame images to disk.
+
+Frames are read from an ffmpeg ``rawvideo`` pipe (RGB24) and yielded as NumPy arrays
+together with their 0-based frame number. ``write_video_frames`` is the inverse: it
+pipes RGB24 frames into an ffmpeg encoder. If FFmpeg is not available, OpenCV's
+``VideoCapture`` / ``VideoWriter`` are used as fallbacks.
+"""
+
+import logging
+import shutil
+import subprocess
+import tempfile
+from pathlib import Path
+from typing import Iterable, Iterator, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from .ffmpeg_wrapper import _build_encoder_args, get_stream_info
+
+logger = logging.getLogger(__name__)
+
+DECODER_BACKENDS = ("auto", "ffmpeg", "opencv")
+
+
+def get_video_dimensions(video_path: Path) -> Tuple[int, int]:
+    """
+    Returns the (width, height) of the first video stream of a file.
+
+    Uses ffprobe if available, otherwise OpenCV.
+
+    Raises:
+        ValueError: If the dimensions cannot be determined.
+    """
+    if shutil.which("ffprobe"):
+        stream_info = get_stream_info(video_path)
+        streams = stream_info.get("streams", []) if stream_info else []
+        video_stream = next((s for s in streams if s.get("codec_type") == "video"), None)
+        if video_stream and video_stream.get("width") and video_stream.get("height"):
+            return int(video_stream["width"]), int(video_stream["height"])
+
+    capture = cv2.VideoCapture(str(video_path))
+    try:
+        width = int(capture.get(cv2.CAP_PROP_FRAME_WIDTH))
+        height = int(capture.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    finally:
+        capture.release()
+
+    if width <= 0 or height <= 0:
+        raise ValueError(f"Could not determine frame dimensions of {video_path}")
+    return width, height
+
+
+def iter_video_frames(
+    video_path: Path,
+    start_frame: int = 0,
+    max_frames: Optional[int] = None,
+    backend: str = "auto",
+) -> Iterator[Tuple[int, np.ndarray]]:
+    """
+    Yields ``(frame_number, frame)`` tuples for a video file.
+
+    Each frame is an RGB ``uint8`` array of shape (height, width, 3). Frame numbers are
+    0-based and match the positions of frames extracted by ``extract_frames``.
+
+    Args:
+        video_path: Path to the video file.
+        start_frame: First frame number to yield (earlier frames are decoded and dropped).
+        max_frames: Stop after yielding this many frames. None yields until the end.
+        backend: 'ffmpeg', 'opencv' or 'auto' (ffmpeg if available, else opencv).
+
+    Raises:
+        FileNotFoundError: If the video file does not exist.
+        ValueError: If an unknown backend is requested.
+        RuntimeError: If the decoder fails.
+    """
+    video_path = Path(video_path)
+    if not video_path.exists():
+        raise FileNotFoundError(f"Video file not found for decoding: {video_path}")
+    if backend not in DECODER_BACKENDS:
+        raise ValueError(f"Unknown decoder backend '{backend}'. Expected one of {DECODER_BACKENDS}.")
+
+    if backend == "auto":
+        backend = "ffmpeg" if shutil.which("ffmpeg") else "opencv"
+
+    if backend == "ffmpeg":
+        yield from _iter_frames_ffmpeg(video_path, start_frame, max_frames)
+    else:
+        yield from _iter_frames_opencv(video_path, start_frame, max_frames)
+
+
+def _iter_frames_ffmpeg(
+    video_path: Path, start_frame: int, max_frames: Optional[int]
+) -> Iterator[Tuple[int, np.ndarray]]:
+    ffmpeg_executable = shutil.which("ffmpeg")
+    if not ffmpeg_executable:
+        raise FileNotFoundError("ffmpeg command not found. Ensure FFmpeg is installed and in the system's PATH.")
+
+    width, height = get_video_dimensions(video_path)
+    frame_size = width * height * 3
+
+    cmd = [
+        ffmpeg_executable,
+        "-v", "error",
+        "-i", str(video_path),
+        "-map", "0:v:0",
+        "-vsync", "passthrough",  # One output frame per decoded frame, no dup/drop
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        "-",
+    ]
+    logger.debug("Running FFmpeg decode command: %s", " ".join(cmd))
+
+    # stderr goes to a temp file so a chatty decoder cannot block on a full pipe
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=stderr_file, bufsize=frame_size)
+        assert process.stdout is not None
+        frame_number = 0
+        yielded = 0
+        try:
+            while max_frames is None or yielded < max_frames:
+                # Fresh writable buffer per frame; consumers may keep or modify frames
+                buffer = bytearray(frame_size)
+                n_read = _read_exact(process.stdout, buffer)
+                if n_read < frame_size:
+                    if n_read:
+                        logger.warning("Discarding truncated trailing frame of %s.", video_path.name)
+                    break
+                if frame_number >= start_frame:
+                    frame = np.frombuffer(buffer, dtype=np.uint8).reshape(height, width, 3)
+                    yield frame_number, frame
+                    yielded += 1
+                frame_number += 1
+        finally:
+            if process.poll() is None:
+                process.kill()
+            process.stdout.close()
+            returncode = process.wait()
+
+        stopped_early = max_frames is not None and yielded >= max_frames
+        if returncode != 0 and not stopped_early:
+            stderr_file.seek(0)
+            stderr_output = stderr_file.read().decode(errors="replace")
+            logger.error("FFmpeg decoding of %s failed with exit code %d:\n%s", video_path.name, returncode, stderr_output)
+            raise RuntimeError(f"FFmpeg decoding failed for {video_path}")
+
+
+def _read_exact(stream, buffer: bytearray) -> int:
+    """Fills buffer from stream until it is full or EOF is reached; returns bytes read."""
+    view = memoryview(buffer)
+    total = 0
+    while total < len(buffer):
+        n = stream.readinto(view[total:])
+        if not n:
+            break
+        total += n
+    return total
+
+
+def _iter_frames_opencv(
+    video_path: Path, start_frame: int, max_frames: Optional[int]
+) -> Iterator[Tuple[int, np.ndarray]]:
+    capture = cv2.VideoCapture(str(video_path))
+    if not capture.isOpened():
+        raise RuntimeError(f"OpenCV could not open video {video_path}")
+
+    frame_number = 0
+    yielded = 0
+    try:
+        while max_frames is None or yielded < max_frames:
+            ok, frame = capture.read()
+            if not ok:
+                break
+            if frame_number >= start_frame:
+                yield frame_number, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                yielded += 1
+            frame_number += 1
+    finally:
+        capture.release()
+
+
+def write_video_frames(
+    frames: Iterable[np.ndarray],
+    output_path: Path,
+    fps: float,
+    width: int,
+    height: int,
+    backend: str = "auto",
+    quality_mode: str = "balanced",
+) -> int:
+    """
+    Encodes RGB ``uint8`` frames of shape (height, width, 3) into a video file.
+
+    Frames are consumed lazily, so only the frame currently being written is held in
+    memory. The ffmpeg backend uses the preferred H.264 encoder (NVENC if available).
+
+    Args:
+        frames: Iterable of RGB frames, e.g. masked frames from ``iter_video_frames``.
+        output_path: Path of the video file to write; overwritten if it exists.
+        fps: Frame rate of the output video.
+        width: Frame width in pixels.
+        height: Frame height in pixels.
+        backend: 'ffmpeg', 'opencv' or 'auto' (ffmpeg if available, else opencv).
+        quality_mode: Encoder quality mode passed to the ffmpeg encoder settings.
+
+    Returns:
+        The number of frames written.
+
+    Raises:
+        ValueError: If an unknown backend is requested or a frame has the wrong shape.
+        RuntimeError: If the encoder fails.
+    """
+    output_path = Path(output_path)
+    if backend not in DECODER_BACKENDS:
+        raise ValueError(f"Unknown encoder backend '{backend}'. Expected one of {DECODER_BACKENDS}.")
+
+    if backend == "auto":
+        backend = "ffmpeg" if shutil.which("ffmpeg") else "opencv"
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    if backend == "ffmpeg":
+        return _write_frames_ffmpeg(frames, output_path, fps, width, height, quality_mode)
+    return _write_frames_opencv(frames, output_path, fps, width, height)
+
+
+def _check_frame_shape(frame: np.ndarray, width: int, height: int) -> None:
+    if frame.shape != (height, width, 3):
+        raise ValueError(f"Frame has shape {frame.shape}, expected {(height, width, 3)}.")
+
+
+def _write_frames_ffmpeg(
+    frames: Iterable[np.ndarray], output_path: Path, fps: float, width: int, height: int, quality_mode: str
+) -> int:
+    ffmpeg_executable = shutil.which("ffmpeg")
+    if not ffmpeg_executable:
+        raise FileNotFoundError("ffmpeg command not found. Ensure FFmpeg is installed and in the system's PATH.")
+
+    encoder_args, encoder_type = _build_encoder_args(quality_mode)
+    cmd = [
+        ffmpeg_executable,
+        "-v", "error",
+        "-y",
+        "-f", "rawvideo",
+        "-pix_fmt", "rgb24",
+        "-s", f"{width}x{height}",
+        "-framerate", str(fps),
+        "-i", "-",
+    ]
+    if width % 2 or height % 2:
+        # yuv420p needs even dimensions
+        cmd += ["-vf", "pad=ceil(iw/2)*2:ceil(ih/2)*2"]
+    cmd += [*encoder_args, "-pix_fmt", "yuv420p", "-movflags", "+faststart", str(output_path)]
+    logger.debug("Running FFmpeg encode command (%s): %s", encoder_type, " ".join(cmd))
+
+    n_written = 0
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(cmd, stdin=subprocess.PIPE, stderr=stderr_file)
+        assert process.stdin is not None
+        try:
+            for frame in frames:
+                _check_frame_shape(frame, width, height)
+                process.stdin.write(np.ascontiguousarray(frame).data)
+                n_written += 1
+            process.stdin.close()
+        except BrokenPipeError:
+            # The encoder exited early; its exit code and stderr are reported below
+            pass
+        except BaseException:
+            process.kill()
+            process.wait()
+            raise
+        returncode = process.wait()
+
+        if returncode != 0:
+            stderr_file.seek(0)
+            stderr_output = stderr_file.read().decode(errors="replace")
+            logger.error("FFmpeg encoding of %s failed with exit code %d:\n%s", output_path.name, returncode, stderr_output)
+            raise RuntimeError(f"FFmpeg encoding failed for {output_path}")
+    return n_written
+
+
+def _write_frames_opencv(frames: Iterable[np.ndarray], output_path: Path, fps: float, width: int, height: int) -> int:
+    fourcc = cv2.VideoWriter_fourcc(*"mp4v")  # type: ignore
+    writer = cv2.VideoWriter(str(output_path), fourcc, fps, (width, height))
+    if not writer.isOpened():
+        raise RuntimeError(f"OpenCV could not open video writer for {output_path}")
+
+    n_written = 0
+    try:
+        for frame in frames:
+            _check_frame_shape(frame, width, height)
+            writer.write(cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+            n_written += 1
+    finally:
+        writer.release()
+    return n_written
+
+
+__all__ = [
+    "get_video_dimensions",
+    "iter_video_frames",
+    "write_video_frames",
+]
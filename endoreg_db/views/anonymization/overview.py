@@ -1,16 +1,22 @@
 # endoreg_db/api/views/anonymization_overview.py
 
+import base64
+import json
+from datetime import datetime
+from itertools import chain
+
 from rest_framework import status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.db import transaction
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.functions import Length, Trim
 from endoreg_db.utils.permissions import DEBUG_PERMISSIONS
 from endoreg_db.services.anonymization import AnonymizationService
 from endoreg_db.services.polling_coordinator import PollingCoordinator, ProcessingLockContext
 from rest_framework.generics import ListAPIView
-from rest_framework.pagination import PageNumberPagination
-from endoreg_db.models import VideoFile, RawPdfFile
+from endoreg_db.models import VideoFile, RawPdfFile, LabelVideoSegment
 from ...serializers import FileOverviewSerializer, VoPPatientDataSerializer
 from django.http import JsonResponse
 import logging
@@ -18,8 +24,41 @@ logger = logging.getLogger(__name__)
 PERMS = DEBUG_PERMISSIONS   # shorten
 
 # ---------- overview ----------------------------------------------------
-class NoPagination(PageNumberPagination):
-    page_size = None
+MAX_OVERVIEW_PAGE_SIZE = 500
+
+
+def _overview_key(item) -> tuple:
+    """Sort key of the merged feed: newest first, then media type and id (descending)."""
+    if isinstance(item, VideoFile):
+        return (item.uploaded_at, "video", item.pk)
+    return (item.date_created, "pdf", item.pk)
+
+
+def _encode_overview_cursor(item) -> str:
+    created_at, media_type, pk = _overview_key(item)
+    raw = json.dumps([created_at.isoformat(), media_type, pk])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_overview_cursor(cursor: str) -> tuple:
+    """Raises ValueError for malformed cursors."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        created_at, media_type, pk = json.loads(raw)
+        return datetime.fromisoformat(created_at), str(media_type), int(pk)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+def _after_cursor(queryset, created_field: str, media_type: str, cursor: tuple):
+    """Rows of ``queryset`` (all of ``media_type``) that come after ``cursor`` in the feed order."""
+    created_at, cursor_type, cursor_pk = cursor
+    older = Q(**{f"{created_field}__lt": created_at})
+    if media_type < cursor_type:
+        return queryset.filter(older | Q(**{created_field: created_at}))
+    if media_type == cursor_type:
+        return queryset.filter(older | Q(**{created_field: created_at, "pk__lt": cursor_pk}))
+    return queryset.filter(older)
 
 
 class AnonymizationOverviewView(ListAPIView):
@@ -27,33 +66,101 @@ class AnonymizationOverviewView(ListAPIView):
     GET /api/anonymization/items/overview/
     --------------------------------------
     Returns a flat list (Video + PDF) ordered by newest upload first.
+
+    Query parameters:
+    - limit: Page size (max 500); enables keyset pagination
+    - cursor: Continue after the item the cursor points to (from ``X-Next-Cursor``)
+    - include_text: "true" to include text/anonymizedText (deferred otherwise)
+
+    Pages are plain lists; the cursor of the next page is sent in the
+    ``X-Next-Cursor`` header (and a ``Link: <...>; rel="next"`` header).
+    Annotation status and PDF anonymization status are annotated in SQL, so a
+    page costs a fixed number of queries.
     """
     serializer_class = FileOverviewSerializer
     permission_classes = DEBUG_PERMISSIONS   
-    pagination_class = NoPagination
+    pagination_class = None
 
-    def get_queryset(self):
-        """
-        Returns a combined queryset of VideoFile and RawPdfFile instances.
-        """
-        # 1) VideoFile queryset - only fields that exist on VideoFile
+    def include_text(self) -> bool:
+        return str(self.request.query_params.get("include_text", "")).lower() in ("1", "true", "yes")
+
+    def get_video_queryset(self):
+        include_text = self.include_text()
         qs_video = (
             VideoFile.objects
             .select_related("state", "sensitive_meta")
-            .prefetch_related("label_video_segments__state")
             .only("id", "original_file_name", "raw_file", "uploaded_at", "state", "sensitive_meta")
+            .annotate(
+                has_validated_segments=Exists(
+                    LabelVideoSegment.objects.filter(video_file=OuterRef("pk"), state__is_validated=True)
+                )
+            )
+            .order_by("-uploaded_at", "-pk")
         )
-        # 2) RawPdfFile queryset - only fields that exist on RawPdfFile
-        qs_pdf = (
+        if include_text:
+            # Text is built from the sensitive meta, its center, gender and examiners
+            qs_video = (
+                qs_video
+                .select_related("sensitive_meta__center", "sensitive_meta__patient_gender")
+                .prefetch_related("sensitive_meta__examiners")
+            )
+        return qs_video
+
+    def get_pdf_queryset(self):
+        fields = ["id", "file", "date_created", "sensitive_meta"]
+        if self.include_text():
+            fields += ["text", "anonymized_text"]
+        return (
             RawPdfFile.objects
-            .select_related("sensitive_meta")
-            .only("id", "file", "date_created", 
-                "text", "anonymized_text",     
-                "sensitive_meta")
+            .select_related("sensitive_meta__state")
+            .only(*fields)
+            .annotate(anonymized_text_length=Length(Trim("anonymized_text")))
+            .order_by("-date_created", "-pk")
+        )
 
+    def get_queryset(self):
+        """
+        Returns VideoFile and RawPdfFile instances merged in feed order (unpaginated).
+        """
+        return sorted(
+            chain(self.get_video_queryset(), self.get_pdf_queryset()), key=_overview_key, reverse=True
         )
 
-        return list(qs_video) + list(qs_pdf)
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context["include_text"] = self.include_text()
+        return context
+
+    def list(self, request, *args, **kwargs):
+        params = request.query_params
+        if "limit" not in params and "cursor" not in params:
+            return Response(self.get_serializer(self.get_queryset(), many=True).data)
+
+        try:
+            limit = min(max(int(params.get("limit", 50)), 1), MAX_OVERVIEW_PAGE_SIZE)
+            cursor = _decode_overview_cursor(params["cursor"]) if params.get("cursor") else None
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        qs_video = self.get_video_queryset()
+        qs_pdf = self.get_pdf_queryset()
+        if cursor is not None:
+            qs_video = _after_cursor(qs_video, "uploaded_at", "video", cursor)
+            qs_pdf = _after_cursor(qs_pdf, "date_created", "pdf", cursor)
+        # Each source contributes at most limit + 1 rows; one extra row tells whether there is a next page
+        items = sorted(chain(qs_video[:limit + 1], qs_pdf[:limit + 1]), key=_overview_key, reverse=True)
+        page = items[:limit]
+
+        response = Response(self.get_serializer(page, many=True).data)
+        if len(items) > limit:
+            next_cursor = _encode_overview_cursor(page[-1])
+            query = params.copy()
+            query["cursor"] = next_cursor
+            query["limit"] = str(limit)
+            response["X-Next-Cursor"] = next_cursor
+            response["Link"] = f'<{request.build_absolute_uri(request.path)}?{query.urlencode()}>; rel="next"'
+        response["Access-Control-Expose-Headers"] = "X-Next-Cursor, Link"
+        return response
     
 class AnonymizationValidateView(APIView):
     """
@@ -1,8 +1,7 @@
-from django.http import FileResponse, Http404, StreamingHttpResponse
+from django.http import Http404
 import mimetypes
 import os
 import logging
-import re
 from ...models import RawPdfFile
 from ...serializers._old.raw_pdf_meta_validation import PDFFileForMetaSerializer, SensitiveMetaUpdateSerializer
 from rest_framework.views import APIView
@@ -15,10 +14,9 @@ from django.db import transaction
 from django.urls import reverse
 from django.utils.encoding import iri_to_uri
 from endoreg_db.utils.paths import PDF_DIR, STORAGE_DIR
-from .pdf_stream_views import ClosingFileWrapper
+from endoreg_db.utils.media_response import media_file_response
 
 logger = logging.getLogger(__name__)
-_RANGE_RE = re.compile(r"bytes=(\d+)-(\d*)")
 
 class PDFMediaView(APIView):
     """
@@ -28,13 +26,13 @@ class PDFMediaView(APIView):
     - Integrates with Media Management expectations (clean deletion after validation is handled elsewhere)
     """
 
-    def get(self, request):
+    def get(self, request, pk=None):
         """
         Handles both:
         - Fetching PDF metadata (if `id` is NOT provided)
-        - Streaming the actual PDF file (if `id` is provided)
+        - Streaming the actual PDF file (if `id` or a `pk` URL argument is provided)
         """
-        pdf_id = request.GET.get("id")
+        pdf_id = pk or request.GET.get("id")
         last_id = request.GET.get("last_id")
 
         if pdf_id:
@@ -76,7 +74,6 @@ class PDFMediaView(APIView):
         Query param `variant=anonymized` selects anonymized file; default is original.
         """
         variant = (self.request.GET.get('variant') or 'original').lower()
-        range_header = self.request.headers.get("Range")
 
         try:
             pdf_entry = RawPdfFile.objects.get(id=pdf_id)
@@ -123,47 +120,11 @@ class PDFMediaView(APIView):
         if not safe_filename.endswith('.pdf'):
             safe_filename += '.pdf'
 
-        file_size = os.path.getsize(file_path)
-
-        # Range support
-        if range_header:
-            match = _RANGE_RE.match(range_header)
-            if match:
-                start = int(match.group(1))
-                end = int(match.group(2) or file_size - 1)
-
-                if start < 0 or start >= file_size:
-                    raise Http404("Invalid range")
-                if end >= file_size:
-                    end = file_size - 1
-
-                chunk_size = end - start + 1
-                try:
-                    fh = open(file_path, 'rb')
-                    fh.seek(start)
-                    resp = StreamingHttpResponse(
-                        ClosingFileWrapper(fh, blksize=8192),
-                        status=206,
-                        content_type="application/pdf",
-                    )
-                    resp["Content-Length"] = str(chunk_size)
-                    resp["Content-Range"] = f"bytes {start}-{end}/{file_size}"
-                    resp["Accept-Ranges"] = "bytes"
-                    resp["Content-Disposition"] = f'inline; filename="{safe_filename}"'
-                    return resp
-                except (OSError, IOError) as e:
-                    logger.error(f"Error opening PDF file for range request: {e}")
-                    raise Http404("Error accessing PDF file")
-
-        # Fallback: serve full file
         mime_type, _ = mimetypes.guess_type(file_path)
         try:
-            fh = open(file_path, 'rb')
-            response = FileResponse(fh, content_type=mime_type or "application/pdf")
-            response["Content-Length"] = str(file_size)
-            response["Accept-Ranges"] = "bytes"
-            response["Content-Disposition"] = f'inline; filename="{safe_filename}"'
-            return response
+            return media_file_response(
+                self.request, file_path, content_type=mime_type or "application/pdf", filename=safe_filename
+            )
         except (OSError, IOError) as e:
             logger.error(f"Error opening PDF file: {e}")
             raise Http404("Error accessing PDF file")
@@ -1,29 +1,35 @@
-import re
 import logging
-from django.http import FileResponse, StreamingHttpResponse, Http404
+from django.http import Http404
 from rest_framework.views import APIView
+from ...utils.media_response import media_file_response
 from ...utils.permissions import EnvironmentAwarePermission
 from endoreg_db.models import RawPdfFile
 import os
 from django.views.decorators.clickjacking import xframe_options_sameorigin
 
 logger = logging.getLogger(__name__)
-_RANGE_RE = re.compile(r"bytes=(\d+)-(\d*)")
 
 class ClosingFileWrapper:
-    """Custom file wrapper that ensures file is closed after streaming"""
-    def __init__(self, file_handle, blksize=8192):
+    """
+    Custom file wrapper that ensures file is closed after streaming.
+    With ``length``, stops after that many bytes instead of reading to end of file.
+    """
+    def __init__(self, file_handle, blksize=8192, length=None):
         self.file_handle = file_handle
         self.blksize = blksize
+        self.remaining = length
         
     def __iter__(self):
         return self
         
     def __next__(self):
-        data = self.file_handle.read(self.blksize)
+        size = self.blksize if self.remaining is None else min(self.blksize, self.remaining)
+        data = self.file_handle.read(size) if size > 0 else b""
         if not data:
             self.file_handle.close()
             raise StopIteration
+        if self.remaining is not None:
+            self.remaining -= len(data)
         return data
         
     def close(self):
@@ -33,6 +39,7 @@ class ClosingFileWrapper:
 class PDFStreamView(APIView):
     """
     Streams a PDF file with correct HTTP range support and proper file handle management.
+    HEAD requests (routed to ``get`` by Django) return the headers without reading the file.
     """
     permission_classes = [EnvironmentAwarePermission]
 
@@ -61,63 +68,11 @@ class PDFStreamView(APIView):
             if not safe_filename.endswith('.pdf'):
                 safe_filename += '.pdf'
 
-            # Handle Range requests
-            range_header = request.headers.get("Range")
-            if range_header:
-                logger.debug(f"Range request for PDF {pdf_id}: {range_header}")
-                match = _RANGE_RE.match(range_header)
-                if match:
-                    start = int(match.group(1))
-                    end = int(match.group(2) or file_size - 1)
-                    
-                    # Validate range
-                    if start >= file_size or start < 0:
-                        logger.warning(f"Invalid range start {start} for file size {file_size}")
-                        raise Http404("Invalid range")
-                        
-                    if end >= file_size:
-                        end = file_size - 1
-                    
-                    chunk_size = end - start + 1
-                    
-                    try:
-                        file_handle = open(file_path, "rb")
-                        file_handle.seek(start)
-                        
-                        logger.debug(f"Serving PDF {pdf_id} range {start}-{end}/{file_size}")
-                        
-                        response = StreamingHttpResponse(
-                            ClosingFileWrapper(file_handle, blksize=8192),
-                            status=206,
-                            content_type="application/pdf",
-                        )
-                        response["Content-Length"] = str(chunk_size)
-                        response["Content-Range"] = f"bytes {start}-{end}/{file_size}"
-                        response["Accept-Ranges"] = "bytes"
-                        response["Content-Disposition"] = f'inline; filename="{safe_filename}"'
-                        
-                        return response
-                    except (OSError, IOError) as e:
-                        logger.error(f"Error opening PDF file for range request: {e}")
-                        raise Http404("Error accessing PDF file")
-                else:
-                    logger.warning(f"Invalid Range header format: {range_header}")
-
-            # Serve entire file using FileResponse (automatically handles file closing)
-            logger.debug(f"Serving full PDF {pdf_id} ({file_size} bytes)")
-            
+            logger.debug(f"Serving PDF {pdf_id} ({file_size} bytes, Range: {request.headers.get('Range')})")
             try:
-                file_handle = open(file_path, "rb")
-                response = FileResponse(
-                    file_handle, 
-                    content_type="application/pdf"
+                return media_file_response(
+                    request, file_path, content_type="application/pdf", filename=safe_filename
                 )
-                response["Content-Length"] = str(file_size)
-                response["Accept-Ranges"] = "bytes"
-                response["Content-Disposition"] = f'inline; filename="{safe_filename}"'
-                
-                # FileResponse will take ownership of file_handle and close it after response
-                return response
             except (OSError, IOError) as e:
                 logger.error(f"Error opening PDF file: {e}")
                 raise Http404("Error accessing PDF file")
@@ -3,7 +3,13 @@ from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from rest_framework.parsers import JSONParser, FormParser, MultiPartParser
-from endoreg_db.services.lookup_store import LookupStore, DEFAULT_TTL_SECONDS
+from endoreg_db.services.lookup_store import (
+    DEFAULT_TTL_SECONDS,
+    LOCK_TIMEOUT_SECONDS,
+    LookupLockTimeout,
+    LookupStore,
+    LookupVersionConflict,
+)
 # Use module import so tests can monkeypatch functions on the module
 from endoreg_db.services import lookup_service as ls
 from endoreg_db.utils.permissions import EnvironmentAwarePermission
@@ -17,6 +23,17 @@ ISSUED_MAP_PREFIX = "lookup:issued_for_internal:"
 
 logger = logging.getLogger(__name__)
 
+
+def _lock_timeout_response(token: str, error: LookupLockTimeout) -> Response:
+    """503 for a token whose write lock is held by another request; the client should retry."""
+    logger.warning("Lookup %s is locked by another request: %s", token, error)
+    return Response(
+        {"detail": str(error), "token": token, "retry_after": LOCK_TIMEOUT_SECONDS},
+        status=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": str(LOCK_TIMEOUT_SECONDS)},
+    )
+
+
 class LookupViewSet(viewsets.ViewSet):
     permission_classes = [EnvironmentAwarePermission]
     parser_classes = (JSONParser, FormParser, MultiPartParser)
@@ -149,7 +166,19 @@ class LookupViewSet(viewsets.ViewSet):
         if not isinstance(updates, dict) or not updates:
             return Response({"detail": "updates must be a non-empty object"}, status=status.HTTP_400_BAD_REQUEST)
 
-        store.set_many(updates)
+        # Optional optimistic concurrency: reject patches based on an outdated version
+        expected_version = request.data.get("version")
+        if expected_version is not None:
+            try:
+                expected_version = int(expected_version)
+            except (TypeError, ValueError):
+                return Response({"detail": "version must be an integer"}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            store.patch(updates, expected_version=expected_version)
+        except LookupVersionConflict as e:
+            return Response({"detail": str(e), "version": e.actual}, status=status.HTTP_409_CONFLICT)
+        except LookupLockTimeout as e:
+            return _lock_timeout_response(pk, e)
 
         if any(key in self.INPUT_KEYS for key in updates.keys()):
             try:
@@ -157,18 +186,26 @@ class LookupViewSet(viewsets.ViewSet):
             except Exception as e:
                 import logging
                 logging.getLogger(__name__).error("Failed to recompute after patch for token %s: %s", pk, e)
-        return Response({"ok": True, "token": pk}, status=status.HTTP_200_OK)
+        return Response({"ok": True, "token": pk, "version": store.get_version()}, status=status.HTTP_200_OK)
 
     @action(detail=True, methods=["post"], url_path="recompute")
     def recompute(self, request, pk=None):
-        """Recompute lookup data based on current PatientExamination and user selections"""
+        """
+        Recompute lookup data based on current PatientExamination and user selections.
+
+        Returns only the changed entries of the derived data (removed entries as null);
+        ``?full=true`` re-evaluates all requirements and returns the complete derived data.
+        """
         if not pk:
             return Response({"detail": "Token required"}, status=status.HTTP_404_NOT_FOUND)
+        full = str(request.query_params.get("full", request.data.get("full", ""))).lower() in ("1", "true", "yes")
         try:
-            updates = ls.recompute_lookup(pk)
+            updates = ls.recompute_lookup(pk, full=full)
             return Response({"ok": True, "token": pk, "updates": updates}, status=status.HTTP_200_OK)
         except ValueError as e:
             return Response({"detail": str(e)}, status=status.HTTP_404_NOT_FOUND)
+        except LookupLockTimeout as e:
+            return _lock_timeout_response(pk, e)
         except Exception as e:
             return Response({"detail": f"Recompute failed: {e}"}, status=status.HTTP_400_BAD_REQUEST)
 
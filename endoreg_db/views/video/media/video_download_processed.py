@@ -1,3 +1,4 @@
+from endoreg_db.utils.media_response import media_file_response
 from endoreg_db.utils.permissions import EnvironmentAwarePermission
 
 
@@ -42,14 +43,12 @@ class VideoDownloadProcessedView(APIView):
             )
 
         try:
-            from django.http import FileResponse
-            with open(abs_output_path, 'rb') as f:
-                response = FileResponse(
-                    f,
-                    content_type='video/mp4'
-                )
-                response['Content-Disposition'] = f'attachment; filename="{os.path.basename(abs_output_path)}"'
-                return response
+            return media_file_response(
+                request,
+                abs_output_path,
+                content_type='video/mp4',
+                as_attachment=True,
+            )
 
         except Exception as e:
             return Response(
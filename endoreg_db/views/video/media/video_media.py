@@ -37,7 +37,8 @@ class VideoMediaView(APIView):
             vf = get_object_or_404(VideoFile, pk=pk)
             return _stream_video_file(
                 vf,
-                os.getenv("FRONTEND_ORIGIN", "*")
+                os.getenv("FRONTEND_ORIGIN", "*"),
+                request,
             )
 
         # META (list or single)
@@ -1,7 +1,7 @@
 from pathlib import Path
 import os
 import mimetypes
-from django.http import FileResponse, Http404
+from django.http import Http404
 from rest_framework import viewsets, decorators, permissions
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -15,11 +15,18 @@ from ...serializers.label.label import LabelSerializer
 from ...serializers.video.video_file_list import VideoFileListSerializer
 from ...models import VideoFile, Label, LabelVideoSegment
 from ...serializers.video.segmentation import VideoFileSerializer
+from ...serializers.label_video_segment._lvs_frames import _media_relpath_from_file_path, _media_url_from_file_path
+from ...utils.media_response import media_file_response
 from ...utils.permissions import dynamic_permission_classes, DEBUG_PERMISSIONS, EnvironmentAwarePermission
 
-def _stream_video_file(vf, frontend_origin):
+FRAME_PAGE_SIZE = 500
+MAX_FRAME_PAGE_SIZE = 5000
+
+
+def _stream_video_file(vf, frontend_origin, request):
     """
     Helper to stream a video file with proper headers and CORS.
+    Honors Range requests (206/416) so players can seek without downloading the file.
     Raises Http404 if file is missing.
     """
     decorators.permission_classes = [EnvironmentAwarePermission]
@@ -51,15 +58,16 @@ def _stream_video_file(vf, frontend_origin):
         content_type = mime or 'video/mp4'
         
         try:
-            # Open file in binary mode and ensure file descriptor is closed by FileResponse
-            file_handle = open(path, 'rb')
-            response = FileResponse(file_handle, content_type=content_type)
-            response['Content-Length'] = str(file_size)
-            response['Accept-Ranges'] = 'bytes'
-            response['Content-Disposition'] = f'inline; filename="{path.name}"'
-            response["Access-Control-Allow-Origin"] = frontend_origin
-            response["Access-Control-Allow-Credentials"] = "true"
-            return response
+            return media_file_response(
+                request,
+                path,
+                content_type=content_type,
+                headers={
+                    "Access-Control-Allow-Origin": frontend_origin,
+                    "Access-Control-Allow-Credentials": "true",
+                    "Access-Control-Expose-Headers": "Accept-Ranges, Content-Length, Content-Range, ETag",
+                },
+            )
         except IOError as e:
             raise Http404(f"Cannot open video file: {str(e)}")
             
@@ -75,7 +83,8 @@ class VideoViewSet(viewsets.ReadOnlyModelViewSet):
     """
     /api/videos/          → list of metadata   (JSON)
     /api/videos/<id>/     → single metadata   (JSON)
-    /videos/<id>/stream/  → raw file          (FileResponse, range-aware)
+    /videos/<id>/stream/  → raw file          (range-aware, 206 for Range requests)
+    /videos/<id>/frames/  → frames, paged     (JSON, ?start=&end=&after=&limit=)
     """
     queryset = VideoFile.objects.all()
     serializer_class = VideoFileListSerializer   # for the list view
@@ -119,7 +128,7 @@ class VideoViewSet(viewsets.ReadOnlyModelViewSet):
         try:
             vf: VideoFile = self.get_object()
             frontend_origin = os.environ.get('FRONTEND_ORIGIN', 'http://localhost:8000')
-            return _stream_video_file(vf, frontend_origin)
+            return _stream_video_file(vf, frontend_origin, request)
         except Http404:
             # Re-raise Http404 exceptions as they should bubble up
             raise
@@ -130,6 +139,61 @@ class VideoViewSet(viewsets.ReadOnlyModelViewSet):
             logger.error(f"Unexpected error in video stream for pk={pk}: {str(e)}")
             raise Http404("Video streaming failed")
 
+    # ---------- FRAMES (paged) ---------- #
+    @decorators.action(methods=['get'], detail=True, url_path='frames')
+    def frames(self, request, pk=None):
+        """
+        Returns the frames of a video page by page, ordered by frame number.
+
+        Query parameters:
+        - start / end: Frame number range (inclusive), e.g. a segment's segment_start/segment_end
+        - after: Cursor, the last frame number of the previous page
+        - limit: Page size (default 500, max 5000)
+
+        The response contains ``next_cursor`` (pass as ``after``) or null on the last page.
+        """
+        vf: VideoFile = self.get_object()
+        try:
+            start = int(request.query_params.get('start', 0))
+            end = request.query_params.get('end')
+            end = int(end) if end is not None else None
+            after = request.query_params.get('after')
+            after = int(after) if after is not None else None
+            limit = min(max(int(request.query_params.get('limit', FRAME_PAGE_SIZE)), 1), MAX_FRAME_PAGE_SIZE)
+        except (TypeError, ValueError):
+            return Response({"error": "start, end, after and limit must be integers"}, status=status.HTTP_400_BAD_REQUEST)
+
+        frames = vf.frames.filter(frame_number__gte=start)
+        if end is not None:
+            frames = frames.filter(frame_number__lte=end)
+        if after is not None:
+            frames = frames.filter(frame_number__gt=after)
+        page = list(frames.order_by('frame_number').only('id', 'frame_number', 'relative_path', 'timestamp')[:limit + 1])
+        has_more = len(page) > limit
+        page = page[:limit]
+
+        fps = vf.fps or None
+        frame_dir = vf.get_frame_dir_path()
+        results = []
+        for frame in page:
+            frame_path = frame_dir / frame.relative_path
+            results.append({
+                "frame_id": frame.id,
+                "frame_number": frame.frame_number,
+                "time": frame.timestamp if frame.timestamp is not None else (
+                    round(frame.frame_number / fps, 3) if fps else None
+                ),
+                "frame_filename": frame_path.name,
+                "frame_file_path": _media_relpath_from_file_path(frame_path),
+                "frame_url": _media_url_from_file_path(frame_path, request=request),
+            })
+
+        return Response({
+            "results": results,
+            "limit": limit,
+            "next_cursor": page[-1].frame_number if has_more else None,
+        }, status=status.HTTP_200_OK)
+
 
 # Neue separate View für Video-Streaming außerhalb des ViewSets
 class VideoStreamView(APIView):
@@ -155,7 +219,7 @@ class VideoStreamView(APIView):
                 
             vf = VideoFile.objects.get(pk=video_id_int)
             frontend_origin = os.environ.get('FRONTEND_ORIGIN', 'http://localhost:8000')
-            return _stream_video_file(vf, frontend_origin)
+            return _stream_video_file(vf, frontend_origin, request)
         except VideoFile.DoesNotExist:
             raise Http404("Video not found")
         except Exception as e:
@@ -223,6 +287,7 @@ class VideoLabelView(APIView):
             
             time_segments = []
             frame_predictions = {}
+            expand_frames = "frames" in request.query_params.get("expand", "").split(",")
             
             for segment in label_segments:
                 # Now fps is guaranteed to be a float
@@ -235,44 +300,46 @@ class VideoLabelView(APIView):
                     "segment_end": segment.end_frame_number,
                     "start_time": round(start_time, 2),
                     "end_time": round(end_time, 2),
-                    "frames": {}
+                    "frame_count": segment.end_frame_number - segment.start_frame_number,
                 }
                 
-                # Add frame-wise data if available
-                for frame_num in range(segment.start_frame_number, segment.end_frame_number + 1):
-                    frame_filename = f"frame_{str(frame_num).zfill(7)}.jpg"
-                    frame_predictions[frame_num] = {
-                        "frame_number": frame_num,
-                        "label": label_name,
-                        "confidence": 1.0  # Default confidence
-                    }
+                if expand_frames:
+                    # Add frame-wise data (?expand=frames); otherwise frames are paged via /api/videos/<id>/frames/
+                    segment_data["frames"] = {}
+                    for frame_num in range(segment.start_frame_number, segment.end_frame_number):
+                        frame_filename = f"frame_{str(frame_num).zfill(7)}.jpg"
+                        frame_predictions[frame_num] = {
+                            "frame_number": frame_num,
+                            "label": label_name,
+                            "confidence": 1.0  # Default confidence
+                        }
                     
-                    # Fix: Safely construct frame_file_path to avoid string/string division errors
-                    frame_file_path = ""
-                    if hasattr(video_entry, 'frame_dir') and video_entry.frame_dir:
-                        try:
-                            # Ensure frame_dir is converted to Path properly
-                            if isinstance(video_entry.frame_dir, str):
-                                frame_dir = Path(video_entry.frame_dir)
-                            elif isinstance(video_entry.frame_dir, Path):
-                                frame_dir = video_entry.frame_dir
-                            else:
-                                # Try to convert to string first, then to Path
-                                frame_dir = Path(str(video_entry.frame_dir))
+                        # Fix: Safely construct frame_file_path to avoid string/string division errors
+                        frame_file_path = ""
+                        if hasattr(video_entry, 'frame_dir') and video_entry.frame_dir:
+                            try:
+                                # Ensure frame_dir is converted to Path properly
+                                if isinstance(video_entry.frame_dir, str):
+                                    frame_dir = Path(video_entry.frame_dir)
+                                elif isinstance(video_entry.frame_dir, Path):
+                                    frame_dir = video_entry.frame_dir
+                                else:
+                                    # Try to convert to string first, then to Path
+                                    frame_dir = Path(str(video_entry.frame_dir))
                             
-                            frame_file_path = str(frame_dir / frame_filename)
-                        except (TypeError, ValueError) as e:
-                            # Log warning but don't fail the request
-                            import logging
-                            logger = logging.getLogger(__name__)
-                            logger.warning(f"Could not construct frame path for frame {frame_num}: {e}")
-                            frame_file_path = ""
+                                frame_file_path = str(frame_dir / frame_filename)
+                            except (TypeError, ValueError) as e:
+                                # Log warning but don't fail the request
+                                import logging
+                                logger = logging.getLogger(__name__)
+                                logger.warning(f"Could not construct frame path for frame {frame_num}: {e}")
+                                frame_file_path = ""
                     
-                    segment_data["frames"][frame_num] = {
-                        "frame_filename": frame_filename,
-                        "frame_file_path": frame_file_path,
-                        "predictions": frame_predictions[frame_num]
-                    }
+                        segment_data["frames"][frame_num] = {
+                            "frame_filename": frame_filename,
+                            "frame_file_path": frame_file_path,
+                            "predictions": frame_predictions[frame_num]
+                        }
                 
                 time_segments.append(segment_data)
             
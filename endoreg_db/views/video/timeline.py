@@ -15,7 +15,6 @@ def video_timeline_view(request, video_id):
 
     segments = []
     frame_markers = []  # Store frame timestamps
-    fps = 50  # Fixed FPS
 
     # Ensure "outside" label exists
     if "outside" in label_segments:
@@ -25,10 +24,8 @@ def video_timeline_view(request, video_id):
                 "end_time": segment["end_time"]
             })
 
-            # Extract frame timestamps for markers
-            for frame_num, _ in segment["frames"].items():
-                time_in_seconds = frame_num / fps
-                frame_markers.append(time_in_seconds)
+            # Start & end markers of the segment
+            frame_markers.extend([segment["start_time"], segment["end_time"]])
 
     # Set video duration correctly
     video_duration = video_entry.duration if hasattr(video_entry, "duration") and video_entry.duration else 226  # Default to 226 seconds
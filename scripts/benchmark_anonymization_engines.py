@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark: wall-clock time of the video anonymization engines.
+
+Writes a synthetic video (or uses ``--path``) and anonymizes it with a static ROI and
+a few 'outside' ranges using
+
+* ``frames``: extract JPEG frames, ``anonymize_frame`` per file, ``assemble_video_from_frames``
+* ``stream``: decode, ``mask_frame`` and encode in one Python pipeline
+* ``ffmpeg``: a single FFmpeg run with the crop/pad/lutrgb filter graph
+
+No database access is needed; the video is described by a stand-in object.
+
+Usage:
+    python -m scripts.benchmark_anonymization_engines [--frames 3000] [--size 1280x720] [--path video.mp4]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from pathlib import Path
+from types import SimpleNamespace
+
+import django
+
+
+def write_video(path: Path, n_frames: int, width: int, height: int, fps: float):
+    import cv2
+    import numpy as np
+
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, (width, height))  # type: ignore
+    rng = np.random.default_rng(0)
+    noise = rng.integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+    for i in range(n_frames):
+        writer.write(np.roll(noise, i * 4, axis=1))
+    writer.release()
+
+
+def run_frames(video, work_dir: Path, endo_roi, outside_frames, output_path: Path):
+    from endoreg_db.models.utils import anonymize_frame
+    from endoreg_db.utils.video.ffmpeg_wrapper import assemble_video_from_frames, extract_frames
+
+    frame_dir = work_dir / "frames"
+    anonymized_dir = work_dir / "anonymized_frames"
+    anonymized_dir.mkdir()
+    frame_paths = extract_frames(video.get_raw_file_path(), frame_dir, quality=2)
+    anonymized_paths = []
+    for frame_path in frame_paths:
+        # extract_frames numbers files from 1; the decoder pipelines count from 0
+        frame_number = int(frame_path.stem.split("_")[-1]) - 1
+        target_path = anonymized_dir / frame_path.name
+        anonymize_frame(frame_path, target_path, endo_roi, all_black=frame_number in outside_frames)
+        anonymized_paths.append(target_path)
+    assemble_video_from_frames(anonymized_paths, output_path, fps=video.get_fps())
+
+
+def run_stream(video, work_dir: Path, endo_roi, outside_frames, output_path: Path):
+    from endoreg_db.models.media.video.video_file_anonymize import _stream_anonymized_video
+
+    _stream_anonymized_video(video, output_path, endo_roi, outside_frames)
+
+
+def run_ffmpeg(video, work_dir: Path, endo_roi, outside_frames, output_path: Path):
+    from endoreg_db.utils.video import get_video_dimensions
+    from endoreg_db.utils.video.ffmpeg_wrapper import anonymize_video_with_filters
+
+    width, height = get_video_dimensions(video.get_raw_file_path())
+    anonymize_video_with_filters(
+        video.get_raw_file_path(), output_path, width, height, endo_roi, outside_frames.ranges()
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=3000)
+    parser.add_argument("--size", default="1280x720")
+    parser.add_argument("--fps", type=float, default=50.0)
+    parser.add_argument("--path", type=Path, help="Anonymize this video instead of a synthetic one")
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+    os.environ.setdefault("TQDM_DISABLE", "1")
+    django.setup()
+    import logging
+
+    from endoreg_db.utils.frame_ranges import FrameRangeSet
+    from endoreg_db.utils.video import get_video_dimensions
+    from endoreg_db.utils.video.ffmpeg_wrapper import _get_fps_and_frame_count
+
+    logging.disable(logging.INFO)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp_dir = Path(tmp)
+        video_path = args.path
+        if video_path is None:
+            width, height = (int(v) for v in args.size.split("x"))
+            video_path = tmp_dir / "raw.mp4"
+            write_video(video_path, args.frames, width, height, args.fps)
+        width, height = get_video_dimensions(video_path)
+        fps, frame_count = _get_fps_and_frame_count(video_path)
+
+        video = SimpleNamespace(
+            uuid="benchmark",
+            frame_count=frame_count,
+            get_raw_file_path=lambda: video_path,
+            get_fps=lambda: fps,
+        )
+        endo_roi = {"x": width // 5, "y": height // 10, "width": width * 3 // 5, "height": height * 4 // 5}
+        step = max(frame_count // 5, 1)
+        outside_frames = FrameRangeSet((start, start + step // 4) for start in range(step, frame_count, step))
+
+        print(f"{video_path.name}: {frame_count} frames, {width}x{height} @ {fps} fps")
+        for name, run in [("frames", run_frames), ("stream", run_stream), ("ffmpeg", run_ffmpeg)]:
+            work_dir = tmp_dir / name
+            work_dir.mkdir()
+            start = time.perf_counter()
+            run(video, work_dir, endo_roi, outside_frames, work_dir / "anonymized.mp4")
+            elapsed = time.perf_counter() - start
+            print(f"{name:7s} {elapsed:8.2f} s   {frame_count / elapsed:8.1f} frames/s")
+
+
+if __name__ == "__main__":
+    main()
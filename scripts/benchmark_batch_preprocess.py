@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-image vs. batched inference preprocessing on CPU.
+
+Compares the PIL based ``InferenceDataset.preprocess`` (crop, pad, LANCZOS resize,
+normalize one frame at a time) with ``BatchPreprocessor`` on synthetic full-HD frames
+and prints frames/s for both.
+
+Usage:
+    python -m scripts.benchmark_batch_preprocess [--frames 64] [--batch-size 16] [--threads 4]
+"""
+
+import argparse
+import time
+
+import numpy as np
+import torch
+
+from endoreg_db.utils.ai import BatchPreprocessor, InferenceDataset
+from endoreg_db.utils.ai.predict import sample_config
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--threads", type=int, default=torch.get_num_threads())
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--width", type=int, default=1920)
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    config = sample_config.copy()
+    # Typical endoscope ROI of a 1080p processor output
+    crop = [30, 1050, 560, 1800]
+
+    rng = np.random.default_rng(0)
+    frames = rng.integers(0, 256, size=(args.batch_size, args.height, args.width, 3), dtype=np.uint8)
+    n_batches = max(1, args.frames // args.batch_size)
+    n_frames = n_batches * args.batch_size
+
+    per_image = InferenceDataset([], [], config)
+    start = time.perf_counter()
+    for _ in range(n_batches):
+        torch.stack([per_image.preprocess(frame, crop) for frame in frames])
+    per_image_s = time.perf_counter() - start
+
+    batched = BatchPreprocessor(crop, config)
+    batched(frames[:1])  # warm up: builds the resampling matrices
+    start = time.perf_counter()
+    for _ in range(n_batches):
+        batched(frames)
+    batched_s = time.perf_counter() - start
+
+    print(f"Frames: {n_frames} ({args.width}x{args.height} -> {config['size_x']}x{config['size_y']}), "
+          f"batch size {args.batch_size}, {args.threads} threads")
+    print(f"Per-image (PIL):  {n_frames / per_image_s:8.1f} frames/s")
+    print(f"Batched (torch):  {n_frames / batched_s:8.1f} frames/s")
+    print(f"Speedup:          {per_image_s / batched_s:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Benchmark: whole-file vs streaming SHA-256 of large video files.
+
+Writes a random file of ``--size-gb`` GB and hashes it once with the old
+``hashlib.sha256(f.read())`` approach and once with ``get_file_hash``, each in a fresh
+subprocess, reporting throughput and the subprocess' peak RSS. The pre-hash used for
+cheap verification is timed as well. Pass ``--path`` to hash an existing file instead.
+
+Usage:
+    python -m scripts.benchmark_file_hashing [--size-gb 2] [--path video.mp4]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+_CHILD = """
+import hashlib, json, resource, sys, time
+from endoreg_db.utils.hashs import get_file_hash, get_file_prehash
+
+method, path = sys.argv[1], sys.argv[2]
+start = time.perf_counter()
+if method == "read_all":
+    with open(path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+elif method == "streaming":
+    digest = get_file_hash(path)
+else:
+    digest = get_file_prehash(path)
+elapsed = time.perf_counter() - start
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"digest": digest, "seconds": elapsed, "peak_rss_mb": peak_kb / 1024}))
+"""
+
+
+def write_file(path: Path, size_bytes: int, block_size: int = 64 * 1024 * 1024):
+    with open(path, "wb") as f:
+        written = 0
+        while written < size_bytes:
+            n = min(block_size, size_bytes - written)
+            f.write(os.urandom(n))
+            written += n
+
+
+def run(method: str, path: Path) -> dict:
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, [os.getcwd(), os.environ.get("PYTHONPATH")]))}
+    result = subprocess.run(
+        [sys.executable, "-c", _CHILD, method, str(path)], check=True, capture_output=True, text=True, env=env
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-gb", type=float, default=2.0)
+    parser.add_argument("--path", type=Path, default=None)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.path
+        if path is None:
+            path = Path(tmp) / "video.bin"
+            write_file(path, int(args.size_gb * 1024**3))
+        size_mb = path.stat().st_size / 1024**2
+        print(f"File: {path} ({size_mb:.0f} MiB)")
+
+        # Warm the page cache so both methods read from memory, not disk
+        run("prehash", path)
+        results = {method: run(method, path) for method in ("read_all", "streaming", "prehash")}
+
+        if results["read_all"]["digest"] != results["streaming"]["digest"]:
+            raise SystemExit("Digest mismatch between whole-file and streaming hash")
+        for method, result in results.items():
+            throughput = size_mb / result["seconds"] if method != "prehash" else float("nan")
+            print(
+                f"{method:10s} {result['seconds']:8.3f} s  {throughput:8.1f} MiB/s  "
+                f"peak RSS {result['peak_rss_mb']:8.1f} MiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: Frame row initialization for long videos.
+
+Compares the previous approach (one Frame instance per frame, a single
+``bulk_create(ignore_conflicts=True)`` and an ``UPDATE ... frame_number__in=[...]``)
+with ``VideoFile.initialize_frames`` (batched inserts, COPY on PostgreSQL, range-based
+updates). Each variant first creates all rows from the frame count, then marks them
+as extracted from frame paths. Everything runs inside a transaction that is rolled
+back, so the database is left unchanged.
+
+Runs against the database of ``DJANGO_SETTINGS_MODULE`` (default ``config.settings.test``,
+SQLite); set ``TEST_DB_ENGINE=django.db.backends.postgresql`` and the ``TEST_DB_*``
+variables to benchmark PostgreSQL.
+
+Usage:
+    python -m scripts.benchmark_frame_initialization [--frames 100000]
+"""
+
+import argparse
+import os
+import time
+import tracemalloc
+from pathlib import Path
+
+import django
+
+
+class _Rollback(Exception):
+    pass
+
+
+def legacy_initialize(video, frame_paths=None):
+    from endoreg_db.models import Frame
+
+    if frame_paths:
+        frames = [
+            Frame(video=video, frame_number=int(p.stem.split("_")[-1]), relative_path=p.name, is_extracted=True)
+            for p in frame_paths
+        ]
+    else:
+        frames = [
+            Frame(video=video, frame_number=n, relative_path=f"frame_{n:07d}.jpg", is_extracted=False)
+            for n in range(video.frame_count)
+        ]
+    Frame.objects.bulk_create(frames, ignore_conflicts=True)
+    if frame_paths:
+        Frame.objects.filter(
+            video=video, frame_number__in=[f.frame_number for f in frames], is_extracted=False
+        ).update(is_extracted=True)
+
+
+def run(label, initialize, n_frames, trace_memory=False):
+    from django.db import transaction
+
+    from endoreg_db.models import Center, Frame, VideoFile
+
+    frame_paths = [Path(f"/frames/frame_{n:07d}.jpg") for n in range(n_frames)]
+    result = {}
+    try:
+        with transaction.atomic():
+            center, _ = Center.objects.get_or_create(name="benchmark_frame_initialization")
+            video = VideoFile.objects.create(
+                center=center, video_hash=f"benchmark-frame-init-{label}", fps=50, frame_count=n_frames
+            )
+            if trace_memory:
+                tracemalloc.start()
+            start = time.perf_counter()
+            initialize(video)
+            result["create"] = time.perf_counter() - start
+            start = time.perf_counter()
+            initialize(video, frame_paths)
+            result["mark"] = time.perf_counter() - start
+            if trace_memory:
+                result["peak_mb"] = tracemalloc.get_traced_memory()[1] / 1024**2
+                tracemalloc.stop()
+            assert Frame.objects.filter(video=video, is_extracted=True).count() == n_frames
+            raise _Rollback
+    except _Rollback:
+        pass
+    return result
+
+
+def report(label, initialize, n_frames):
+    timings = run(label, initialize, n_frames)
+    # Memory tracing slows allocation down, so it gets a separate run
+    peak_mb = run(label, initialize, n_frames, trace_memory=True)["peak_mb"]
+    print(
+        f"{label:8s} create {timings['create']:7.2f} s   mark extracted {timings['mark']:7.2f} s   "
+        f"peak Python memory {peak_mb:7.1f} MiB"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=100_000)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+    os.environ.setdefault("TQDM_DISABLE", "1")
+    django.setup()
+    import logging
+
+    from django.db import connection
+
+    from endoreg_db.models.media.video.video_file_frames import _initialize_frames
+
+    logging.disable(logging.INFO)
+    print(f"Database: {connection.vendor}, {args.frames} frames")
+    report("legacy", legacy_initialize, args.frames)
+    report("batched", _initialize_frames, args.frames)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: inference data loading throughput for 0/2/4/8 workers.
+
+Writes synthetic full-HD JPEG frames to a temporary directory and measures how fast
+``make_inference_loader`` delivers preprocessed batches (decode, crop, LANCZOS resize,
+normalize via ``InferenceDataset``) for each worker count. Thread mode is what runs
+inside Celery workers; pass ``--mode process`` to compare spawn-context DataLoader
+workers.
+
+Usage:
+    python -m scripts.benchmark_inference_loader [--frames 96] [--workers 0 2 4 8] [--mode thread]
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from endoreg_db.utils.ai import InferenceDataset
+from endoreg_db.utils.ai.parallel_loader import WORKER_MODES, make_inference_loader
+from endoreg_db.utils.ai.predict import sample_config
+
+
+def write_frames(frame_dir: Path, n_frames: int, height: int, width: int):
+    rng = np.random.default_rng(0)
+    # Smooth gradients plus noise compress like real endoscopy frames, unlike pure noise
+    base = np.linspace(0, 255, width, dtype=np.float32)[None, :, None].repeat(height, 0).repeat(3, 2)
+    paths = []
+    for i in range(n_frames):
+        noise = rng.normal(0, 12, size=(height, width, 3)).astype(np.float32)
+        frame = np.clip(base + noise + i, 0, 255).astype(np.uint8)
+        path = frame_dir / f"frame_{i:07d}.jpg"
+        Image.fromarray(frame).save(path, quality=90)
+        paths.append(path.as_posix())
+    return paths
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=96)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 2, 4, 8])
+    parser.add_argument("--mode", choices=WORKER_MODES, default="thread")
+    parser.add_argument("--height", type=int, default=1080)
+    parser.add_argument("--width", type=int, default=1920)
+    args = parser.parse_args()
+
+    crop = [30, 1050, 560, 1800]
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = write_frames(Path(tmp), args.frames, args.height, args.width)
+        print(f"Frames: {args.frames} JPEGs ({args.width}x{args.height}), batch size {args.batch_size}, mode {args.mode}")
+
+        baseline = None
+        for n_workers in args.workers:
+            config = sample_config.copy()
+            config.update({"batchsize": args.batch_size, "num_workers": n_workers, "worker_mode": args.mode})
+            dataset = InferenceDataset(paths, [crop] * len(paths), config)
+
+            start = time.perf_counter()
+            n_loaded = sum(batch.shape[0] for batch in make_inference_loader(dataset, config))
+            elapsed = time.perf_counter() - start
+
+            fps = n_loaded / elapsed
+            baseline = baseline or fps
+            print(f"{n_workers:2d} workers: {fps:8.1f} frames/s ({fps / baseline:5.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
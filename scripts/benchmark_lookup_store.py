@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: LookupStore backends for large requirement lookups.
+
+Builds a lookup dict shaped like the requirement UI state with ``--sets`` requirement
+sets of ``--requirements`` requirements each (``requirementsBySet``,
+``requirementStatus``, ``suggestedActions``, ...) and measures, per backend
+
+* ``patch``: a keystroke-level update of ``selectedChoices``
+* ``get_many``: reading ``requirementSetStatus`` only
+* ``get_all``: reading the whole lookup
+
+Uses the default cache of ``DJANGO_SETTINGS_MODULE`` (default ``config.settings.test``,
+LocMemCache; point it at a Redis/Memcached configuration for realistic numbers).
+
+Usage:
+    python -m scripts.benchmark_lookup_store [--sets 50] [--requirements 40] [--repeat 500]
+"""
+
+import argparse
+import os
+import time
+
+import django
+
+
+def build_lookup(n_sets: int, n_requirements: int) -> dict:
+    requirement_ids = range(n_sets * n_requirements)
+    return {
+        "patient_examination_id": 1,
+        "selectedRequirementSetIds": list(range(n_sets)),
+        "selectedChoices": {},
+        "requirementsBySet": {
+            set_id: [
+                {"id": set_id * n_requirements + i, "name": f"requirement_{set_id}_{i}"} for i in range(n_requirements)
+            ]
+            for set_id in range(n_sets)
+        },
+        "requirementStatus": {str(r): r % 3 == 0 for r in requirement_ids},
+        "requirementSetStatus": {str(s): s % 2 == 0 for s in range(n_sets)},
+        "suggestedActions": {
+            str(r): [{"type": "add_finding", "finding_id": r, "classification_ids": [1, 2, 3], "note": "default"}]
+            for r in requirement_ids
+        },
+    }
+
+
+def timed(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for i in range(repeat):
+        fn(i)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sets", type=int, default=50)
+    parser.add_argument("--requirements", type=int, default=40)
+    parser.add_argument("--repeat", type=int, default=500)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+    django.setup()
+    from endoreg_db.services.lookup_store import LookupStore
+
+    lookup = build_lookup(args.sets, args.requirements)
+    print(f"{args.sets} sets x {args.requirements} requirements, {args.repeat} repetitions (ms per call)")
+    print(f"{'backend':8} {'patch':>10} {'get_many':>10} {'get_all':>10}")
+    for backend in ("blob", "fields"):
+        store = LookupStore(backend=backend)
+        store.init(lookup)
+        try:
+            patch = timed(lambda i: store.patch({"selectedChoices": {"1": i}}), args.repeat)
+            get_many = timed(lambda i: store.get_many(["requirementSetStatus"]), args.repeat)
+            get_all = timed(lambda i: store.get_all(), args.repeat)
+            assert store.get("selectedChoices") == {"1": args.repeat - 1}
+        finally:
+            store.delete()
+        print(f"{backend:8} {patch:10.3f} {get_many:10.3f} {get_all:10.3f}")
+
+
+if __name__ == "__main__":
+    main()
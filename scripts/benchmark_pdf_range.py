@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Benchmark: bytes read per PDF.js-style page load of a large PDF.
+
+PDF.js fetches a document in ``--chunk`` sized Range requests (default 64 KiB, its
+``rangeChunkSize``): the header, the cross-reference table at the end of the file
+and then the chunks holding the rendered pages. For a generated file of ``--size-mb``
+this replays
+
+* ``header``, ``xref`` and ``--pages`` evenly spaced page chunks
+
+against
+
+* ``unbounded``: the former PDF stream behavior, seeking to the range start and
+  streaming to end of file (``ClosingFileWrapper`` without ``length``)
+* ``bounded``: ``media_file_response`` as used by the PDF views
+
+and reports the bytes read from disk and the time per load.
+
+Usage:
+    python -m scripts.benchmark_pdf_range [--size-mb 50] [--pages 10] [--chunk 65536] [--repeat 5]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+import django
+
+
+def page_load_ranges(size: int, pages: int, chunk: int) -> list:
+    ranges = [(0, chunk - 1), (max(size - chunk, 0), size - 1)]
+    step = max(size // (pages + 1), chunk)
+    ranges += [(offset, min(offset + chunk, size) - 1) for offset in range(step, size - chunk, step)][:pages]
+    return ranges
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size-mb", type=int, default=50)
+    parser.add_argument("--pages", type=int, default=10)
+    parser.add_argument("--chunk", type=int, default=64 * 1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+    django.setup()
+    from django.test import RequestFactory
+
+    from endoreg_db.utils.media_response import media_file_response
+    from endoreg_db.views.pdf import ClosingFileWrapper
+
+    factory = RequestFactory()
+
+    def unbounded(path, start, end):
+        file_handle = open(path, "rb")
+        file_handle.seek(start)
+        return sum(len(chunk) for chunk in ClosingFileWrapper(file_handle, blksize=8192))
+
+    def bounded(path, start, end):
+        request = factory.get("/pdf/", HTTP_RANGE=f"bytes={start}-{end}")
+        response = media_file_response(request, path, content_type="application/pdf")
+        try:
+            return sum(len(chunk) for chunk in response.streaming_content)
+        finally:
+            response.close()
+
+    with tempfile.NamedTemporaryFile(suffix=".pdf") as pdf:
+        block = os.urandom(1024 * 1024)
+        for _ in range(args.size_mb):
+            pdf.write(block)
+        pdf.flush()
+        size = args.size_mb * 1024 * 1024
+        ranges = page_load_ranges(size, args.pages, args.chunk)
+        requested = sum(end - start + 1 for start, end in ranges)
+
+        print(f"{args.size_mb} MiB file, {len(ranges)} range requests, {requested} bytes requested per load")
+        print(f"{'strategy':10} {'bytes read':>14} {'ms/load':>10}")
+        for name, serve in (("unbounded", unbounded), ("bounded", bounded)):
+            start_time = time.perf_counter()
+            for _ in range(args.repeat):
+                read = sum(serve(pdf.name, start, end) for start, end in ranges)
+            elapsed = (time.perf_counter() - start_time) / args.repeat * 1000
+            print(f"{name:10} {read:14d} {elapsed:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark: evaluating requirement sets over many patient examinations.
+
+Creates ``--examinations`` colonoscopy examinations (one colon polyp finding each,
+with a varying number of classifications) and evaluates the colo-austria requirement
+sets for all of them
+
+* ``single``: ``RequirementSet.evaluate(examination)`` per examination and set, timed
+  on ``--sample`` examinations and extrapolated
+* ``batch``: ``evaluate_examinations`` over the whole queryset
+
+Everything runs inside a transaction that is rolled back. Requires the base data
+(``python manage.py load_base_db_data``) in the database of ``DJANGO_SETTINGS_MODULE``
+(default ``config.settings.test``).
+
+Usage:
+    python -m scripts.benchmark_requirement_batch_evaluation [--examinations 10000] [--sample 200]
+"""
+
+import argparse
+import os
+import time
+from datetime import date
+
+import django
+
+EXAMINATION_NAME = "colonoscopy_austria_screening"
+SET_NAMES = [
+    "colonoscopy_austria_screening_finding_polyp_required_classifications",
+]
+
+
+class _Rollback(Exception):
+    pass
+
+
+def create_examinations(n: int):
+    from endoreg_db.models import (
+        Center,
+        Examination,
+        Finding,
+        Gender,
+        Patient,
+        PatientExamination,
+        PatientFinding,
+        PatientFindingClassification,
+    )
+
+    center, _ = Center.objects.get_or_create(name="benchmark_requirement_batch_evaluation")
+    gender = Gender.objects.first()
+    examination = Examination.objects.get(name=EXAMINATION_NAME)
+    colon_polyp = Finding.objects.get(name="colon_polyp")
+    classifications = [(c, c.choices.first()) for c in colon_polyp.finding_classifications.all()]
+
+    patients = Patient.objects.bulk_create(
+        Patient(first_name="Bench", last_name=f"Mark{i}", dob=date(1970, 1, 1), center=center, gender=gender)
+        for i in range(n)
+    )
+    examinations = PatientExamination.objects.bulk_create(
+        PatientExamination(patient=p, examination=examination, date_start=date(2024, 1, 1), hash=f"benchmark-{i}")
+        for i, p in enumerate(patients)
+    )
+    findings = PatientFinding.objects.bulk_create(
+        PatientFinding(patient_examination=e, finding=colon_polyp) for e in examinations
+    )
+    PatientFindingClassification.objects.bulk_create(
+        PatientFindingClassification(finding=f, classification=c, classification_choice=choice)
+        for i, f in enumerate(findings)
+        for c, choice in classifications[: i % (len(classifications) + 1)]
+    )
+    return PatientExamination.objects.filter(pk__in=[e.pk for e in examinations]).order_by("pk")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--examinations", type=int, default=10_000)
+    parser.add_argument("--sample", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "config.settings.test")
+    os.environ.setdefault("TQDM_DISABLE", "1")
+    django.setup()
+    import logging
+
+    import numpy as np
+    from django.db import connection, transaction
+    from django.test.utils import CaptureQueriesContext
+
+    from endoreg_db.models import RequirementSet
+    from endoreg_db.models.requirement.requirement_evaluation.evaluation_plan import get_evaluation_plan
+    from endoreg_db.services.examination_batch_evaluation import evaluate_examinations
+
+    logging.disable(logging.INFO)
+    requirement_sets = list(RequirementSet.objects.filter(name__in=SET_NAMES))
+    if not requirement_sets:
+        raise SystemExit("Requirement sets not found; run `python manage.py load_base_db_data` first.")
+
+    try:
+        with transaction.atomic():
+            examinations = create_examinations(args.examinations)
+            get_evaluation_plan(refresh=True)
+            print(f"Database: {connection.vendor}, {args.examinations} examinations, {len(requirement_sets)} sets")
+
+            sample = list(examinations[: args.sample])
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                single = np.array([[rs.evaluate(e) for rs in requirement_sets] for e in sample], dtype=bool)
+                elapsed = (time.perf_counter() - start) * args.examinations / len(sample)
+            n_queries = len(queries) * args.examinations // len(sample)
+            print(f"single  {elapsed:8.2f} s   ~{n_queries} queries (extrapolated from {len(sample)})")
+
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                matrix = evaluate_examinations(examinations, requirement_sets)
+                elapsed = time.perf_counter() - start
+            print(f"batch   {elapsed:8.2f} s   {len(queries)} queries")
+
+            assert np.array_equal(matrix.results[: len(sample)], single), "batch and single results differ"
+            print("satisfied:", {rs.name: f"{matrix.satisfied_fraction()[rs.pk]:.1%}" for rs in requirement_sets})
+            raise _Rollback
+    except _Rollback:
+        pass
+
+
+if __name__ == "__main__":
+    main()
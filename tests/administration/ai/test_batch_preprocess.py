@@ -0,0 +1,46 @@
+import numpy as np
+import torch
+from django.test import TestCase
+
+from endoreg_db.utils.ai import BatchPreprocessor, InferenceDataset
+from endoreg_db.utils.ai.predict import sample_config
+
+# Largest allowed deviation from the PIL path, in grey levels (rounding of intermediates)
+MAX_GREY_LEVEL_DIFF = 1.0
+
+
+class BatchPreprocessorParityTest(TestCase):
+    def setUp(self):
+        self.config = sample_config.copy()
+        self.config.update({"size_x": 128, "size_y": 128})
+        self.per_image = InferenceDataset([], [], self.config)
+        rng = np.random.default_rng(42)
+        self.frames = rng.integers(0, 256, size=(4, 120, 160, 3), dtype=np.uint8)
+        # Add flat regions so the resampling sees edges, not only noise
+        self.frames[:, :40] = (self.frames[:, :40] // 64) * 64
+
+    def _assert_parity(self, crop):
+        expected = torch.stack([self.per_image.preprocess(frame, crop) for frame in self.frames])
+        actual = BatchPreprocessor(crop, self.config)(self.frames)
+
+        self.assertEqual(actual.shape, expected.shape)
+        std = torch.tensor(self.config["std"]).view(1, 3, 1, 1)
+        grey_level_diff = ((actual - expected) * std * 255).abs()
+        self.assertLessEqual(float(grey_level_diff.max()), MAX_GREY_LEVEL_DIFF + 1e-3)
+        self.assertLess(float((grey_level_diff > 0.5).float().mean()), 0.01)
+
+    def test_wide_crop_is_padded_vertically(self):
+        self._assert_parity([10, 90, 5, 150])
+
+    def test_tall_crop_is_padded_horizontally(self):
+        self._assert_parity([0, 120, 30, 100])
+
+    def test_square_upscaling_crop(self):
+        self._assert_parity([20, 60, 20, 60])
+
+    def test_crop_outside_frame_is_zero_padded(self):
+        self._assert_parity([-10, 100, 100, 180])
+
+    def test_missing_crop_raises(self):
+        with self.assertRaises(ValueError):
+            BatchPreprocessor(None, self.config)
@@ -0,0 +1,90 @@
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+from torch import nn
+
+from endoreg_db.utils.ai.model_cache import ModelCache, ModelCacheKey, model_nbytes, weights_fingerprint
+
+
+def _linear(n_features=64):
+    # float32 weights + bias
+    return nn.Linear(n_features, n_features)
+
+
+class ModelCacheTest(TestCase):
+    def setUp(self):
+        self.model_bytes = model_nbytes(_linear())
+        self.loads = []
+
+    def _loader(self, tag):
+        def load():
+            self.loads.append(tag)
+            model = _linear()
+            model.train()
+            return model
+        return load
+
+    def _key(self, name, device="cpu"):
+        return ModelCacheKey(name, "1", "abc", device)
+
+    def test_hit_returns_same_model_in_eval_mode(self):
+        cache = ModelCache(max_bytes=10 * self.model_bytes)
+        first = cache.get_or_load(self._key("a"), self._loader("a"))
+        second = cache.get_or_load(self._key("a"), self._loader("a"))
+
+        self.assertIs(first, second)
+        self.assertFalse(first.training)
+        self.assertEqual(self.loads, ["a"])
+        stats = cache.stats()
+        self.assertEqual((stats.hits, stats.misses), (1, 1))
+        self.assertEqual(stats.resident_bytes, self.model_bytes)
+        self.assertGreater(stats.load_seconds, 0)
+
+    def test_device_is_part_of_the_key(self):
+        cache = ModelCache(max_bytes=10 * self.model_bytes)
+        cache.get_or_load(self._key("a", "cpu"), self._loader("cpu"))
+        cache.get_or_load(self._key("a", "cuda:0"), self._loader("cuda"))
+        self.assertEqual(self.loads, ["cpu", "cuda"])
+
+        cache.clear(device="cuda")
+        self.assertIn(self._key("a", "cpu"), cache)
+        self.assertNotIn(self._key("a", "cuda:0"), cache)
+
+    def test_least_recently_used_model_is_evicted_over_budget(self):
+        cache = ModelCache(max_bytes=2 * self.model_bytes)
+        cache.get_or_load(self._key("a"), self._loader("a"))
+        cache.get_or_load(self._key("b"), self._loader("b"))
+        cache.get_or_load(self._key("a"), self._loader("a"))  # a is now most recent
+        cache.get_or_load(self._key("c"), self._loader("c"))
+
+        self.assertIn(self._key("a"), cache)
+        self.assertNotIn(self._key("b"), cache)
+        self.assertIn(self._key("c"), cache)
+        self.assertEqual(cache.stats().evictions, 1)
+
+    def test_model_larger_than_budget_stays_resident_alone(self):
+        cache = ModelCache(max_bytes=self.model_bytes // 2)
+        cache.get_or_load(self._key("a"), self._loader("a"))
+        cache.get_or_load(self._key("b"), self._loader("b"))
+        cache.get_or_load(self._key("b"), self._loader("b"))
+
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(self.loads, ["a", "b"])
+
+    def test_zero_budget_disables_caching(self):
+        cache = ModelCache(max_bytes=0)
+        cache.get_or_load(self._key("a"), self._loader("a"))
+        cache.get_or_load(self._key("a"), self._loader("a"))
+        self.assertEqual(self.loads, ["a", "a"])
+        self.assertEqual(len(cache), 0)
+
+    def test_weights_fingerprint_changes_with_content(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "model.ckpt"
+            path.write_bytes(b"weights-v1")
+            first = weights_fingerprint(path)
+            self.assertEqual(first, weights_fingerprint(path))
+
+            path.write_bytes(b"weights-v2-longer")
+            self.assertNotEqual(first, weights_fingerprint(path))
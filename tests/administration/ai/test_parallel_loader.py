@@ -0,0 +1,50 @@
+from unittest import mock
+
+import torch
+from django.test import TestCase
+from torch.utils.data import DataLoader, Dataset
+
+from endoreg_db.utils.ai import parallel_loader
+from endoreg_db.utils.ai.parallel_loader import ThreadedBatchLoader, make_inference_loader
+
+
+class _RangeDataset(Dataset):
+    def __init__(self, n_items):
+        self.n_items = n_items
+
+    def __len__(self):
+        return self.n_items
+
+    def __getitem__(self, idx):
+        return torch.full((2, 2), float(idx))
+
+
+class ThreadedBatchLoaderTest(TestCase):
+    def test_batches_match_dataloader_order(self):
+        dataset = _RangeDataset(37)
+        expected = list(DataLoader(dataset, batch_size=8, shuffle=False))
+        actual = list(ThreadedBatchLoader(dataset, batch_size=8, num_workers=3))
+
+        self.assertEqual(len(actual), len(expected))
+        for got, want in zip(actual, expected):
+            self.assertTrue(torch.equal(got, want))
+
+    def test_stopping_early_does_not_hang(self):
+        loader = ThreadedBatchLoader(_RangeDataset(100), batch_size=4, num_workers=2)
+        first = next(iter(loader))
+        self.assertEqual(first.shape, (4, 2, 2))
+
+    def test_thread_mode_is_used_by_default(self):
+        loader = make_inference_loader(_RangeDataset(4), {"batchsize": 2, "num_workers": 2})
+        self.assertIsInstance(loader, ThreadedBatchLoader)
+
+    def test_process_mode_falls_back_to_threads_in_daemon_process(self):
+        config = {"batchsize": 2, "num_workers": 2, "worker_mode": "process"}
+        with mock.patch.object(parallel_loader, "_in_daemon_process", return_value=True):
+            loader = make_inference_loader(_RangeDataset(4), config)
+        self.assertIsInstance(loader, ThreadedBatchLoader)
+
+    def test_zero_workers_uses_in_process_dataloader(self):
+        loader = make_inference_loader(_RangeDataset(4), {"batchsize": 2, "num_workers": 0})
+        self.assertIsInstance(loader, DataLoader)
+        self.assertEqual(loader.num_workers, 0)
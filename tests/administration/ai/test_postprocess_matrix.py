@@ -0,0 +1,93 @@
+import numpy as np
+from django.test import TestCase
+
+from endoreg_db.utils.ai.postprocess import (
+    IncrementalSequenceFinder,
+    PredictionBuffer,
+    find_true_pred_sequences,
+    make_smooth_preds,
+    prediction_matrix_to_sequences,
+    smooth_prediction_matrix,
+)
+
+LABELS = ["outside", "polyp", "blood", "nbi"]
+FPS = 10
+
+
+def _per_label_sequences(matrix, window_size_s=1, fps=FPS, threshold=0.5):
+    sequences = {}
+    for i, label in enumerate(LABELS):
+        smooth = make_smooth_preds(matrix[:, i], window_size_s=window_size_s, fps=fps)
+        binary = smooth > threshold
+        sequences[label] = find_true_pred_sequences(binary) if binary.any() else []
+    return sequences
+
+
+def _predictions(n_frames, seed=0):
+    rng = np.random.default_rng(seed)
+    # Piecewise constant segments plus noise, so sequences of different lengths appear
+    segment_values = rng.random((n_frames // 25 + 1, len(LABELS)))
+    matrix = np.repeat(segment_values, 25, axis=0)[:n_frames]
+    matrix = matrix + rng.normal(0, 0.1, size=matrix.shape)
+    matrix[:30, 0] = 0.95  # label active from the first frame
+    matrix[-30:, 1] = 0.95  # label active until the last frame
+    return np.clip(matrix, 0, 1).astype(np.float32)
+
+
+class PredictionMatrixTest(TestCase):
+    def test_smoothing_matches_per_label_convolution(self):
+        matrix = _predictions(300)
+        smooth = smooth_prediction_matrix(matrix, window_size_s=1, fps=FPS)
+        for i in range(len(LABELS)):
+            expected = make_smooth_preds(matrix[:, i], window_size_s=1, fps=FPS)
+            np.testing.assert_allclose(smooth[:, i], expected, atol=1e-6)
+
+    def test_smoothing_video_shorter_than_window(self):
+        matrix = _predictions(6)
+        smooth = smooth_prediction_matrix(matrix, window_size_s=1, fps=FPS)
+        expected = make_smooth_preds(matrix[:, 0], window_size_s=1, fps=FPS)
+        np.testing.assert_allclose(smooth[:, 0], expected, atol=1e-6)
+
+    def test_sequences_match_per_label_functions(self):
+        matrix = _predictions(500)
+        self.assertEqual(
+            prediction_matrix_to_sequences(matrix, LABELS, window_size_s=1, fps=FPS),
+            _per_label_sequences(matrix),
+        )
+
+    def test_incremental_sequences_match_offline(self):
+        matrix = _predictions(500, seed=3)
+        expected = prediction_matrix_to_sequences(matrix, LABELS, window_size_s=1, fps=FPS)
+
+        for batch_size in (1, 7, 16, 128):
+            finder = IncrementalSequenceFinder(LABELS, window_size_s=1, fps=FPS)
+            emitted = []
+            for start in range(0, len(matrix), batch_size):
+                emitted += finder.update(matrix[start:start + batch_size])
+            emitted += finder.finalize()
+
+            actual = {label: [] for label in LABELS}
+            for label, start, stop in emitted:
+                actual[label].append((start, stop))
+            actual = {label: sorted(seqs) for label, seqs in actual.items()}
+            self.assertEqual(actual, expected, f"batch_size={batch_size}")
+
+    def test_incremental_video_shorter_than_window(self):
+        # 4 frames, 10 frame window: every smoothed value is 4 * 0.9 / 10 = 0.36
+        matrix = np.full((4, len(LABELS)), 0.9, dtype=np.float32)
+        finder = IncrementalSequenceFinder(LABELS, window_size_s=1, fps=FPS, threshold=0.3)
+        self.assertEqual(finder.update(matrix), [])
+        emitted = finder.finalize()
+        expected = prediction_matrix_to_sequences(matrix, LABELS, window_size_s=1, fps=FPS, threshold=0.3)
+        self.assertEqual(expected["outside"], [(0, 6)])
+        self.assertEqual({label: [(start, stop)] for label, start, stop in emitted}, expected)
+
+    def test_prediction_buffer_grows_past_capacity(self):
+        buffer = PredictionBuffer(capacity=4, dtype=np.float16)
+        matrix = _predictions(11)
+        for start in range(0, 11, 3):
+            buffer.append(matrix[start:start + 3])
+
+        self.assertEqual(len(buffer), 11)
+        self.assertEqual(buffer.array().dtype, np.float16)
+        np.testing.assert_allclose(buffer.array(), matrix, atol=1e-3)
@@ -0,0 +1,63 @@
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+
+from endoreg_db.models import BaseDataFile, RequirementSet, RequirementSetType, Tag
+from endoreg_db.utils.base_data_snapshot import dump_base_data_snapshot, restore_base_data_snapshot
+
+CHECKSUM = "test-checksum"
+
+
+class BaseDataSnapshotTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = Path(self.tmp_dir.name) / "snapshot.json.gz"
+
+        set_type = RequirementSetType.objects.create(name="snapshot_test_type")
+        self.tags = [Tag.objects.create(name=f"snapshot_test_tag_{i}") for i in range(3)]
+        self.req_set = RequirementSet.objects.create(
+            name="snapshot_test_set", requirement_set_type=set_type, description="restored"
+        )
+        self.req_set.tags.set(self.tags[:2])
+        BaseDataFile.objects.create(path="endoreg_db.Tag/tag/tags.yaml", model_name="Tag", content_hash="0" * 64)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _clear(self):
+        RequirementSet.objects.all().delete()
+        RequirementSetType.objects.all().delete()
+        Tag.objects.all().delete()
+        BaseDataFile.objects.all().delete()
+
+    def test_restores_rows_with_primary_keys_and_m2m(self):
+        counts = dump_base_data_snapshot(self.path, checksum=CHECKSUM)
+        self.assertEqual(counts["endoreg_db.Tag"], 3)
+        self.assertEqual(counts["endoreg_db.RequirementSet_tags"], 2)
+        self._clear()
+
+        self.assertTrue(restore_base_data_snapshot(self.path, checksum=CHECKSUM))
+
+        req_set = RequirementSet.objects.get(name="snapshot_test_set")
+        self.assertEqual(req_set.pk, self.req_set.pk)
+        self.assertEqual(req_set.description, "restored")
+        self.assertEqual(req_set.requirement_set_type.name, "snapshot_test_type")
+        self.assertEqual(sorted(req_set.tags.values_list("pk", flat=True)), [t.pk for t in self.tags[:2]])
+        self.assertEqual(BaseDataFile.objects.count(), 1)
+        # Sequences continue after the restored primary keys
+        self.assertGreater(Tag.objects.create(name="snapshot_test_new").pk, max(t.pk for t in self.tags))
+
+    def test_checksum_mismatch_falls_back(self):
+        dump_base_data_snapshot(self.path, checksum=CHECKSUM)
+        self._clear()
+        self.assertFalse(restore_base_data_snapshot(self.path, checksum="other"))
+        self.assertFalse(Tag.objects.exists())
+
+    def test_does_not_restore_into_non_empty_tables(self):
+        dump_base_data_snapshot(self.path, checksum=CHECKSUM)
+        self.assertFalse(restore_base_data_snapshot(self.path, checksum=CHECKSUM))
+        self.assertEqual(Tag.objects.count(), 3)
+
+    def test_missing_snapshot(self):
+        self.assertFalse(restore_base_data_snapshot(self.path / "missing", checksum=CHECKSUM))
@@ -0,0 +1,128 @@
+import tempfile
+from io import StringIO
+from pathlib import Path
+from types import SimpleNamespace
+
+from django.core.management.color import no_style
+from django.test import TestCase
+
+from endoreg_db.models import BaseDataFile, RequirementSet, RequirementSetType, Tag
+from endoreg_db.utils.dataloader import _changed_fields, load_model_data_from_yaml
+
+SET_TYPE_YAML = """
+- model: endoreg_db.requirement_set_type
+  fields:
+    name: bulk_loader_test_all
+"""
+
+SET_YAML = """
+- model: endoreg_db.requirement_set
+  fields:
+    name: bulk_loader_test_parent
+    requirement_set_type: bulk_loader_test_all
+    links_to_sets:
+      - bulk_loader_test_child
+    tags:
+      - bulk_loader_test_tag_a
+      - bulk_loader_test_tag_b
+- model: endoreg_db.requirement_set
+  fields:
+    name: bulk_loader_test_child
+    description: child set
+"""
+
+
+class BulkDataLoaderTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.data_dir = Path(self.tmp_dir.name)
+        (self.data_dir / "set_type").mkdir()
+        (self.data_dir / "set").mkdir()
+        (self.data_dir / "set_type" / "types.yaml").write_text(SET_TYPE_YAML)
+        self.set_file = self.data_dir / "set" / "sets.yaml"
+        self.set_file.write_text(SET_YAML)
+        Tag.objects.get_or_create(name="bulk_loader_test_tag_a")
+        Tag.objects.get_or_create(name="bulk_loader_test_tag_b")
+        self.command = SimpleNamespace(stdout=StringIO(), style=no_style())
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def _load(self, **kwargs):
+        load_model_data_from_yaml(
+            self.command,
+            "RequirementSetType",
+            {"dir": self.data_dir / "set_type", "model": RequirementSetType, "foreign_keys": [], "foreign_key_models": []},
+            False,
+            **kwargs,
+        )
+        load_model_data_from_yaml(
+            self.command,
+            "RequirementSet",
+            {
+                "dir": self.data_dir / "set",
+                "model": RequirementSet,
+                "foreign_keys": ["requirement_set_type", "links_to_sets", "tags"],
+                "foreign_key_models": [RequirementSetType, RequirementSet, Tag],
+            },
+            False,
+            **kwargs,
+        )
+
+    def test_loads_foreign_keys_and_links_within_a_file(self):
+        self._load()
+
+        parent = RequirementSet.objects.get(name="bulk_loader_test_parent")
+        self.assertEqual(parent.requirement_set_type.name, "bulk_loader_test_all")
+        # The child is defined after the parent in the same file
+        self.assertEqual([s.name for s in parent.links_to_sets.all()], ["bulk_loader_test_child"])
+        self.assertEqual(
+            sorted(parent.tags.values_list("name", flat=True)), ["bulk_loader_test_tag_a", "bulk_loader_test_tag_b"]
+        )
+        self.assertEqual(RequirementSet.objects.get(name="bulk_loader_test_child").description, "child set")
+        self.assertEqual(BaseDataFile.objects.filter(model_name__in=["RequirementSet", "RequirementSetType"]).count(), 2)
+
+    def test_unchanged_files_are_skipped(self):
+        self._load()
+        with self.assertNumQueries(2):  # one BaseDataFile lookup per model
+            self._load()
+
+    def test_changed_file_updates_fields_and_m2m(self):
+        self._load()
+        self.set_file.write_text(
+            SET_YAML.replace("child set", "changed").replace("      - bulk_loader_test_tag_b\n", "")
+        )
+        self._load()
+
+        self.assertEqual(RequirementSet.objects.get(name="bulk_loader_test_child").description, "changed")
+        parent = RequirementSet.objects.get(name="bulk_loader_test_parent")
+        self.assertEqual(list(parent.tags.values_list("name", flat=True)), ["bulk_loader_test_tag_a"])
+        self.assertEqual(RequirementSet.objects.filter(name__startswith="bulk_loader_test_").count(), 2)
+
+    def test_force_reloads_unchanged_files(self):
+        self._load()
+        RequirementSet.objects.filter(name="bulk_loader_test_child").update(description="edited in db")
+        self._load(force=True)
+        self.assertEqual(RequirementSet.objects.get(name="bulk_loader_test_child").description, "child set")
+
+    def test_files_with_unresolved_keys_are_reloaded(self):
+        Tag.objects.filter(name="bulk_loader_test_tag_b").delete()
+        self._load()
+        self.assertFalse(BaseDataFile.objects.filter(model_name="RequirementSet").exists())
+
+        Tag.objects.create(name="bulk_loader_test_tag_b")
+        self._load()
+
+        parent = RequirementSet.objects.get(name="bulk_loader_test_parent")
+        self.assertEqual(
+            sorted(parent.tags.values_list("name", flat=True)), ["bulk_loader_test_tag_a", "bulk_loader_test_tag_b"]
+        )
+        self.assertTrue(BaseDataFile.objects.filter(model_name="RequirementSet").exists())
+
+    def test_changed_fields_applies_all_keys_before_falling_back(self):
+        obj = RequirementSet(name="bulk_loader_test_unsaved", description="old")
+        changed = _changed_fields(obj, {"not_a_field": 1, "description": "new"})
+
+        self.assertIsNone(changed)
+        self.assertEqual(obj.not_a_field, 1)
+        self.assertEqual(obj.description, "new")
@@ -0,0 +1,136 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from endoreg_db.models import Frame, ImageClassificationAnnotation, Label, LabelVideoSegment, VideoPredictionMeta
+from endoreg_db.serializers import LabelVideoSegmentSerializer
+from endoreg_db.serializers.label_video_segment._lvs_frames import _batched_frame_ranges, build_segment_frame_payloads
+
+from ..helpers.data_loader import (
+    load_ai_model_label_data,
+    load_ai_model_data,
+    load_default_ai_model
+)
+from ..helpers.default_objects import (
+    get_latest_segmentation_model,
+    get_default_video_file,
+    get_information_source_prediction
+)
+
+# Videos not cached on the segments, frames, annotations with labels, information source types
+MAX_PAYLOAD_QUERIES = 4
+
+
+class SegmentFramePayloadTest(TestCase):
+    def setUp(self):
+        load_ai_model_label_data()
+        load_ai_model_data()
+        load_default_ai_model()
+
+        self.video_file = get_default_video_file()
+        self.video_file.get_frame_dir_path()  # sets frame_dir once, outside of the measured queries
+        prediction_meta, _ = VideoPredictionMeta.objects.get_or_create(
+            video_file=self.video_file, model_meta=get_latest_segmentation_model()
+        )
+        self.segments = []
+        for start, end in ((0, 10), (10, 30)):
+            segment = LabelVideoSegment.create_from_video(
+                source=self.video_file,
+                prediction_meta=prediction_meta,
+                label=Label.get_outside_label(),
+                start_frame_number=start,
+                end_frame_number=end,
+            )
+            segment.source = get_information_source_prediction()
+            segment.save()
+            segment.generate_annotations()
+            self.segments.append(segment)
+
+    def _fresh_segments(self):
+        return list(LabelVideoSegment.objects.filter(pk__in=[s.pk for s in self.segments]).order_by("pk"))
+
+    def test_query_count_does_not_depend_on_frame_count(self):
+        short, long = self._fresh_segments()
+        with CaptureQueriesContext(connection) as short_queries:
+            short_payload = build_segment_frame_payloads([short])[short.pk]
+        with CaptureQueriesContext(connection) as long_queries:
+            long_payload = build_segment_frame_payloads([long])[long.pk]
+
+        self.assertEqual(len(short_payload["frames"]), 10)
+        self.assertEqual(len(long_payload["frames"]), 20)
+        self.assertEqual(len(short_queries), len(long_queries))
+        self.assertLessEqual(len(long_queries), MAX_PAYLOAD_QUERIES)
+
+    def test_many_segments_share_one_batch(self):
+        segments = self._fresh_segments()
+        with CaptureQueriesContext(connection) as queries:
+            payloads = build_segment_frame_payloads(segments)
+        self.assertLessEqual(len(queries), MAX_PAYLOAD_QUERIES)
+        self.assertEqual([len(p["frames"]) for p in payloads.values()], [10, 20])
+
+    def test_many_segments_use_one_range_per_video(self):
+        # More segments than SQLite's expression depth limit; unsaved copies are enough for the payload
+        template = self._fresh_segments()[0]
+        segments = [
+            LabelVideoSegment(
+                pk=100_000 + i,
+                video_file=template.video_file,
+                label=template.label,
+                start_frame_number=i % 30,
+                end_frame_number=i % 30 + 1,
+            )
+            for i in range(1200)
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            payloads = build_segment_frame_payloads(segments)
+
+        self.assertLessEqual(len(queries), MAX_PAYLOAD_QUERIES)
+        self.assertEqual(len(payloads), 1200)
+        self.assertTrue(all(len(p["frames"]) == 1 for p in payloads.values()))
+        self.assertEqual(payloads[100_005]["frames"][0]["frame_id"], template.video_file.frames.get(frame_number=5).pk)
+
+    def test_frames_outside_all_segments_are_not_fetched(self):
+        template = self._fresh_segments()[0]
+        segments = [
+            LabelVideoSegment(
+                pk=200_000 + i, video_file=template.video_file, label=template.label,
+                start_frame_number=start, end_frame_number=end,
+            )
+            for i, (start, end) in enumerate(((2, 4), (3, 5), (20, 23)))
+        ]
+        expected = [2, 3, 4, 20, 21, 22]
+
+        fetched = []
+        for frame_ranges in _batched_frame_ranges(segments):
+            fetched += Frame.objects.filter(frame_ranges).values_list("frame_number", flat=True)
+        self.assertEqual(sorted(fetched), expected)
+        for frame_ranges in _batched_frame_ranges(segments, prefix="frame__"):
+            annotated = ImageClassificationAnnotation.objects.filter(frame_ranges).values_list(
+                "frame__frame_number", flat=True
+            )
+            self.assertTrue(set(annotated) <= set(expected))
+
+    def test_payload_matches_frame_annotations(self):
+        segment = self._fresh_segments()[1]
+        payload = LabelVideoSegmentSerializer(segment).data["time_segments"]
+        frames = list(segment.frames)
+
+        self.assertEqual(payload["segment_id"], segment.pk)
+        self.assertEqual([f["frame_id"] for f in payload["frames"]], [f.pk for f in frames])
+        for frame, frame_payload in zip(frames, payload["frames"]):
+            self.assertEqual(frame_payload["frame_filename"], frame.file_path.name)
+            self.assertEqual(
+                sorted(a["id"] for a in frame_payload["predictions"]),
+                sorted(frame.predictions.values_list("id", flat=True)),
+            )
+            self.assertEqual(frame_payload["manual_annotations"], [])
+            self.assertEqual(frame_payload["predictions"][0]["frame_number"], frame.frame_number)
+
+    def test_list_serializer_matches_single_serializer(self):
+        segments = self._fresh_segments()
+        many = LabelVideoSegmentSerializer(segments, many=True).data
+        single = [LabelVideoSegmentSerializer(s).data for s in self._fresh_segments()]
+        self.assertEqual(
+            [s["time_segments"] for s in many],
+            [s["time_segments"] for s in single],
+        )
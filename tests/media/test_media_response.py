@@ -0,0 +1,153 @@
+import pytest
+from django.test import RequestFactory
+
+from endoreg_db.utils.media_response import MAX_RANGES, media_file_response, parse_range_header
+
+CONTENT = bytes(range(256)) * 40  # 10240 bytes
+
+
+@pytest.fixture
+def media_file(tmp_path):
+    path = tmp_path / "sample.mp4"
+    path.write_bytes(CONTENT)
+    return path
+
+
+def _get(path, **headers):
+    request = RequestFactory().get("/media/", **headers)
+    return media_file_response(request, path, content_type="video/mp4")
+
+
+def _body(response):
+    return b"".join(response.streaming_content)
+
+
+@pytest.mark.parametrize(
+    "header, expected",
+    [
+        (None, None),
+        ("items=0-1", None),
+        ("bytes=abc", None),
+        ("bytes=5-2", None),
+        ("bytes=0-99", [(0, 99)]),
+        ("bytes=100-", [(100, 999)]),
+        ("bytes=-100", [(900, 999)]),
+        ("bytes=-5000", [(0, 999)]),
+        ("bytes=990-2000", [(990, 999)]),
+        ("bytes=0-9, 5-19, 20-29, 500-509", [(0, 29), (500, 509)]),
+        ("bytes=1000-", []),
+        ("bytes=-0", []),
+    ],
+)
+def test_parse_range_header(header, expected):
+    assert parse_range_header(header, 1000) == expected
+
+
+def test_parse_range_header_ignores_too_many_ranges():
+    header = "bytes=" + ",".join(f"{i * 10}-{i * 10 + 1}" for i in range(MAX_RANGES + 1))
+    assert parse_range_header(header, 1000) is None
+
+
+def test_full_response(media_file):
+    response = _get(media_file)
+    assert response.status_code == 200
+    assert response["Content-Length"] == str(len(CONTENT))
+    assert response["Accept-Ranges"] == "bytes"
+    assert response["Content-Disposition"] == 'inline; filename="sample.mp4"'
+    assert _body(response) == CONTENT
+
+
+def test_single_range(media_file):
+    response = _get(media_file, HTTP_RANGE="bytes=1000-1999")
+    assert response.status_code == 206
+    assert response["Content-Range"] == f"bytes 1000-1999/{len(CONTENT)}"
+    assert response["Content-Length"] == "1000"
+    assert _body(response) == CONTENT[1000:2000]
+
+
+def test_suffix_range(media_file):
+    response = _get(media_file, HTTP_RANGE="bytes=-10")
+    assert response.status_code == 206
+    assert _body(response) == CONTENT[-10:]
+
+
+def test_unsatisfiable_range(media_file):
+    response = _get(media_file, HTTP_RANGE=f"bytes={len(CONTENT)}-")
+    assert response.status_code == 416
+    assert response["Content-Range"] == f"bytes */{len(CONTENT)}"
+
+
+def test_multiple_ranges(media_file):
+    response = _get(media_file, HTTP_RANGE="bytes=0-9,5000-5009")
+    assert response.status_code == 206
+    assert response["Content-Type"].startswith("multipart/byteranges; boundary=")
+    body = _body(response)
+    assert len(body) == int(response["Content-Length"])
+    assert f"Content-Range: bytes 0-9/{len(CONTENT)}".encode() in body
+    assert f"Content-Range: bytes 5000-5009/{len(CONTENT)}".encode() in body
+    assert CONTENT[5000:5010] in body
+
+
+def test_if_range_mismatch_serves_full_file(media_file):
+    response = _get(media_file, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE='"outdated"')
+    assert response.status_code == 200
+    assert _body(response) == CONTENT
+
+
+def test_if_range_match_serves_range(media_file):
+    etag = _get(media_file)["ETag"]
+    response = _get(media_file, HTTP_RANGE="bytes=0-9", HTTP_IF_RANGE=etag)
+    assert response.status_code == 206
+    assert _body(response) == CONTENT[:10]
+
+
+def test_if_none_match(media_file):
+    etag = _get(media_file)["ETag"]
+    response = _get(media_file, HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response["ETag"] == etag
+
+
+def test_x_accel_redirect_offload(media_file, monkeypatch):
+    monkeypatch.setenv("ENDOREG_MEDIA_OFFLOAD", "x-accel-redirect")
+    monkeypatch.setenv("ENDOREG_MEDIA_OFFLOAD_ROOT", str(media_file.parent))
+    response = _get(media_file, HTTP_RANGE="bytes=0-9")
+    assert response.status_code == 200
+    assert response["X-Accel-Redirect"] == "/protected-media/sample.mp4"
+    assert response.content == b""
+
+
+def test_single_range_reads_only_the_range(media_file):
+    response = _get(media_file, HTTP_RANGE="bytes=100-199")
+    file_handle = response.file_to_stream.file_handle
+    chunks = list(response.streaming_content)
+    assert b"".join(chunks) == CONTENT[100:200]
+    assert file_handle.tell() == 200
+    response.close()
+    assert file_handle.closed
+
+
+def test_sendfile_range_exposes_file_descriptor(media_file, monkeypatch):
+    monkeypatch.setenv("ENDOREG_MEDIA_RANGE_SENDFILE", "1")
+    response = _get(media_file, HTTP_RANGE="bytes=100-199")
+    assert response.file_to_stream.fileno() > 0
+    assert _body(response) == CONTENT[100:200]
+    response.close()
+
+
+def test_head_returns_headers_only(media_file):
+    request = RequestFactory().head("/media/", HTTP_RANGE="bytes=0-9")
+    response = media_file_response(request, media_file, content_type="video/mp4")
+    assert response.status_code == 200
+    assert response["Content-Length"] == str(len(CONTENT))
+    assert response["Accept-Ranges"] == "bytes"
+    assert response.content == b""
+
+
+def test_closing_file_wrapper_stops_at_length(media_file):
+    from endoreg_db.views.pdf import ClosingFileWrapper
+
+    file_handle = open(media_file, "rb")
+    file_handle.seek(10)
+    assert b"".join(ClosingFileWrapper(file_handle, blksize=7, length=20)) == CONTENT[10:30]
+    assert file_handle.closed
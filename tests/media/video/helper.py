@@ -1,7 +1,10 @@
 from pathlib import Path
 import random
 import re
-from typing import Optional
+from typing import Callable, Optional, Tuple
+
+import cv2
+import numpy as np
 
 from logging import getLogger
 logger = getLogger(__name__)
@@ -110,3 +113,59 @@ def get_random_video_path_by_examination_alias(
 
 
 TEST_VIDEOS = {key: value if value.exists() else None for key, value in TEST_VIDEOS.items()}
+
+
+# numbered_frame encodes the frame number in a band of black/white blocks (one per bit)
+FRAME_NUMBER_BITS = 10
+FRAME_NUMBER_BAND_HEIGHT = 32
+
+
+def numbered_frame(frame_number: int, size: Tuple[int, int] = (160, 120)) -> np.ndarray:
+    """
+    A BGR frame with a distinct blue level and its number drawn on it.
+
+    The number is also encoded as a band of blocks at the top, which survives lossy
+    encoding; ``read_frame_number`` decodes it.
+    """
+    width, height = size
+    frame = np.zeros((height, width, 3), dtype=np.uint8)
+    frame[:, :, 0] = frame_number % 256
+    block_width = width // FRAME_NUMBER_BITS
+    for bit in range(FRAME_NUMBER_BITS):
+        value = 255 if frame_number >> bit & 1 else 0
+        frame[:FRAME_NUMBER_BAND_HEIGHT, bit * block_width:(bit + 1) * block_width] = value
+    cv2.putText(frame, str(frame_number), (10, height - 40), cv2.FONT_HERSHEY_SIMPLEX, 1.5, (255, 255, 255), 2)
+    return frame
+
+
+def read_frame_number(image: np.ndarray) -> int:
+    """Decodes the frame number of a (decoded) ``numbered_frame``."""
+    block_width = image.shape[1] // FRAME_NUMBER_BITS
+    number = 0
+    for bit in range(FRAME_NUMBER_BITS):
+        # Only the block centers, which are not blurred by the neighbouring blocks
+        block = image[4:FRAME_NUMBER_BAND_HEIGHT - 4, bit * block_width + 4:(bit + 1) * block_width - 4]
+        if block.mean() > 127:
+            number |= 1 << bit
+    return number
+
+
+def write_test_video(
+    path: Path,
+    n_frames: int,
+    size: Tuple[int, int] = (160, 120),
+    fps: float = 25,
+    frame_factory: Optional[Callable[[int], np.ndarray]] = None,
+) -> None:
+    """
+    Writes an mp4v test video of ``n_frames`` frames of ``size`` (width, height).
+
+    ``frame_factory(i)`` returns the BGR frame ``i``; defaults to ``numbered_frame``.
+    mp4v inserts a keyframe every 12 frames.
+    """
+    if frame_factory is None:
+        frame_factory = lambda i: numbered_frame(i, size)  # noqa: E731
+    writer = cv2.VideoWriter(str(path), cv2.VideoWriter_fourcc(*"mp4v"), fps, size)  # type: ignore
+    for i in range(n_frames):
+        writer.write(frame_factory(i))
+    writer.release()
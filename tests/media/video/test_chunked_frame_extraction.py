@@ -0,0 +1,108 @@
+import shutil
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+import cv2
+import numpy as np
+from django.test import TestCase
+
+from endoreg_db.utils.video.ffmpeg_wrapper import (
+    extract_frames,
+    get_keyframe_times,
+    has_constant_frame_rate,
+    is_ffmpeg_available,
+    plan_frame_chunks,
+)
+
+from .helper import read_frame_number, write_test_video
+
+N_FRAMES = 600
+FPS = 25
+
+
+class PlanFrameChunksTest(TestCase):
+    def test_chunks_cover_all_frames_once(self):
+        keyframes = [i * 0.48 for i in range(50)]  # every 12 frames at 25 fps
+        chunks = plan_frame_chunks(keyframes, FPS, n_chunks=4, min_chunk_frames=100)
+
+        self.assertEqual(len(chunks), 4)
+        self.assertEqual(chunks[0].first_frame, 0)
+        self.assertIsNone(chunks[0].start_time)
+        self.assertIsNone(chunks[-1].n_frames)
+        for chunk, following in zip(chunks, chunks[1:]):
+            self.assertEqual(chunk.first_frame + chunk.n_frames, following.first_frame)
+            self.assertEqual(following.first_frame % 12, 0)
+
+    def test_seek_is_relative_to_first_keyframe(self):
+        # MPEG-TS and B-frame MP4 files start at a non-zero timestamp; ffmpeg's -ss is relative to it
+        keyframes = [1.4 + i * 0.48 for i in range(50)]
+        chunks = plan_frame_chunks(keyframes, FPS, n_chunks=4, min_chunk_frames=100)
+
+        self.assertEqual(len(chunks), 4)
+        for chunk in chunks[1:]:
+            self.assertEqual(chunk.first_frame % 12, 0)
+            self.assertAlmostEqual(chunk.start_time, (chunk.first_frame - 0.5) / FPS)
+
+    def test_single_chunk_without_keyframes(self):
+        self.assertEqual(len(plan_frame_chunks([], FPS, n_chunks=4)), 1)
+        self.assertEqual(len(plan_frame_chunks([0.0, 0.48], FPS, n_chunks=1)), 1)
+
+
+@unittest.skipUnless(is_ffmpeg_available(), "FFmpeg command not found")
+class ChunkedFrameExtractionTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp = Path(self.tmp_dir.name)
+        self.video_path = self.tmp / "test.mp4"
+        write_test_video(self.video_path, N_FRAMES, fps=FPS)
+
+    def test_keyframes_are_found(self):
+        keyframes = get_keyframe_times(self.video_path)
+        self.assertGreater(len(keyframes), 10)
+        self.assertEqual(keyframes[0], 0.0)
+
+    def test_chunked_extraction_matches_single_run(self):
+        single = extract_frames(self.video_path, self.tmp / "single", quality=2)
+
+        chunk_sizes = []
+        progress = []
+        chunked = extract_frames(
+            self.video_path,
+            self.tmp / "chunked",
+            quality=2,
+            workers=3,
+            progress_callback=lambda done, total: progress.append((done, total)),
+            chunk_callback=lambda paths: chunk_sizes.append(len(paths)),
+        )
+
+        self.assertEqual(len(single), N_FRAMES)
+        self.assertEqual([p.name for p in chunked], [f"frame_{n:07d}.jpg" for n in range(N_FRAMES)])
+        self.assertEqual([p.name for p in chunked], [p.name for p in single])
+        self.assertGreater(len(chunk_sizes), 1)
+        self.assertEqual(sum(chunk_sizes), N_FRAMES)
+        self.assertEqual(progress[-1], (N_FRAMES, N_FRAMES))
+        for single_path, chunked_path in zip(single, chunked):
+            np.testing.assert_array_equal(cv2.imread(str(single_path)), cv2.imread(str(chunked_path)))
+        for n in range(0, N_FRAMES, 37):
+            self.assertEqual(read_frame_number(cv2.imread(str(chunked[n]))), n)
+
+    def test_chunked_extraction_with_non_zero_start_time(self):
+        ts_path = self.tmp / "test.ts"
+        subprocess.run(
+            [shutil.which("ffmpeg"), "-v", "error", "-i", str(self.video_path), "-c", "copy", str(ts_path)],
+            check=True,
+        )
+        self.assertGreater(get_keyframe_times(ts_path)[0], 0.0)
+        self.assertTrue(has_constant_frame_rate(ts_path))
+
+        single = extract_frames(ts_path, self.tmp / "ts_single", quality=2)
+        chunked = extract_frames(ts_path, self.tmp / "ts_chunked", quality=2, workers=3)
+
+        self.assertEqual([p.name for p in chunked], [p.name for p in single])
+        for single_path, chunked_path in zip(single, chunked):
+            np.testing.assert_array_equal(cv2.imread(str(single_path)), cv2.imread(str(chunked_path)))
+        for n in range(0, N_FRAMES, 37):
+            self.assertEqual(read_frame_number(cv2.imread(str(chunked[n]))), n)
@@ -0,0 +1,81 @@
+import subprocess
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from django.test import TestCase
+
+from endoreg_db.models.utils import mask_frame
+from endoreg_db.utils.video import iter_video_frames
+from endoreg_db.utils.video.ffmpeg_wrapper import (
+    anonymize_video_with_filters,
+    build_anonymization_filter,
+    is_ffmpeg_available,
+)
+
+from .helper import write_test_video
+
+N_FRAMES = 30
+WIDTH, HEIGHT = 96, 64
+# Odd offsets and a ROI reaching past the right border
+ENDO_ROI = {"x": 13, "y": 7, "width": 90, "height": 41}
+BLACKOUT_RANGES = [(4, 8), (15, 15), (27, 40)]
+CENSOR_COLOR = (10, 20, 30)  # BGR
+
+
+class AnonymizationFilterTest(TestCase):
+    def test_filter_graph_for_ranges(self):
+        graph = build_anonymization_filter(WIDTH, HEIGHT, ENDO_ROI, BLACKOUT_RANGES, CENSOR_COLOR)
+        self.assertEqual(
+            graph,
+            "format=rgb24,crop=83:41:13:7,pad=96:64:13:7:color=black,"
+            "lutrgb=r=30:g=20:b=10:enable='between(n,4,8)+eq(n,15)+between(n,27,40)'",
+        )
+
+    def test_full_frame_roi_without_ranges_only_converts(self):
+        roi = {"x": 0, "y": 0, "width": WIDTH, "height": HEIGHT}
+        self.assertEqual(build_anonymization_filter(WIDTH, HEIGHT, roi, []), "format=rgb24")
+
+
+@unittest.skipUnless(is_ffmpeg_available(), "FFmpeg command not found")
+class FfmpegAnonymizationParityTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.video_path = Path(self.tmp_dir.name) / "raw.mp4"
+        rng = np.random.default_rng(0)
+        write_test_video(
+            self.video_path, N_FRAMES, size=(WIDTH, HEIGHT),
+            frame_factory=lambda _: rng.integers(0, 256, size=(HEIGHT, WIDTH, 3), dtype=np.uint8),
+        )
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_filter_graph_matches_python_masking_pixel_for_pixel(self):
+        graph = build_anonymization_filter(WIDTH, HEIGHT, ENDO_ROI, BLACKOUT_RANGES, CENSOR_COLOR)
+        # Raw RGB output, so the comparison is not affected by a lossy encoder
+        result = subprocess.run(
+            [
+                "ffmpeg", "-v", "error", "-i", str(self.video_path), "-vsync", "passthrough",
+                "-vf", graph, "-f", "rawvideo", "-pix_fmt", "rgb24", "-",
+            ],
+            check=True,
+            capture_output=True,
+        )
+        filtered = np.frombuffer(result.stdout, dtype=np.uint8).reshape(-1, HEIGHT, WIDTH, 3)
+        self.assertEqual(len(filtered), N_FRAMES)
+
+        rgb_censor_color = tuple(reversed(CENSOR_COLOR))
+        for frame_number, frame in iter_video_frames(self.video_path, backend="ffmpeg"):
+            all_black = any(first <= frame_number <= last for first, last in BLACKOUT_RANGES)
+            expected = mask_frame(frame, ENDO_ROI, all_black=all_black, censor_color=rgb_censor_color)
+            np.testing.assert_array_equal(filtered[frame_number], expected, err_msg=f"frame {frame_number}")
+
+    def test_anonymize_video_with_filters_writes_all_frames(self):
+        output_path = Path(self.tmp_dir.name) / "anonymized.mp4"
+        anonymize_video_with_filters(self.video_path, output_path, WIDTH, HEIGHT, ENDO_ROI, BLACKOUT_RANGES)
+
+        frames = list(iter_video_frames(output_path, backend="ffmpeg"))
+        self.assertEqual(len(frames), N_FRAMES)
+        self.assertLess(frames[5][1].mean(), 20)
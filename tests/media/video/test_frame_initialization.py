@@ -0,0 +1,82 @@
+import os
+from pathlib import Path
+from unittest import mock
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from endoreg_db.models import Center, Frame, VideoFile
+from endoreg_db.models.media.video.video_file_frames import _insert_frame_rows
+from endoreg_db.models.media.video.video_file_frames._insert_frame_rows import _bulk_create_frame_rows
+
+N_FRAMES = 95
+
+
+class FrameInitializationTest(TestCase):
+    def setUp(self):
+        center = Center.objects.create(name="frame_initialization_test_center")
+        self.video = VideoFile.objects.create(
+            center=center, video_hash="frame-initialization-test", fps=25, frame_count=N_FRAMES
+        )
+
+    def test_rows_are_inserted_in_batches(self):
+        n_rows = _insert_frame_rows(self.video, ((n, f"frame_{n:07d}.jpg") for n in range(N_FRAMES)), batch_size=10)
+        self.assertEqual(n_rows, N_FRAMES)
+
+        # Overlapping rows across a batch boundary: existing rows are skipped and keep their flag
+        n_rows = _insert_frame_rows(
+            self.video, ((n, f"frame_{n:07d}.jpg") for n in range(88, N_FRAMES + 5)), extracted=True, batch_size=10
+        )
+        self.assertEqual(n_rows, N_FRAMES + 5 - 88)
+
+        frames = Frame.objects.filter(video=self.video)
+        self.assertEqual(sorted(frames.values_list("frame_number", flat=True)), list(range(N_FRAMES + 5)))
+        self.assertEqual(frames.get(frame_number=42).relative_path, "frame_0000042.jpg")
+        self.assertEqual(
+            sorted(frames.filter(is_extracted=True).values_list("frame_number", flat=True)),
+            list(range(N_FRAMES, N_FRAMES + 5)),
+        )
+
+    def test_generic_backend_creates_one_batch_per_batch_size_rows(self):
+        with mock.patch.object(QuerySet, "bulk_create", autospec=True, side_effect=QuerySet.bulk_create) as bulk_create:
+            n_rows = _bulk_create_frame_rows(
+                self.video, ((n, f"frame_{n:07d}.jpg") for n in range(N_FRAMES)), extracted=False, batch_size=10
+            )
+
+        self.assertEqual(n_rows, N_FRAMES)
+        self.assertEqual([len(call.args[1]) for call in bulk_create.call_args_list], [10] * 9 + [5])
+        self.assertEqual(Frame.objects.filter(video=self.video).count(), N_FRAMES)
+
+    def test_initialize_from_frame_count(self):
+        with mock.patch.dict(os.environ, {"ENDOREG_FRAME_INSERT_BATCH_SIZE": "20"}):
+            self.video.initialize_frames()
+
+        frames = Frame.objects.filter(video=self.video)
+        self.assertEqual(frames.count(), N_FRAMES)
+        self.assertFalse(frames.filter(is_extracted=True).exists())
+        self.assertEqual(frames.get(frame_number=42).relative_path, "frame_0000042.jpg")
+        state = self.video.get_or_create_state()
+        self.assertTrue(state.frames_initialized)
+        self.assertEqual(state.frame_count, N_FRAMES)
+
+        # Initializing again skips the existing rows
+        self.video.initialize_frames()
+        self.assertEqual(frames.count(), N_FRAMES)
+
+    def test_initialize_from_paths_marks_existing_rows_by_range(self):
+        self.video.initialize_frames()
+        paths = [Path(f"/frames/frame_{n:07d}.jpg") for n in [*range(10, 40), *range(60, 70)]]
+
+        with CaptureQueriesContext(connection) as queries:
+            self.video.initialize_frames(frame_paths=paths)
+
+        updates = [q["sql"] for q in queries.captured_queries if q["sql"].startswith("UPDATE")]
+        frame_updates = [sql for sql in updates if Frame._meta.db_table in sql]
+        self.assertEqual(len(frame_updates), 2)
+        self.assertTrue(all("BETWEEN" in sql and " IN (" not in sql for sql in frame_updates))
+
+        extracted = Frame.objects.filter(video=self.video, is_extracted=True)
+        self.assertEqual(sorted(extracted.values_list("frame_number", flat=True)), [*range(10, 40), *range(60, 70)])
+        self.assertEqual(Frame.objects.filter(video=self.video).count(), N_FRAMES)
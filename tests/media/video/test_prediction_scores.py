@@ -0,0 +1,90 @@
+import shutil
+import tempfile
+
+import numpy as np
+from django.test import TestCase, override_settings
+
+from endoreg_db.models import (
+    AiModel,
+    Center,
+    Label,
+    LabelSet,
+    LabelVideoSegment,
+    ModelMeta,
+    VideoFile,
+    VideoPredictionMeta,
+)
+from endoreg_db.utils.ai.postprocess import prediction_matrix_to_sequences
+
+LABELS = ["outside", "polyp"]
+FPS = 10
+
+
+class PredictionScoreMatrixTest(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        labels = [Label.objects.get_or_create(name=name)[0] for name in LABELS]
+        labelset = LabelSet.objects.create(name="score_matrix_test", version=1)
+        labelset.labels.set(labels)
+        ai_model = AiModel.objects.create(name="score_matrix_test_model")
+        model_meta = ModelMeta.objects.create(
+            name="score_matrix_test_meta", version="1", model=ai_model, labelset=labelset
+        )
+        center = Center.objects.create(name="score_matrix_test_center")
+        self.video = VideoFile.objects.create(
+            center=center, video_hash="score-matrix-test", fps=FPS, frame_count=300
+        )
+        self.prediction_meta = VideoPredictionMeta.objects.create(video_file=self.video, model_meta=model_meta)
+
+        self.scores = np.zeros((300, len(LABELS)), dtype=np.float32)
+        self.scores[20:80, 0] = 0.9
+        self.scores[150:160, 1] = 0.6
+        self.scores[200:290, 1] = 0.8
+
+    def test_score_matrix_round_trip_is_memory_mapped(self):
+        self.prediction_meta.save_score_matrix(self.scores, LABELS)
+        self.prediction_meta.refresh_from_db()
+
+        loaded = self.prediction_meta.get_score_matrix()
+        self.assertIsInstance(loaded, np.memmap)
+        np.testing.assert_array_equal(loaded, self.scores)
+        self.assertEqual(self.prediction_meta.score_labels, LABELS)
+
+    def test_shape_must_match_labels(self):
+        with self.assertRaises(ValueError):
+            self.prediction_meta.save_score_matrix(self.scores, LABELS[:1])
+
+    def test_rethresholding_uses_stored_scores(self):
+        self.prediction_meta.save_score_matrix(self.scores, LABELS)
+
+        default = self.prediction_meta.compute_sequences(smooth_window_size_s=1, binarize_threshold=0.5)
+        self.assertEqual(default, prediction_matrix_to_sequences(self.scores, LABELS, window_size_s=1, fps=FPS))
+
+        # The short 0.6 burst only passes the default threshold
+        strict = self.prediction_meta.compute_sequences(smooth_window_size_s=1, binarize_threshold=0.75)
+        self.assertEqual(len(default["polyp"]), 2)
+        self.assertEqual(len(strict["polyp"]), 1)
+
+    def test_regenerate_segments_replaces_predicted_segments(self):
+        self.prediction_meta.save_score_matrix(self.scores, LABELS)
+
+        self.prediction_meta.regenerate_segments_from_scores(smooth_window_size_s=1, binarize_threshold=0.5)
+        self.assertEqual(LabelVideoSegment.objects.filter(prediction_meta=self.prediction_meta).count(), 3)
+
+        sequences = self.prediction_meta.regenerate_segments_from_scores(
+            smooth_window_size_s=1, binarize_threshold=0.75
+        )
+        segments = LabelVideoSegment.objects.filter(prediction_meta=self.prediction_meta)
+        self.assertEqual(segments.count(), 2)
+        self.assertEqual(segments.filter(label__name="polyp").count(), 1)
+        self.video.refresh_from_db()
+        self.assertEqual(self.video.sequences["polyp"], [list(s) for s in sequences["polyp"]])
+
+    def test_missing_score_matrix(self):
+        self.assertIsNone(self.prediction_meta.get_score_matrix())
+        self.assertIsNone(self.prediction_meta.compute_sequences())
@@ -0,0 +1,156 @@
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+import cv2
+from django.test import TestCase
+
+from endoreg_db.models import Center, Frame, VideoFile
+from endoreg_db.utils.paths import data_paths
+from endoreg_db.utils.video.ffmpeg_wrapper import (
+    FrameSelection,
+    extract_frames,
+    extract_selected_frames,
+    is_ffmpeg_available,
+)
+
+from .helper import read_frame_number, write_test_video
+
+N_FRAMES = 600
+FPS = 25
+
+
+class FrameSelectionTest(TestCase):
+    def test_stride(self):
+        self.assertEqual(FrameSelection(stride=250).resolve(FPS, N_FRAMES), [0, 250, 500])
+
+    def test_times_are_rounded_to_frames(self):
+        self.assertEqual(FrameSelection(times=[0.0, 1.0, 2.01, 99.0]).resolve(FPS, N_FRAMES), [0, 25, 50])
+
+    def test_frame_numbers_are_sorted_and_clipped(self):
+        selection = FrameSelection(frame_numbers=[10, 3, 10, -1, N_FRAMES])
+        self.assertEqual(selection.resolve(FPS, N_FRAMES), [3, 10])
+
+    def test_evenly_spaced(self):
+        self.assertEqual(FrameSelection.evenly_spaced(4, N_FRAMES).frame_numbers, [0, 150, 300, 450])
+
+    def test_exactly_one_field_required(self):
+        with self.assertRaises(ValueError):
+            FrameSelection().resolve(FPS, N_FRAMES)
+        with self.assertRaises(ValueError):
+            FrameSelection(stride=2, times=[1.0]).resolve(FPS, N_FRAMES)
+        with self.assertRaises(ValueError):
+            FrameSelection(times=[1.0]).resolve(None, N_FRAMES)
+
+
+@unittest.skipUnless(is_ffmpeg_available(), "FFmpeg command not found")
+class SelectedFrameExtractionTest(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        cls.tmp = Path(cls.tmp_dir.name)
+        cls.video_path = cls.tmp / "test.mp4"
+        write_test_video(cls.video_path, N_FRAMES, fps=FPS)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+        super().tearDownClass()
+
+    def assert_frames_match_reference(self, extracted):
+        # The frame number is decoded from the pixels, independent of ffmpeg's numbering
+        for number, path in extracted.items():
+            self.assertEqual(path.name, f"frame_{number:07d}.jpg")
+            self.assertEqual(read_frame_number(cv2.imread(str(path))), number, f"frame {number}")
+
+    def test_full_extraction_uses_the_same_numbering(self):
+        extracted = extract_frames(self.video_path, self.tmp / "all", quality=2)
+        self.assertEqual(len(extracted), N_FRAMES)
+        self.assert_frames_match_reference({int(path.stem.split("_")[-1]): path for path in extracted})
+
+    def test_dense_selection_uses_select_filter(self):
+        selection = FrameSelection(stride=25)
+        extracted = extract_selected_frames(self.video_path, self.tmp / "stride", selection, quality=2)
+
+        self.assertEqual(sorted(extracted), list(range(0, N_FRAMES, 25)))
+        self.assertEqual(extracted[50].name, "frame_0000050.jpg")
+        self.assertEqual(len(list((self.tmp / "stride").iterdir())), N_FRAMES // 25)
+        self.assert_frames_match_reference(extracted)
+
+    def test_irregular_selection(self):
+        numbers = [0, 1, 2, 7, 100, 101, 599]
+        extracted = extract_selected_frames(
+            self.video_path, self.tmp / "irregular", FrameSelection(frame_numbers=numbers), quality=2
+        )
+        self.assertEqual(sorted(extracted), numbers)
+        self.assert_frames_match_reference(extracted)
+
+    def test_sparse_selection_seeks_to_each_frame(self):
+        numbers = [0, 301, 599]
+        extracted = extract_selected_frames(
+            self.video_path, self.tmp / "sparse", FrameSelection(frame_numbers=numbers), quality=2
+        )
+        self.assertEqual(sorted(extracted), numbers)
+        self.assert_frames_match_reference(extracted)
+
+
+@unittest.skipUnless(is_ffmpeg_available(), "FFmpeg command not found")
+class VideoFileSelectedFramesTest(TestCase):
+    def setUp(self):
+        video_dir = data_paths["video"]
+        video_dir.mkdir(parents=True, exist_ok=True)
+        video_path = video_dir / "selected_frames_test.mp4"
+        write_test_video(video_path, N_FRAMES, fps=FPS)
+        self.addCleanup(video_path.unlink, missing_ok=True)
+
+        center = Center.objects.create(name="selected_frames_test_center")
+        self.video = VideoFile.objects.create(
+            center=center, video_hash="selected-frames-test", fps=FPS, frame_count=N_FRAMES
+        )
+        self.video.raw_file.name = f"{video_dir.name}/{video_path.name}"
+        self.video.save(update_fields=["raw_file"])
+        self.addCleanup(shutil.rmtree, self.video.get_frame_dir_path(), ignore_errors=True)
+
+    def test_frame_rows_are_created_for_selected_frames_only(self):
+        paths = self.video.extract_selected_frames(FrameSelection(times=[0.0, 4.0, 8.0]))
+
+        self.assertEqual([p.name for p in paths], ["frame_0000000.jpg", "frame_0000100.jpg", "frame_0000200.jpg"])
+        frames = Frame.objects.filter(video=self.video)
+        self.assertEqual(sorted(frames.values_list("frame_number", flat=True)), [0, 100, 200])
+        self.assertTrue(all(frame.is_extracted and frame.file_path.exists() for frame in frames))
+        self.assertFalse(self.video.get_or_create_state().frames_extracted)
+        self.assertTrue(self.video.get_or_create_state().frames_sampled)
+
+    def test_full_extraction_replaces_sampled_frames(self):
+        self.video.extract_selected_frames(FrameSelection(frame_numbers=[5, 6]))
+        self.video.extract_frames()
+
+        state = self.video.get_or_create_state()
+        self.assertTrue(state.frames_extracted)
+        self.assertFalse(state.frames_sampled)
+        self.assertEqual(len(list(self.video.get_frame_dir_path().glob("frame_*.jpg"))), N_FRAMES)
+
+    def test_complete_extraction_is_kept_despite_approximate_frame_count(self):
+        self.video.extract_frames()
+        first_frame = self.video.get_frame_dir_path() / "frame_0000000.jpg"
+        mtime = first_frame.stat().st_mtime_ns
+        # Container metadata may overstate the frame count; that alone must not trigger a re-extraction
+        self.video.frame_count = N_FRAMES + 50
+        self.video.save(update_fields=["frame_count"])
+        state = self.video.get_or_create_state()
+        state.frames_extracted = False
+        state.save(update_fields=["frames_extracted"])
+
+        self.video.extract_frames()
+        self.assertEqual(first_frame.stat().st_mtime_ns, mtime)
+
+    def test_existing_frames_are_reused(self):
+        first = self.video.extract_selected_frames(FrameSelection(frame_numbers=[5, 6]))
+        mtime = first[0].stat().st_mtime_ns
+
+        paths = self.video.extract_selected_frames(FrameSelection(frame_numbers=[5, 6, 7]))
+        self.assertEqual([p.name for p in paths], ["frame_0000005.jpg", "frame_0000006.jpg", "frame_0000007.jpg"])
+        self.assertEqual(paths[0].stat().st_mtime_ns, mtime)
+        self.assertEqual(Frame.objects.filter(video=self.video, is_extracted=True).count(), 3)
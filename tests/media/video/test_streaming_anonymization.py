@@ -0,0 +1,75 @@
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+import cv2
+import numpy as np
+from django.test import TestCase
+
+from endoreg_db.models.media.video.video_file_anonymize import _stream_anonymized_video
+from endoreg_db.models.utils import anonymize_frame, mask_frame
+from endoreg_db.utils.frame_ranges import FrameRangeSet
+from endoreg_db.utils.video import iter_video_frames, write_video_frames
+
+from .helper import write_test_video
+
+N_FRAMES = 10
+WIDTH, HEIGHT = 64, 48
+ENDO_ROI = {"x": 10, "y": 6, "width": 40, "height": 30}
+OUTSIDE_FRAMES = FrameRangeSet([(3, 5)])
+
+
+class StreamingAnonymizationTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.tmp_path = Path(self.tmp_dir.name)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_mask_frame_matches_anonymize_frame(self):
+        rng = np.random.default_rng(0)
+        frame = rng.integers(0, 256, size=(HEIGHT, WIDTH, 3), dtype=np.uint8)
+        raw_path = self.tmp_path / "raw.png"
+        target_path = self.tmp_path / "anonymized.png"
+        cv2.imwrite(str(raw_path), frame)
+
+        for all_black in (False, True):
+            anonymize_frame(raw_path, target_path, ENDO_ROI, all_black=all_black, censor_color=(1, 2, 3))
+            expected = cv2.imread(str(target_path))
+            masked = mask_frame(frame.copy(), ENDO_ROI, all_black=all_black, censor_color=(1, 2, 3))
+            np.testing.assert_array_equal(masked, expected)
+
+    def test_write_video_frames_rejects_wrong_shape(self):
+        frames = [np.zeros((HEIGHT + 1, WIDTH, 3), dtype=np.uint8)]
+        with self.assertRaises(ValueError):
+            write_video_frames(frames, self.tmp_path / "out.mp4", 25, WIDTH, HEIGHT, backend="opencv")
+
+    def test_stream_anonymized_video_masks_every_frame(self):
+        raw_path = self.tmp_path / "raw.mp4"
+        output_path = self.tmp_path / "anonymized.mp4"
+        write_test_video(
+            raw_path, N_FRAMES, size=(WIDTH, HEIGHT),
+            frame_factory=lambda _: np.full((HEIGHT, WIDTH, 3), 200, dtype=np.uint8),
+        )
+        video = SimpleNamespace(
+            uuid="streaming-anonymization-test",
+            frame_count=N_FRAMES,
+            get_raw_file_path=lambda: raw_path,
+            get_fps=lambda: 25,
+        )
+
+        n_frames = _stream_anonymized_video(video, output_path, ENDO_ROI, OUTSIDE_FRAMES, backend="opencv")
+
+        self.assertEqual(n_frames, N_FRAMES)
+        frames = list(iter_video_frames(output_path, backend="opencv"))
+        self.assertEqual(len(frames), N_FRAMES)
+        for frame_number, frame in frames:
+            # Compare region means; the encoder is lossy
+            inside = frame[8:34, 12:48].mean()
+            self.assertLess(frame[:4].mean(), 20)
+            self.assertLess(frame[:, :8].mean(), 20)
+            if frame_number in OUTSIDE_FRAMES:
+                self.assertLess(inside, 20)
+            else:
+                self.assertGreater(inside, 150)
@@ -0,0 +1,83 @@
+import tempfile
+from pathlib import Path
+
+import cv2
+import numpy as np
+import torch
+from django.test import TestCase
+from torch import nn
+
+from endoreg_db.utils.ai import Classifier, InferenceDataset, StreamingInferenceDataset
+from endoreg_db.utils.ai.predict import sample_config
+from endoreg_db.utils.video import iter_video_frames
+
+from .helper import write_test_video
+
+N_FRAMES = 12
+WIDTH, HEIGHT = 64, 48
+CROP = (4, 44, 8, 60)  # ymin, ymax, xmin, xmax
+
+
+def _growing_bar_frame(i: int) -> np.ndarray:
+    frame = np.zeros((HEIGHT, WIDTH, 3), dtype=np.uint8)
+    frame[:, : (i + 1) * 5] = (20 * i, 255 - 20 * i, 128)
+    return frame
+
+
+class TinyNet(nn.Module):
+    def __init__(self, n_labels):
+        super().__init__()
+        self.pool = nn.AdaptiveAvgPool2d(1)
+        self.fc = nn.Linear(3, n_labels)
+
+    def forward(self, x):
+        return self.fc(self.pool(x).flatten(1))
+
+
+class StreamingInferenceTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.video_path = Path(self.tmp_dir.name) / "video.mp4"
+        write_test_video(self.video_path, N_FRAMES, size=(WIDTH, HEIGHT), frame_factory=_growing_bar_frame)
+
+        self.config = sample_config.copy()
+        self.config.update({"size_x": 32, "size_y": 32, "batchsize": 5})
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_iter_video_frames_preserves_frame_numbers(self):
+        frames = list(iter_video_frames(self.video_path, backend="opencv"))
+        self.assertEqual([n for n, _ in frames], list(range(N_FRAMES)))
+        self.assertEqual(frames[0][1].shape, (HEIGHT, WIDTH, 3))
+        self.assertEqual(frames[0][1].dtype, np.uint8)
+
+        window = list(iter_video_frames(self.video_path, start_frame=3, max_frames=4, backend="opencv"))
+        self.assertEqual([n for n, _ in window], [3, 4, 5, 6])
+
+    def test_streaming_dataset_matches_file_dataset(self):
+        frames = list(iter_video_frames(self.video_path, backend="opencv"))
+        paths = []
+        for frame_number, frame in frames:
+            # PNG is lossless, so both paths see identical pixels
+            path = Path(self.tmp_dir.name) / f"frame_{frame_number + 1:07d}.png"
+            cv2.imwrite(str(path), cv2.cvtColor(frame, cv2.COLOR_RGB2BGR))
+            paths.append(path.as_posix())
+
+        file_ds = InferenceDataset(paths, [CROP] * len(paths), self.config)
+        stream_ds = StreamingInferenceDataset(frames, CROP, self.config)
+
+        for (frame_number, streamed), expected_idx in zip(stream_ds, range(len(paths))):
+            self.assertEqual(frame_number, expected_idx)
+            self.assertTrue(torch.equal(streamed, file_ds[expected_idx]))
+
+    def test_pipe_stream_returns_predictions_per_frame(self):
+        torch.manual_seed(0)
+        classifier = Classifier(TinyNet(len(self.config["labels"])), config=self.config)
+
+        frames = iter_video_frames(self.video_path, backend="opencv")
+        frame_numbers, predictions = classifier.pipe_stream(frames, CROP)
+
+        self.assertEqual(frame_numbers, list(range(N_FRAMES)))
+        self.assertEqual(len(predictions), N_FRAMES)
+        self.assertEqual(len(predictions[0]), len(self.config["labels"]))
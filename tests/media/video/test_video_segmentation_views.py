@@ -105,6 +105,47 @@ class VideoSegmentationViewTests(TestCase):
         # Content-Range is only present in partial content responses
         self.assertIn('Access-Control-Allow-Origin', response)
 
+    def test_stream_view_serves_partial_content(self):
+        """Range requests are answered with 206 and only the requested bytes."""
+        url = f"/api/media/videos/{self.video.pk}/stream/"
+
+        response = self.client.get(url, HTTP_RANGE="bytes=0-99")
+
+        self.assertEqual(response.status_code, status.HTTP_206_PARTIAL_CONTENT)
+        self.assertEqual(response['Content-Length'], '100')
+        self.assertTrue(response['Content-Range'].startswith('bytes 0-99/'))
+        self.assertEqual(len(b"".join(response.streaming_content)), 100)
+        self.assertIn('Content-Range', response['Access-Control-Expose-Headers'])
+
+    def test_frames_endpoint_pages_by_frame_number(self):
+        """Frames are returned page by page with a keyset cursor."""
+        url = f"/api/videos/{self.video.pk}/frames/"
+
+        first = self.client.get(url, {"start": 10, "end": 19, "limit": 6}).json()
+        self.assertEqual([f["frame_number"] for f in first["results"]], list(range(10, 16)))
+        self.assertEqual(first["next_cursor"], 15)
+
+        second = self.client.get(url, {"start": 10, "end": 19, "limit": 6, "after": first["next_cursor"]}).json()
+        self.assertEqual([f["frame_number"] for f in second["results"]], list(range(16, 20)))
+        self.assertIsNone(second["next_cursor"])
+        self.assertIn("frame_url", second["results"][0])
+
+        response = self.client.get(url, {"limit": "many"})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_label_time_segments_are_compact_unless_expanded(self):
+        """Segment payloads hold range descriptors; per-frame entries only with expand_frames."""
+        from endoreg_db.serializers.video.segmentation import VideoFileSerializer
+
+        self.video.sequences = {"outside": [[0, 99]]}
+        compact = VideoFileSerializer(self.video).get_label_time_segments(self.video)
+        time_range = compact["outside"]["time_ranges"][0]
+        self.assertEqual(time_range["frame_count"], 100)
+        self.assertNotIn("frames", time_range)
+
+        expanded = VideoFileSerializer(self.video, context={"expand_frames": True}).get_label_time_segments(self.video)
+        self.assertEqual(len(expanded["outside"]["time_ranges"][0]["frames"]), 100)
+
     @override_settings(DEBUG=True)
     def test_video_segments_creation_works_in_dev_mode(self):
         """Test that video segment creation works in development mode (AllowAny permissions)."""
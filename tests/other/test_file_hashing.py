@@ -0,0 +1,57 @@
+import hashlib
+import io
+import tempfile
+from pathlib import Path
+
+from django.test import TestCase
+
+from endoreg_db.utils.hashs import get_file_hash, get_file_prehash, get_pdf_hash, get_video_hash
+
+
+class FileHashingTest(TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.tmp = Path(self.tmp_dir.name)
+        # Not a multiple of the chunk sizes used below
+        self.content = bytes(range(256)) * 4099
+        self.path = self.tmp / "file.bin"
+        self.path.write_bytes(self.content)
+        self.expected = hashlib.sha256(self.content).hexdigest()
+
+    def test_streaming_hash_matches_whole_file_hash(self):
+        for chunk_size in (1, 1000, 4096, len(self.content) + 1):
+            self.assertEqual(get_file_hash(self.path, chunk_size=chunk_size), self.expected)
+        self.assertEqual(get_video_hash(self.path), self.expected)
+        self.assertEqual(get_pdf_hash(self.path), self.expected)
+
+    def test_file_objects_are_hashed_from_current_position(self):
+        self.assertEqual(get_file_hash(io.BytesIO(self.content), chunk_size=1000), self.expected)
+        with open(self.path, "rb") as f:
+            f.seek(10)
+            self.assertEqual(get_file_hash(f), hashlib.sha256(self.content[10:]).hexdigest())
+
+    def test_empty_file(self):
+        empty = self.tmp / "empty.bin"
+        empty.touch()
+        self.assertEqual(get_file_hash(empty), hashlib.sha256(b"").hexdigest())
+        self.assertEqual(len(get_file_prehash(empty)), 64)
+
+    def test_prehash_detects_size_head_and_tail_changes(self):
+        prehash = get_file_prehash(self.path, block_size=1024)
+        copy = self.tmp / "copy.bin"
+        copy.write_bytes(self.content)
+        self.assertEqual(get_file_prehash(copy, block_size=1024), prehash)
+
+        for changed in (
+            self.content + b"\x00",
+            b"\xff" + self.content[1:],
+            self.content[:-1] + b"\xff",
+        ):
+            copy.write_bytes(changed)
+            self.assertNotEqual(get_file_prehash(copy, block_size=1024), prehash)
+
+        # The middle of the file is not part of the pre-hash
+        middle = len(self.content) // 2
+        copy.write_bytes(self.content[:middle] + b"\xff" + self.content[middle + 1:])
+        self.assertEqual(get_file_prehash(copy, block_size=1024), prehash)
@@ -0,0 +1,58 @@
+import numpy as np
+from django.test import TestCase
+
+from endoreg_db.models import Center, Label, LabelVideoSegment, VideoFile
+from endoreg_db.models.media.video.video_file_segments import _get_outside_frames
+from endoreg_db.utils.frame_ranges import FrameRangeSet
+
+
+class FrameRangeSetTest(TestCase):
+    def setUp(self):
+        # Overlapping, touching, contained, empty and single-frame ranges, unsorted
+        self.ranges = FrameRangeSet([(10, 20), (5, 8), (21, 25), (30, 29), (40, 40), (12, 13)])
+
+    def test_ranges_are_sorted_and_merged(self):
+        self.assertEqual(self.ranges.ranges(), [(5, 8), (10, 25), (40, 40)])
+        self.assertEqual(len(self.ranges), 4 + 16 + 1)
+        self.assertFalse(FrameRangeSet())
+        self.assertEqual(FrameRangeSet([(3, 4), (1, 2)]), FrameRangeSet([(1, 4)]))
+
+    def test_membership_matches_expanded_set(self):
+        expanded = {n for first, last in [(10, 20), (5, 8), (21, 25), (40, 40), (12, 13)] for n in range(first, last + 1)}
+        candidates = np.arange(-2, 45)
+
+        self.assertEqual([n in self.ranges for n in candidates.tolist()], [n in expanded for n in candidates.tolist()])
+        np.testing.assert_array_equal(self.ranges.contains(candidates), [n in expanded for n in candidates.tolist()])
+        np.testing.assert_array_equal(np.flatnonzero(self.ranges.mask(42)), sorted(n for n in expanded if n < 42))
+
+    def test_mask_clips_ranges_to_length(self):
+        mask = FrameRangeSet([(-5, 1), (8, 50)]).mask(10)
+        np.testing.assert_array_equal(np.flatnonzero(mask), [0, 1, 8, 9])
+        self.assertFalse(FrameRangeSet().mask(5).any())
+
+
+class OutsideFrameRangesTest(TestCase):
+    def setUp(self):
+        center = Center.objects.create(name="frame_ranges_test_center")
+        self.video = VideoFile.objects.create(center=center, video_hash="frame-ranges-test", fps=25, frame_count=100)
+        self.video.initialize_frames()
+        outside, _ = Label.objects.get_or_create(name="outside")
+        other = Label.objects.create(name="frame_ranges_test_other")
+        for label, first, last in [(outside, 10, 19), (outside, 15, 30), (outside, 60, 61), (other, 40, 50)]:
+            LabelVideoSegment.objects.create(
+                video_file=self.video, label=label, start_frame_number=first, end_frame_number=last
+            )
+
+    def test_video_outside_frame_ranges(self):
+        # Segment ends are exclusive
+        self.assertEqual(self.video.get_outside_frame_ranges().ranges(), [(10, 29), (60, 60)])
+
+    def test_outside_frames_match_frame_ranges_and_segment_frames(self):
+        frames = list(_get_outside_frames(self.video).values_list("frame_number", flat=True))
+        self.assertEqual(frames, [*range(10, 30), 60])
+        self.assertEqual(frames, np.flatnonzero(self.video.get_outside_frame_ranges().mask(100)).tolist())
+        segment_frames = {
+            n for segment in self.video.get_outside_segments()
+            for n in segment.get_frames().values_list("frame_number", flat=True)
+        }
+        self.assertEqual(sorted(segment_frames), frames)
@@ -0,0 +1,104 @@
+import pytest
+from django.core.cache import cache
+
+from endoreg_db.services.lookup_store import LookupStore, LookupVersionConflict
+
+BACKENDS = ["blob", "fields"]
+
+
+@pytest.fixture(autouse=True)
+def _clear_cache():
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_patch_merges_and_bumps_version(backend):
+    store = LookupStore(backend=backend)
+    store.init({"a": 1, "requirementStatus": {"1": False}})
+    assert store.get_version() == 1
+
+    assert store.patch({"requirementStatus": {"1": True}, "b": None}) == 2
+    assert store.set("c", [1, 2]) == 3
+
+    assert store.get_all() == {"a": 1, "requirementStatus": {"1": True}, "b": None, "c": [1, 2]}
+    assert store.get_many(["a", "c", "missing"]) == {"a": 1, "c": [1, 2], "missing": None}
+    assert store.get("b", "default") is None
+    assert store.get("missing", "default") == "default"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_patch_rejects_outdated_version(backend):
+    store = LookupStore(backend=backend)
+    store.init({"a": 1})
+    store.patch({"a": 2}, expected_version=1)
+
+    with pytest.raises(LookupVersionConflict) as excinfo:
+        store.patch({"a": 3}, expected_version=1)
+    assert excinfo.value.actual == 2
+    assert store.get("a") == 2
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_delete(backend):
+    store = LookupStore(backend=backend)
+    store.init({"a": 1})
+    cache.set(store.input_state_key, {"finding": {1: 1}})
+    cache.set(store.plan_version_key, "v1")
+    store.delete()
+    assert store.get_all() == {}
+    assert store.get_version() == 0
+    assert cache.get(store.input_state_key) is None
+    assert cache.get(store.plan_version_key) is None
+
+
+def test_init_drops_recompute_state_of_previous_data():
+    store = LookupStore(backend="blob")
+    store.init({"a": 1})
+    cache.set(store.input_state_key, {"finding": {1: 1}})
+    cache.set(store.plan_version_key, "v1")
+
+    store.init({"a": 2})
+    assert cache.get(store.input_state_key) is None
+    assert cache.get(store.plan_version_key) is None
+
+
+def test_field_backend_stores_fields_individually():
+    store = LookupStore(backend="fields")
+    store.init({"a": 1, "b": {"large": list(range(10))}})
+    store.patch({"a": 2})
+
+    assert cache.get(store.cache_key) is None
+    assert cache.get(f"{store.cache_key}:f:a") == 2
+    assert cache.get(f"{store.cache_key}:keys") == ["a", "b"]
+
+    # Re-initializing drops fields that are no longer part of the lookup
+    store.init({"a": 3})
+    assert cache.get(f"{store.cache_key}:f:b") is None
+    assert store.get_all() == {"a": 3}
+
+
+def test_field_backend_reads_and_migrates_blob_lookups():
+    cache.set("lookup:legacy", {"a": 1, "b": 2})
+    store = LookupStore(token="legacy", backend="fields")
+    assert store.get_all() == {"a": 1, "b": 2}
+    assert store.get_many(["b"]) == {"b": 2}
+
+    store.patch({"b": 3})
+    assert cache.get("lookup:legacy") is None
+    assert store.get_all() == {"a": 1, "b": 3}
+
+
+def test_lock_is_released_after_failed_write():
+    store = LookupStore(backend="blob")
+    with pytest.raises(RuntimeError):
+        with store.lock():
+            raise RuntimeError
+    assert cache.get(f"{store.cache_key}:lock") is None
+    store.patch({"a": 1})
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError):
+        LookupStore(backend="redis")
@@ -0,0 +1,75 @@
+import datetime
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from endoreg_db.models import PatientExamination, RequirementSet
+from endoreg_db.models.medical.finding.finding import Finding
+from endoreg_db.models.requirement.requirement_evaluation.evaluation_plan import (
+    get_evaluation_plan,
+    invalidate_evaluation_plan,
+)
+from endoreg_db.services.examination_batch_evaluation import evaluate_examinations
+
+from ..helpers.data_loader import load_data
+from ..helpers.default_objects import generate_patient
+
+COLO_AUSTRIA_EXAMINATION_NAME = "colonoscopy_austria_screening"
+POLYP_SET_NAME = "colonoscopy_austria_screening_finding_polyp_required_classifications"
+
+
+class BatchExaminationEvaluationTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        load_data()
+        cls.req_set = RequirementSet.objects.get(name=POLYP_SET_NAME)
+        colon_polyp = Finding.objects.get(name="colon_polyp")
+
+        cls.examinations = []
+        for n_classified in (None, 0, 3, -1):
+            patient = generate_patient()
+            patient.save()
+            examination = patient.create_examination(
+                examination_name_str=COLO_AUSTRIA_EXAMINATION_NAME,
+                date_start=timezone.now(),
+                date_end=timezone.now() + datetime.timedelta(minutes=30),
+            )
+            examination.save()
+            if n_classified is not None:
+                patient_finding = examination.create_finding(colon_polyp)
+                classifications = list(colon_polyp.finding_classifications.all())
+                if n_classified >= 0:
+                    classifications = classifications[:n_classified]
+                for classification in classifications:
+                    patient_finding.add_classification(classification.pk, classification.choices.first().pk)
+            cls.examinations.append(examination)
+
+    def setUp(self):
+        invalidate_evaluation_plan()
+
+    def test_matches_single_evaluation(self):
+        examinations = PatientExamination.objects.filter(pk__in=[e.pk for e in self.examinations]).order_by("pk")
+        matrix = evaluate_examinations(examinations, [self.req_set])
+
+        self.assertEqual(matrix.results.shape, (len(self.examinations), 1))
+        self.assertEqual(matrix.examination_ids.tolist(), sorted(e.pk for e in self.examinations))
+        for examination in self.examinations:
+            expected = self.req_set.evaluate(PatientExamination.objects.get(pk=examination.pk))
+            self.assertEqual(matrix.for_examination(examination.pk), {self.req_set.pk: expected})
+
+    def test_query_count_does_not_grow_with_examinations(self):
+        get_evaluation_plan()
+        query_counts = []
+        for n in (1, len(self.examinations)):
+            examinations = PatientExamination.objects.filter(pk__in=[e.pk for e in self.examinations[-n:]])
+            with CaptureQueriesContext(connection) as queries:
+                evaluate_examinations(examinations, [self.req_set.pk])
+            query_counts.append(len(queries))
+        self.assertEqual(query_counts[0], query_counts[1])
+
+    def test_empty_queryset(self):
+        matrix = evaluate_examinations(PatientExamination.objects.none(), [self.req_set])
+        self.assertEqual(matrix.results.shape, (0, 1))
+        self.assertEqual(matrix.satisfied_fraction(), {self.req_set.pk: 0.0})
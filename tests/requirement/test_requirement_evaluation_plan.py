@@ -0,0 +1,121 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from endoreg_db.models import (
+    Disease,
+    Patient,
+    PatientDisease,
+    Requirement,
+    RequirementOperator,
+    RequirementSet,
+    RequirementSetType,
+    RequirementType,
+)
+from endoreg_db.models.requirement.requirement_evaluation import evaluation_plan
+from endoreg_db.models.requirement.requirement_evaluation.evaluation_plan import (
+    get_evaluation_plan,
+    invalidate_evaluation_plan,
+)
+from endoreg_db.services.examination_evaluation import _eval_set_tree
+
+from ..helpers.data_loader import load_data
+from ..helpers.default_objects import generate_patient
+
+
+class RequirementEvaluationPlanTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        load_data()
+        cls.disease = Disease.objects.create(name="evaluation_plan_test_disease")
+        cls.other_disease = Disease.objects.create(name="evaluation_plan_test_other_disease")
+        patient_type, _ = RequirementType.objects.get_or_create(name="patient")
+        operator, _ = RequirementOperator.objects.get_or_create(name="models_match_any")
+        set_type_all, _ = RequirementSetType.objects.get_or_create(name="all")
+        set_type_any, _ = RequirementSetType.objects.get_or_create(name="any")
+
+        cls.requirements = []
+        for i in range(3):
+            requirement = Requirement.objects.create(name=f"evaluation_plan_test_requirement_{i}")
+            requirement.requirement_types.add(patient_type)
+            requirement.operators.add(operator)
+            requirement.diseases.add(cls.disease)
+            cls.requirements.append(requirement)
+
+        # root -> (child_a, child_b), child_a -> child_b
+        cls.root = RequirementSet.objects.create(name="evaluation_plan_test_root", requirement_set_type=set_type_all)
+        cls.child_a = RequirementSet.objects.create(name="evaluation_plan_test_child_a", requirement_set_type=set_type_any)
+        cls.child_b = RequirementSet.objects.create(name="evaluation_plan_test_child_b", requirement_set_type=set_type_all)
+        cls.root.requirements.add(cls.requirements[0])
+        cls.child_a.requirements.add(cls.requirements[1])
+        cls.child_b.requirements.add(cls.requirements[2])
+        cls.root.links_to_sets.add(cls.child_a, cls.child_b)
+        cls.child_a.links_to_sets.add(cls.child_b)
+
+    def setUp(self):
+        invalidate_evaluation_plan()
+        self.patient = generate_patient()
+        self.patient.save()
+        PatientDisease.objects.create(patient=self.patient, disease=self.disease)
+
+    def tearDown(self):
+        invalidate_evaluation_plan()
+
+    def _fresh_patient(self) -> Patient:
+        return Patient.objects.get(pk=self.patient.pk)
+
+    def test_plan_resolves_sets_and_requirements(self):
+        plan = get_evaluation_plan()
+        root_plan = plan.requirement_sets[self.root.pk]
+        self.assertEqual(root_plan.requirement_ids, (self.requirements[0].pk,))
+        self.assertEqual(root_plan.linked_set_ids, (self.child_a.pk, self.child_b.pk))
+        self.assertEqual(set(root_plan.all_linked_set_ids), {self.child_a.pk, self.child_b.pk})
+        self.assertEqual(root_plan.all_linked_set_ids, tuple(s.pk for s in self.root.all_linked_sets))
+
+        requirement_plan = plan.requirements[self.requirements[0].pk]
+        self.assertEqual(requirement_plan.link_ids["diseases"], frozenset({self.disease.pk}))
+        self.assertEqual(requirement_plan.expected_models, (Patient,))
+        self.assertEqual([op.name for op in requirement_plan.operators], ["models_match_any"])
+
+    def test_cached_plan_evaluates_with_constant_queries(self):
+        self.assertTrue(self.root.evaluate(self._fresh_patient()))  # compiles the plan
+
+        patient = self._fresh_patient()
+        with CaptureQueriesContext(connection) as links_queries:
+            patient.links
+        patient = self._fresh_patient()
+        # Only the input is resolved, once for all requirements and linked sets
+        with self.assertNumQueries(len(links_queries)):
+            self.assertTrue(self.root.evaluate(patient))
+
+    def test_plan_is_invalidated_on_requirement_change(self):
+        self.assertTrue(self.requirements[0].evaluate(self._fresh_patient(), mode="strict"))
+        self.assertIsNotNone(evaluation_plan._plan)
+
+        self.requirements[0].diseases.set([self.other_disease])
+        self.assertIsNone(evaluation_plan._plan)
+        self.assertFalse(self.requirements[0].evaluate(self._fresh_patient(), mode="strict"))
+        self.assertFalse(self.root.evaluate(self._fresh_patient()))
+
+    def test_cyclic_links_terminate(self):
+        self.child_b.links_to_sets.add(self.root)
+        self.assertIsNone(evaluation_plan._plan)
+        self.assertTrue(self.root.evaluate(self._fresh_patient()))
+        self.assertTrue(self.child_b.evaluate(self._fresh_patient()))
+
+    def test_set_tree_recompiles_plan_for_sets_created_elsewhere(self):
+        stale_plan = get_evaluation_plan()
+        new_set = RequirementSet.objects.create(
+            name="evaluation_plan_test_new_set", requirement_set_type=self.root.requirement_set_type
+        )
+        new_set.requirements.add(self.requirements[0])
+        new_set.links_to_sets.add(self.child_b)
+        # Another process created the set: this process still holds the stale plan
+        evaluation_plan._plan = stale_plan
+        self.assertNotIn(new_set.pk, stale_plan.requirement_sets)
+
+        result = _eval_set_tree(new_set, self._fresh_patient(), set())
+        self.assertEqual(result.id, new_set.pk)
+        self.assertTrue(result.is_satisfied)
+        self.assertEqual([child.id for child in result.linked_sets], [self.child_b.pk])
+        self.assertIn(new_set.pk, get_evaluation_plan().requirement_sets)
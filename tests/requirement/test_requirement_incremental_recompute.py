@@ -0,0 +1,113 @@
+import datetime
+from unittest import mock
+
+from django.test import TestCase
+from django.utils import timezone
+
+from endoreg_db.models import Requirement
+from endoreg_db.models.medical.finding.finding import Finding
+from endoreg_db.models.requirement.requirement_evaluation.evaluation_plan import (
+    get_evaluation_plan,
+    invalidate_evaluation_plan,
+)
+from endoreg_db.services import lookup_service as ls
+from endoreg_db.services.lookup_store import LookupStore
+from endoreg_db.services.requirement_dependencies import (
+    affected_requirement_ids,
+    changed_input_ids,
+    requirement_dependencies,
+)
+
+from ..helpers.data_loader import load_data
+from ..helpers.default_objects import generate_patient
+
+COLO_AUSTRIA_EXAMINATION_NAME = "colonoscopy_austria_screening"
+
+
+class IncrementalRecomputeTest(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        load_data()
+        patient = generate_patient()
+        patient.save()
+        cls.examination = patient.create_examination(
+            examination_name_str=COLO_AUSTRIA_EXAMINATION_NAME,
+            date_start=timezone.now(),
+            date_end=timezone.now() + datetime.timedelta(minutes=30),
+        )
+        cls.examination.save()
+        cls.colon_polyp = Finding.objects.get(name="colon_polyp")
+        cls.patient_finding = cls.examination.create_finding(cls.colon_polyp)
+
+    def setUp(self):
+        invalidate_evaluation_plan()
+        pe = ls.load_patient_exam_for_eval(self.examination.pk)
+        self.requirement_sets = ls.requirement_sets_for_patient_exam(pe)
+        self.assertTrue(self.requirement_sets)
+        self.token = ls.create_lookup_token_for_pe(self.examination.pk)
+        self.store = LookupStore(token=self.token)
+        self.store.set("selectedRequirementSetIds", [rs.id for rs in self.requirement_sets])
+        self.requirement_ids = {r.id for rs in self.requirement_sets for r in rs.requirements.all()}
+
+    def _recompute_counting(self, **kwargs):
+        with mock.patch.object(Requirement, "evaluate", autospec=True, side_effect=Requirement.evaluate) as evaluate:
+            delta = ls.recompute_lookup(self.token, **kwargs)
+        return delta, {call.args[0].id for call in evaluate.call_args_list}
+
+    def test_first_recompute_evaluates_everything(self):
+        delta, evaluated = self._recompute_counting()
+        self.assertEqual(evaluated, self.requirement_ids)
+        self.assertEqual(set(delta["requirementStatus"]), {str(r) for r in self.requirement_ids})
+
+    def test_unchanged_input_only_evaluates_untracked_requirements(self):
+        ls.recompute_lookup(self.token)
+        delta, evaluated = self._recompute_counting()
+
+        plan = get_evaluation_plan()
+        untracked = {r for r in self.requirement_ids if requirement_dependencies(plan, r) is None}
+        self.assertEqual(evaluated, untracked)
+        self.assertEqual(delta, {})
+
+    def test_changed_requirement_definition_evaluates_everything(self):
+        ls.recompute_lookup(self.token)
+        version = get_evaluation_plan().version
+        requirement = Requirement.objects.get(pk=min(self.requirement_ids))
+        requirement.numeric_value = (requirement.numeric_value or 0) + 1
+        requirement.save()
+
+        _, evaluated = self._recompute_counting()
+        self.assertNotEqual(get_evaluation_plan().version, version)
+        self.assertEqual(evaluated, self.requirement_ids)
+
+    def test_changed_classification_matches_full_recompute(self):
+        ls.recompute_lookup(self.token)
+        for classification in self.colon_polyp.finding_classifications.all():
+            self.patient_finding.add_classification(classification.pk, classification.choices.first().pk)
+
+        delta, evaluated = self._recompute_counting()
+        plan = get_evaluation_plan()
+        self.assertEqual(
+            evaluated,
+            affected_requirement_ids(plan, self.requirement_ids, {"finding_classifications"}),
+        )
+        incremental_status = self.store.get("requirementStatus")
+        full = ls.recompute_lookup(self.token, full=True)
+        self.assertEqual(incremental_status, full["requirementStatus"])
+        self.assertEqual(self.store.get("requirementSetStatus"), full["requirementSetStatus"])
+        for requirement_id, status in delta.get("requirementStatus", {}).items():
+            self.assertEqual(full["requirementStatus"][requirement_id], status)
+
+
+class LookupDeltaTest(TestCase):
+    def test_changed_input_ids(self):
+        previous = {"lab_values": {1: (1, 5.0), 2: (2, 1.0)}, "patient_findings": {3: (7, True)}}
+        current = {"lab_values": {1: (1, 6.0), 4: (2, 1.0)}, "patient_findings": {3: (7, True)}}
+        self.assertEqual(changed_input_ids(previous, current), {"lab_values": {1, 2, 4}})
+
+    def test_lookup_delta_reports_changed_and_removed_entries(self):
+        previous = {"requirementStatus": {"1": True, "2": False}, "requirementSetStatus": {"5": True}}
+        current = {"requirementStatus": {"1": True, "3": False}, "requirementSetStatus": {"5": True}}
+        self.assertEqual(
+            ls._lookup_delta(previous, current),
+            {"requirementStatus": {"2": None, "3": False}},
+        )
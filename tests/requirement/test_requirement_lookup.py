@@ -123,6 +123,26 @@ def test_lookup_patch_parts_updates_cache(client):
     assert data["selectedRequirementSetIds"] == [1, 2]
 
 
+
+@pytest.mark.parametrize("method, path", [("patch", "parts"), ("post", "recompute")])
+def test_lookup_writes_on_locked_token_return_503(client, monkeypatch, method, path):
+    from endoreg_db.services import lookup_store
+    from endoreg_db.services.lookup_store import LookupStore
+
+    token = f"t_locked_{path}"
+    _seed_cache(token, {"a": 1, "patient_examination_id": 1})
+    monkeypatch.setattr(lookup_store, "LOCK_WAIT_SECONDS", 0)
+
+    with LookupStore(token=token).lock():
+        resp = getattr(client, method)(
+            f"/api/lookup/{token}/{path}/",
+            data=json.dumps({"updates": {"a": 2}}),
+            content_type="application/json",
+        )
+    assert resp.status_code == 503, resp.content
+    assert resp["Retry-After"] == str(lookup_store.LOCK_TIMEOUT_SECONDS)
+    assert cache.get(f"lookup:{token}")["a"] == 1
+
 def test_lookup_session_expiration_and_restart(client, monkeypatch):
     """Test that expired sessions trigger automatic restart without infinite loops"""
     from endoreg_db.services import lookup_service as ls
@@ -4,7 +4,9 @@ Tests the /api/anonymization/items/overview/ endpoint that returns
 FileItem interface data for videos and PDFs.
 """
 import pytest
+from django.db import connection
 from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework import status
 from endoreg_db.models import SensitiveMeta, VideoState, SensitiveMetaState
@@ -22,6 +24,9 @@ logger = logging.getLogger(__name__)
 # Environment-based test control
 SKIP_EXPENSIVE_TESTS = os.environ.get("SKIP_EXPENSIVE_TESTS", "true").lower() == "true"
 
+# Videos (with validated segment annotation), PDFs (with anonymized text length); independent of the number of files
+MAX_OVERVIEW_QUERIES = 2
+
 @override_settings(
     DEBUG=True,
     REST_FRAMEWORK={
@@ -150,6 +155,45 @@ class AnonymizationOverviewAPITest(TestCase):
         ## self.assertEqual(video_item['annotationStatus'], 'done')  # Sensitive meta is verified
         # self.assertIsNotNone(video_item['createdAt'])
 
+    @pytest.mark.integration
+    @pytest.mark.api
+    def test_overview_cursor_pagination(self):
+        """Pages follow X-Next-Cursor through the merged feed without repeating items."""
+        full = self.client.get('/api/anonymization/items/overview/')
+        self.assertEqual(full.status_code, status.HTTP_200_OK)
+        expected = [(item['mediaType'], item['id']) for item in full.data]
+
+        seen = []
+        params = {'limit': 1}
+        for _ in range(len(expected) + 1):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.get('/api/anonymization/items/overview/', params)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertLessEqual(len(response.data), 1)
+            self.assertLessEqual(len(queries), MAX_OVERVIEW_QUERIES)
+            seen += [(item['mediaType'], item['id']) for item in response.data]
+            if 'X-Next-Cursor' not in response:
+                break
+            params = {'limit': 1, 'cursor': response['X-Next-Cursor']}
+
+        self.assertEqual(seen, expected)
+
+    @pytest.mark.unit
+    def test_overview_text_is_opt_in(self):
+        """Text fields are only loaded with include_text=true."""
+        item = next(i for i in self.client.get('/api/anonymization/items/overview/').data if i['mediaType'] == 'pdf')
+        self.assertEqual(item['text'], '')
+        self.assertEqual(item['anonymizedText'], '')
+
+        response = self.client.get('/api/anonymization/items/overview/', {'include_text': 'true'})
+        item = next(i for i in response.data if i['mediaType'] == 'pdf')
+        self.assertEqual(item['text'], self.raw_pdf.text or '')
+
+    @pytest.mark.unit
+    def test_overview_invalid_cursor(self):
+        response = self.client.get('/api/anonymization/items/overview/', {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
 #TODO Repair after refactor    
     # def test_video_anonymization_statuses(self):
     #     """Test different video anonymization statuses."""
@@ -7,11 +7,12 @@ with frame-level anonymization.
 
 import tempfile
 import os
+import tracemalloc
 import pytest
 from pathlib import Path
 from django.test import TestCase
-from endoreg_db.models import VideoFile
-from endoreg_db.services.video_import import import_and_anonymize
+from endoreg_db.models import Center, VideoFile
+from endoreg_db.services.video_import import VideoImportService, import_and_anonymize
 from .helpers.default_objects import get_default_center, get_default_processor
 from .media.video.helper import get_random_video_path_by_examination_alias
 import logging
@@ -132,4 +133,40 @@ class TestVideoImportService(TestCase):
         finally:
             # Clean up if file still exists
             if temp_path.exists():
-                temp_path.unlink()
\ No newline at end of file
+                temp_path.unlink()
+
+
+class TestStoreProcessedVideo(TestCase):
+    """The cleaned video is moved into storage instead of being read into memory."""
+
+    SIZE = 32 * 1024 * 1024
+
+    def setUp(self):
+        center = Center.objects.create(name="store_processed_video_test_center")
+        self.video = VideoFile.objects.create(center=center, video_hash="store-processed-video-test")
+        self.service = VideoImportService()
+        self.service.current_video = self.video
+
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.cleaned_path = Path(self.tmp_dir.name) / "store-processed-video-test.mp4"
+        with open(self.cleaned_path, "wb") as f:
+            f.truncate(self.SIZE)
+
+    @pytest.mark.unit
+    def test_store_processed_video_does_not_load_file(self):
+        tracemalloc.start()
+        try:
+            self.service._store_processed_video(self.cleaned_path)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+        stored_path = Path(self.video.processed_file.path)
+        self.addCleanup(stored_path.unlink, missing_ok=True)
+        self.assertLess(peak, self.SIZE // 8)
+        self.assertFalse(self.cleaned_path.exists())
+        self.assertEqual(stored_path.stat().st_size, self.SIZE)
+
+        self.video.refresh_from_db()
+        self.assertEqual(Path(self.video.processed_file.path), stored_path)